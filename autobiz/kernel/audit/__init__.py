@@ -0,0 +1,44 @@
+"""Audit module: hash-chained audit log with Merkle checkpoints.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+"""
+
+from autobiz.kernel.audit.chain import (
+    GENESIS_HASH,
+    AuditChainError,
+    AuditEntry,
+    hash_entry,
+    verify_chain,
+)
+from autobiz.kernel.audit.merkle import InclusionProof, MerkleTree, merkle_root, root_from_proof
+from autobiz.kernel.audit.sequencer import AuditSequencer, AuditSequencerStats
+from autobiz.kernel.audit.store import (
+    AuditCheckpoint,
+    AuditConflictError,
+    AuditStore,
+    InMemoryAuditStore,
+    PostgresAuditStore,
+)
+from autobiz.kernel.audit.verifier import AuditProof, AuditVerifier, verify_inclusion
+
+__all__ = [
+    "GENESIS_HASH",
+    "AuditChainError",
+    "AuditEntry",
+    "hash_entry",
+    "verify_chain",
+    "InclusionProof",
+    "MerkleTree",
+    "merkle_root",
+    "root_from_proof",
+    "AuditSequencer",
+    "AuditSequencerStats",
+    "AuditCheckpoint",
+    "AuditConflictError",
+    "AuditStore",
+    "InMemoryAuditStore",
+    "PostgresAuditStore",
+    "AuditProof",
+    "AuditVerifier",
+    "verify_inclusion",
+]
@@ -0,0 +1,156 @@
+"""Hash-chained audit entries.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Requirements: INV-04, P1-R05
+
+Every entry carries prev_hash, the entry_hash of the entry before it
+(GENESIS_HASH for seq 0), and its own entry_hash:
+
+    entry_hash = SHA-256(0x00 || prev_hash || JCS(body))
+
+where body is {seq, tenant_id, event, payload, recorded_at} in RFC 8785
+canonical form, so the hash survives a round-trip through JSONB. The 0x00
+prefix makes entry hashes usable directly as Merkle leaves (interior nodes
+use 0x01, see autobiz.kernel.audit.merkle).
+
+verify_chain() checks a contiguous run of entries against the hash of the
+entry before it. It is a plain module-level function over picklable
+values, so chunks of a long range can be checked in a process pool and
+stitched together by comparing their boundary hashes.
+"""
+
+import hashlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from autobiz.kernel.idempotency.jcs import canonicalize
+
+HASH_SIZE = 32
+GENESIS_HASH = bytes(HASH_SIZE)
+
+# Domain separation between entry (leaf) hashes and Merkle interior nodes
+LEAF_PREFIX = b"\x00"
+
+
+class AuditChainError(RuntimeError):
+    """Raised when the audit chain or a checkpoint does not verify.
+
+    Attributes:
+        seq: First entry at which verification failed
+    """
+
+    def __init__(self, seq: int, message: str) -> None:
+        """Initialize error.
+
+        Args:
+            seq: Offending entry sequence number
+            message: What did not match
+        """
+        self.seq = seq
+        super().__init__(f"Audit chain broken at seq {seq}: {message}")
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def hash_entry(
+    seq: int,
+    tenant_id: str,
+    event: str,
+    payload: Any,
+    recorded_at: datetime,
+    prev_hash: bytes,
+) -> bytes:
+    """entry_hash of an audit entry.
+
+    Raises:
+        CanonicalizationError: If payload is not representable as I-JSON
+    """
+    body = canonicalize(
+        {
+            "seq": seq,
+            "tenant_id": tenant_id,
+            "event": event,
+            "payload": payload,
+            "recorded_at": _timestamp(recorded_at),
+        }
+    )
+    return hashlib.sha256(LEAF_PREFIX + prev_hash + body).digest()
+
+
+@dataclass(frozen=True)
+class AuditEntry:
+    """One immutable audit log entry.
+
+    Attributes:
+        seq: Position in the global chain (from 0)
+        tenant_id: Tenant the event concerns
+        event: Event type (e.g. CROSS_TENANT_ATTEMPT, HITL_DECISION)
+        payload: JSON event details
+        recorded_at: When the sequencer chained the entry
+        prev_hash: entry_hash of entry seq - 1
+        entry_hash: Hash of this entry (see module docstring)
+    """
+
+    seq: int
+    tenant_id: str
+    event: str
+    payload: Any
+    recorded_at: datetime
+    prev_hash: bytes
+    entry_hash: bytes
+
+    @classmethod
+    def chain(
+        cls,
+        prev: "AuditEntry | None",
+        tenant_id: str,
+        event: str,
+        payload: Any,
+        recorded_at: datetime,
+    ) -> "AuditEntry":
+        """Build the entry that follows prev (None for the first entry)."""
+        seq = prev.seq + 1 if prev is not None else 0
+        prev_hash = prev.entry_hash if prev is not None else GENESIS_HASH
+        return cls(
+            seq=seq,
+            tenant_id=tenant_id,
+            event=event,
+            payload=payload,
+            recorded_at=recorded_at,
+            prev_hash=prev_hash,
+            entry_hash=hash_entry(seq, tenant_id, event, payload, recorded_at, prev_hash),
+        )
+
+    def computed_hash(self) -> bytes:
+        """Recompute entry_hash from the entry's content."""
+        return hash_entry(
+            self.seq, self.tenant_id, self.event, self.payload, self.recorded_at, self.prev_hash
+        )
+
+
+def verify_chain(entries: Sequence[AuditEntry], prev_hash: bytes, first_seq: int) -> None:
+    """Check that entries are intact and continue the chain at first_seq.
+
+    Args:
+        entries: Consecutive entries, ascending seq
+        prev_hash: entry_hash of entry first_seq - 1 (GENESIS_HASH for 0)
+        first_seq: Expected seq of entries[0]
+
+    Raises:
+        AuditChainError: At the first missing, reordered, relinked or
+            altered entry
+    """
+    expected_seq = first_seq
+    for entry in entries:
+        if entry.seq != expected_seq:
+            raise AuditChainError(expected_seq, f"found seq {entry.seq}")
+        if entry.prev_hash != prev_hash:
+            raise AuditChainError(entry.seq, "prev_hash does not match the previous entry")
+        if entry.computed_hash() != entry.entry_hash:
+            raise AuditChainError(entry.seq, "entry content does not match entry_hash")
+        prev_hash = entry.entry_hash
+        expected_seq += 1
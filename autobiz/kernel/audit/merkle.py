@@ -0,0 +1,129 @@
+"""Merkle trees over audit entry hashes: roots and inclusion proofs.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Requirements: INV-04, P1-R05
+
+Same tree shape as RFC 6962 / RFC 9162 (Certificate Transparency): leaves
+are entry hashes (already 0x00-prefixed, see chain.py), an interior node
+is SHA-256(0x01 || left || right), and an odd node at the end of a level
+is promoted unchanged. An inclusion proof for leaf i of an n-leaf tree
+lists at most ceil(log2 n) sibling hashes, and verifying it rebuilds the
+root from the leaf in as many steps.
+"""
+
+import hashlib
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+NODE_PREFIX = b"\x01"
+
+
+def _node(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _next_level(level: Sequence[bytes]) -> list[bytes]:
+    parents = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+    if len(level) % 2:
+        parents.append(level[-1])
+    return parents
+
+
+def merkle_root(leaves: Sequence[bytes]) -> bytes:
+    """Root of the tree over leaves.
+
+    Raises:
+        ValueError: If there are no leaves
+    """
+    if not leaves:
+        raise ValueError("A Merkle tree needs at least one leaf")
+    level = list(leaves)
+    while len(level) > 1:
+        level = _next_level(level)
+    return level[0]
+
+
+@dataclass(frozen=True)
+class InclusionProof:
+    """Audit path from one leaf to the root.
+
+    Attributes:
+        leaf_index: Position of the leaf in the tree
+        leaf_count: Number of leaves in the tree
+        path: Sibling hashes, leaf level first
+    """
+
+    leaf_index: int
+    leaf_count: int
+    path: tuple[bytes, ...]
+
+
+class MerkleTree:
+    """All levels of a tree, for generating proofs of many leaves."""
+
+    def __init__(self, leaves: Sequence[bytes]) -> None:
+        """Build every level.
+
+        Args:
+            leaves: Leaf hashes in order
+
+        Raises:
+            ValueError: If there are no leaves
+        """
+        if not leaves:
+            raise ValueError("A Merkle tree needs at least one leaf")
+        self._levels = [list(leaves)]
+        while len(self._levels[-1]) > 1:
+            self._levels.append(_next_level(self._levels[-1]))
+
+    @property
+    def root(self) -> bytes:
+        """Tree root."""
+        return self._levels[-1][0]
+
+    @property
+    def leaf_count(self) -> int:
+        """Number of leaves."""
+        return len(self._levels[0])
+
+    def proof(self, leaf_index: int) -> InclusionProof:
+        """Inclusion proof for one leaf.
+
+        Raises:
+            IndexError: If leaf_index is out of range
+        """
+        if not 0 <= leaf_index < self.leaf_count:
+            raise IndexError(f"leaf {leaf_index} not in a tree of {self.leaf_count}")
+        path: list[bytes] = []
+        index = leaf_index
+        for level in self._levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                path.append(level[sibling])
+            index //= 2
+        return InclusionProof(leaf_index, self.leaf_count, tuple(path))
+
+
+def root_from_proof(leaf: bytes, proof: InclusionProof) -> bytes | None:
+    """Root implied by a leaf and its proof, or None if the proof is malformed."""
+    if not 0 <= proof.leaf_index < proof.leaf_count:
+        return None
+    node, index, size = leaf, proof.leaf_index, proof.leaf_count
+    siblings = iter(proof.path)
+    while size > 1:
+        if index % 2:
+            sibling = next(siblings, None)
+            if sibling is None:
+                return None
+            node = _node(sibling, node)
+        elif index + 1 < size:
+            sibling = next(siblings, None)
+            if sibling is None:
+                return None
+            node = _node(node, sibling)
+        # else: last odd node, promoted unchanged
+        index //= 2
+        size = (size + 1) // 2
+    if next(siblings, None) is not None:
+        return None
+    return node
@@ -0,0 +1,212 @@
+"""AuditSequencer: the single writer that chains audit entries in batches.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Requirements: INV-04, P1-R05
+
+Chaining forces a total order: entry n+1 hashes entry n. If every caller
+read the tail, hashed and inserted on its own, all writers would
+serialize on the tail row (a lock or a retry loop per entry). Instead
+callers enqueue events and one background task owns the tail:
+
+1. Take everything queued (up to max_batch, plus an optional linger)
+2. Assign consecutive seqs and chain the batch in memory from the tail
+3. Write it with one store.append() (one multi-row INSERT)
+4. Resolve every caller's future with its committed entry
+
+Under load, batches grow by themselves while a write is in flight, so the
+tail costs one round-trip per batch instead of one per entry. If another
+sequencer appended first (AuditConflictError), the tail is reloaded and
+the batch re-chained. If a write fails for another reason its callers get
+the error; a write that failed ambiguously may still have committed, so a
+caller that retries can produce a second (distinct) entry, never a gap.
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from autobiz.kernel.audit.chain import AuditEntry
+from autobiz.kernel.audit.store import AuditConflictError, AuditStore
+from autobiz.kernel.idempotency.receipts import utcnow
+
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_MAX_PENDING = 10_000
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+@dataclass
+class AuditSequencerStats:
+    """Counters for audit-write telemetry."""
+
+    appended: int = 0
+    batches: int = 0
+    conflicts: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _Pending:
+    tenant_id: str
+    event: str
+    payload: Any
+    future: "asyncio.Future[AuditEntry]" = field(repr=False)
+
+
+# Queue sentinel telling the drain task to exit
+_STOP: Any = object()
+
+
+class AuditSequencer:
+    """Batching single writer for the audit hash chain.
+
+    Usage:
+        sequencer = AuditSequencer(PostgresAuditStore(pool))
+        sequencer.start()
+        entry = await sequencer.append(tenant_id, "HITL_DECISION", {...})
+        ...
+        await sequencer.close()
+
+    Run one sequencer per deployment; a second one is tolerated (conflicts
+    are retried) but the two then contend on the tail. A sequencer is bound
+    to one asyncio event loop.
+    """
+
+    def __init__(
+        self,
+        store: AuditStore,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_delay: float = 0.0,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        """Initialize sequencer.
+
+        Args:
+            store: Durable audit store
+            max_batch: Most entries per store.append()
+            max_pending: Queue bound; append() waits beyond it
+            max_delay: Linger before a non-full batch is written (seconds)
+            max_attempts: Tries per batch when another writer took the tail
+            clock: Aware-UTC clock for recorded_at
+        """
+        if max_batch < 1 or max_pending < 1 or max_attempts < 1:
+            raise ValueError("max_batch, max_pending and max_attempts must be at least 1")
+        self._store = store
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._max_attempts = max_attempts
+        self._clock = clock
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_pending)
+        self._task: asyncio.Task[None] | None = None
+        self._tail: AuditEntry | None = None
+        self._tail_known = False
+        self.stats = AuditSequencerStats()
+
+    def start(self) -> None:
+        """Start the background drain task (requires a running loop)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def append(self, tenant_id: str, event: str, payload: Any) -> AuditEntry:
+        """Chain an event; returns its entry once committed.
+
+        Raises:
+            RuntimeError: If the sequencer is not running
+            CanonicalizationError: If payload is not representable as I-JSON
+            Exception: Whatever the store raised for this entry's batch
+        """
+        if self._task is None or self._task.done():
+            raise RuntimeError("AuditSequencer is not running")
+        future: asyncio.Future[AuditEntry] = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Pending(tenant_id, event, payload, future))
+        return await future
+
+    async def close(self) -> None:
+        """Write everything queued, then stop the drain task."""
+        if self._task is not None:
+            await self._queue.put(_STOP)
+            await self._task
+            self._task = None
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            first = await queue.get()
+            if first is _STOP:
+                return
+            batch: list[_Pending] = [first]
+            stopping = self._take(batch)
+            if not stopping and len(batch) < self._max_batch and self._max_delay > 0:
+                await asyncio.sleep(self._max_delay)
+                stopping = self._take(batch)
+            await self._commit(batch)
+
+    def _take(self, batch: list[_Pending]) -> bool:
+        """Move queued items into batch up to max_batch; True if _STOP was taken."""
+        while len(batch) < self._max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    def _chain(self, batch: list[_Pending]) -> list[tuple[_Pending, AuditEntry]]:
+        chained: list[tuple[_Pending, AuditEntry]] = []
+        prev = self._tail
+        recorded_at = self._clock()
+        for pending in batch:
+            if pending.future.done():  # caller cancelled
+                continue
+            try:
+                entry = AuditEntry.chain(
+                    prev, pending.tenant_id, pending.event, pending.payload, recorded_at
+                )
+            except Exception as e:
+                # Only this entry is rejected; it does not consume a seq
+                pending.future.set_exception(e)
+                continue
+            chained.append((pending, entry))
+            prev = entry
+        return chained
+
+    async def _commit(self, batch: list[_Pending]) -> None:
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                if not self._tail_known:
+                    self._tail = await self._store.tail()
+                    self._tail_known = True
+                chained = self._chain(batch)
+                if not chained:
+                    return
+                await self._store.append([entry for _, entry in chained])
+            except AuditConflictError as e:
+                self.stats.conflicts += 1
+                self._tail_known = False
+                if attempt == self._max_attempts:
+                    self._fail(batch, e)
+                    return
+            except Exception as e:
+                self._tail_known = False
+                self._fail(batch, e)
+                return
+            else:
+                self._tail = chained[-1][1]
+                self.stats.batches += 1
+                self.stats.appended += len(chained)
+                for pending, entry in chained:
+                    if not pending.future.done():
+                        pending.future.set_result(entry)
+                return
+
+    def _fail(self, batch: list[_Pending], error: Exception) -> None:
+        for pending in batch:
+            if not pending.future.done():
+                self.stats.failed += 1
+                pending.future.set_exception(error)
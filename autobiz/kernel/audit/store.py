@@ -0,0 +1,288 @@
+"""Audit log storage: entries and Merkle checkpoints.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Requirements: INV-04, P1-R05
+
+Entries are append-only (migration 004 rejects UPDATE and DELETE on
+audit_log). append() writes a whole batch or nothing, and fails with
+AuditConflictError if any of its sequence numbers is already taken, which
+is how a second sequencer racing for the tail is detected.
+
+Checkpoints cover contiguous, non-overlapping seq ranges in order: each
+starts right after the previous one's last_seq.
+"""
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Protocol
+
+from autobiz.kernel.audit.chain import AuditEntry
+
+if TYPE_CHECKING:
+    import asyncpg
+
+
+class AuditConflictError(RuntimeError):
+    """Raised by append() when a sequence number in the batch is taken."""
+
+
+@dataclass(frozen=True)
+class AuditCheckpoint:
+    """Merkle root over a verified range of the chain.
+
+    Attributes:
+        first_seq: First entry covered
+        last_seq: Last entry covered
+        root: Merkle root of the entry hashes first_seq..last_seq
+        head_hash: entry_hash of last_seq (where the next range resumes)
+        created_at: When the range was verified
+    """
+
+    first_seq: int
+    last_seq: int
+    root: bytes
+    head_hash: bytes
+    created_at: datetime
+
+    @property
+    def leaf_count(self) -> int:
+        """Entries covered."""
+        return self.last_seq - self.first_seq + 1
+
+    def covers(self, seq: int) -> bool:
+        """True if seq is in the checkpoint's range."""
+        return self.first_seq <= seq <= self.last_seq
+
+
+class AuditStore(Protocol):
+    """Durable audit entries and checkpoints."""
+
+    async def tail(self) -> AuditEntry | None:
+        """Entry with the highest seq, or None for an empty log."""
+        ...
+
+    async def append(self, entries: Sequence[AuditEntry]) -> None:
+        """Insert a batch atomically.
+
+        Raises:
+            AuditConflictError: If any seq is already present
+        """
+        ...
+
+    async def read(self, first_seq: int, last_seq: int) -> list[AuditEntry]:
+        """Entries first_seq..last_seq inclusive, ascending."""
+        ...
+
+    async def entry_hashes(self, first_seq: int, last_seq: int) -> list[bytes]:
+        """entry_hash of entries first_seq..last_seq inclusive, ascending."""
+        ...
+
+    async def latest_checkpoint(self) -> AuditCheckpoint | None:
+        """Checkpoint with the highest last_seq."""
+        ...
+
+    async def checkpoint_for(self, seq: int) -> AuditCheckpoint | None:
+        """Checkpoint covering seq, if any."""
+        ...
+
+    async def checkpoints(self) -> list[AuditCheckpoint]:
+        """Every checkpoint, ascending."""
+        ...
+
+    async def add_checkpoint(self, checkpoint: AuditCheckpoint) -> None:
+        """Record a checkpoint continuing the latest one."""
+        ...
+
+
+class InMemoryAuditStore:
+    """List-backed AuditStore for tests and benchmarks."""
+
+    def __init__(self) -> None:
+        """Initialize empty store."""
+        self.entries: list[AuditEntry] = []
+        self._checkpoints: list[AuditCheckpoint] = []
+        self.append_calls = 0
+
+    async def tail(self) -> AuditEntry | None:
+        """Entry with the highest seq."""
+        return self.entries[-1] if self.entries else None
+
+    async def append(self, entries: Sequence[AuditEntry]) -> None:
+        """Insert a batch; rejects it whole if it does not start at the tail."""
+        self.append_calls += 1
+        if entries and entries[0].seq != len(self.entries):
+            raise AuditConflictError(f"seq {entries[0].seq} is taken or leaves a gap")
+        self.entries.extend(entries)
+
+    async def read(self, first_seq: int, last_seq: int) -> list[AuditEntry]:
+        """Entries first_seq..last_seq inclusive."""
+        return self.entries[first_seq : last_seq + 1]
+
+    async def entry_hashes(self, first_seq: int, last_seq: int) -> list[bytes]:
+        """entry_hash of entries first_seq..last_seq inclusive."""
+        return [entry.entry_hash for entry in self.entries[first_seq : last_seq + 1]]
+
+    async def latest_checkpoint(self) -> AuditCheckpoint | None:
+        """Checkpoint with the highest last_seq."""
+        return self._checkpoints[-1] if self._checkpoints else None
+
+    async def checkpoint_for(self, seq: int) -> AuditCheckpoint | None:
+        """Checkpoint covering seq."""
+        return next((cp for cp in self._checkpoints if cp.covers(seq)), None)
+
+    async def checkpoints(self) -> list[AuditCheckpoint]:
+        """Every checkpoint."""
+        return list(self._checkpoints)
+
+    async def add_checkpoint(self, checkpoint: AuditCheckpoint) -> None:
+        """Record a checkpoint."""
+        latest = self._checkpoints[-1] if self._checkpoints else None
+        if checkpoint.first_seq != (latest.last_seq + 1 if latest else 0):
+            raise AuditConflictError(f"checkpoint at {checkpoint.first_seq} does not continue")
+        self._checkpoints.append(checkpoint)
+
+
+_COLUMNS = "seq, tenant_id, event, payload, recorded_at, prev_hash, entry_hash"
+
+_TAIL = f"SELECT {_COLUMNS} FROM audit_log ORDER BY seq DESC LIMIT 1"
+
+_INSERT = """
+    INSERT INTO audit_log (seq, tenant_id, event, payload, recorded_at, prev_hash, entry_hash)
+    SELECT * FROM unnest(
+        $1::bigint[], $2::text[], $3::text[], $4::jsonb[],
+        $5::timestamptz[], $6::bytea[], $7::bytea[]
+    )
+"""
+
+_READ = f"SELECT {_COLUMNS} FROM audit_log WHERE seq BETWEEN $1 AND $2 ORDER BY seq"
+
+_HASHES = "SELECT entry_hash FROM audit_log WHERE seq BETWEEN $1 AND $2 ORDER BY seq"
+
+_CHECKPOINT_COLUMNS = "first_seq, last_seq, root, head_hash, created_at"
+
+_LATEST_CHECKPOINT = (
+    f"SELECT {_CHECKPOINT_COLUMNS} FROM audit_checkpoints ORDER BY last_seq DESC LIMIT 1"
+)
+
+_CHECKPOINT_FOR = f"""
+    SELECT {_CHECKPOINT_COLUMNS} FROM audit_checkpoints
+    WHERE last_seq >= $1 AND first_seq <= $1
+    ORDER BY last_seq LIMIT 1
+"""
+
+_CHECKPOINTS = f"SELECT {_CHECKPOINT_COLUMNS} FROM audit_checkpoints ORDER BY last_seq"
+
+_INSERT_CHECKPOINT = """
+    INSERT INTO audit_checkpoints (first_seq, last_seq, root, head_hash, created_at)
+    VALUES ($1, $2, $3, $4, $5)
+"""
+
+_UNIQUE_VIOLATION = "23505"
+
+
+def _row_to_entry(row: Any) -> AuditEntry:
+    payload = row["payload"]
+    return AuditEntry(
+        seq=row["seq"],
+        tenant_id=row["tenant_id"],
+        event=row["event"],
+        payload=json.loads(payload) if isinstance(payload, str) else payload,
+        recorded_at=row["recorded_at"],
+        prev_hash=bytes(row["prev_hash"]),
+        entry_hash=bytes(row["entry_hash"]),
+    )
+
+
+def _row_to_checkpoint(row: Any) -> AuditCheckpoint:
+    return AuditCheckpoint(
+        first_seq=row["first_seq"],
+        last_seq=row["last_seq"],
+        root=bytes(row["root"]),
+        head_hash=bytes(row["head_hash"]),
+        created_at=row["created_at"],
+    )
+
+
+class PostgresAuditStore:
+    """AuditStore over audit_log and audit_checkpoints (migration 004)."""
+
+    def __init__(self, pool: "asyncpg.Pool") -> None:
+        """Initialize store.
+
+        Args:
+            pool: asyncpg connection pool
+        """
+        self._pool = pool
+
+    async def tail(self) -> AuditEntry | None:
+        """Entry with the highest seq."""
+        row = await self._pool.fetchrow(_TAIL)
+        return _row_to_entry(row) if row is not None else None
+
+    async def append(self, entries: Sequence[AuditEntry]) -> None:
+        """Insert a batch with one multi-row INSERT.
+
+        Raises:
+            AuditConflictError: If any seq is already present
+        """
+        try:
+            await self._pool.execute(
+                _INSERT,
+                [e.seq for e in entries],
+                [e.tenant_id for e in entries],
+                [e.event for e in entries],
+                [json.dumps(e.payload, separators=(",", ":")) for e in entries],
+                [e.recorded_at for e in entries],
+                [e.prev_hash for e in entries],
+                [e.entry_hash for e in entries],
+            )
+        except Exception as e:
+            if getattr(e, "sqlstate", None) == _UNIQUE_VIOLATION:
+                raise AuditConflictError(str(e)) from e
+            raise
+
+    async def read(self, first_seq: int, last_seq: int) -> list[AuditEntry]:
+        """Entries first_seq..last_seq inclusive."""
+        rows = await self._pool.fetch(_READ, first_seq, last_seq)
+        return [_row_to_entry(row) for row in rows]
+
+    async def entry_hashes(self, first_seq: int, last_seq: int) -> list[bytes]:
+        """entry_hash of entries first_seq..last_seq inclusive."""
+        rows = await self._pool.fetch(_HASHES, first_seq, last_seq)
+        return [bytes(row["entry_hash"]) for row in rows]
+
+    async def latest_checkpoint(self) -> AuditCheckpoint | None:
+        """Checkpoint with the highest last_seq."""
+        row = await self._pool.fetchrow(_LATEST_CHECKPOINT)
+        return _row_to_checkpoint(row) if row is not None else None
+
+    async def checkpoint_for(self, seq: int) -> AuditCheckpoint | None:
+        """Checkpoint covering seq."""
+        row = await self._pool.fetchrow(_CHECKPOINT_FOR, seq)
+        return _row_to_checkpoint(row) if row is not None else None
+
+    async def checkpoints(self) -> list[AuditCheckpoint]:
+        """Every checkpoint."""
+        return [_row_to_checkpoint(row) for row in await self._pool.fetch(_CHECKPOINTS)]
+
+    async def add_checkpoint(self, checkpoint: AuditCheckpoint) -> None:
+        """Record a checkpoint.
+
+        Raises:
+            AuditConflictError: If a checkpoint already ends at last_seq
+        """
+        try:
+            await self._pool.execute(
+                _INSERT_CHECKPOINT,
+                checkpoint.first_seq,
+                checkpoint.last_seq,
+                checkpoint.root,
+                checkpoint.head_hash,
+                checkpoint.created_at,
+            )
+        except Exception as e:
+            if getattr(e, "sqlstate", None) == _UNIQUE_VIOLATION:
+                raise AuditConflictError(str(e)) from e
+            raise
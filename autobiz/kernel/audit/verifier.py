@@ -0,0 +1,206 @@
+"""Incremental chain verification, Merkle checkpoints and inclusion proofs.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Requirements: INV-04, P1-R05
+
+The nightly job (AuditVerifier.checkpoint) verifies only the entries
+appended since the latest checkpoint, which itself ends on a verified
+head hash, then records a new checkpoint with the Merkle root of that
+range. Work per night is proportional to that day's entries rather than
+to the whole history.
+
+The range is read in chunks; each chunk is checked by verify_chain() on
+an executor (pass a ProcessPoolExecutor to use several cores) and the
+chunks are stitched by comparing boundary seqs and hashes in the caller.
+
+prove() returns an inclusion proof for one entry against its
+checkpoint's root; verify_inclusion() checks it with O(log n) hashes and
+without reading any other entry. verify_all() is the on-demand full
+audit: the whole chain plus every checkpoint's root.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime
+
+from autobiz.kernel.audit.chain import GENESIS_HASH, AuditChainError, AuditEntry, verify_chain
+from autobiz.kernel.audit.merkle import InclusionProof, MerkleTree, merkle_root, root_from_proof
+from autobiz.kernel.audit.store import AuditCheckpoint, AuditStore
+from autobiz.kernel.idempotency.receipts import utcnow
+
+DEFAULT_CHUNK_SIZE = 10_000
+# Chunks verified concurrently (bounds entries held in memory)
+DEFAULT_MAX_IN_FLIGHT = 8
+# Checkpoint trees kept for proof generation
+TREE_CACHE_SIZE = 8
+
+
+@dataclass(frozen=True)
+class AuditProof:
+    """An entry with its path to a checkpoint root.
+
+    Attributes:
+        entry: The audit entry
+        checkpoint: Checkpoint whose range contains the entry
+        inclusion: Audit path from entry.entry_hash to checkpoint.root
+    """
+
+    entry: AuditEntry
+    checkpoint: AuditCheckpoint
+    inclusion: InclusionProof
+
+
+def verify_inclusion(entry: AuditEntry, proof: InclusionProof, root: bytes) -> bool:
+    """True if entry is intact and is leaf proof.leaf_index under root.
+
+    Costs one entry hash and at most ceil(log2 leaf_count) node hashes.
+    """
+    if entry.computed_hash() != entry.entry_hash:
+        return False
+    return root_from_proof(entry.entry_hash, proof) == root
+
+
+class AuditVerifier:
+    """Checkpoints, verifies and proves entries of one audit store."""
+
+    def __init__(
+        self,
+        store: AuditStore,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        executor: Executor | None = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        """Initialize verifier.
+
+        Args:
+            store: Audit store to verify
+            chunk_size: Entries read and verified per task
+            executor: Where chunks are verified (default: the loop's
+                thread pool; a ProcessPoolExecutor verifies in parallel)
+            max_in_flight: Chunks verified at the same time
+            clock: Aware-UTC clock for checkpoint created_at
+        """
+        if chunk_size < 1 or max_in_flight < 1:
+            raise ValueError("chunk_size and max_in_flight must be at least 1")
+        self._store = store
+        self._chunk_size = chunk_size
+        self._executor = executor
+        self._max_in_flight = max_in_flight
+        self._clock = clock
+        self._trees: OrderedDict[int, MerkleTree] = OrderedDict()
+
+    async def _verify_range(self, first_seq: int, last_seq: int, prev_hash: bytes) -> list[bytes]:
+        """Verify entries first_seq..last_seq continuing prev_hash; returns their hashes.
+
+        Raises:
+            AuditChainError: At the first entry that does not verify
+        """
+        loop = asyncio.get_running_loop()
+        hashes: list[bytes] = []
+        in_flight: list[Awaitable[None]] = []
+        expected_seq = first_seq
+        for start in range(first_seq, last_seq + 1, self._chunk_size):
+            end = min(start + self._chunk_size - 1, last_seq)
+            chunk = await self._store.read(start, end)
+            if len(chunk) != end - start + 1:
+                present = {entry.seq for entry in chunk}
+                missing = next(seq for seq in range(start, end + 1) if seq not in present)
+                raise AuditChainError(missing, "entry is missing")
+            # Stitch: the chunk must continue where the previous one ended
+            if chunk[0].seq != expected_seq:
+                raise AuditChainError(expected_seq, f"found seq {chunk[0].seq}")
+            if chunk[0].prev_hash != prev_hash:
+                raise AuditChainError(chunk[0].seq, "prev_hash does not match the previous entry")
+            in_flight.append(
+                loop.run_in_executor(
+                    self._executor, verify_chain, chunk, chunk[0].prev_hash, chunk[0].seq
+                )
+            )
+            hashes.extend(entry.entry_hash for entry in chunk)
+            prev_hash = chunk[-1].entry_hash
+            expected_seq = end + 1
+            if len(in_flight) >= self._max_in_flight:
+                await in_flight.pop(0)
+        await asyncio.gather(*in_flight)
+        return hashes
+
+    async def checkpoint(self) -> AuditCheckpoint | None:
+        """Verify entries since the latest checkpoint and checkpoint them.
+
+        Returns:
+            The new checkpoint, or None if nothing was appended since
+
+        Raises:
+            AuditChainError: If an entry in the new range does not verify;
+                no checkpoint is recorded
+        """
+        latest = await self._store.latest_checkpoint()
+        tail = await self._store.tail()
+        first_seq = latest.last_seq + 1 if latest is not None else 0
+        if tail is None or tail.seq < first_seq:
+            return None
+        prev_hash = latest.head_hash if latest is not None else GENESIS_HASH
+
+        hashes = await self._verify_range(first_seq, tail.seq, prev_hash)
+        checkpoint = AuditCheckpoint(
+            first_seq=first_seq,
+            last_seq=tail.seq,
+            root=merkle_root(hashes),
+            head_hash=hashes[-1],
+            created_at=self._clock(),
+        )
+        await self._store.add_checkpoint(checkpoint)
+        return checkpoint
+
+    async def verify_all(self) -> int:
+        """Verify the whole chain and every checkpoint root.
+
+        Returns:
+            Number of entries verified
+
+        Raises:
+            AuditChainError: At the first entry or checkpoint that does not verify
+        """
+        tail = await self._store.tail()
+        if tail is None:
+            return 0
+        hashes = await self._verify_range(0, tail.seq, GENESIS_HASH)
+        for checkpoint in await self._store.checkpoints():
+            leaves = hashes[checkpoint.first_seq : checkpoint.last_seq + 1]
+            if len(leaves) != checkpoint.leaf_count or leaves[-1] != checkpoint.head_hash:
+                raise AuditChainError(checkpoint.last_seq, "checkpoint head does not match")
+            if merkle_root(leaves) != checkpoint.root:
+                raise AuditChainError(checkpoint.first_seq, "checkpoint root does not match")
+        return len(hashes)
+
+    async def prove(self, seq: int) -> AuditProof:
+        """Inclusion proof of one entry against its checkpoint.
+
+        Raises:
+            LookupError: If seq is not covered by a checkpoint yet
+            AuditChainError: If the stored range no longer matches the root
+        """
+        checkpoint = await self._store.checkpoint_for(seq)
+        if checkpoint is None:
+            raise LookupError(f"seq {seq} is not covered by a checkpoint yet")
+        (entry,) = await self._store.read(seq, seq)
+        tree = await self._tree(checkpoint)
+        return AuditProof(entry, checkpoint, tree.proof(seq - checkpoint.first_seq))
+
+    async def _tree(self, checkpoint: AuditCheckpoint) -> MerkleTree:
+        tree = self._trees.get(checkpoint.last_seq)
+        if tree is not None:
+            self._trees.move_to_end(checkpoint.last_seq)
+            return tree
+        leaves = await self._store.entry_hashes(checkpoint.first_seq, checkpoint.last_seq)
+        tree = MerkleTree(leaves)
+        if tree.root != checkpoint.root:
+            raise AuditChainError(checkpoint.first_seq, "checkpoint root does not match")
+        self._trees[checkpoint.last_seq] = tree
+        if len(self._trees) > TREE_CACHE_SIZE:
+            self._trees.popitem(last=False)
+        return tree
@@ -0,0 +1,32 @@
+"""Compile module: condition expressions for workflow branches and HITL rules.
+
+Part of P1-TASK-16: HITL Approvals
+"""
+
+from autobiz.kernel.compile.conditions import (
+    FUNCTIONS,
+    CompiledCondition,
+    ConditionEvaluationError,
+    ConditionSet,
+    ConditionSyntaxError,
+    compile_condition,
+    compile_conditions,
+    interpret,
+    parse_condition,
+    referenced_paths,
+    uses_now,
+)
+
+__all__ = [
+    "FUNCTIONS",
+    "CompiledCondition",
+    "ConditionEvaluationError",
+    "ConditionSet",
+    "ConditionSyntaxError",
+    "compile_condition",
+    "compile_conditions",
+    "interpret",
+    "parse_condition",
+    "referenced_paths",
+    "uses_now",
+]
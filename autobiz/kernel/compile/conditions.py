@@ -0,0 +1,723 @@
+"""Condition expressions: parser, reference interpreter and closure compiler.
+
+Part of P1-TASK-16: HITL Approvals
+Requirements: INV-07, P1-R09
+
+The restricted infix DSL of §5.5, used by BRANCH steps and HITL rules:
+    $.order.refund_eligible AND $.order.amount <= 500 AND NOT $.order.disputed
+    duration_seconds($.order.created_at, now()) < 86400
+
+parse_condition() turns an expression into a JSONLogic-shaped AST and
+interpret() walks that AST; together they define the semantics.
+compile_condition() parses each distinct string once (cached by the raw
+string) and turns the AST into a tree of closures: paths become
+precomputed accessors, literal-only subtrees are folded, and comparisons
+with a literal skip the type dispatch when the operand allows it.
+compile_conditions() compiles conditions that are evaluated against the
+same state together, so every path any of them uses is resolved once.
+
+Precedence, loosest first: OR, AND, NOT, comparison. Comparisons do not
+chain; parentheses group.
+
+Semantics (shared by both evaluators):
+- A missing path, or a path through a non-container, is null
+- AND / OR short-circuit and return bool; NOT returns bool
+- == / != use JSON equality: true is not 1, 1 equals 1.0
+- < <= > >= compare two numbers, two strings or two datetimes; anything
+  else raises ConditionEvaluationError, as do functions given operands
+  they do not accept
+- now() is the clock passed to evaluate(), never the system clock, so a
+  replay sees the recorded value
+- duration_seconds(a, b) is b - a in whole seconds (truncated); each
+  argument is a datetime or an ISO-8601 string
+"""
+
+import operator
+import re
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+# Allowed functions and their arity; anything else is a syntax error
+FUNCTIONS = {
+    "len": 1,
+    "contains": 2,
+    "startswith": 2,
+    "endswith": 2,
+    "now": 0,
+    "duration_seconds": 2,
+}
+
+_ORDERING: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_COMPARISONS = frozenset({"==", "!=", *_ORDERING})
+_KEYWORDS = {"true": True, "false": False, "null": None}
+_ESCAPES = {"\\": "\\", "'": "'", '"': '"', "n": "\n", "t": "\t"}
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+    (?P<path>\$(?:\.[A-Za-z_][A-Za-z0-9_]*|\[[0-9]+\])+)
+    |(?P<number>-?[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+    |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    |(?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    |(?P<op>==|!=|<=|>=|<|>|\(|\)|,)
+    )""",
+    re.VERBOSE,
+)
+_PATH_SEGMENT = re.compile(r"\.([A-Za-z_][A-Za-z0-9_]*)|\[([0-9]+)\]")
+_SPACE = re.compile(r"\s*")
+
+
+class ConditionSyntaxError(ValueError):
+    """Raised when a condition is not a valid expression of the DSL."""
+
+    def __init__(self, raw: str, position: int, message: str) -> None:
+        """Initialize error.
+
+        Args:
+            raw: Offending expression
+            position: Character offset of the problem
+            message: What is wrong there
+        """
+        self.raw = raw
+        self.position = position
+        super().__init__(f"Invalid condition {raw!r} at {position}: {message}")
+
+
+class ConditionEvaluationError(ValueError):
+    """Raised when an operator or function gets operands it does not accept."""
+
+
+# --- Parsing ---------------------------------------------------------------
+
+
+class _Parser:
+    """Recursive descent over the token list, emitting JSONLogic nodes."""
+
+    def __init__(self, raw: str) -> None:
+        self.raw = raw
+        self.tokens: list[tuple[str, str, int]] = []
+        pos, end = 0, len(raw.rstrip())
+        while pos < end:
+            match = _TOKEN.match(raw, pos)
+            if match is None:
+                start = _SPACE.match(raw, pos).end()  # type: ignore[union-attr]
+                raise ConditionSyntaxError(raw, start, f"unexpected {raw[start:start + 10]!r}")
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind), match.start(kind)))  # type: ignore[arg-type]
+            pos = match.end()
+        self.tokens.append(("end", "", len(raw)))
+        self.index = 0
+
+    def error(self, message: str) -> ConditionSyntaxError:
+        return ConditionSyntaxError(self.raw, self.tokens[self.index][2], message)
+
+    def peek(self) -> tuple[str, str]:
+        kind, text, _ = self.tokens[self.index]
+        return kind, text
+
+    def take(self, kind: str, text: str) -> None:
+        if self.peek() != (kind, text):
+            raise self.error(f"expected {text!r}")
+        self.index += 1
+
+    def parse(self) -> Any:
+        node = self.disjunction()
+        if self.peek()[0] != "end":
+            raise self.error(f"unexpected {self.peek()[1]!r}")
+        return node
+
+    def disjunction(self) -> Any:
+        items = [self.conjunction()]
+        while self.peek() == ("name", "OR"):
+            self.index += 1
+            items.append(self.conjunction())
+        return items[0] if len(items) == 1 else {"or": items}
+
+    def conjunction(self) -> Any:
+        items = [self.negation()]
+        while self.peek() == ("name", "AND"):
+            self.index += 1
+            items.append(self.negation())
+        return items[0] if len(items) == 1 else {"and": items}
+
+    def negation(self) -> Any:
+        if self.peek() == ("name", "NOT"):
+            self.index += 1
+            return {"!": [self.negation()]}
+        return self.comparison()
+
+    def comparison(self) -> Any:
+        left = self.operand()
+        kind, op = self.peek()
+        if kind != "op" or op not in _COMPARISONS:
+            return left
+        self.index += 1
+        right = self.operand()
+        kind, text = self.peek()
+        if kind == "op" and text in _COMPARISONS:
+            raise self.error("comparisons do not chain; use AND")
+        return {op: [left, right]}
+
+    def operand(self) -> Any:
+        kind, text = self.peek()
+        if kind == "path":
+            self.index += 1
+            return {"var": _var(text)}
+        if kind == "number":
+            self.index += 1
+            return float(text) if any(c in text for c in ".eE") else int(text)
+        if kind == "string":
+            value = self.string(text)
+            self.index += 1
+            return value
+        if kind == "op" and text == "(":
+            self.index += 1
+            node = self.disjunction()
+            self.take("op", ")")
+            return node
+        if kind == "name" and text in _KEYWORDS:
+            self.index += 1
+            return _KEYWORDS[text]
+        if kind == "name" and self.tokens[self.index + 1][:2] == ("op", "("):
+            return self.call(text)
+        if kind == "end":
+            raise self.error("unexpected end of expression")
+        raise self.error(f"unexpected {text!r}")
+
+    def call(self, name: str) -> Any:
+        if name not in FUNCTIONS:
+            raise self.error(f"unknown function {name!r}")
+        position = self.tokens[self.index][2]
+        self.index += 2
+        args = []
+        if self.peek() != ("op", ")"):
+            args.append(self.disjunction())
+            while self.peek() == ("op", ","):
+                self.index += 1
+                args.append(self.disjunction())
+        self.take("op", ")")
+        if len(args) != FUNCTIONS[name]:
+            raise ConditionSyntaxError(
+                self.raw, position, f"{name}() takes {FUNCTIONS[name]} argument(s), got {len(args)}"
+            )
+        return {name: args}
+
+    def string(self, token: str) -> str:
+        body = token[1:-1]
+        try:
+            return re.sub(r"\\(.)", lambda m: _ESCAPES[m.group(1)], body)
+        except KeyError as exc:
+            raise self.error(f"unknown escape \\{exc.args[0]}") from None
+
+
+def _var(path: str) -> str:
+    """JSONLogic var for a DSL path: "$.items[0].sku" -> "items.0.sku"."""
+    return ".".join(field or index for field, index in _PATH_SEGMENT.findall(path))
+
+
+def _segments(var: str) -> tuple[str | int, ...]:
+    """Path segments of a var; digit-only segments are array indexes."""
+    return tuple(int(part) if part.isdigit() else part for part in var.split("."))
+
+
+def _display(var: str) -> str:
+    """DSL form of a var: "items.0.sku" -> "$.items[0].sku"."""
+    return "$" + "".join(f"[{s}]" if isinstance(s, int) else f".{s}" for s in _segments(var))
+
+
+def parse_condition(raw: str) -> Any:
+    """Parse a condition into its JSONLogic AST.
+
+    Paths become {"var": "a.b.0"}, operators {"<=": [left, right]},
+    AND / OR / NOT {"and": [...]}, {"or": [...]}, {"!": [x]}, and function
+    calls {"name": [args]}. Literals are plain JSON values.
+
+    Args:
+        raw: Expression in the condition DSL
+
+    Returns:
+        A fresh AST (the caller may keep or modify it)
+
+    Raises:
+        ConditionSyntaxError: If raw is not a valid expression
+    """
+    return _Parser(raw).parse()
+
+
+@lru_cache(maxsize=4096)
+def _parsed(raw: str) -> Any:
+    """Shared AST per raw string; never handed out, so never modified."""
+    return parse_condition(raw)
+
+
+def referenced_paths(ast: Any) -> list[str]:
+    """State paths used by an AST, in first-use order, as "$.a.b" strings."""
+    found: dict[str, None] = {}
+
+    def visit(node: Any) -> None:
+        if isinstance(node, dict):
+            ((op, args),) = node.items()
+            if op == "var":
+                found.setdefault(_display(args))
+            else:
+                for arg in args:
+                    visit(arg)
+
+    visit(ast)
+    return list(found)
+
+
+def uses_now(ast: Any) -> bool:
+    """True if the AST calls now() (its result depends on the clock)."""
+    if not isinstance(ast, dict):
+        return False
+    ((op, args),) = ast.items()
+    return op == "now" or (op != "var" and any(uses_now(arg) for arg in args))
+
+
+# --- Operators and functions -----------------------------------------------
+
+
+def _is_number(x: Any) -> bool:
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def _equal(one: Any, two: Any) -> bool:
+    """JSON equality: booleans are not numbers; containers compare deeply."""
+    if isinstance(one, bool) or isinstance(two, bool):
+        return one is two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(_equal(i, j) for i, j in zip(one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return len(one) == len(two) and all(
+            key in two and _equal(value, two[key]) for key, value in one.items()
+        )
+    return bool(one == two)
+
+
+def _compare(test: Callable[[Any, Any], bool], one: Any, two: Any) -> bool:
+    if (
+        (_is_number(one) and _is_number(two))
+        or (isinstance(one, str) and isinstance(two, str))
+        or (isinstance(one, datetime) and isinstance(two, datetime))
+    ):
+        try:
+            return test(one, two)
+        except TypeError as exc:  # naive vs aware datetimes
+            raise ConditionEvaluationError(str(exc)) from None
+    raise ConditionEvaluationError(f"cannot order {type(one).__name__} and {type(two).__name__}")
+
+
+def _len(value: Any) -> int:
+    if isinstance(value, (list, str, dict)):
+        return len(value)
+    raise ConditionEvaluationError(f"len() of {type(value).__name__}")
+
+
+def _contains(container: Any, value: Any) -> bool:
+    if isinstance(container, list):
+        return any(_equal(item, value) for item in container)
+    if isinstance(container, str) and isinstance(value, str):
+        return value in container
+    raise ConditionEvaluationError(
+        f"contains() of {type(container).__name__} and {type(value).__name__}"
+    )
+
+
+def _startswith(value: Any, prefix: Any) -> bool:
+    if isinstance(value, str) and isinstance(prefix, str):
+        return value.startswith(prefix)
+    raise ConditionEvaluationError("startswith() takes two strings")
+
+
+def _endswith(value: Any, suffix: Any) -> bool:
+    if isinstance(value, str) and isinstance(suffix, str):
+        return value.endswith(suffix)
+    raise ConditionEvaluationError("endswith() takes two strings")
+
+
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            # fromisoformat() accepts a trailing "Z" only from Python 3.11
+            return datetime.fromisoformat(value[:-1] + "+00:00" if value[-1:] == "Z" else value)
+        except ValueError:
+            pass
+    raise ConditionEvaluationError(f"not a timestamp: {value!r}")
+
+
+def _duration_seconds(start: Any, end: Any) -> int:
+    try:
+        delta = _as_datetime(end) - _as_datetime(start)
+    except TypeError as exc:  # naive vs aware datetimes
+        raise ConditionEvaluationError(str(exc)) from None
+    return int(delta.total_seconds())
+
+
+def _now(clock: datetime | None) -> datetime:
+    if clock is None:
+        raise ConditionEvaluationError("now() needs an injected clock")
+    return clock
+
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "len": _len,
+    "contains": _contains,
+    "startswith": _startswith,
+    "endswith": _endswith,
+    "duration_seconds": _duration_seconds,
+}
+
+
+def _resolve(state: Any, segments: tuple[str | int, ...]) -> Any:
+    node = state
+    for segment in segments:
+        if isinstance(segment, int):
+            if not isinstance(node, list) or segment >= len(node):
+                return None
+            node = node[segment]
+        elif isinstance(node, dict):
+            node = node.get(segment)
+        else:
+            return None
+    return node
+
+
+# --- Reference interpreter -------------------------------------------------
+
+
+def interpret(ast: Any, state: Any, now: datetime | None = None) -> Any:
+    """Evaluate an AST by walking it (the reference semantics).
+
+    Args:
+        ast: Result of parse_condition()
+        state: JSON state the paths are resolved against
+        now: Injected clock for now()
+
+    Returns:
+        The expression's value
+
+    Raises:
+        ConditionEvaluationError: If an operator or function gets operands
+            it does not accept, or now() is reached without a clock
+    """
+    if not isinstance(ast, dict):
+        return ast
+    ((op, args),) = ast.items()
+    if op == "var":
+        return _resolve(state, _segments(args))
+    if op == "and":
+        return all(interpret(arg, state, now) for arg in args)
+    if op == "or":
+        return any(interpret(arg, state, now) for arg in args)
+    if op == "!":
+        return not interpret(args[0], state, now)
+    if op == "now":
+        return _now(now)
+    values = [interpret(arg, state, now) for arg in args]
+    if op == "==":
+        return _equal(*values)
+    if op == "!=":
+        return not _equal(*values)
+    if op in _ORDERING:
+        return _compare(_ORDERING[op], *values)
+    if op in _FUNCTIONS:
+        return _FUNCTIONS[op](*values)
+    raise ConditionEvaluationError(f"unknown operator {op!r}")
+
+
+# --- Closure compiler ------------------------------------------------------
+
+# A compiled node reads from one list: [now, path values...]
+_Eval = Callable[[list[Any]], Any]
+
+_NOT_CONSTANT: Any = object()
+
+
+def _constant(value: Any) -> _Eval:
+    return lambda values: value
+
+
+def _slot(index: int) -> _Eval:
+    return operator.itemgetter(index)
+
+
+def _clock(values: list[Any]) -> Any:
+    return _now(values[0])
+
+
+def _accessor(var: str) -> Callable[[Any], Any]:
+    """Specialized reader for one path (one or two keys are unrolled)."""
+    segments = _segments(var)
+    if len(segments) == 1 and isinstance(segments[0], str):
+        key = segments[0]
+        return lambda state: state.get(key) if isinstance(state, dict) else None
+    if len(segments) == 2 and all(isinstance(s, str) for s in segments):
+        outer, inner = segments
+
+        def get(state: Any) -> Any:
+            if isinstance(state, dict):
+                state = state.get(outer)
+                if isinstance(state, dict):
+                    return state.get(inner)
+            return None
+
+        return get
+    return lambda state: _resolve(state, segments)
+
+
+def _conjunction(parts: list[_Eval]) -> _Eval:
+    if len(parts) == 2:
+        first, second = parts
+        return lambda values: bool(first(values) and second(values))
+
+    def evaluate(values: list[Any]) -> bool:
+        for part in parts:
+            if not part(values):
+                return False
+        return True
+
+    return evaluate
+
+
+def _disjunction(parts: list[_Eval]) -> _Eval:
+    if len(parts) == 2:
+        first, second = parts
+        return lambda values: bool(first(values) or second(values))
+
+    def evaluate(values: list[Any]) -> bool:
+        for part in parts:
+            if part(values):
+                return True
+        return False
+
+    return evaluate
+
+
+def _negation(part: _Eval) -> _Eval:
+    return lambda values: not part(values)
+
+
+def _ordering(op: str, left: _Eval, right: _Eval, left_value: Any, right_value: Any) -> _Eval:
+    test = _ORDERING[op]
+    if _is_number(right_value) or isinstance(right_value, str):
+        fast = (int, float) if _is_number(right_value) else (str,)
+
+        def against_constant(values: list[Any]) -> bool:
+            value = left(values)
+            if type(value) in fast:
+                return test(value, right_value)
+            return _compare(test, value, right_value)
+
+        return against_constant
+    if _is_number(left_value) or isinstance(left_value, str):
+        fast = (int, float) if _is_number(left_value) else (str,)
+
+        def constant_against(values: list[Any]) -> bool:
+            value = right(values)
+            if type(value) in fast:
+                return test(left_value, value)
+            return _compare(test, left_value, value)
+
+        return constant_against
+    return lambda values: _compare(test, left(values), right(values))
+
+
+def _equality(negate: bool, left: _Eval, right: _Eval, right_value: Any) -> _Eval:
+    if isinstance(right_value, str):
+        # Only an equal str equals a str, so plain == is JSON equality here
+        def equals_string(values: list[Any]) -> bool:
+            value = left(values)
+            return isinstance(value, str) and value == right_value
+
+        if negate:
+            return lambda values: not equals_string(values)
+        return equals_string
+    if negate:
+        return lambda values: not _equal(left(values), right(values))
+    return lambda values: _equal(left(values), right(values))
+
+
+def _call(function: Callable[..., Any], parts: list[_Eval]) -> _Eval:
+    if len(parts) == 1:
+        (only,) = parts
+        return lambda values: function(only(values))
+    first, second = parts
+    return lambda values: function(first(values), second(values))
+
+
+def _compile(ast: Any, slots: dict[str, int]) -> tuple[_Eval, Any]:
+    """Closure for an AST node, and its value if it is constant.
+
+    Path slots are allocated in `slots` (var -> index into the values
+    list; index 0 is the clock), so conditions compiled with the same
+    dict share their path reads.
+    """
+    if not isinstance(ast, dict):
+        return _constant(ast), ast
+    ((op, args),) = ast.items()
+    if op == "var":
+        index = slots.setdefault(args, len(slots) + 1)
+        return _slot(index), _NOT_CONSTANT
+    if op == "now":
+        return _clock, _NOT_CONSTANT
+    compiled = [_compile(arg, slots) for arg in args]
+    if all(value is not _NOT_CONSTANT for _, value in compiled):
+        # Literal-only subtree: fold with the reference semantics, unless
+        # it raises (then it must raise when, and only if, it is reached)
+        try:
+            value = interpret(ast, None)
+        except ConditionEvaluationError:
+            pass
+        else:
+            return _constant(value), value
+    parts = [part for part, _ in compiled]
+    if op == "and":
+        return _conjunction(parts), _NOT_CONSTANT
+    if op == "or":
+        return _disjunction(parts), _NOT_CONSTANT
+    if op == "!":
+        return _negation(parts[0]), _NOT_CONSTANT
+    if op in ("==", "!="):
+        (left, left_value), (right, right_value) = compiled
+        if right_value is _NOT_CONSTANT:
+            # Equality is symmetric: put a constant operand on the right
+            left, right, right_value = right, left, left_value
+        return _equality(op == "!=", left, right, right_value), _NOT_CONSTANT
+    if op in _ORDERING:
+        (left, left_value), (right, right_value) = compiled
+        return _ordering(op, left, right, left_value, right_value), _NOT_CONSTANT
+    if op in _FUNCTIONS:
+        return _call(_FUNCTIONS[op], parts), _NOT_CONSTANT
+    raise ConditionEvaluationError(f"unknown operator {op!r}")
+
+
+class CompiledCondition:
+    """One condition, parsed once and compiled to closures.
+
+    Attributes:
+        raw: Expression as written
+        parsed: Its JSONLogic AST (shared; do not modify)
+        referenced_paths: State paths it reads, as "$.a.b" strings
+        clock_dependent: True if it calls now()
+    """
+
+    __slots__ = ("raw", "parsed", "referenced_paths", "clock_dependent", "_evaluate", "_getters")
+
+    def __init__(self, raw: str) -> None:
+        """Parse and compile.
+
+        Args:
+            raw: Expression in the condition DSL
+
+        Raises:
+            ConditionSyntaxError: If raw is not a valid expression
+        """
+        self.raw = raw
+        self.parsed = _parsed(raw)
+        slots: dict[str, int] = {}
+        self._evaluate, _ = _compile(self.parsed, slots)
+        self._getters = tuple(_accessor(var) for var in slots)
+        self.referenced_paths = tuple(_display(var) for var in slots)
+        self.clock_dependent = uses_now(self.parsed)
+
+    def evaluate(self, state: Any, now: datetime | None = None) -> Any:
+        """Evaluate against a state.
+
+        Args:
+            state: JSON state the paths are resolved against
+            now: Injected clock for now()
+
+        Returns:
+            Same value as interpret(self.parsed, state, now)
+
+        Raises:
+            ConditionEvaluationError: As interpret()
+        """
+        values = [now]
+        for get in self._getters:
+            values.append(get(state))
+        return self._evaluate(values)
+
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.raw!r})"
+
+
+class ConditionSet:
+    """Conditions evaluated together against one state.
+
+    Every distinct path used by any member is resolved once per
+    evaluate(), then each member's closures read the shared values.
+
+    Attributes:
+        raws: Member expressions, in order
+        referenced_paths: Distinct state paths read by the members
+        clock_dependent: True if any member calls now()
+    """
+
+    __slots__ = ("raws", "referenced_paths", "clock_dependent", "_members", "_getters")
+
+    def __init__(self, raws: Iterable[str]) -> None:
+        """Parse and compile every member.
+
+        Args:
+            raws: Expressions in the condition DSL
+
+        Raises:
+            ConditionSyntaxError: If any expression is invalid
+        """
+        self.raws = tuple(raws)
+        slots: dict[str, int] = {}
+        self._members = tuple(_compile(_parsed(raw), slots)[0] for raw in self.raws)
+        self._getters = tuple(_accessor(var) for var in slots)
+        self.referenced_paths = tuple(_display(var) for var in slots)
+        self.clock_dependent = any(uses_now(_parsed(raw)) for raw in self.raws)
+
+    def evaluate(self, state: Any, now: datetime | None = None) -> list[Any]:
+        """Evaluate every member against one state.
+
+        Args:
+            state: JSON state the paths are resolved against
+            now: Injected clock for now()
+
+        Returns:
+            One value per member, in order
+
+        Raises:
+            ConditionEvaluationError: From the first member that raises
+        """
+        values = [now]
+        for get in self._getters:
+            values.append(get(state))
+        return [member(values) for member in self._members]
+
+    def __len__(self) -> int:
+        return len(self.raws)
+
+
+@lru_cache(maxsize=4096)
+def compile_condition(raw: str) -> CompiledCondition:
+    """Compiled, shared CompiledCondition for an expression string.
+
+    Raises:
+        ConditionSyntaxError: If raw is not a valid expression
+    """
+    return CompiledCondition(raw)
+
+
+@lru_cache(maxsize=1024)
+def compile_conditions(raws: tuple[str, ...]) -> ConditionSet:
+    """Compiled, shared ConditionSet for a tuple of expression strings.
+
+    Raises:
+        ConditionSyntaxError: If any expression is invalid
+    """
+    return ConditionSet(raws)
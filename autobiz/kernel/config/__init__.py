@@ -0,0 +1,20 @@
+"""Config module: kernel queue bounds and overflow handling.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+"""
+
+from autobiz.kernel.config.queues import (
+    QUEUE_CONFIGS,
+    OverflowStrategy,
+    QueueConfig,
+    QueueFullError,
+    QueueLevel,
+)
+
+__all__ = [
+    "QUEUE_CONFIGS",
+    "OverflowStrategy",
+    "QueueConfig",
+    "QueueFullError",
+    "QueueLevel",
+]
@@ -0,0 +1,102 @@
+"""QueueConfig: bounds and overflow handling for kernel queues.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+Requirements: P1-R26, P1-R27
+
+Canonical definition per AUTOBIZ_ECOSYSTEM_PLAN_v4.6.md §11.6. Every
+in-memory queue in front of a slower consumer has a max_depth and says
+what happens beyond it:
+- REJECT_NEW: refuse the new item (QueueFullError), pushing back on the
+  producer (a webhook source retries later)
+- DROP_OLDEST: make room by discarding the oldest item
+- SPILL_TO_DISK: move overflow to spill_path, up to spill_max_size_mb
+
+warning_threshold and critical_threshold are fractions of max_depth at
+which depth becomes worth an alert or a page.
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+OverflowStrategy = Literal["DROP_OLDEST", "REJECT_NEW", "SPILL_TO_DISK"]
+QueueLevel = Literal["OK", "WARNING", "CRITICAL"]
+
+
+class QueueConfig(BaseModel):
+    """Configuration for a bounded queue with overflow handling."""
+
+    model_config = ConfigDict(frozen=True)
+
+    max_depth: int = Field(gt=0)
+    overflow_strategy: OverflowStrategy
+
+    # Alerting
+    warning_threshold: float = Field(default=0.7, gt=0, le=1)  # Alert at 70% capacity
+    critical_threshold: float = Field(default=0.9, gt=0, le=1)  # Page at 90% capacity
+
+    # Spill configuration (for SPILL_TO_DISK)
+    spill_path: str | None = None
+    spill_max_size_mb: int | None = Field(default=None, gt=0)
+
+    @model_validator(mode="after")
+    def _check(self) -> "QueueConfig":
+        if self.warning_threshold > self.critical_threshold:
+            raise ValueError("warning_threshold must not exceed critical_threshold")
+        if self.overflow_strategy == "SPILL_TO_DISK" and self.spill_path is None:
+            raise ValueError("SPILL_TO_DISK needs a spill_path")
+        return self
+
+    def level(self, depth: int) -> QueueLevel:
+        """Alert level for a queue holding depth items."""
+        if depth >= self.critical_threshold * self.max_depth:
+            return "CRITICAL"
+        if depth >= self.warning_threshold * self.max_depth:
+            return "WARNING"
+        return "OK"
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a REJECT_NEW queue is at max_depth.
+
+    Attributes:
+        queue: Queue name
+        depth: Items held when the new one was refused
+        max_depth: Configured bound
+    """
+
+    def __init__(self, queue: str, depth: int, max_depth: int) -> None:
+        """Initialize error.
+
+        Args:
+            queue: Queue name
+            depth: Items held when the new one was refused
+            max_depth: Configured bound
+        """
+        self.queue = queue
+        self.depth = depth
+        self.max_depth = max_depth
+        super().__init__(f"queue {queue} is full ({depth}/{max_depth})")
+
+
+# Queue configurations by type
+QUEUE_CONFIGS: dict[str, QueueConfig] = {
+    "event_ordering_gate": QueueConfig(
+        max_depth=10000,
+        overflow_strategy="REJECT_NEW",  # Backpressure to webhook source
+        warning_threshold=0.7,
+        critical_threshold=0.9,
+    ),
+    "reconciliation_queue": QueueConfig(
+        max_depth=5000,
+        overflow_strategy="SPILL_TO_DISK",
+        spill_path="/var/spool/autobiz/reconciliation",
+        spill_max_size_mb=1000,
+    ),
+    "hitl_pending_approvals": QueueConfig(
+        max_depth=1000,
+        overflow_strategy="REJECT_NEW",  # Force escalation
+        warning_threshold=0.5,  # Earlier warning for human queue
+        critical_threshold=0.8,
+    ),
+}
@@ -0,0 +1,50 @@
+"""Database module: partition maintenance and tenant-scoped connection pools.
+
+Part of P1-TASK-14: Receipt Storage
+"""
+
+from autobiz.kernel.db.partitions import (
+    PartitionMaintainer,
+    PartitionPlan,
+    PartitionSpec,
+    create_partition_sql,
+    detach_partition_sql,
+    drain_default_sql,
+    partition_name,
+    plan_partitions,
+    stranded_days_sql,
+)
+from autobiz.kernel.db.pool import (
+    SHARED,
+    WAIT_BUCKETS,
+    Isolation,
+    PoolUsage,
+    TenantPool,
+    TenantPoolConfig,
+    TenantPoolStats,
+    TenantTransaction,
+    begin_sql,
+    quote_literal,
+)
+
+__all__ = [
+    "PartitionMaintainer",
+    "PartitionPlan",
+    "PartitionSpec",
+    "create_partition_sql",
+    "detach_partition_sql",
+    "drain_default_sql",
+    "partition_name",
+    "plan_partitions",
+    "stranded_days_sql",
+    "SHARED",
+    "WAIT_BUCKETS",
+    "Isolation",
+    "PoolUsage",
+    "TenantPool",
+    "TenantPoolConfig",
+    "TenantPoolStats",
+    "TenantTransaction",
+    "begin_sql",
+    "quote_literal",
+]
@@ -0,0 +1,298 @@
+"""Daily range partitions: create ahead, detach and archive behind.
+
+Part of P1-TASK-14: Receipt Storage
+Requirements: INV-05, P1-R07
+
+Tables partitioned by day on a timestamp column (receipts, by
+first_seen_at) never delete expired rows. A maintenance pass:
+1. Creates the partitions for today through `premake_days` ahead
+2. Detaches every partition whose whole range is older than `retention`
+3. Moves detached partitions into the archive schema (or drops them)
+
+Detaching and moving are catalog-only operations: their cost does not
+depend on the number of rows, and no index or heap bloat is left behind.
+
+The DEFAULT partition ({table}_default) catches rows for days that have
+no partition yet, e.g. after the job stopped for longer than
+premake_days. Such a day can no longer be created directly: CREATE TABLE
+... PARTITION OF fails while DEFAULT holds rows for its range. The pass
+therefore drains DEFAULT first, in one transaction: detach it, create
+the missing days, move its rows into them and re-attach it empty. Kept
+empty, DEFAULT also keeps the scan every later create does of it cheap.
+
+Partitions are named {table}_pYYYYMMDD and cover [day 00:00 UTC, next day
+00:00 UTC). plan_partitions() is pure; PartitionMaintainer applies a plan
+through an asyncpg pool.
+"""
+
+import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import asyncpg
+
+_DAY = timedelta(days=1)
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """Partitioning layout and retention for one table.
+
+    Attributes:
+        table: Partitioned parent table
+        column: Timestamp column the table is partitioned on
+        archive_schema: Schema detached partitions move to; None drops them
+        premake_days: Days of partitions kept ready after today
+        retention: How long after a partition's upper bound it stays attached
+        lock_timeout_ms: Bound on waiting for the parent lock when detaching
+    """
+
+    table: str = "receipts"
+    column: str = "first_seen_at"
+    archive_schema: str | None = "receipts_archive"
+    premake_days: int = 7
+    # 24h lookback plus a day of slack for clock skew and late readers
+    retention: timedelta = timedelta(hours=48)
+    lock_timeout_ms: int = 2000
+
+    def __post_init__(self) -> None:
+        """Validate identifiers (they are interpolated into DDL) and windows."""
+        for label, value in (
+            ("table", self.table),
+            ("column", self.column),
+            ("archive_schema", self.archive_schema),
+        ):
+            if value is not None and not _IDENTIFIER.match(value):
+                raise ValueError(f"{label} {value!r} is not a plain lowercase identifier")
+        if self.premake_days < 0:
+            raise ValueError("premake_days must not be negative")
+        if self.retention < timedelta(0):
+            raise ValueError("retention must not be negative")
+
+    @property
+    def default_partition(self) -> str:
+        """Name of the DEFAULT partition."""
+        return f"{self.table}_default"
+
+
+@dataclass(frozen=True)
+class PartitionPlan:
+    """Work found by plan_partitions().
+
+    Attributes:
+        create: Days whose partitions are missing, oldest first
+        detach: Names of attached partitions past retention, oldest first
+        drain: Days with rows in the DEFAULT partition, oldest first (also
+            in create); their rows move into the new partitions
+    """
+
+    create: list[date] = field(default_factory=list)
+    detach: list[str] = field(default_factory=list)
+    drain: list[date] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        """True if there is nothing to do."""
+        return not self.create and not self.detach
+
+
+def partition_name(spec: PartitionSpec, day: date) -> str:
+    """Name of the partition holding `day`."""
+    return f"{spec.table}_p{day:%Y%m%d}"
+
+
+def partition_day(spec: PartitionSpec, name: str) -> date | None:
+    """Day a partition name covers, or None for non-daily partitions (DEFAULT)."""
+    prefix = f"{spec.table}_p"
+    suffix = name[len(prefix) :]
+    if not name.startswith(prefix) or len(suffix) != 8 or not suffix.isdigit():
+        return None
+    try:
+        return datetime.strptime(suffix, "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def day_bounds(day: date) -> tuple[datetime, datetime]:
+    """[start, end) of a daily partition as aware UTC datetimes."""
+    start = datetime.combine(day, time(), tzinfo=timezone.utc)
+    return start, start + _DAY
+
+
+def plan_partitions(
+    spec: PartitionSpec,
+    existing: Iterable[str],
+    now: datetime,
+    stranded: Iterable[date] = (),
+) -> PartitionPlan:
+    """Decide which partitions to create, drain and detach.
+
+    Args:
+        spec: Table layout and retention
+        existing: Names of the partitions currently attached to spec.table
+        now: Aware current time
+        stranded: Days that have rows in the DEFAULT partition
+
+    Returns:
+        PartitionPlan; applying it twice is a no-op the second time
+    """
+    attached: dict[date, str] = {}
+    for name in existing:
+        day = partition_day(spec, name)
+        if day is not None:
+            attached[day] = name
+
+    today = now.astimezone(timezone.utc).date()
+    drain = sorted(set(stranded) - attached.keys())
+    ahead = {today + timedelta(days=n) for n in range(spec.premake_days + 1)}
+    create = sorted((ahead - attached.keys()) | set(drain))
+    # A partition expires once every row in it has been past retention
+    detach = [
+        attached[day] for day in sorted(attached) if day_bounds(day)[1] + spec.retention <= now
+    ]
+    return PartitionPlan(create=create, detach=detach, drain=drain)
+
+
+def create_partition_sql(spec: PartitionSpec, day: date) -> str:
+    """DDL attaching a new daily partition."""
+    start, end = day_bounds(day)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(spec, day)} "
+        f"PARTITION OF {spec.table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def detach_partition_sql(spec: PartitionSpec, name: str) -> list[str]:
+    """Statements (one transaction) detaching a partition and archiving or dropping it.
+
+    Plain DETACH rather than DETACH CONCURRENTLY: the latter is not allowed
+    while the table has a DEFAULT partition. The parent lock is held only for
+    the catalog update, and lock_timeout bounds how long inserts can queue
+    behind it; a timed-out detach is retried on the next pass.
+    """
+    statements = [
+        f"SET LOCAL lock_timeout = {spec.lock_timeout_ms}",
+        f"ALTER TABLE {spec.table} DETACH PARTITION {name}",
+    ]
+    if spec.archive_schema is not None:
+        statements.append(f"ALTER TABLE {name} SET SCHEMA {spec.archive_schema}")
+    else:
+        statements.append(f"DROP TABLE {name}")
+    return statements
+
+
+def drain_default_sql(spec: PartitionSpec, days: Iterable[date]) -> list[str]:
+    """Statements (one transaction) creating days while DEFAULT holds rows for some.
+
+    With DEFAULT detached the new partitions can be created, and its rows
+    are routed into them by re-inserting through the parent. Inserts queue
+    behind the parent lock for the length of the copy, which is as many
+    rows as piled up while maintenance was behind.
+
+    Args:
+        spec: Table layout
+        days: Every day DEFAULT has rows for, plus any other missing days
+    """
+    default = spec.default_partition
+    return [
+        f"SET LOCAL lock_timeout = {spec.lock_timeout_ms}",
+        f"ALTER TABLE {spec.table} DETACH PARTITION {default}",
+        *(create_partition_sql(spec, day) for day in days),
+        f"INSERT INTO {spec.table} SELECT * FROM {default}",
+        f"TRUNCATE {default}",
+        f"ALTER TABLE {spec.table} ATTACH PARTITION {default} DEFAULT",
+    ]
+
+
+def stranded_days_sql(spec: PartitionSpec) -> str:
+    """Query listing the UTC days that have rows in the DEFAULT partition."""
+    return (
+        f"SELECT DISTINCT ({spec.column} AT TIME ZONE 'UTC')::date AS day "
+        f"FROM {spec.default_partition}"
+    )
+
+
+_LIST_PARTITIONS = """
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE pg_inherits.inhparent = $1::regclass
+"""
+
+
+class PartitionMaintainer:
+    """Applies plan_partitions() to a live database.
+
+    Run run_once() from a periodic job (hourly is plenty; each pass is
+    idempotent and cheap when there is nothing to do).
+    """
+
+    def __init__(
+        self,
+        pool: "asyncpg.Pool",
+        spec: PartitionSpec | None = None,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        """Initialize maintainer.
+
+        Args:
+            pool: asyncpg connection pool
+            spec: Table layout and retention (default: receipts)
+            clock: Aware-UTC clock
+        """
+        self._pool = pool
+        self.spec = spec if spec is not None else PartitionSpec()
+        self._clock = clock if clock is not None else (lambda: datetime.now(timezone.utc))
+
+    async def attached_partitions(self) -> list[str]:
+        """Names of the partitions currently attached to the table."""
+        rows = await self._pool.fetch(_LIST_PARTITIONS, self.spec.table)
+        return [row["relname"] for row in rows]
+
+    async def stranded_days(self) -> list[date]:
+        """Days that have rows in the DEFAULT partition."""
+        rows = await self._pool.fetch(stranded_days_sql(self.spec))
+        return [row["day"] for row in rows]
+
+    async def run_once(self, now: datetime | None = None) -> PartitionPlan:
+        """Create missing partitions, drain DEFAULT and detach expired ones.
+
+        Days drained out of DEFAULT that are already past retention are
+        detached on the next pass.
+
+        Args:
+            now: Time to plan for (default: the clock)
+
+        Returns:
+            The plan that was applied
+        """
+        now = now if now is not None else self._clock()
+        attached = await self.attached_partitions()
+        stranded = await self.stranded_days() if self.spec.default_partition in attached else []
+        plan = plan_partitions(self.spec, attached, now, stranded)
+        async with self._pool.acquire() as conn:
+            if plan.drain:
+                async with conn.transaction():
+                    for statement in drain_default_sql(self.spec, plan.create):
+                        await conn.execute(statement)
+            else:
+                for day in plan.create:
+                    await conn.execute(create_partition_sql(self.spec, day))
+            for name in plan.detach:
+                async with conn.transaction():
+                    for statement in self.detach_statements(name):
+                        await conn.execute(statement)
+        return plan
+
+    def detach_statements(self, name: str) -> list[str]:
+        """Statements run in one transaction to retire an expired partition.
+
+        Subclasses extend this to carry data out of the partition first.
+        """
+        return detach_partition_sql(self.spec, name)
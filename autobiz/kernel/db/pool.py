@@ -0,0 +1,401 @@
+"""TenantPool: tenant-scoped transactions over asyncpg pools.
+
+Part of P1-TASK-04: Tenant Context + RLS Isolation
+Requirements: INV-02, P1-R21
+
+set_tenant_context() (migration 001) sets app.current_tenant_id for the
+current transaction only, so it must run at the start of every
+transaction. The plan's TenantConnection (§12.2) costs, per transaction,
+a round trip for BEGIN, one for set_tenant_context(), one for RESET
+app.current_tenant_id, and one more for asyncpg's own reset on release,
+on top of the statements and COMMIT. TenantPool's transactions:
+
+- Begin lazily, with the first statement: BEGIN and set_tenant_context()
+  go out as one simple-query message. A first execute() without
+  arguments rides in the same message, so a one-statement write costs
+  two round trips including COMMIT
+- Skip RESET: the context is transaction-local and ends at COMMIT or
+  ROLLBACK. Pools are created with a no-op reset (asyncpg still rolls
+  back a transaction left open); statements must change session state
+  only with SET LOCAL
+- Are capped per tenant: at most max_connections_per_tenant concurrent
+  transactions of one tenant hold shared-pool connections, so a noisy
+  tenant queues behind its own cap instead of starving the others
+- Use a dedicated pool for each tenant in dedicated_pool_tenants
+
+stats counts acquires, waits and timeouts, with a histogram of time
+spent waiting for a connection; usage() reports each pool's size and
+connections in use.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    import asyncpg
+
+Isolation = Literal["read_committed", "repeatable_read", "serializable"]
+
+SHARED = "shared"
+# Upper bounds (seconds) of the wait histogram buckets; the last bucket is unbounded
+WAIT_BUCKETS = (0.001, 0.01, 0.1, 1.0)
+
+
+@dataclass(frozen=True)
+class TenantPoolConfig:
+    """Pool sizes and per-tenant limits (§12.2 TenantConnectionConfig).
+
+    Attributes:
+        shared_min_size: Connections the shared pool keeps open
+        shared_max_size: Connections the shared pool may open
+        min_connections_per_tenant: Connections a dedicated pool keeps open
+        max_connections_per_tenant: Concurrent transactions per tenant
+            (the size of a dedicated pool)
+        connection_timeout_seconds: Longest wait for a connection
+        dedicated_pool_tenants: Tenants with a pool of their own
+    """
+
+    shared_min_size: int = 2
+    shared_max_size: int = 20
+    min_connections_per_tenant: int = 1
+    max_connections_per_tenant: int = 10
+    connection_timeout_seconds: float = 30.0
+    dedicated_pool_tenants: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        """Validate sizes."""
+        if not 0 <= self.shared_min_size <= self.shared_max_size or self.shared_max_size < 1:
+            raise ValueError("need 0 <= shared_min_size <= shared_max_size, and a non-empty pool")
+        if not 0 <= self.min_connections_per_tenant <= self.max_connections_per_tenant:
+            raise ValueError("need 0 <= min_connections_per_tenant <= max_connections_per_tenant")
+        if self.max_connections_per_tenant < 1 or self.connection_timeout_seconds <= 0:
+            raise ValueError("max_connections_per_tenant and the timeout must be positive")
+
+
+@dataclass
+class TenantPoolStats:
+    """Counters for pool telemetry.
+
+    Attributes:
+        transactions: Transactions that got a connection
+        capped: Of those, how many queued behind their tenant's cap
+        timeouts: Transactions that gave up waiting
+        wait_seconds_total: Time spent waiting for connections
+        wait_seconds_max: Longest single wait
+        wait_histogram: Waits per WAIT_BUCKETS bucket, plus one for longer
+    """
+
+    transactions: int = 0
+    capped: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    wait_histogram: list[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+
+    def _record(self, waited: float) -> None:
+        self.transactions += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        bucket = 0
+        while bucket < len(WAIT_BUCKETS) and waited > WAIT_BUCKETS[bucket]:
+            bucket += 1
+        self.wait_histogram[bucket] += 1
+
+
+@dataclass(frozen=True)
+class PoolUsage:
+    """Connections of one pool.
+
+    Attributes:
+        size: Connections open
+        in_use: Connections held by transactions
+        max_size: Connections the pool may open
+    """
+
+    size: int
+    in_use: int
+    max_size: int
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of max_size in use."""
+        return self.in_use / self.max_size
+
+
+def quote_literal(value: str) -> str:
+    """SQL string literal for value, valid whatever standard_conforming_strings is.
+
+    Raises:
+        ValueError: If value contains a NUL character
+    """
+    if "\0" in value:
+        raise ValueError("NUL is not allowed in SQL strings")
+    return "E'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def begin_sql(tenant_id: str, isolation: Isolation | None = None, readonly: bool = False) -> str:
+    """BEGIN plus set_tenant_context(), as one simple-query script."""
+    mode = ""
+    if isolation is not None:
+        mode += " ISOLATION LEVEL " + isolation.replace("_", " ").upper()
+    if readonly:
+        mode += " READ ONLY"
+    return f"BEGIN{mode}; SELECT set_tenant_context({quote_literal(tenant_id)})"
+
+
+async def _keep_session(connection: "asyncpg.Connection") -> None:
+    # Replaces Connection.reset() on release: the tenant context ends with
+    # its transaction, and asyncpg rolls back a transaction left open
+    return None
+
+
+class TenantTransaction:
+    """One transaction under a tenant context.
+
+    Usage:
+        async with pool.transaction(tenant_id) as tx:
+            rows = await tx.fetch("SELECT ... FROM orders WHERE ...", ...)
+            await tx.execute("UPDATE ...", ...)
+
+    Commits on a clean exit and rolls back on an exception.
+    """
+
+    def __init__(
+        self, pool: "TenantPool", tenant_id: str, isolation: Isolation | None, readonly: bool
+    ) -> None:
+        """Initialize transaction (use TenantPool.transaction())."""
+        self.tenant_id = tenant_id
+        self._pool = pool
+        self._begin = begin_sql(tenant_id, isolation, readonly)
+        self._connection: Any = None
+        self._begun = False
+
+    async def __aenter__(self) -> "TenantTransaction":
+        """Wait for a connection (tenant cap, then pool)."""
+        self._connection = await self._pool._acquire(self.tenant_id)
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        """Commit or roll back, and return the connection."""
+        connection, self._connection = self._connection, None
+        try:
+            if self._begun:
+                await connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            await self._pool._release(self.tenant_id, connection)
+
+    async def execute(self, query: str, *args: Any, timeout: float | None = None) -> str:
+        """Execute a statement; returns its status.
+
+        The first statement of the transaction, if it has no arguments, is
+        sent together with BEGIN and the tenant context.
+        """
+        connection = self._open()
+        if not self._begun and not args:
+            self._begun = True
+            status: str = await connection.execute(f"{self._begin}; {query}", timeout=timeout)
+            return status
+        await self._start()
+        status = await connection.execute(query, *args, timeout=timeout)
+        return status
+
+    async def executemany(
+        self, query: str, args: Sequence[Sequence[Any]], timeout: float | None = None
+    ) -> None:
+        """Execute a statement for each argument tuple."""
+        connection = self._open()
+        await self._start()
+        await connection.executemany(query, args, timeout=timeout)
+
+    async def fetch(self, query: str, *args: Any, timeout: float | None = None) -> list[Any]:
+        """Rows of a query."""
+        connection = self._open()
+        await self._start()
+        rows: list[Any] = await connection.fetch(query, *args, timeout=timeout)
+        return rows
+
+    async def fetchrow(self, query: str, *args: Any, timeout: float | None = None) -> Any:
+        """First row of a query, or None."""
+        connection = self._open()
+        await self._start()
+        return await connection.fetchrow(query, *args, timeout=timeout)
+
+    async def fetchval(self, query: str, *args: Any, timeout: float | None = None) -> Any:
+        """First column of the first row of a query, or None."""
+        connection = self._open()
+        await self._start()
+        return await connection.fetchval(query, *args, timeout=timeout)
+
+    def _open(self) -> Any:
+        if self._connection is None:
+            raise RuntimeError("transaction is not active; use it in 'async with'")
+        return self._connection
+
+    async def _start(self) -> None:
+        if not self._begun:
+            # Set first: a failed BEGIN is still answered with ROLLBACK
+            self._begun = True
+            await self._connection.execute(self._begin)
+
+
+class TenantPool:
+    """Tenant-scoped transactions over a shared pool and dedicated pools.
+
+    Use from one event loop.
+    """
+
+    def __init__(
+        self,
+        shared: "asyncpg.Pool",
+        config: TenantPoolConfig | None = None,
+        dedicated: Mapping[str, "asyncpg.Pool"] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Wrap existing pools (see connect() to create them).
+
+        Args:
+            shared: Pool for tenants without a dedicated one
+            config: Limits (max_connections_per_tenant, timeout)
+            dedicated: Pools by tenant id
+            clock: Monotonic clock in seconds, for wait times
+        """
+        self.config = config if config is not None else TenantPoolConfig()
+        self.stats = TenantPoolStats()
+        self._shared = shared
+        self._dedicated = dict(dedicated or {})
+        self._clock = clock
+        self._gates: dict[str, asyncio.Semaphore] = {}
+        # Transactions holding or waiting for each tenant's gate
+        self._gate_users: dict[str, int] = {}
+
+    @classmethod
+    async def connect(
+        cls, dsn: str, config: TenantPoolConfig | None = None, **connect_kwargs: Any
+    ) -> "TenantPool":
+        """Create the shared pool and one pool per dedicated tenant.
+
+        Args:
+            dsn: Database URL
+            config: Pool sizes and limits
+            **connect_kwargs: Passed to asyncpg.create_pool()
+        """
+        import asyncpg
+
+        config = config if config is not None else TenantPoolConfig()
+        shared = await asyncpg.create_pool(
+            dsn,
+            min_size=config.shared_min_size,
+            max_size=config.shared_max_size,
+            reset=_keep_session,
+            **connect_kwargs,
+        )
+        dedicated = {}
+        for tenant_id in config.dedicated_pool_tenants:
+            dedicated[tenant_id] = await asyncpg.create_pool(
+                dsn,
+                min_size=config.min_connections_per_tenant,
+                max_size=config.max_connections_per_tenant,
+                reset=_keep_session,
+                **connect_kwargs,
+            )
+        return cls(shared, config, dedicated)
+
+    def transaction(
+        self, tenant_id: str, isolation: Isolation | None = None, readonly: bool = False
+    ) -> TenantTransaction:
+        """A transaction with app.current_tenant_id set to tenant_id.
+
+        Args:
+            tenant_id: Tenant the transaction runs as
+            isolation: Isolation level (default: the server's)
+            readonly: Start the transaction READ ONLY
+
+        Raises:
+            ValueError: If tenant_id is empty or contains NUL
+        """
+        if not tenant_id:
+            raise ValueError("tenant_id must not be empty")
+        return TenantTransaction(self, tenant_id, isolation, readonly)
+
+    def usage(self) -> dict[str, PoolUsage]:
+        """Usage of the shared pool (key SHARED) and each dedicated pool."""
+        pools = {SHARED: self._shared, **self._dedicated}
+        return {
+            name: PoolUsage(
+                size=pool.get_size(),
+                in_use=pool.get_size() - pool.get_idle_size(),
+                max_size=pool.get_max_size(),
+            )
+            for name, pool in pools.items()
+        }
+
+    def in_flight(self, tenant_id: str) -> int:
+        """Transactions of a shared-pool tenant holding or waiting for its cap."""
+        return self._gate_users.get(tenant_id, 0)
+
+    async def close(self) -> None:
+        """Close every pool."""
+        for pool in (self._shared, *self._dedicated.values()):
+            await pool.close()
+
+    async def _acquire(self, tenant_id: str) -> Any:
+        started = self._clock()
+        try:
+            connection = await asyncio.wait_for(
+                self._wait(tenant_id), self.config.connection_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats._record(self._clock() - started)
+        return connection
+
+    async def _wait(self, tenant_id: str) -> Any:
+        dedicated = self._dedicated.get(tenant_id)
+        if dedicated is not None:
+            return await dedicated.acquire()
+        gate = self._gate(tenant_id)
+        try:
+            if gate.locked():
+                self.stats.capped += 1
+            await gate.acquire()
+            try:
+                return await self._shared.acquire()
+            except BaseException:
+                gate.release()
+                raise
+        except BaseException:
+            self._leave_gate(tenant_id)
+            raise
+
+    async def _release(self, tenant_id: str, connection: Any) -> None:
+        dedicated = self._dedicated.get(tenant_id)
+        if dedicated is not None:
+            await dedicated.release(connection)
+            return
+        try:
+            await self._shared.release(connection)
+        finally:
+            self._gates[tenant_id].release()
+            self._leave_gate(tenant_id)
+
+    def _gate(self, tenant_id: str) -> asyncio.Semaphore:
+        gate = self._gates.get(tenant_id)
+        if gate is None:
+            gate = self._gates[tenant_id] = asyncio.Semaphore(
+                self.config.max_connections_per_tenant
+            )
+        self._gate_users[tenant_id] = self._gate_users.get(tenant_id, 0) + 1
+        return gate
+
+    def _leave_gate(self, tenant_id: str) -> None:
+        users = self._gate_users[tenant_id] - 1
+        if users:
+            self._gate_users[tenant_id] = users
+        else:
+            # Nobody holds or waits for it: it is back at full capacity
+            del self._gate_users[tenant_id]
+            del self._gates[tenant_id]
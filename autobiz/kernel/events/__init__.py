@@ -0,0 +1,109 @@
+"""Events module: webhook ingest, retention, causal ordering and reconciliation.
+
+Part of P1-TASK-24: Webhook Ingress + Signature Verification
+"""
+
+from autobiz.kernel.events.hash_tree import BucketHashTree, TreeDiff
+from autobiz.kernel.events.ingestor import (
+    EventIngestor,
+    EventIngestorStats,
+    IngestAck,
+    SecretLookup,
+    Webhook,
+)
+from autobiz.kernel.events.ordering import (
+    EventOrderingGate,
+    EventRef,
+    GatedEvent,
+    PostgresOrderingStore,
+    Release,
+    ReleaseReason,
+)
+from autobiz.kernel.events.reconciliation import (
+    ChangePage,
+    Drift,
+    DriftKind,
+    DriftStore,
+    InMemoryDriftStore,
+    InMemoryReconciliationSource,
+    PostgresDriftStore,
+    PostgresStateSource,
+    ReconciliationDetector,
+    ReconciliationSource,
+    SourceRecord,
+    SyncStats,
+    entity_digest,
+)
+from autobiz.kernel.events.retention import (
+    EVENT_STORE_PARTITIONS,
+    PAYLOAD_RETENTION,
+    EventStoreCompactor,
+    compact_partition_sql,
+)
+from autobiz.kernel.events.sources import (
+    DEFAULT_SOURCES,
+    EventIdentity,
+    InternalSource,
+    ShopifySource,
+    StripeSource,
+    WebhookRejectedError,
+    WebhookSignatureError,
+    WebhookSource,
+)
+from autobiz.kernel.events.store import (
+    EventRecord,
+    EventStore,
+    InboundEvent,
+    InMemoryEventStore,
+    PostgresEventStore,
+    StoredEvent,
+)
+from autobiz.kernel.events.timer_wheel import TimerWheel
+
+__all__ = [
+    "BucketHashTree",
+    "TreeDiff",
+    "EventIngestor",
+    "EventIngestorStats",
+    "IngestAck",
+    "SecretLookup",
+    "Webhook",
+    "EventOrderingGate",
+    "EventRef",
+    "GatedEvent",
+    "PostgresOrderingStore",
+    "Release",
+    "ReleaseReason",
+    "ChangePage",
+    "Drift",
+    "DriftKind",
+    "DriftStore",
+    "InMemoryDriftStore",
+    "InMemoryReconciliationSource",
+    "PostgresDriftStore",
+    "PostgresStateSource",
+    "ReconciliationDetector",
+    "ReconciliationSource",
+    "SourceRecord",
+    "SyncStats",
+    "entity_digest",
+    "EVENT_STORE_PARTITIONS",
+    "PAYLOAD_RETENTION",
+    "EventStoreCompactor",
+    "compact_partition_sql",
+    "DEFAULT_SOURCES",
+    "EventIdentity",
+    "InternalSource",
+    "ShopifySource",
+    "StripeSource",
+    "WebhookRejectedError",
+    "WebhookSignatureError",
+    "WebhookSource",
+    "EventRecord",
+    "EventStore",
+    "InboundEvent",
+    "InMemoryEventStore",
+    "PostgresEventStore",
+    "StoredEvent",
+    "TimerWheel",
+]
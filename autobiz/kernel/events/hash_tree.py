@@ -0,0 +1,154 @@
+"""BucketHashTree: bucketed content hashes of an entity set, for range diffing.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+Requirements: P1-R29
+
+Each entity has a 64-bit digest of (entity_id, content). Entities are
+spread over `buckets` buckets by a hash of entity_id alone, so the local
+and remote copies of an entity always land in the same bucket. A bucket's
+value is the sum of its entities' digests mod 2**64, and each tree level
+above sums `fanout` children, up to a single root. Sums (unlike a hash of
+the children) update in place: changing one entity adds the difference
+of its digests along one path, O(levels).
+
+diff() walks two trees of the same shape from the root and descends only
+into nodes whose sums differ, then compares the entities of the differing
+buckets one by one. Two equal entity sets cost one comparison; d changed
+entities cost about d * (levels * fanout + entities per bucket).
+"""
+
+import zlib
+from dataclasses import dataclass
+
+_MASK = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class TreeDiff:
+    """Result of comparing two trees.
+
+    Attributes:
+        entity_ids: Entities whose digest differs or that exist on one side only
+        buckets: Buckets whose sums differ
+        node_comparisons: Tree node sums compared (buckets included)
+        entity_comparisons: Entity digests compared inside differing buckets
+    """
+
+    entity_ids: list[str]
+    buckets: list[int]
+    node_comparisons: int
+    entity_comparisons: int
+
+
+class BucketHashTree:
+    """Per-bucket entity digests with a tree of bucket sums above them."""
+
+    def __init__(self, buckets: int = 4096, fanout: int = 16) -> None:
+        """Initialize an empty tree.
+
+        Args:
+            buckets: Number of buckets (a power of fanout)
+            fanout: Children per tree node
+        """
+        levels = 0
+        size = 1
+        while size < buckets:
+            size *= fanout
+            levels += 1
+        if fanout < 2 or size != buckets:
+            raise ValueError("buckets must be a power of fanout, and fanout at least 2")
+        self.buckets = buckets
+        self.fanout = fanout
+        # _levels[0] holds bucket sums; _levels[-1] is [root]
+        self._levels: list[list[int]] = [[0] * (buckets // fanout**n) for n in range(levels + 1)]
+        self._members: list[dict[str, int] | None] = [None] * buckets
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Entities in the tree."""
+        return self._count
+
+    @property
+    def root(self) -> int:
+        """Sum of all entity digests mod 2**64."""
+        return self._levels[-1][0]
+
+    def bucket_of(self, entity_id: str) -> int:
+        """Bucket holding entity_id (stable across processes)."""
+        return zlib.crc32(entity_id.encode()) % self.buckets
+
+    def get(self, entity_id: str) -> int | None:
+        """Digest stored for entity_id, if any."""
+        members = self._members[self.bucket_of(entity_id)]
+        return members.get(entity_id) if members is not None else None
+
+    def set(self, entity_id: str, digest: int) -> None:
+        """Store (or replace) the digest of entity_id."""
+        bucket = self.bucket_of(entity_id)
+        members = self._members[bucket]
+        if members is None:
+            members = self._members[bucket] = {}
+        old = members.get(entity_id)
+        if old == digest:
+            return
+        if old is None:
+            self._count += 1
+            old = 0
+        members[entity_id] = digest
+        self._add(bucket, digest - old)
+
+    def discard(self, entity_id: str) -> None:
+        """Remove entity_id if present."""
+        bucket = self.bucket_of(entity_id)
+        members = self._members[bucket]
+        if members is None or entity_id not in members:
+            return
+        self._count -= 1
+        self._add(bucket, -members.pop(entity_id))
+
+    def diff(self, other: "BucketHashTree") -> TreeDiff:
+        """Entities that differ between this tree and other.
+
+        Raises:
+            ValueError: If the trees differ in shape
+        """
+        if (self.buckets, self.fanout) != (other.buckets, other.fanout):
+            raise ValueError("can only diff trees with the same buckets and fanout")
+        fanout = self.fanout
+        node_comparisons = 0
+        entity_comparisons = 0
+        buckets: list[int] = []
+        # Depth-first from the root, in bucket order
+        stack = [(len(self._levels) - 1, 0)]
+        while stack:
+            level, index = stack.pop()
+            node_comparisons += 1
+            if self._levels[level][index] == other._levels[level][index]:
+                continue
+            if level == 0:
+                buckets.append(index)
+            else:
+                first = index * fanout
+                stack.extend(
+                    (level - 1, child) for child in range(first + fanout - 1, first - 1, -1)
+                )
+
+        entity_ids: list[str] = []
+        for bucket in buckets:
+            mine = self._members[bucket] or {}
+            theirs = other._members[bucket] or {}
+            for entity_id, digest in mine.items():
+                entity_comparisons += 1
+                if theirs.get(entity_id) != digest:
+                    entity_ids.append(entity_id)
+            for entity_id in theirs:
+                if entity_id not in mine:
+                    entity_comparisons += 1
+                    entity_ids.append(entity_id)
+        return TreeDiff(entity_ids, buckets, node_comparisons, entity_comparisons)
+
+    def _add(self, bucket: int, delta: int) -> None:
+        index = bucket
+        for level in self._levels:
+            level[index] = (level[index] + delta) & _MASK
+            index //= self.fanout
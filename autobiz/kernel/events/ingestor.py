@@ -0,0 +1,413 @@
+"""EventIngestor: verified, micro-batched webhook ingest into event_store.
+
+Part of P1-TASK-24: Webhook Ingress + Signature Verification
+Requirements: P1-RH05, P1-R26
+
+Provider bursts arrive one webhook per request. Checking for a duplicate
+and inserting each one on its own costs two round trips per event and
+serializes the burst on the connection pool. Instead:
+
+1. Admission: at most QueueConfig.max_depth webhooks (event_ordering_gate:
+   10000) may be between arrival and ack. Beyond that ingest() raises
+   QueueFullError straight away (REJECT_NEW), so the HTTP layer can answer
+   503 and the provider retries later, instead of memory growing.
+2. Verification, concurrently per request: the body is streamed once,
+   each chunk feeding both the signature MACs and payload_sha256. A bad
+   signature is rejected before anything is stored (P1-H10).
+3. Batching: verified events are queued; a background task takes
+   everything queued (up to max_batch, plus an optional linger) and
+   writes it with one EventStore.insert_many() (INSERT ... ON CONFLICT
+   DO NOTHING RETURNING). Up to max_in_flight batches are written at once.
+4. Ack: ingest() returns only after its event's batch committed. A
+   redelivered event (same source_event_id) comes back as a duplicate of
+   the stored row (P1-T36), also within one batch.
+
+If a batch fails, every webhook in it gets the error; the provider
+redelivers and the unique constraint keeps the retry idempotent. Bodies
+the jsonb column would refuse (not UTF-8, NaN/Infinity, \u0000 or lone
+surrogate escapes) are therefore rejected in verification, so one bad
+event cannot fail the valid events batched with it on every redelivery.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import AsyncIterable, Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from autobiz.kernel.config.queues import QUEUE_CONFIGS, QueueConfig, QueueFullError, QueueLevel
+from autobiz.kernel.events.sources import (
+    DEFAULT_SOURCES,
+    WebhookRejectedError,
+    WebhookSignatureError,
+    WebhookSource,
+)
+from autobiz.kernel.events.store import EventStore, InboundEvent, StoredEvent
+from autobiz.kernel.idempotency.receipts import utcnow
+
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_DELAY = 0.0
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_BODY_BYTES = 1024 * 1024
+QUEUE_NAME = "event_ordering_gate"
+
+# (tenant_id, source) -> secrets currently valid for it (several while rotating)
+SecretLookup = Callable[[str, str], Sequence[bytes]]
+
+
+@dataclass(frozen=True)
+class Webhook:
+    """One inbound webhook request.
+
+    Attributes:
+        tenant_id: Tenant the endpoint belongs to
+        source: Provider (a key of the ingestor's sources)
+        headers: Request headers (any case)
+        body: Raw body, whole or as a stream of chunks
+    """
+
+    tenant_id: str
+    source: str
+    headers: Mapping[str, str]
+    body: bytes | AsyncIterable[bytes]
+
+
+@dataclass(frozen=True)
+class IngestAck:
+    """A webhook's event, committed to event_store.
+
+    Attributes:
+        event: The verified event
+        event_id: Its event_store row (see StoredEvent.event_id)
+        duplicate: It had been received before; nothing new was stored
+    """
+
+    event: InboundEvent
+    event_id: str | None
+    duplicate: bool
+
+
+@dataclass
+class EventIngestorStats:
+    """Counters for ingress telemetry."""
+
+    stored: int = 0
+    duplicates: int = 0
+    rejected_invalid: int = 0
+    rejected_full: int = 0
+    batches: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _Pending:
+    event: InboundEvent
+    future: "asyncio.Future[IngestAck]" = field(repr=False)
+
+
+# Queue sentinel telling the drain task to exit
+_STOP: Any = object()
+
+
+def _reject_constant(name: str) -> Any:
+    raise ValueError(f"{name} is not valid JSON")
+
+
+def _storable(payload: Any) -> bool:
+    """False if a string in payload holds U+0000 or a lone surrogate (jsonb refuses both)."""
+    stack = [payload]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value)
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+        elif isinstance(value, str):
+            if "\x00" in value:
+                return False
+            try:
+                value.encode()
+            except UnicodeEncodeError:
+                return False
+    return True
+
+
+def _parse_payload(source: str, body: bytes) -> Any:
+    """Parse a body as strict JSON that event_store's jsonb column accepts.
+
+    Raises:
+        WebhookRejectedError: If it is not UTF-8, not JSON, or not storable
+    """
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise WebhookRejectedError(source, "payload is not UTF-8") from None
+    try:
+        payload = json.loads(text, parse_constant=_reject_constant)
+    except ValueError:
+        raise WebhookRejectedError(source, "payload is not JSON") from None
+    # Both can only come from \u escapes; raw control characters fail to parse
+    if "\\u" in text and not _storable(payload):
+        raise WebhookRejectedError(source, "payload has a \\u0000 or lone surrogate escape")
+    return payload
+
+
+async def _chunks(body: bytes | AsyncIterable[bytes]) -> AsyncIterable[bytes]:
+    if isinstance(body, bytes):
+        yield body
+    else:
+        async for chunk in body:
+            yield chunk
+
+
+class EventIngestor:
+    """Webhook front door of the event pipeline.
+
+    Usage:
+        ingestor = EventIngestor(PostgresEventStore(pool), secrets=lookup)
+        ingestor.start()
+        try:
+            ack = await ingestor.ingest(Webhook(tenant_id, "STRIPE", headers, body))
+        except QueueFullError:
+            ...  # 503, provider retries
+        except WebhookRejectedError:
+            ...  # 400/401, never stored
+        await ingestor.close()
+
+    An ingestor is bound to one asyncio event loop.
+    """
+
+    def __init__(
+        self,
+        store: EventStore,
+        secrets: SecretLookup,
+        sources: Mapping[str, WebhookSource] | None = None,
+        queue: QueueConfig = QUEUE_CONFIGS[QUEUE_NAME],
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        """Initialize ingestor.
+
+        Args:
+            store: Durable event store
+            secrets: Signing secrets per (tenant_id, source)
+            sources: Signature schemes by source name (default: STRIPE,
+                SHOPIFY, INTERNAL)
+            queue: Bound on webhooks between arrival and ack (REJECT_NEW)
+            max_batch: Most events per insert_many()
+            max_delay: Linger before a non-full batch is written (seconds)
+            max_in_flight: Batches written concurrently
+            max_body_bytes: Largest accepted body
+            clock: Aware-UTC clock for received_at and signature tolerance
+
+        Raises:
+            ValueError: If queue is not REJECT_NEW or a bound is below 1
+        """
+        if queue.overflow_strategy != "REJECT_NEW":
+            raise ValueError(
+                "the ingestor pushes back on webhook sources: queue must be REJECT_NEW"
+            )
+        if max_batch < 1 or max_in_flight < 1 or max_body_bytes < 1:
+            raise ValueError("max_batch, max_in_flight and max_body_bytes must be at least 1")
+        self._store = store
+        self._secrets = secrets
+        self._sources = dict(sources) if sources is not None else dict(DEFAULT_SOURCES)
+        self.queue = queue
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._max_body_bytes = max_body_bytes
+        self._clock = clock
+        self._depth = 0
+        self._pending: asyncio.Queue[Any] = asyncio.Queue()
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._writes: set[asyncio.Task[None]] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+        self.stats = EventIngestorStats()
+
+    @property
+    def depth(self) -> int:
+        """Webhooks admitted and not yet acked."""
+        return self._depth
+
+    @property
+    def level(self) -> QueueLevel:
+        """Alert level of depth against the queue thresholds."""
+        return self.queue.level(self._depth)
+
+    def start(self) -> None:
+        """Start the background batching task (requires a running loop)."""
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def ingest(self, webhook: Webhook) -> IngestAck:
+        """Verify a webhook and store its event; returns once committed.
+
+        Raises:
+            RuntimeError: If the ingestor is not running or is closing
+            QueueFullError: If max_depth webhooks are already in progress
+            WebhookSignatureError: If the signature does not verify
+            WebhookRejectedError: If the source, body or payload is invalid
+            Exception: Whatever the store raised for this event's batch
+        """
+        if self._task is None or self._task.done() or self._closing:
+            raise RuntimeError("EventIngestor is not running")
+        if self._depth >= self.queue.max_depth:
+            self.stats.rejected_full += 1
+            raise QueueFullError(QUEUE_NAME, self._depth, self.queue.max_depth)
+        self._depth += 1
+        try:
+            try:
+                event = await self.verify(webhook)
+            except WebhookRejectedError:
+                self.stats.rejected_invalid += 1
+                raise
+            # close() may have queued _STOP while the body was streaming
+            if self._closing:
+                raise RuntimeError("EventIngestor is not running")
+            future: asyncio.Future[IngestAck] = asyncio.get_running_loop().create_future()
+            self._pending.put_nowait(_Pending(event, future))
+            return await future
+        finally:
+            self._depth -= 1
+
+    async def verify(self, webhook: Webhook) -> InboundEvent:
+        """Stream the body through the MACs and SHA-256; build the event.
+
+        Raises:
+            WebhookSignatureError: If the signature does not verify
+            WebhookRejectedError: If the source, body or payload is invalid
+        """
+        source = self._sources.get(webhook.source)
+        if source is None:
+            raise WebhookRejectedError(webhook.source, "unknown source")
+        headers = {name.lower(): value for name, value in webhook.headers.items()}
+        secrets = self._secrets(webhook.tenant_id, webhook.source)
+        if not secrets:
+            raise WebhookSignatureError(source.name, "no signing secret for tenant")
+        received_at = self._clock()
+        macs = source.begin(headers, secrets, received_at)
+
+        sha256 = hashlib.sha256()
+        chunks = []
+        size = 0
+        async for chunk in _chunks(webhook.body):
+            size += len(chunk)
+            if size > self._max_body_bytes:
+                raise WebhookRejectedError(source.name, "body too large")
+            sha256.update(chunk)
+            for mac in macs:
+                mac.update(chunk)
+            chunks.append(chunk)
+        if not source.verify(headers, [mac.digest() for mac in macs]):
+            raise WebhookSignatureError(source.name, "signature mismatch")
+
+        body = b"".join(chunks)
+        payload = _parse_payload(source.name, body)
+        identity = source.identify(headers, payload)
+        return InboundEvent(
+            tenant_id=webhook.tenant_id,
+            source=source.name,
+            source_event_id=identity.source_event_id,
+            event_type=identity.event_type,
+            received_at=received_at,
+            body=body,
+            payload=payload,
+            payload_sha256=sha256.hexdigest(),
+            seq=identity.seq,
+            predecessor_source_event_id=identity.predecessor_source_event_id,
+        )
+
+    async def close(self) -> None:
+        """Write everything queued, then stop the batching task.
+
+        ingest() calls that have not queued their event yet raise
+        RuntimeError instead of waiting for a batch that never comes.
+        """
+        if self._task is not None:
+            self._closing = True
+            self._pending.put_nowait(_STOP)
+            await self._task
+            self._task = None
+            # Anything queued behind _STOP is failed, never left hanging
+            while not self._pending.empty():
+                item = self._pending.get_nowait()
+                if item is not _STOP and not item.future.done():
+                    item.future.set_exception(RuntimeError("EventIngestor is not running"))
+        if self._writes:
+            await asyncio.gather(*self._writes)
+
+    async def _drain(self) -> None:
+        queue = self._pending
+        stopping = False
+        while not stopping:
+            first = await queue.get()
+            if first is _STOP:
+                return
+            batch: list[_Pending] = [first]
+            stopping = self._take(batch)
+            if not stopping and len(batch) < self._max_batch and self._max_delay > 0:
+                await asyncio.sleep(self._max_delay)
+                stopping = self._take(batch)
+            # Waiting for a write slot lets the batch keep filling
+            await self._in_flight.acquire()
+            if not stopping:
+                stopping = self._take(batch)
+            task = asyncio.get_running_loop().create_task(self._commit(batch))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    def _take(self, batch: list[_Pending]) -> bool:
+        """Move queued items into batch up to max_batch; True if _STOP was taken."""
+        while len(batch) < self._max_batch:
+            try:
+                item = self._pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            if item is _STOP:
+                return True
+            batch.append(item)
+        return False
+
+    async def _commit(self, batch: list[_Pending]) -> None:
+        try:
+            live = [pending for pending in batch if not pending.future.done()]
+            # One row per dedup key; later copies in the batch are duplicates of it
+            first: dict[tuple[str, str, str], int] = {}
+            unique: list[_Pending] = []
+            for pending in live:
+                if pending.event.dedup_key not in first:
+                    first[pending.event.dedup_key] = len(unique)
+                    unique.append(pending)
+            if not unique:
+                return
+            try:
+                results: list[StoredEvent] = await self._store.insert_many(
+                    [pending.event for pending in unique]
+                )
+            except Exception as e:
+                for pending in live:
+                    if not pending.future.done():
+                        self.stats.failed += 1
+                        pending.future.set_exception(e)
+                return
+            self.stats.batches += 1
+            for pending in live:
+                index = first[pending.event.dedup_key]
+                result = results[index]
+                duplicate = result.duplicate or pending is not unique[index]
+                if duplicate:
+                    self.stats.duplicates += 1
+                else:
+                    self.stats.stored += 1
+                if not pending.future.done():
+                    pending.future.set_result(IngestAck(pending.event, result.event_id, duplicate))
+        finally:
+            self._in_flight.release()
@@ -0,0 +1,378 @@
+"""EventOrderingGate: causal ordering with a dependency index and timer wheel.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+Requirements: P1-R27, P1-R28
+
+An event whose predecessor_source_event_id has not been released yet is
+held (processing_status HELD_ORDERING) until it is, or for at most 60
+seconds (§11.3). Scanning the held rows every minute makes release
+latency up to a minute and costs a query per scan. The gate keeps held
+events in memory instead:
+- a dependency index from each missing predecessor to the events waiting
+  for it, so releasing an event releases its dependents in O(1) each,
+  along whole chains (C waits for B waits for A)
+- a TimerWheel with one timer per held event, so the 60-second timeouts
+  fire from memory at tick resolution, without polling
+
+offer() and expire() return Release records; the caller persists the new
+processing_status and hands released events to the state machine. A
+timeout release is flagged (TIMEOUT, with the missing predecessor) so its
+preconditions are checked before it is applied. On restart, rebuild()
+re-holds the HELD_ORDERING rows of event_store; deadlines count from
+received_at, so timeouts keep their original time.
+"""
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Literal
+
+from autobiz.kernel.config.queues import QUEUE_CONFIGS, QueueConfig, QueueLevel
+from autobiz.kernel.events.timer_wheel import TimerWheel
+from autobiz.kernel.idempotency.receipts import utcnow
+
+if TYPE_CHECKING:
+    import asyncpg
+
+DEFAULT_TIMEOUT = timedelta(seconds=60)
+DEFAULT_TICK = timedelta(milliseconds=100)
+DEFAULT_REMEMBER = 100_000
+
+# (tenant_id, source, source_event_id)
+EventRef = tuple[str, str, str]
+ReleaseReason = Literal["IN_ORDER", "PREDECESSOR_RELEASED", "TIMEOUT"]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(frozen=True)
+class GatedEvent:
+    """What the gate needs to know about a stored event.
+
+    Attributes:
+        event_id: event_store row id
+        tenant_id: Owning tenant
+        source: Provider
+        source_event_id: Provider event id
+        event_type: Provider event type
+        received_at: Ingest time (timeouts count from it)
+        predecessor_source_event_id: Event that must be released first
+    """
+
+    event_id: str
+    tenant_id: str
+    source: str
+    source_event_id: str
+    event_type: str
+    received_at: datetime
+    predecessor_source_event_id: str | None = None
+
+    @property
+    def ref(self) -> EventRef:
+        """(tenant_id, source, source_event_id)."""
+        return (self.tenant_id, self.source, self.source_event_id)
+
+    @property
+    def predecessor_ref(self) -> EventRef | None:
+        """Ref of the predecessor (same tenant and source), if any."""
+        if self.predecessor_source_event_id is None:
+            return None
+        return (self.tenant_id, self.source, self.predecessor_source_event_id)
+
+
+@dataclass(frozen=True)
+class Release:
+    """An event let through the gate.
+
+    Attributes:
+        event: Released event
+        reason: IN_ORDER (never held), PREDECESSOR_RELEASED or TIMEOUT
+        held_for: Time since received_at when released (0 if never held)
+        missing_predecessor: For TIMEOUT, the predecessor that never came
+    """
+
+    event: GatedEvent
+    reason: ReleaseReason
+    held_for: timedelta
+    missing_predecessor: str | None = None
+
+    @property
+    def timeout_released(self) -> bool:
+        """True if released without its predecessor (check preconditions)."""
+        return self.reason == "TIMEOUT"
+
+
+def _micros(at: datetime) -> int:
+    return (at - _EPOCH) // _MICROSECOND
+
+
+class EventOrderingGate:
+    """In-memory ordering gate for one process's event stream.
+
+    Not thread-safe; use from one event loop.
+    """
+
+    def __init__(
+        self,
+        timeout: timedelta = DEFAULT_TIMEOUT,
+        tick: timedelta = DEFAULT_TICK,
+        queue: QueueConfig = QUEUE_CONFIGS["event_ordering_gate"],
+        remember: int = DEFAULT_REMEMBER,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        """Initialize an empty gate.
+
+        Args:
+            timeout: Longest hold before release without the predecessor
+            tick: Timer resolution (a timeout fires at most one tick late)
+            queue: Thresholds for the level of held events
+            remember: Recently released refs kept, so that a successor
+                arriving soon after its predecessor passes straight through
+            clock: Aware-UTC clock
+        """
+        if tick <= timedelta(0) or timeout < timedelta(0):
+            raise ValueError("tick must be positive and timeout not negative")
+        self.timeout = timeout
+        self.queue = queue
+        self._tick_us = tick // _MICROSECOND
+        self._remember = remember
+        self._clock = clock
+        self._held: dict[EventRef, GatedEvent] = {}
+        self._waiting: dict[EventRef, dict[EventRef, None]] = {}
+        self._released: OrderedDict[EventRef, None] = OrderedDict()
+        self._wheel: TimerWheel[EventRef] = self._new_wheel()
+        self._armed = asyncio.Event()
+        # Tick run() is sleeping until; None while it has no timer to wait for
+        self._wake_tick: int | None = None
+
+    @property
+    def depth(self) -> int:
+        """Events held."""
+        return len(self._held)
+
+    @property
+    def level(self) -> QueueLevel:
+        """Alert level of depth against the queue thresholds."""
+        return self.queue.level(len(self._held))
+
+    def is_held(self, ref: EventRef) -> bool:
+        """True if the event is waiting in the gate."""
+        return ref in self._held
+
+    def waiting_for(self, ref: EventRef) -> list[EventRef]:
+        """Events held until ref is released."""
+        return list(self._waiting.get(ref, ()))
+
+    def offer(self, event: GatedEvent, predecessor_released: bool = False) -> list[Release]:
+        """Pass a newly stored event through the gate.
+
+        The event is released at once if it has no predecessor, or its
+        predecessor has been released (recently, as far as the gate
+        remembers, or per predecessor_released) and is not held. Otherwise
+        it is held. Releasing it also releases every event waiting on it,
+        transitively.
+
+        Args:
+            event: Stored event
+            predecessor_released: Caller knows the predecessor was released
+                (an event_store lookup for predecessors older than the
+                gate's memory)
+
+        Returns:
+            Releases in causal order (empty if the event was held, or was
+            offered before)
+        """
+        ref = event.ref
+        if ref in self._held or ref in self._released:
+            return []
+        predecessor = event.predecessor_ref
+        if predecessor is not None and (
+            predecessor in self._held or not (predecessor_released or predecessor in self._released)
+        ):
+            self._hold(event, predecessor)
+            return []
+        now = self._clock()
+        releases = [Release(event, "IN_ORDER", timedelta(0))]
+        self._mark_released(ref)
+        self._release_dependents(ref, now, releases)
+        return releases
+
+    def expire(self, now: datetime | None = None) -> list[Release]:
+        """Release events held for timeout, then their dependents.
+
+        Args:
+            now: Current time (default: the clock)
+        """
+        now = now if now is not None else self._clock()
+        releases: list[Release] = []
+        for ref, _ in self._wheel.advance(self._tick_at(now)):
+            event = self._held.pop(ref, None)
+            if event is None:
+                continue
+            predecessor = event.predecessor_ref
+            if predecessor is not None:
+                waiting = self._waiting.get(predecessor)
+                if waiting is not None:
+                    waiting.pop(ref, None)
+                    if not waiting:
+                        del self._waiting[predecessor]
+            releases.append(
+                Release(
+                    event,
+                    "TIMEOUT",
+                    now - event.received_at,
+                    missing_predecessor=event.predecessor_source_event_id,
+                )
+            )
+            self._mark_released(ref)
+            self._release_dependents(ref, now, releases)
+        return releases
+
+    def next_timeout(self) -> datetime | None:
+        """When expire() may next have work (never after the next timeout)."""
+        tick = self._wheel.next_due()
+        if tick is None:
+            return None
+        return _EPOCH + tick * self._tick_us * _MICROSECOND
+
+    def rebuild(self, held: Iterable[GatedEvent]) -> list[Release]:
+        """Replace the gate's state with stored HELD_ORDERING events.
+
+        Events are held on their predecessors regardless of row order;
+        any whose timeout already passed is released by the next expire().
+
+        Returns:
+            Releases of rows without a predecessor (nothing to wait for)
+        """
+        self._held.clear()
+        self._waiting.clear()
+        self._released.clear()
+        self._wheel = self._new_wheel()
+        releases = []
+        for event in held:
+            predecessor = event.predecessor_ref
+            if predecessor is None:
+                releases.append(Release(event, "IN_ORDER", timedelta(0)))
+            elif event.ref not in self._held:
+                self._hold(event, predecessor)
+        self._armed.set()
+        return releases
+
+    async def run(
+        self,
+        on_release: Callable[[list[Release]], Awaitable[None]],
+        stop: asyncio.Event,
+    ) -> None:
+        """Fire timeouts until stop is set, sleeping until each is due.
+
+        Args:
+            on_release: Called with each non-empty expire() result
+            stop: Set to end the loop
+        """
+        stopping = asyncio.ensure_future(stop.wait())
+        try:
+            while not stop.is_set():
+                releases = self.expire()
+                if releases:
+                    await on_release(releases)
+                wake = self.next_timeout()
+                self._wake_tick = self._wheel.next_due()
+                self._armed.clear()
+                armed = asyncio.ensure_future(self._armed.wait())
+                delay = None if wake is None else (wake - self._clock()).total_seconds()
+                await asyncio.wait(
+                    {stopping, armed},
+                    timeout=max(0.0, delay) if delay is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                armed.cancel()
+        finally:
+            stopping.cancel()
+
+    def _tick_at(self, at: datetime) -> int:
+        return _micros(at) // self._tick_us
+
+    def _new_wheel(self) -> TimerWheel[EventRef]:
+        # One tick behind, so timers already overdue fire on the next expire()
+        return TimerWheel(start=self._tick_at(self._clock()) - 1)
+
+    def _hold(self, event: GatedEvent, predecessor: EventRef) -> None:
+        ref = event.ref
+        self._held[ref] = event
+        self._waiting.setdefault(predecessor, {})[ref] = None
+        deadline_us = _micros(event.received_at + self.timeout)
+        # First tick at or after the deadline: never early
+        tick = -(-deadline_us // self._tick_us)
+        self._wheel.schedule(ref, tick)
+        if self._wake_tick is None or tick < self._wake_tick:
+            # Earlier than run() is sleeping until (events may arrive late)
+            self._wake_tick = tick
+            self._armed.set()
+
+    def _mark_released(self, ref: EventRef) -> None:
+        self._released[ref] = None
+        if len(self._released) > self._remember:
+            self._released.popitem(last=False)
+
+    def _release_dependents(self, root: EventRef, now: datetime, releases: list[Release]) -> None:
+        stack = [root]
+        while stack:
+            waiting = self._waiting.pop(stack.pop(), None)
+            if not waiting:
+                continue
+            for ref in waiting:
+                event = self._held.pop(ref)
+                self._wheel.cancel(ref)
+                releases.append(Release(event, "PREDECESSOR_RELEASED", now - event.received_at))
+                self._mark_released(ref)
+                stack.append(ref)
+
+
+_HELD = """
+    SELECT event_id::text AS event_id, tenant_id, source, source_event_id, event_type,
+           received_at, predecessor_source_event_id
+    FROM event_store
+    WHERE tenant_id = ANY($1::text[]) AND processing_status = 'HELD_ORDERING'
+    ORDER BY received_at
+"""
+
+_SET_STATUS = """
+    UPDATE event_store SET processing_status = $2
+    WHERE event_id = ANY($1::uuid[])
+"""
+
+
+class PostgresOrderingStore:
+    """Persists gate decisions in event_store.processing_status."""
+
+    def __init__(self, pool: "asyncpg.Pool") -> None:
+        """Initialize store.
+
+        Args:
+            pool: asyncpg connection pool
+        """
+        self._pool = pool
+
+    async def load_held(self, tenant_ids: Sequence[str]) -> list[GatedEvent]:
+        """HELD_ORDERING events of the tenants (idx_events_tenant_status), oldest first."""
+        rows = await self._pool.fetch(_HELD, list(tenant_ids))
+        return [
+            GatedEvent(
+                event_id=row["event_id"],
+                tenant_id=row["tenant_id"],
+                source=row["source"],
+                source_event_id=row["source_event_id"],
+                event_type=row["event_type"],
+                received_at=row["received_at"],
+                predecessor_source_event_id=row["predecessor_source_event_id"],
+            )
+            for row in rows
+        ]
+
+    async def set_status(self, event_ids: Sequence[str], status: str) -> None:
+        """Set processing_status of many events with one UPDATE."""
+        if event_ids:
+            await self._pool.execute(_SET_STATUS, list(event_ids), status)
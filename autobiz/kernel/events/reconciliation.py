@@ -0,0 +1,590 @@
+"""ReconciliationDetector: drift detection by hash-range diffing.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+Requirements: P1-R29
+
+The order and payment sync jobs compare local state (state_current)
+against the provider (Shopify, Stripe) and record drift in
+reconciliation_jobs. Comparing every entity on every run costs a full
+listing of the provider per run. Instead, per tenant, the detector keeps
+a BucketHashTree of each side:
+
+1. Pull only what changed since the last run on each side
+   (changed_since() with an updated_since cursor) and update the trees
+2. Diff the trees range by range: only buckets whose sums differ are
+   opened, and only entities in them whose digests differ are candidates
+3. Fetch the candidates from both sides, re-check them, and insert one
+   drift row per entity in one statement
+
+The first run of a tenant pulls everything (cursor None). An entity's
+digest covers a projection of its state (the fields both sides have, in
+the same shape), so projections must map equal business state to equal
+JSON. Drift that is still unchanged is not reported again, and a PENDING
+job suppresses a new row for the same entity.
+"""
+
+import asyncio
+import hashlib
+import json
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Protocol
+
+from autobiz.kernel.events.hash_tree import BucketHashTree
+from autobiz.kernel.idempotency.jcs import canonicalize
+
+if TYPE_CHECKING:
+    import asyncpg
+
+Projection = Callable[[Any], Any]
+
+
+def _identity(state: Any) -> Any:
+    return state
+
+
+def entity_digest(entity_id: str, projected: Any) -> int:
+    """64-bit digest of an entity's id and projected state.
+
+    Raises:
+        CanonicalizationError: If projected is not representable as I-JSON
+    """
+    data = entity_id.encode() + b"\0" + canonicalize(projected)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+@dataclass(frozen=True)
+class SourceRecord:
+    """One entity as returned by a source.
+
+    Attributes:
+        entity_id: Entity identifier (shared by both sides)
+        state: Current state, or None if the entity was deleted
+        updated_at: When the source last changed it, if known
+    """
+
+    entity_id: str
+    state: Any
+    updated_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class ChangePage:
+    """One page of changed entities.
+
+    Attributes:
+        records: Entities changed after the requested cursor
+        cursor: Cursor to continue from (opaque to the caller)
+        has_more: Whether another page is already available
+    """
+
+    records: list[SourceRecord]
+    cursor: str | None
+    has_more: bool
+
+
+class ReconciliationSource(Protocol):
+    """One side of a reconciliation: local state or a provider API."""
+
+    async def changed_since(
+        self, tenant_id: str, entity_type: str, cursor: str | None, limit: int
+    ) -> ChangePage:
+        """Up to limit entities changed after cursor (None: from the start)."""
+        ...
+
+    async def fetch(
+        self, tenant_id: str, entity_type: str, entity_ids: Sequence[str]
+    ) -> dict[str, Any]:
+        """Current states of entity_ids; deleted or unknown ids are left out."""
+        ...
+
+
+class InMemoryReconciliationSource:
+    """In-memory source with a change log, standing in for a provider.
+
+    Each put() or delete() takes the next version number; the cursor is
+    the last version returned. Counts calls like a rate-limited API.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty source."""
+        self._version = 0
+        # (tenant_id, entity_type) -> entity_id -> (version, state or None)
+        self._entities: dict[tuple[str, str], dict[str, tuple[int, Any]]] = {}
+        # (tenant_id, entity_type) -> [(version, entity_id)], ascending
+        self._log: dict[tuple[str, str], list[tuple[int, str]]] = {}
+        self.calls = 0
+        self.records_returned = 0
+
+    def put(self, tenant_id: str, entity_type: str, entity_id: str, state: Any) -> None:
+        """Create or replace an entity."""
+        self._record(tenant_id, entity_type, entity_id, state)
+
+    def delete(self, tenant_id: str, entity_type: str, entity_id: str) -> None:
+        """Delete an entity (returned as a tombstone by changed_since)."""
+        self._record(tenant_id, entity_type, entity_id, None)
+
+    def get(self, tenant_id: str, entity_type: str, entity_id: str) -> Any:
+        """Current state of an entity, or None."""
+        entry = self._entities.get((tenant_id, entity_type), {}).get(entity_id)
+        return entry[1] if entry is not None else None
+
+    async def changed_since(
+        self, tenant_id: str, entity_type: str, cursor: str | None, limit: int
+    ) -> ChangePage:
+        """Latest version of each entity changed after cursor, in version order."""
+        self.calls += 1
+        key = (tenant_id, entity_type)
+        entities = self._entities.get(key, {})
+        log = self._log.get(key, [])
+        after = int(cursor) if cursor is not None else 0
+        records: list[SourceRecord] = []
+        position = bisect_right(log, after, key=lambda entry: entry[0])
+        while position < len(log) and len(records) < limit:
+            version, entity_id = log[position]
+            position += 1
+            latest, state = entities[entity_id]
+            # A superseded entry: the entity comes later, at its latest version
+            if latest == version:
+                records.append(SourceRecord(entity_id, state))
+            after = version
+        self.records_returned += len(records)
+        return ChangePage(records, str(after), position < len(log))
+
+    async def fetch(
+        self, tenant_id: str, entity_type: str, entity_ids: Sequence[str]
+    ) -> dict[str, Any]:
+        """Current states of entity_ids."""
+        self.calls += 1
+        entities = self._entities.get((tenant_id, entity_type), {})
+        states = {}
+        for entity_id in entity_ids:
+            entry = entities.get(entity_id)
+            if entry is not None and entry[1] is not None:
+                states[entity_id] = entry[1]
+        self.records_returned += len(states)
+        return states
+
+    def _record(self, tenant_id: str, entity_type: str, entity_id: str, state: Any) -> None:
+        self._version += 1
+        key = (tenant_id, entity_type)
+        self._entities.setdefault(key, {})[entity_id] = (self._version, state)
+        self._log.setdefault(key, []).append((self._version, entity_id))
+
+
+_STATE_CHANGED = """
+    SELECT entity_id, state, updated_at
+    FROM state_current
+    WHERE tenant_id = $1 AND entity_type = $2 AND (updated_at, entity_id) > ($3, $4)
+    ORDER BY updated_at, entity_id
+    LIMIT $5
+"""
+
+_STATE_FETCH = """
+    SELECT entity_id, state
+    FROM state_current
+    WHERE tenant_id = $1 AND entity_type = $2 AND entity_id = ANY($3::text[])
+"""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class PostgresStateSource:
+    """Local side: state_current, paged by (updated_at, entity_id).
+
+    updated_at comes from the committing process's clock, so a row can
+    commit with an updated_at slightly before one already read. Once a
+    run has caught up, the cursor is rewound by `overlap`; the re-read
+    rows are idempotent tree updates.
+    """
+
+    def __init__(self, pool: "asyncpg.Pool", overlap: timedelta = timedelta(seconds=30)) -> None:
+        """Initialize source.
+
+        Args:
+            pool: asyncpg connection pool
+            overlap: How far a caught-up cursor is rewound
+        """
+        self._pool = pool
+        self._overlap = overlap
+
+    async def changed_since(
+        self, tenant_id: str, entity_type: str, cursor: str | None, limit: int
+    ) -> ChangePage:
+        """Rows after cursor (idx_state_current_updated)."""
+        after_at, after_id = _EPOCH, ""
+        if cursor is not None:
+            at, after_id = cursor.split("|", 1)
+            after_at = datetime.fromisoformat(at)
+        rows = await self._pool.fetch(
+            _STATE_CHANGED, tenant_id, entity_type, after_at, after_id, limit
+        )
+        records = [
+            SourceRecord(row["entity_id"], _json(row["state"]), row["updated_at"]) for row in rows
+        ]
+        if not rows:
+            return ChangePage(records, f"{after_at.isoformat()}|", False)
+        # updated_at is NOT NULL in state_current; read it off the row
+        last_at: datetime = rows[-1]["updated_at"]
+        if len(records) == limit:
+            return ChangePage(records, f"{last_at.isoformat()}|{rows[-1]['entity_id']}", True)
+        after_at = max(after_at, last_at - self._overlap)
+        return ChangePage(records, f"{after_at.isoformat()}|", False)
+
+    async def fetch(
+        self, tenant_id: str, entity_type: str, entity_ids: Sequence[str]
+    ) -> dict[str, Any]:
+        """Current states of entity_ids (primary key)."""
+        rows = await self._pool.fetch(_STATE_FETCH, tenant_id, entity_type, list(entity_ids))
+        return {row["entity_id"]: _json(row["state"]) for row in rows}
+
+
+def _json(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+class DriftKind(str, Enum):
+    """How the two sides disagree about an entity."""
+
+    MISSING_LOCAL = "MISSING_LOCAL"
+    MISSING_REMOTE = "MISSING_REMOTE"
+    MISMATCH = "MISMATCH"
+
+
+@dataclass(frozen=True)
+class Drift:
+    """One entity that differs between local and remote.
+
+    Attributes:
+        tenant_id: Tenant identifier
+        job_type: Reconciliation job type (e.g. ORDER_SYNC)
+        entity_type: Entity type
+        entity_id: Entity identifier
+        kind: How the sides disagree
+        description: Human-readable summary (differing fields)
+        local_state: Local state, or None if missing locally
+        remote_state: Remote state, or None if missing remotely
+        detected_at: When the drift was confirmed
+    """
+
+    tenant_id: str
+    job_type: str
+    entity_type: str
+    entity_id: str
+    kind: DriftKind
+    description: str
+    local_state: Any
+    remote_state: Any
+    detected_at: datetime
+
+
+class DriftStore(Protocol):
+    """Sink for detected drift (reconciliation_jobs)."""
+
+    async def insert_many(self, drifts: Sequence[Drift]) -> int:
+        """Insert drift rows, skipping entities with a PENDING job; returns rows inserted."""
+        ...
+
+
+class InMemoryDriftStore:
+    """In-memory drift store for tests."""
+
+    def __init__(self) -> None:
+        """Initialize empty store."""
+        self.jobs: list[Drift] = []
+        self._pending: set[tuple[str, str, str, str]] = set()
+
+    async def insert_many(self, drifts: Sequence[Drift]) -> int:
+        """Append drifts that have no PENDING job."""
+        inserted = 0
+        for drift in drifts:
+            key = (drift.tenant_id, drift.job_type, drift.entity_type, drift.entity_id)
+            if key in self._pending:
+                continue
+            self._pending.add(key)
+            self.jobs.append(drift)
+            inserted += 1
+        return inserted
+
+    def resolve(self, tenant_id: str, job_type: str, entity_type: str, entity_id: str) -> None:
+        """Mark an entity's PENDING job resolved."""
+        self._pending.discard((tenant_id, job_type, entity_type, entity_id))
+
+
+_INSERT_DRIFT = """
+    INSERT INTO reconciliation_jobs
+        (tenant_id, job_type, entity_type, entity_id, detected_at,
+         drift_description, local_state, remote_state)
+    SELECT d.tenant_id, d.job_type, d.entity_type, d.entity_id, d.detected_at,
+           d.description, d.local_state::jsonb, d.remote_state::jsonb
+    FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::timestamptz[],
+                $6::text[], $7::text[], $8::text[])
+        AS d(tenant_id, job_type, entity_type, entity_id, detected_at,
+             description, local_state, remote_state)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM reconciliation_jobs j
+        WHERE j.tenant_id = d.tenant_id
+          AND j.entity_type = d.entity_type
+          AND j.entity_id = d.entity_id
+          AND j.job_type = d.job_type
+          AND j.status = 'PENDING'
+    )
+"""
+
+
+class PostgresDriftStore:
+    """Writes drift to reconciliation_jobs, one statement per batch."""
+
+    def __init__(self, pool: "asyncpg.Pool") -> None:
+        """Initialize store.
+
+        Args:
+            pool: asyncpg connection pool
+        """
+        self._pool = pool
+
+    async def insert_many(self, drifts: Sequence[Drift]) -> int:
+        """Insert drifts with one INSERT ... SELECT FROM unnest (idx_reconciliation_pending)."""
+        if not drifts:
+            return 0
+        status = await self._pool.execute(
+            _INSERT_DRIFT,
+            [d.tenant_id for d in drifts],
+            [d.job_type for d in drifts],
+            [d.entity_type for d in drifts],
+            [d.entity_id for d in drifts],
+            [d.detected_at for d in drifts],
+            [d.description for d in drifts],
+            [_dump(d.local_state) for d in drifts],
+            [_dump(d.remote_state) for d in drifts],
+        )
+        # "INSERT 0 <rows>"
+        return int(status.split()[-1])
+
+
+def _dump(state: Any) -> str | None:
+    return json.dumps(state) if state is not None else None
+
+
+@dataclass
+class SyncStats:
+    """Work done by one sync of one tenant.
+
+    Attributes:
+        local_calls: Calls to the local source
+        remote_calls: Calls to the remote source
+        local_changes: Changed records pulled from the local source
+        remote_changes: Changed records pulled from the remote source
+        node_comparisons: Tree node sums compared
+        entity_comparisons: Entity digests compared in differing buckets
+        buckets_differing: Buckets whose sums differ
+        candidates: Differing entities not already reported unchanged
+        drift_found: Candidates confirmed after fetching both sides
+        drift_inserted: Drift rows inserted (no PENDING job yet)
+    """
+
+    local_calls: int = 0
+    remote_calls: int = 0
+    local_changes: int = 0
+    remote_changes: int = 0
+    node_comparisons: int = 0
+    entity_comparisons: int = 0
+    buckets_differing: int = 0
+    candidates: int = 0
+    drift_found: int = 0
+    drift_inserted: int = 0
+
+
+@dataclass
+class _TenantState:
+    local: BucketHashTree
+    remote: BucketHashTree
+    local_cursor: str | None = None
+    remote_cursor: str | None = None
+    # entity_id -> (local digest, remote digest) when last reported
+    reported: dict[str, tuple[int | None, int | None]] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ReconciliationDetector:
+    """Finds drift between a local and a remote source, one tenant at a time.
+
+    Trees and cursors live in memory, per tenant: a new process starts
+    each tenant with a full pull of both sides.
+    """
+
+    def __init__(
+        self,
+        job_type: str,
+        entity_type: str,
+        local: ReconciliationSource,
+        remote: ReconciliationSource,
+        drift_store: DriftStore,
+        project_local: Projection = _identity,
+        project_remote: Projection = _identity,
+        buckets: int = 4096,
+        fanout: int = 16,
+        page_size: int = 100,
+        fetch_batch: int = 100,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        """Initialize detector.
+
+        Args:
+            job_type: reconciliation_jobs.job_type of drift rows (e.g. ORDER_SYNC)
+            entity_type: Entity type reconciled
+            local: Local source (e.g. PostgresStateSource)
+            remote: Provider source
+            drift_store: Where drift rows go
+            project_local: Local state to the compared fields
+            project_remote: Remote state to the compared fields
+            buckets: Buckets per tree (a power of fanout)
+            fanout: Children per tree node
+            page_size: Records per changed_since() call
+            fetch_batch: Ids per fetch() call
+            clock: Aware-UTC clock for detected_at
+        """
+        self.job_type = job_type
+        self.entity_type = entity_type
+        self._local = local
+        self._remote = remote
+        self._drift_store = drift_store
+        self._project_local = project_local
+        self._project_remote = project_remote
+        self._buckets = buckets
+        self._fanout = fanout
+        self._page_size = page_size
+        self._fetch_batch = fetch_batch
+        self._clock = clock if clock is not None else (lambda: datetime.now(timezone.utc))
+        self._tenants: dict[str, _TenantState] = {}
+        BucketHashTree(buckets, fanout)  # validate the shape up front
+
+    async def sync(self, tenant_id: str) -> SyncStats:
+        """Pull changes, diff, and record drift for one tenant.
+
+        Raises:
+            CanonicalizationError: If a projected state is not I-JSON
+        """
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            tenant = self._tenants[tenant_id] = _TenantState(
+                BucketHashTree(self._buckets, self._fanout),
+                BucketHashTree(self._buckets, self._fanout),
+            )
+        async with tenant.lock:
+            return await self._sync(tenant_id, tenant)
+
+    async def _sync(self, tenant_id: str, tenant: _TenantState) -> SyncStats:
+        stats = SyncStats()
+        tenant.local_cursor, stats.local_calls, stats.local_changes = await self._pull(
+            self._local, tenant.local, self._project_local, tenant_id, tenant.local_cursor
+        )
+        tenant.remote_cursor, stats.remote_calls, stats.remote_changes = await self._pull(
+            self._remote, tenant.remote, self._project_remote, tenant_id, tenant.remote_cursor
+        )
+
+        diff = tenant.local.diff(tenant.remote)
+        stats.node_comparisons = diff.node_comparisons
+        stats.entity_comparisons = diff.entity_comparisons
+        stats.buckets_differing = len(diff.buckets)
+        differing = set(diff.entity_ids)
+        for entity_id in [e for e in tenant.reported if e not in differing]:
+            del tenant.reported[entity_id]
+        candidates = [
+            entity_id
+            for entity_id in diff.entity_ids
+            if tenant.reported.get(entity_id)
+            != (tenant.local.get(entity_id), tenant.remote.get(entity_id))
+        ]
+        stats.candidates = len(candidates)
+
+        drifts: list[Drift] = []
+        for offset in range(0, len(candidates), self._fetch_batch):
+            batch = candidates[offset : offset + self._fetch_batch]
+            local_states = await self._local.fetch(tenant_id, self.entity_type, batch)
+            remote_states = await self._remote.fetch(tenant_id, self.entity_type, batch)
+            stats.local_calls += 1
+            stats.remote_calls += 1
+            drifts.extend(self._confirm(tenant_id, tenant, batch, local_states, remote_states))
+        stats.drift_found = len(drifts)
+        if drifts:
+            stats.drift_inserted = await self._drift_store.insert_many(drifts)
+        return stats
+
+    async def _pull(
+        self,
+        source: ReconciliationSource,
+        tree: BucketHashTree,
+        project: Projection,
+        tenant_id: str,
+        cursor: str | None,
+    ) -> tuple[str | None, int, int]:
+        calls = 0
+        changes = 0
+        while True:
+            page = await source.changed_since(tenant_id, self.entity_type, cursor, self._page_size)
+            calls += 1
+            changes += len(page.records)
+            for record in page.records:
+                _apply(tree, project, record.entity_id, record.state)
+            cursor = page.cursor
+            if not page.has_more:
+                return cursor, calls, changes
+
+    def _confirm(
+        self,
+        tenant_id: str,
+        tenant: _TenantState,
+        entity_ids: Iterable[str],
+        local_states: dict[str, Any],
+        remote_states: dict[str, Any],
+    ) -> Iterable[Drift]:
+        # The fetched states are newer than the trees: refresh, then re-check
+        detected_at = self._clock()
+        for entity_id in entity_ids:
+            local_state = local_states.get(entity_id)
+            remote_state = remote_states.get(entity_id)
+            _apply(tenant.local, self._project_local, entity_id, local_state)
+            _apply(tenant.remote, self._project_remote, entity_id, remote_state)
+            digests = (tenant.local.get(entity_id), tenant.remote.get(entity_id))
+            if digests[0] == digests[1]:
+                tenant.reported.pop(entity_id, None)
+                continue
+            tenant.reported[entity_id] = digests
+            if local_state is None:
+                kind, description = DriftKind.MISSING_LOCAL, "missing locally"
+            elif remote_state is None:
+                kind, description = DriftKind.MISSING_REMOTE, "missing remotely"
+            else:
+                kind = DriftKind.MISMATCH
+                description = _describe(
+                    self._project_local(local_state), self._project_remote(remote_state)
+                )
+            yield Drift(
+                tenant_id=tenant_id,
+                job_type=self.job_type,
+                entity_type=self.entity_type,
+                entity_id=entity_id,
+                kind=kind,
+                description=f"{kind.value}: {description}",
+                local_state=local_state,
+                remote_state=remote_state,
+                detected_at=detected_at,
+            )
+
+
+def _apply(tree: BucketHashTree, project: Projection, entity_id: str, state: Any) -> None:
+    if state is None:
+        tree.discard(entity_id)
+    else:
+        tree.set(entity_id, entity_digest(entity_id, project(state)))
+
+
+def _describe(local: Any, remote: Any) -> str:
+    if isinstance(local, dict) and isinstance(remote, dict):
+        fields = sorted(k for k in local.keys() | remote.keys() if local.get(k) != remote.get(k))
+        return "fields " + ", ".join(fields)
+    return "states differ"
@@ -0,0 +1,81 @@
+"""Event payload retention: compact expired event_store partitions.
+
+Part of P1-TASK-24: Webhook Ingress + Signature Verification
+Requirements: P1-R26
+
+event_store is partitioned by day on received_at (migration 006) and
+payload_json is kept for PAYLOAD_RETENTION. After that only the
+event_ledger row is left: key, payload_sha256 and metadata, which still
+backs dedup of redeliveries and provenance lookups.
+
+EventStoreCompactor is a PartitionMaintainer for event_store. For each
+expired partition, in one transaction, it detaches the partition, copies
+the final processing outcome from it onto the ledger rows, then drops it.
+Detaching first waits out in-flight status updates and blocks new ones,
+so the copy sees the final values. The copy reads one partition
+sequentially; the drop is catalog-only, so no row deletes, vacuum work or
+index bloat are left behind.
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from autobiz.kernel.db.partitions import PartitionMaintainer, PartitionSpec, detach_partition_sql
+
+if TYPE_CHECKING:
+    import asyncpg
+
+PAYLOAD_RETENTION = timedelta(days=90)
+
+EVENT_STORE_PARTITIONS = PartitionSpec(
+    table="event_store",
+    column="received_at",
+    archive_schema=None,
+    premake_days=7,
+    retention=PAYLOAD_RETENTION,
+)
+
+
+def compact_partition_sql(name: str) -> str:
+    """UPDATE copying a partition's processing outcome onto its ledger rows.
+
+    Args:
+        name: Partition name, as listed by the maintainer (a plain identifier);
+            detached already, so no status update can still change it
+    """
+    return (
+        "UPDATE event_ledger l SET "
+        "processing_status = e.processing_status, run_id = e.run_id, "
+        "correlation_id = e.correlation_id, applied_at = e.applied_at, "
+        f"compacted_at = NOW() FROM {name} e WHERE l.event_id = e.event_id"
+    )
+
+
+class EventStoreCompactor(PartitionMaintainer):
+    """Creates event_store partitions ahead and compacts expired ones.
+
+    Run run_once() from the same periodic job as receipt maintenance.
+    """
+
+    def __init__(
+        self,
+        pool: "asyncpg.Pool",
+        spec: PartitionSpec = EVENT_STORE_PARTITIONS,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        """Initialize compactor.
+
+        Args:
+            pool: asyncpg connection pool
+            spec: event_store layout and payload retention
+            clock: Aware-UTC clock
+        """
+        if spec.archive_schema is not None:
+            raise ValueError("event_store partitions are compacted, not archived")
+        super().__init__(pool, spec, clock)
+
+    def detach_statements(self, name: str) -> list[str]:
+        """Detach the partition, copy its outcome to the ledger, then drop it."""
+        lock_timeout, detach, drop = detach_partition_sql(self.spec, name)
+        return [lock_timeout, detach, compact_partition_sql(name), drop]
@@ -0,0 +1,231 @@
+"""Webhook sources: signature schemes and event identity per provider.
+
+Part of P1-TASK-24: Webhook Ingress + Signature Verification
+Requirements: P1-RH05, P1-R26
+
+Each provider signs the raw request body with HMAC-SHA256 under a shared
+secret, with its own header format:
+- STRIPE: Stripe-Signature "t=<unix>,v1=<hex>[,v1=...]" over "<t>." + body,
+  timestamp within a tolerance (replay protection)
+- SHOPIFY: X-Shopify-Hmac-Sha256, base64 of the HMAC over the body
+- INTERNAL: X-Autobiz-Signature "sha256=<hex>" over the body
+
+A source only prepares the MACs (begin()) and checks the digests
+(verify()); the ingestor feeds the body to them chunk by chunk, in the
+same pass that computes payload_sha256, so the body is read once.
+Several secrets may be valid at once (rotation); a body is accepted if
+any of them matches. Headers are looked up by lower-case name.
+"""
+
+import base64
+import hashlib
+import hmac
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, ClassVar
+
+
+class WebhookRejectedError(ValueError):
+    """Raised when a webhook is refused before it reaches event_store.
+
+    Attributes:
+        source: Webhook source
+        reason: Why it was refused
+    """
+
+    def __init__(self, source: str, reason: str) -> None:
+        """Initialize error.
+
+        Args:
+            source: Webhook source
+            reason: Why it was refused
+        """
+        self.source = source
+        self.reason = reason
+        super().__init__(f"{source} webhook rejected: {reason}")
+
+
+class WebhookSignatureError(WebhookRejectedError):
+    """Raised when a webhook signature is missing, malformed or wrong (P1-H10)."""
+
+
+@dataclass(frozen=True)
+class EventIdentity:
+    """Where an event sits in its provider's stream.
+
+    Attributes:
+        source_event_id: Provider event id (unique per tenant and source)
+        event_type: Provider event type
+        seq: Ordering key, if the provider gives one
+        predecessor_source_event_id: Causal predecessor, if known
+    """
+
+    source_event_id: str
+    event_type: str
+    seq: str | None = None
+    predecessor_source_event_id: str | None = None
+
+
+class WebhookSource(ABC):
+    """Signature scheme and event identity of one provider."""
+
+    name: ClassVar[str]
+
+    def begin(
+        self, headers: Mapping[str, str], secrets: Sequence[bytes], now: datetime
+    ) -> list["hmac.HMAC"]:
+        """One MAC per secret, already fed with any signed prefix.
+
+        Raises:
+            WebhookSignatureError: If the signature header is missing,
+                malformed or (for timestamped schemes) stale
+        """
+        self._signatures(headers, now)
+        return [hmac.new(secret, digestmod=hashlib.sha256) for secret in secrets]
+
+    def verify(self, headers: Mapping[str, str], digests: Sequence[bytes]) -> bool:
+        """True if any MAC digest matches a signature in headers."""
+        signatures = self._signatures(headers, None)
+        return any(
+            hmac.compare_digest(digest, signature) for digest in digests for signature in signatures
+        )
+
+    @abstractmethod
+    def identify(self, headers: Mapping[str, str], payload: Any) -> EventIdentity:
+        """Event id, type and ordering keys of a verified webhook.
+
+        Raises:
+            WebhookRejectedError: If they are missing
+        """
+
+    @abstractmethod
+    def _signatures(self, headers: Mapping[str, str], now: datetime | None) -> list[bytes]:
+        """Signatures in headers; with now, also check any signed timestamp."""
+
+    def _header(self, headers: Mapping[str, str], name: str) -> str:
+        value = headers.get(name)
+        if not value:
+            raise WebhookSignatureError(self.name, f"missing {name} header")
+        return value
+
+    def _field(self, payload: Any, name: str) -> str:
+        value = payload.get(name) if isinstance(payload, dict) else None
+        if not isinstance(value, str) or not value:
+            raise WebhookRejectedError(self.name, f"payload has no {name!r}")
+        return value
+
+
+class StripeSource(WebhookSource):
+    """Stripe: timestamped signature; id, type and created from the event body."""
+
+    name = "STRIPE"
+    HEADER = "stripe-signature"
+
+    def __init__(self, tolerance: timedelta = timedelta(minutes=5)) -> None:
+        """Initialize source.
+
+        Args:
+            tolerance: Largest accepted distance between the signed
+                timestamp and now
+        """
+        self.tolerance = tolerance
+
+    def begin(
+        self, headers: Mapping[str, str], secrets: Sequence[bytes], now: datetime
+    ) -> list["hmac.HMAC"]:
+        """MACs over "<t>." followed by the body."""
+        self._signatures(headers, now)
+        prefix = self._parse(headers)[0].encode() + b"."
+        return [hmac.new(secret, prefix, hashlib.sha256) for secret in secrets]
+
+    def identify(self, headers: Mapping[str, str], payload: Any) -> EventIdentity:
+        """Event id and type from the body; created orders events."""
+        created = payload.get("created") if isinstance(payload, dict) else None
+        return EventIdentity(
+            self._field(payload, "id"),
+            self._field(payload, "type"),
+            seq=str(created) if isinstance(created, int) else None,
+        )
+
+    def _parse(self, headers: Mapping[str, str]) -> tuple[str, list[str]]:
+        timestamp = ""
+        signatures = []
+        for item in self._header(headers, self.HEADER).split(","):
+            key, _, value = item.strip().partition("=")
+            if key == "t":
+                timestamp = value
+            elif key == "v1":
+                signatures.append(value)
+        if not timestamp.isdigit() or not signatures:
+            raise WebhookSignatureError(self.name, "malformed signature header")
+        return timestamp, signatures
+
+    def _signatures(self, headers: Mapping[str, str], now: datetime | None) -> list[bytes]:
+        timestamp, signatures = self._parse(headers)
+        if (
+            now is not None
+            and abs(now.timestamp() - int(timestamp)) > self.tolerance.total_seconds()
+        ):
+            raise WebhookSignatureError(self.name, "timestamp outside tolerance")
+        try:
+            return [bytes.fromhex(signature) for signature in signatures]
+        except ValueError:
+            raise WebhookSignatureError(self.name, "malformed signature header") from None
+
+
+class ShopifySource(WebhookSource):
+    """Shopify: base64 body signature; id and topic from headers."""
+
+    name = "SHOPIFY"
+    HEADER = "x-shopify-hmac-sha256"
+
+    def identify(self, headers: Mapping[str, str], payload: Any) -> EventIdentity:
+        """Webhook id and topic headers (the body is the bare resource)."""
+        event_id = headers.get("x-shopify-event-id") or headers.get("x-shopify-webhook-id")
+        topic = headers.get("x-shopify-topic")
+        if not event_id or not topic:
+            raise WebhookRejectedError(self.name, "missing webhook id or topic header")
+        return EventIdentity(event_id, topic, seq=headers.get("x-shopify-triggered-at"))
+
+    def _signatures(self, headers: Mapping[str, str], now: datetime | None) -> list[bytes]:
+        try:
+            return [base64.b64decode(self._header(headers, self.HEADER), validate=True)]
+        except ValueError:
+            raise WebhookSignatureError(self.name, "malformed signature header") from None
+
+
+class InternalSource(WebhookSource):
+    """Kernel-internal events: hex body signature; identity from the body."""
+
+    name = "INTERNAL"
+    HEADER = "x-autobiz-signature"
+
+    def identify(self, headers: Mapping[str, str], payload: Any) -> EventIdentity:
+        """id and type, plus optional seq and predecessor_id, from the body."""
+        # _field rejects non-object bodies before .get() is reached
+        event_id = self._field(payload, "id")
+        event_type = self._field(payload, "type")
+        seq = payload.get("seq")
+        predecessor = payload.get("predecessor_id")
+        return EventIdentity(
+            event_id,
+            event_type,
+            seq=str(seq) if seq is not None else None,
+            predecessor_source_event_id=predecessor if isinstance(predecessor, str) else None,
+        )
+
+    def _signatures(self, headers: Mapping[str, str], now: datetime | None) -> list[bytes]:
+        scheme, _, value = self._header(headers, self.HEADER).partition("=")
+        try:
+            if scheme != "sha256":
+                raise ValueError(scheme)
+            return [bytes.fromhex(value)]
+        except ValueError:
+            raise WebhookSignatureError(self.name, "malformed signature header") from None
+
+
+DEFAULT_SOURCES: dict[str, WebhookSource] = {
+    source.name: source for source in (StripeSource(), ShopifySource(), InternalSource())
+}
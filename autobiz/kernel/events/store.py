@@ -0,0 +1,326 @@
+"""Event store: bulk insert with deduplication on the provider event id.
+
+Part of P1-TASK-24: Webhook Ingress + Signature Verification
+Requirements: P1-RH05, P1-R26
+
+Events live in two tiers (migration 006):
+- event_ledger: key, payload_sha256 and metadata of every event, kept
+  for good; its primary key (tenant_id, source, source_event_id) is the
+  dedup authority
+- event_store: full rows with payload_json, partitioned by day, dropped
+  after PAYLOAD_RETENTION (autobiz.kernel.events.retention)
+
+insert_many() writes a batch of verified events with a single statement
+instead of a dedup SELECT plus an INSERT per event: an INSERT into
+event_ledger ... ON CONFLICT DO NOTHING RETURNING, then the event_store
+rows for the keys that came back. A redelivered event is skipped by the
+ledger key, in whichever tier its first delivery now is, and reported as
+a duplicate of that event.
+"""
+
+import asyncio
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Protocol
+from uuid import uuid4
+
+if TYPE_CHECKING:
+    import asyncpg
+
+
+@dataclass(frozen=True)
+class InboundEvent:
+    """A verified webhook, ready for event_store.
+
+    Attributes:
+        tenant_id: Owning tenant
+        source: STRIPE, SHOPIFY, PRINTFUL or INTERNAL
+        source_event_id: Provider event id
+        event_type: Provider event type
+        received_at: Ingest time
+        body: Raw payload bytes (stored as payload_json)
+        payload: Parsed body
+        payload_sha256: Hex SHA-256 of body
+        seq: Ordering key, if known
+        predecessor_source_event_id: Causal predecessor, if known
+        signature_valid: Signature checked (always True from the ingestor)
+    """
+
+    tenant_id: str
+    source: str
+    source_event_id: str
+    event_type: str
+    received_at: datetime
+    body: bytes
+    payload: Any
+    payload_sha256: str
+    seq: str | None = None
+    predecessor_source_event_id: str | None = None
+    signature_valid: bool = True
+
+    @property
+    def dedup_key(self) -> tuple[str, str, str]:
+        """(tenant_id, source, source_event_id): the event_store unique key."""
+        return (self.tenant_id, self.source, self.source_event_id)
+
+
+@dataclass(frozen=True)
+class StoredEvent:
+    """Outcome of storing one event.
+
+    Attributes:
+        event_id: event_store row id (None if a duplicate's row is not
+            visible yet: it was committed concurrently)
+        duplicate: The event was already stored; nothing was written
+    """
+
+    event_id: str | None
+    duplicate: bool
+
+
+@dataclass(frozen=True)
+class EventRecord:
+    """Provenance of a stored event, from either tier.
+
+    Attributes:
+        event_id: event_store row id
+        tenant_id: Owning tenant
+        source: Provider
+        source_event_id: Provider event id
+        event_type: Provider event type
+        received_at: Ingest time
+        payload_sha256: Hex SHA-256 of the payload
+        signature_valid: Signature checked at ingest
+        seq: Ordering key, if known
+        predecessor_source_event_id: Causal predecessor, if known
+        payload: Parsed payload; None once compacted
+        compacted_at: When the payload was dropped (None while it is kept)
+    """
+
+    event_id: str
+    tenant_id: str
+    source: str
+    source_event_id: str
+    event_type: str
+    received_at: datetime
+    payload_sha256: str
+    signature_valid: bool
+    seq: str | None = None
+    predecessor_source_event_id: str | None = None
+    payload: Any = None
+    compacted_at: datetime | None = None
+
+    @property
+    def compacted(self) -> bool:
+        """True if only the hash and metadata are left."""
+        return self.compacted_at is not None
+
+
+def _record(event_id: str, event: InboundEvent) -> EventRecord:
+    return EventRecord(
+        event_id=event_id,
+        tenant_id=event.tenant_id,
+        source=event.source,
+        source_event_id=event.source_event_id,
+        event_type=event.event_type,
+        received_at=event.received_at,
+        payload_sha256=event.payload_sha256,
+        signature_valid=event.signature_valid,
+        seq=event.seq,
+        predecessor_source_event_id=event.predecessor_source_event_id,
+        payload=event.payload,
+    )
+
+
+class EventStore(Protocol):
+    """Durable inbound event ledger."""
+
+    async def insert_many(self, events: Sequence[InboundEvent]) -> list[StoredEvent]:
+        """Insert events whose dedup_key is new; one result per event, in order.
+
+        dedup_keys must be distinct within a call.
+        """
+        ...
+
+    async def get(self, tenant_id: str, source: str, source_event_id: str) -> EventRecord | None:
+        """Provenance of an event by its provider id, from either tier."""
+        ...
+
+
+class InMemoryEventStore:
+    """Dict-backed EventStore for tests and benchmarks.
+
+    Attributes:
+        events: Hot-tier events (payload kept) by event_id, in insertion order
+        compacted: Compacted events (hash and metadata only) by event_id
+        statements: insert_many() calls made
+        latency: Simulated seconds per call
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initialize an empty store.
+
+        Args:
+            latency: Simulated seconds per call (0: calls never yield)
+        """
+        self.events: dict[str, InboundEvent] = {}
+        self.compacted: dict[str, EventRecord] = {}
+        self._ids: dict[tuple[str, str, str], str] = {}
+        self.statements = 0
+        self.latency = latency
+
+    async def insert_many(self, events: Sequence[InboundEvent]) -> list[StoredEvent]:
+        """Insert new events; report the others as duplicates."""
+        self.statements += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        results = []
+        for event in events:
+            existing = self._ids.get(event.dedup_key)
+            if existing is not None:
+                results.append(StoredEvent(existing, duplicate=True))
+                continue
+            event_id = str(uuid4())
+            self._ids[event.dedup_key] = event_id
+            self.events[event_id] = event
+            results.append(StoredEvent(event_id, duplicate=False))
+        return results
+
+    async def get(self, tenant_id: str, source: str, source_event_id: str) -> EventRecord | None:
+        """Provenance of an event, with its payload while it is kept."""
+        event_id = self._ids.get((tenant_id, source, source_event_id))
+        if event_id is None:
+            return None
+        event = self.events.get(event_id)
+        return _record(event_id, event) if event is not None else self.compacted[event_id]
+
+    def compact(self, received_before: datetime, now: datetime) -> int:
+        """Drop the payloads of events received before a cutoff.
+
+        Args:
+            received_before: Events received earlier are compacted
+            now: Recorded as compacted_at
+
+        Returns:
+            Events compacted
+        """
+        expired = [
+            event_id
+            for event_id, event in self.events.items()
+            if event.received_at < received_before
+        ]
+        for event_id in expired:
+            record = _record(event_id, self.events.pop(event_id))
+            self.compacted[event_id] = replace(record, payload=None, compacted_at=now)
+        return len(expired)
+
+
+# Keys new to the ledger come back from `keyed` and get their event_store
+# row; for the rest the ledger row already stored is looked up in the same
+# statement (the insert is not visible to it, so only rows stored before
+# this batch match). `inserted` runs although nothing reads it.
+_INSERT_MANY = """
+    WITH batch AS (
+        SELECT * FROM unnest(
+            $1::text[], $2::text[], $3::text[], $4::text[], $5::timestamptz[],
+            $6::text[], $7::text[], $8::text[], $9::text[], $10::bool[]
+        ) WITH ORDINALITY AS b(tenant_id, source, source_event_id, event_type, received_at,
+                               seq, predecessor_source_event_id, payload_json,
+                               payload_sha256, signature_valid, ord)
+    ),
+    keyed AS (
+        INSERT INTO event_ledger
+            (tenant_id, source, source_event_id, event_id, event_type, received_at, seq,
+             predecessor_source_event_id, payload_sha256, signature_valid)
+        SELECT tenant_id, source, source_event_id, gen_random_uuid(), event_type,
+               received_at, seq, predecessor_source_event_id, payload_sha256,
+               signature_valid
+        FROM batch ORDER BY ord
+        ON CONFLICT (tenant_id, source, source_event_id) DO NOTHING
+        RETURNING event_id, tenant_id, source, source_event_id
+    ),
+    inserted AS (
+        INSERT INTO event_store
+            (event_id, tenant_id, source, source_event_id, event_type, received_at, seq,
+             predecessor_source_event_id, payload_json, payload_sha256, signature_valid)
+        SELECT k.event_id, b.tenant_id, b.source, b.source_event_id, b.event_type,
+               b.received_at, b.seq, b.predecessor_source_event_id, b.payload_json::jsonb,
+               b.payload_sha256, b.signature_valid
+        FROM batch b JOIN keyed k USING (tenant_id, source, source_event_id)
+        RETURNING event_id
+    )
+    SELECT b.ord, COALESCE(k.event_id, l.event_id)::text AS event_id,
+           k.event_id IS NULL AS duplicate
+    FROM batch b
+    LEFT JOIN keyed k USING (tenant_id, source, source_event_id)
+    LEFT JOIN event_ledger l
+        ON k.event_id IS NULL
+        AND l.tenant_id = b.tenant_id
+        AND l.source = b.source
+        AND l.source_event_id = b.source_event_id
+    ORDER BY b.ord
+"""
+
+# received_at in the join lets the executor prune to one partition
+_GET = """
+    SELECT l.event_id::text AS event_id, l.tenant_id, l.source, l.source_event_id,
+           l.event_type, l.received_at, l.payload_sha256, l.signature_valid, l.seq,
+           l.predecessor_source_event_id, l.compacted_at, e.payload_json::text AS payload_json
+    FROM event_ledger l
+    LEFT JOIN event_store e ON e.event_id = l.event_id AND e.received_at = l.received_at
+    WHERE l.tenant_id = $1 AND l.source = $2 AND l.source_event_id = $3
+"""
+
+
+class PostgresEventStore:
+    """EventStore over the event_store table."""
+
+    def __init__(self, pool: "asyncpg.Pool") -> None:
+        """Initialize store.
+
+        Args:
+            pool: asyncpg connection pool
+        """
+        self._pool = pool
+
+    async def insert_many(self, events: Sequence[InboundEvent]) -> list[StoredEvent]:
+        """One statement for the batch: ledger INSERT ... ON CONFLICT, then new rows."""
+        if not events:
+            return []
+        rows = await self._pool.fetch(
+            _INSERT_MANY,
+            [e.tenant_id for e in events],
+            [e.source for e in events],
+            [e.source_event_id for e in events],
+            [e.event_type for e in events],
+            [e.received_at for e in events],
+            [e.seq for e in events],
+            [e.predecessor_source_event_id for e in events],
+            [e.body.decode() for e in events],
+            [e.payload_sha256 for e in events],
+            [e.signature_valid for e in events],
+        )
+        return [StoredEvent(row["event_id"], row["duplicate"]) for row in rows]
+
+    async def get(self, tenant_id: str, source: str, source_event_id: str) -> EventRecord | None:
+        """One ledger primary-key probe, plus the payload while its partition is kept."""
+        row = await self._pool.fetchrow(_GET, tenant_id, source, source_event_id)
+        if row is None:
+            return None
+        payload_json = row["payload_json"]
+        return EventRecord(
+            event_id=row["event_id"],
+            tenant_id=row["tenant_id"],
+            source=row["source"],
+            source_event_id=row["source_event_id"],
+            event_type=row["event_type"],
+            received_at=row["received_at"],
+            payload_sha256=row["payload_sha256"],
+            signature_valid=row["signature_valid"],
+            seq=row["seq"],
+            predecessor_source_event_id=row["predecessor_source_event_id"],
+            payload=json.loads(payload_json) if payload_json is not None else None,
+            compacted_at=row["compacted_at"],
+        )
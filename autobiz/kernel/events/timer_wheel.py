@@ -0,0 +1,152 @@
+"""TimerWheel: hierarchical timing wheel for many same-length timeouts.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+Requirements: P1-R28
+
+Time is counted in integer ticks. Level 0 has one slot per tick for the
+next `slots` ticks; level 1 one slot per `slots` ticks for the next
+`slots**2`; and so on. A timer goes in the lowest level whose span covers
+its distance from now. Each time a level-0 revolution completes, the
+next level-1 slot is cascaded (re-placed into level 0), and likewise up
+the hierarchy. So:
+- schedule() and cancel() are O(1)
+- advance() costs O(ticks passed + timers fired or cascaded), whatever
+  the number of timers waiting
+- a timer fires at the first tick >= its deadline: never early, and late
+  only by however long advance() was not called
+
+Timers further out than the top level covers are parked in its last slot
+and re-placed on each cascade until they are in range.
+"""
+
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    """Timers keyed by K, each firing once at an integer tick."""
+
+    def __init__(self, start: int = 0, slots: int = 64, levels: int = 4) -> None:
+        """Initialize an empty wheel.
+
+        Args:
+            start: Current tick
+            slots: Slots per level (span of level n: slots ** (n + 1) ticks)
+            levels: Number of levels
+        """
+        if slots < 2 or levels < 1:
+            raise ValueError("slots must be at least 2 and levels at least 1")
+        self._slots = slots
+        self._levels = levels
+        self._now = start
+        self._wheels: list[list[dict[K, int]]] = [[{} for _ in range(slots)] for _ in range(levels)]
+        self._where: dict[K, tuple[int, int]] = {}
+
+    @property
+    def now(self) -> int:
+        """Current tick."""
+        return self._now
+
+    def __len__(self) -> int:
+        """Timers scheduled."""
+        return len(self._where)
+
+    def __contains__(self, key: object) -> bool:
+        """True if key has a pending timer."""
+        return key in self._where
+
+    def schedule(self, key: K, deadline: int) -> None:
+        """Fire key at tick deadline (replacing any timer it already has)."""
+        self.cancel(key)
+        self._place(key, deadline)
+
+    def cancel(self, key: K) -> bool:
+        """Drop key's timer; False if it had none."""
+        where = self._where.pop(key, None)
+        if where is None:
+            return False
+        level, slot = where
+        del self._wheels[level][slot][key]
+        return True
+
+    def advance(self, to: int) -> list[tuple[K, int]]:
+        """Move the wheel to tick to; returns (key, deadline) of every timer due."""
+        fired: list[tuple[K, int]] = []
+        if not self._where:
+            self._now = max(self._now, to)
+            return fired
+        slots = self._slots
+        while self._now < to:
+            self._now += 1
+            tick = self._now
+            # Cascade the higher levels whose revolution boundary this is
+            span = slots
+            level = 1
+            while level < self._levels and tick % span == 0:
+                span *= slots
+                level += 1
+            for upper in range(level - 1, 0, -1):
+                bucket = self._wheels[upper][(tick // slots**upper) % slots]
+                moved = list(bucket.items())
+                bucket.clear()
+                for key, deadline in moved:
+                    del self._where[key]
+                    if deadline <= tick:
+                        fired.append((key, deadline))
+                    else:
+                        self._place(key, deadline)
+            bucket = self._wheels[0][tick % slots]
+            if bucket:
+                due = list(bucket.items())
+                bucket.clear()
+                for key, deadline in due:
+                    del self._where[key]
+                    if deadline <= tick:
+                        fired.append((key, deadline))
+                    else:  # parked beyond a single-level wheel's span
+                        self._place(key, deadline)
+            if not self._where:
+                self._now = max(self._now, to)
+                break
+        return fired
+
+    def next_due(self) -> int | None:
+        """Earliest tick at which advance() may fire or cascade; None if empty.
+
+        Exact when the next timer is in level 0; otherwise the next
+        cascade boundary, which is never later than the timer.
+        """
+        if not self._where:
+            return None
+        slots = self._slots
+        for offset in range(1, slots + 1):
+            tick = self._now + offset
+            if self._wheels[0][tick % slots]:
+                return tick
+            if tick % slots == 0:
+                return tick
+        return self._now + slots  # pragma: no cover - a boundary is always within slots
+
+    def _place(self, key: K, deadline: int) -> None:
+        if deadline <= self._now:
+            # Already due: fire on the next tick
+            slot = (self._now + 1) % self._slots
+            self._wheels[0][slot][key] = deadline
+            self._where[key] = (0, slot)
+            return
+        delta = deadline - self._now
+        span = self._slots
+        for level in range(self._levels):
+            if delta < span or level == self._levels - 1:
+                if delta >= span:
+                    # Beyond the top level: park in its last slot for now
+                    at = self._now + span - span // self._slots
+                else:
+                    at = deadline
+                slot = (at // (span // self._slots)) % self._slots
+                self._wheels[level][slot][key] = deadline
+                self._where[key] = (level, slot)
+                return
+            span *= self._slots
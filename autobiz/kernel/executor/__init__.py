@@ -1,21 +1,71 @@
 """Executor module: Tool execution and schema validation.
 
 Part of P1-TASK-06: Tool Registry + Schema Validation
+
+Public names are resolved on first attribute access (PEP 562), so
+`import autobiz.kernel.executor` stays cheap for short-lived workers; the
+submodule - and pydantic/jsonschema behind it - loads when a name is used.
 """
 
-from autobiz.kernel.executor.schema_validator import (
-    SchemaValidationError,
-    SchemaValidator,
-    ValidationErrorCode,
-)
-from autobiz.kernel.executor.tool_contract import ToolContract
-from autobiz.kernel.executor.tool_registry import ToolNotFoundError, ToolRegistry
-
-__all__ = [
-    "ToolContract",
-    "ToolRegistry",
-    "ToolNotFoundError",
-    "SchemaValidator",
-    "SchemaValidationError",
-    "ValidationErrorCode",
-]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from autobiz.kernel.executor.batch_validator import BatchValidationResult, validate_many
+    from autobiz.kernel.executor.contract_manifest import (
+        ContractSource,
+        ManifestError,
+        load_manifest_dir,
+        scan_entry_points,
+        scan_manifest_dir,
+    )
+    from autobiz.kernel.executor.schema_validator import (
+        CompiledSchema,
+        SchemaValidationError,
+        SchemaValidator,
+        SchemaViolation,
+        ValidationErrorCode,
+        ValidationMode,
+    )
+    from autobiz.kernel.executor.tool_contract import ToolContract
+    from autobiz.kernel.executor.tool_registry import (
+        RegistrySnapshot,
+        ToolNotFoundError,
+        ToolRegistry,
+    )
+
+# Public name -> defining submodule
+_EXPORTS = {
+    "ToolContract": "tool_contract",
+    "ToolRegistry": "tool_registry",
+    "ToolNotFoundError": "tool_registry",
+    "RegistrySnapshot": "tool_registry",
+    "ContractSource": "contract_manifest",
+    "ManifestError": "contract_manifest",
+    "load_manifest_dir": "contract_manifest",
+    "scan_manifest_dir": "contract_manifest",
+    "scan_entry_points": "contract_manifest",
+    "SchemaValidator": "schema_validator",
+    "CompiledSchema": "schema_validator",
+    "SchemaValidationError": "schema_validator",
+    "SchemaViolation": "schema_validator",
+    "ValidationErrorCode": "schema_validator",
+    "ValidationMode": "schema_validator",
+    "BatchValidationResult": "batch_validator",
+    "validate_many": "batch_validator",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
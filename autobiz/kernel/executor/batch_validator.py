@@ -0,0 +1,226 @@
+"""Batch validation: validate many payloads against one schema.
+
+Part of P1-TASK-06: Tool Registry + Schema Validation
+Requirements: INV-01, P1-R01, P1-R18
+Oracle: Schema (deterministic validation)
+
+Used for event_store replays, tool-call backfills and webhook bursts. The
+schema is compiled once per process; items are streamed from any iterable
+and validated serially or, for large batches, in chunks on a process pool.
+"""
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Literal
+
+from autobiz.kernel.executor.schema_validator import (
+    CompiledSchema,
+    SchemaBackend,
+    SchemaValidator,
+    SchemaViolation,
+)
+
+if TYPE_CHECKING:
+    # Only for annotations: importing it would load pydantic
+    from autobiz.kernel.executor.tool_contract import ToolContract
+
+# Per-item status codes stored in BatchValidationResult.statuses
+STATUS_VALID = 0
+STATUS_INVALID = 1
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# (index, message, path, schema_path, keyword) - picklable form of a violation
+_WireViolation = tuple[int, str, str, str, str]
+
+
+@dataclass
+class BatchValidationResult:
+    """Compact per-item outcome of validate_many().
+
+    Attributes:
+        statuses: One byte per item, STATUS_VALID or STATUS_INVALID, in input order
+        errors: First violation for each failing item, keyed by item index
+    """
+
+    statuses: bytearray = field(default_factory=bytearray)
+    errors: dict[int, SchemaViolation] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        """Number of items validated."""
+        return len(self.statuses)
+
+    @property
+    def invalid_count(self) -> int:
+        """Number of items that failed validation."""
+        return len(self.errors)
+
+    @property
+    def valid_count(self) -> int:
+        """Number of items that passed validation."""
+        return len(self.statuses) - len(self.errors)
+
+    def is_valid(self, index: int) -> bool:
+        """Return whether the item at index passed validation."""
+        return self.statuses[index] == STATUS_VALID
+
+    def invalid_indices(self) -> list[int]:
+        """Indices of failing items, in input order."""
+        return sorted(self.errors)
+
+
+def validate_many(
+    items: Iterable[Any],
+    schema_or_contract: "dict[str, Any] | ToolContract | CompiledSchema",
+    *,
+    which: Literal["input", "output"] = "input",
+    validator: SchemaValidator | None = None,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BatchValidationResult:
+    """Validate every item against one schema, compiling it only once.
+
+    Args:
+        items: Payloads to validate; any iterable, consumed lazily
+        schema_or_contract: JSON Schema, precompiled schema, or ToolContract
+        which: Contract schema to use when given a ToolContract
+        validator: SchemaValidator to compile with (defaults to the compiled backend);
+            a precompiled schema keeps the backend it was compiled with
+        workers: Process count; None or 1 validates in the calling process
+        chunk_size: Items per process-pool task
+
+    Returns:
+        BatchValidationResult with one status per item and first errors
+
+    Raises:
+        SchemaValidationError: If the schema is malformed (SCHEMA_MALFORMED)
+        ValueError: If workers or chunk_size is not positive
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    validator = validator or SchemaValidator(backend="compiled")
+    schema = _resolve_schema(schema_or_contract, which)
+    compiled = schema if isinstance(schema, CompiledSchema) else validator.compile(schema)
+
+    result = BatchValidationResult()
+    if workers is None or workers == 1:
+        _validate_serial(validator, compiled, items, result)
+    else:
+        _validate_parallel(compiled.backend, compiled.schema, items, workers, chunk_size, result)
+    return result
+
+
+def _resolve_schema(
+    schema_or_contract: "dict[str, Any] | ToolContract | CompiledSchema",
+    which: Literal["input", "output"],
+) -> dict[str, Any] | CompiledSchema:
+    """Pick the schema out of a contract, or pass a schema through."""
+    if isinstance(schema_or_contract, (dict, CompiledSchema)):
+        return schema_or_contract
+    if which == "input":
+        return schema_or_contract.input_schema
+    return schema_or_contract.output_schema
+
+
+def _validate_serial(
+    validator: SchemaValidator,
+    compiled: CompiledSchema,
+    items: Iterable[Any],
+    result: BatchValidationResult,
+) -> None:
+    """Validate items in-process, appending to result."""
+    statuses = result.statuses
+    errors = result.errors
+    first_violation = validator.first_violation
+
+    for index, item in enumerate(items, start=len(statuses)):
+        violation = first_violation(item, compiled)
+        if violation is None:
+            statuses.append(STATUS_VALID)
+        else:
+            statuses.append(STATUS_INVALID)
+            errors[index] = violation
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Yield lists of up to size items without materializing the iterable."""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _validate_parallel(
+    backend: SchemaBackend,
+    schema: dict[str, Any],
+    items: Iterable[Any],
+    workers: int,
+    chunk_size: int,
+    result: BatchValidationResult,
+) -> None:
+    """Validate chunks on a process pool, keeping a bounded number in flight."""
+    max_in_flight = workers * 2
+    pending: deque[tuple[int, Future[tuple[bytes, list[_WireViolation]]]]] = deque()
+
+    def drain_one() -> None:
+        start, future = pending.popleft()
+        statuses, violations = future.result()
+        result.statuses += statuses
+        for offset, message, path, schema_path, keyword in violations:
+            result.errors[start + offset] = SchemaViolation(
+                message=message, path=path, schema_path=schema_path, keyword=keyword
+            )
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(backend, schema)
+    ) as pool:
+        start = 0
+        for chunk in _chunks(items, chunk_size):
+            pending.append((start, pool.submit(_validate_chunk, chunk)))
+            start += len(chunk)
+            if len(pending) >= max_in_flight:
+                drain_one()
+        while pending:
+            drain_one()
+
+
+# Worker-process state, set once per process by _init_worker
+_worker_validator: SchemaValidator | None = None
+_worker_compiled: CompiledSchema | None = None
+
+
+def _init_worker(backend: SchemaBackend, schema: dict[str, Any]) -> None:
+    """Compile the schema once in each pool process."""
+    global _worker_validator, _worker_compiled
+    _worker_validator = SchemaValidator(backend=backend)
+    _worker_compiled = _worker_validator.compile(schema)
+
+
+def _validate_chunk(chunk: list[Any]) -> tuple[bytes, list[_WireViolation]]:
+    """Validate one chunk in a worker; returns statuses and picklable violations."""
+    assert _worker_validator is not None and _worker_compiled is not None
+
+    statuses = bytearray(len(chunk))
+    violations: list[_WireViolation] = []
+    first_violation = _worker_validator.first_violation
+    compiled = _worker_compiled
+
+    for offset, item in enumerate(chunk):
+        violation = first_violation(item, compiled)
+        if violation is not None:
+            statuses[offset] = STATUS_INVALID
+            violations.append(
+                (
+                    offset,
+                    violation.message,
+                    violation.path,
+                    violation.schema_path,
+                    violation.keyword,
+                )
+            )
+    return bytes(statuses), violations
@@ -0,0 +1,242 @@
+"""Contract manifests: ToolContract definitions stored as JSON files.
+
+Part of P1-TASK-06: Tool Registry + Schema Validation
+Requirements: INV-01, P1-R01, P1-R18
+
+A manifest file holds one contract object or a list of contract objects,
+using ToolContract field names. A manifest directory is every `*.json`
+file in it, read in sorted filename order.
+
+Contracts can also be published by installed packages through the
+`autobiz.tool_contracts` entry-point group. Each entry point is named
+`<tool name>@<version>` and refers to a ToolContract, a contract dict, or a
+zero-argument callable returning either.
+
+The scan_* functions only read names and versions; they return
+ContractSource objects whose load() builds the ToolContract (importing
+pydantic and, for entry points, the publishing module) on first use.
+"""
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from importlib.metadata import EntryPoint
+
+    from autobiz.kernel.executor.tool_contract import ToolContract
+
+ENTRY_POINT_GROUP = "autobiz.tool_contracts"
+
+
+class ManifestError(Exception):
+    """Raised when a contract manifest cannot be read or parsed.
+
+    Attributes:
+        path: Manifest file that failed
+    """
+
+    def __init__(self, path: Path, message: str) -> None:
+        """Initialize manifest error.
+
+        Args:
+            path: Manifest file that failed
+            message: Human-readable error description
+        """
+        super().__init__(f"{path}: {message}")
+        self.path = path
+
+
+@dataclass(frozen=True)
+class ContractSource:
+    """A declared contract that has not been parsed yet.
+
+    Attributes:
+        name: Tool name
+        version: Tool version (SemVer string)
+        origin: Where the contract is declared (file path or entry point)
+        loader: Zero-argument callable building the ToolContract
+    """
+
+    name: str
+    version: str
+    origin: str
+    loader: Callable[[], "ToolContract"]
+
+    def load(self) -> "ToolContract":
+        """Build the ToolContract.
+
+        Raises:
+            ManifestError: If the contract is invalid or declares a different
+                name/version than the manifest entry
+        """
+        contract = self.loader()
+        if (contract.name, contract.version) != (self.name, self.version):
+            raise ManifestError(
+                Path(self.origin),
+                f"declared {self.name}@{self.version} but loaded "
+                f"{contract.name}@{contract.version}",
+            )
+        return contract
+
+
+def read_manifest_entries(path: Path) -> list[dict[str, Any]]:
+    """Read raw contract entries from a manifest file without parsing them.
+
+    Args:
+        path: Manifest file
+
+    Returns:
+        Contract dicts in file order
+
+    Raises:
+        ManifestError: If the file is unreadable, not JSON, or not contract objects
+    """
+    try:
+        document = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ManifestError(path, f"cannot read manifest: {e}")
+
+    entries = document if isinstance(document, list) else [document]
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ManifestError(path, "manifest entries must be JSON objects")
+    return entries
+
+
+def parse_contract(path: Path, entry: dict[str, Any]) -> "ToolContract":
+    """Parse one manifest entry into a ToolContract.
+
+    Args:
+        path: Manifest file the entry came from (for error reporting)
+        entry: Raw contract dict
+
+    Returns:
+        Parsed ToolContract
+
+    Raises:
+        ManifestError: If the entry is not a valid ToolContract
+    """
+    from pydantic import ValidationError
+
+    from autobiz.kernel.executor.tool_contract import ToolContract
+
+    try:
+        return ToolContract(**entry)
+    except ValidationError as e:
+        raise ManifestError(path, f"invalid contract {entry.get('name')!r}: {e}")
+
+
+def manifest_files(directory: Path) -> list[Path]:
+    """List manifest files in a directory, sorted by filename.
+
+    Raises:
+        ManifestError: If directory does not exist
+    """
+    if not directory.is_dir():
+        raise ManifestError(directory, "manifest directory not found")
+    return sorted(directory.glob("*.json"))
+
+
+def load_manifest_dir(directory: Path | str) -> list["ToolContract"]:
+    """Load and parse every contract in a manifest directory.
+
+    Args:
+        directory: Directory containing `*.json` manifests
+
+    Returns:
+        Parsed contracts, in filename then file order
+
+    Raises:
+        ManifestError: If any manifest is unreadable or invalid
+    """
+    contracts: list[ToolContract] = []
+    for path in manifest_files(Path(directory)):
+        contracts.extend(parse_contract(path, entry) for entry in read_manifest_entries(path))
+    return contracts
+
+
+def scan_manifest_dir(directory: Path | str) -> list[ContractSource]:
+    """Declare every contract in a manifest directory without parsing it.
+
+    Files are read as JSON to learn each entry's name and version; building
+    ToolContract objects is deferred to ContractSource.load().
+
+    Args:
+        directory: Directory containing `*.json` manifests
+
+    Returns:
+        Contract sources, in filename then file order
+
+    Raises:
+        ManifestError: If a manifest is unreadable or an entry lacks name/version
+    """
+    sources: list[ContractSource] = []
+    for path in manifest_files(Path(directory)):
+        for entry in read_manifest_entries(path):
+            name, version = entry.get("name"), entry.get("version")
+            if not isinstance(name, str) or not isinstance(version, str):
+                raise ManifestError(path, "manifest entries need string name and version")
+            sources.append(
+                ContractSource(
+                    name=name,
+                    version=version,
+                    origin=str(path),
+                    loader=partial(parse_contract, path, entry),
+                )
+            )
+    return sources
+
+
+def scan_entry_points(group: str = ENTRY_POINT_GROUP) -> list[ContractSource]:
+    """Declare contracts published by installed packages without importing them.
+
+    Args:
+        group: Entry-point group to scan
+
+    Returns:
+        Contract sources, sorted by entry-point name
+
+    Raises:
+        ManifestError: If an entry-point name is not `<tool name>@<version>`
+    """
+    from importlib.metadata import entry_points
+
+    sources: list[ContractSource] = []
+    for entry_point in sorted(entry_points(group=group), key=lambda ep: ep.name):
+        name, sep, version = entry_point.name.rpartition("@")
+        if not sep or not name or not version:
+            raise ManifestError(
+                Path(entry_point.value), f"entry point '{entry_point.name}' is not name@version"
+            )
+        sources.append(
+            ContractSource(
+                name=name,
+                version=version,
+                origin=f"{group}:{entry_point.name}",
+                loader=partial(_load_entry_point, entry_point),
+            )
+        )
+    return sources
+
+
+def _load_entry_point(entry_point: "EntryPoint") -> "ToolContract":
+    """Import an entry point's target and coerce it to a ToolContract."""
+    from autobiz.kernel.executor.tool_contract import ToolContract
+
+    origin = Path(entry_point.value)
+    try:
+        target = entry_point.load()
+    except Exception as e:
+        raise ManifestError(origin, f"cannot load entry point '{entry_point.name}': {e}")
+
+    if callable(target) and not isinstance(target, type):
+        target = target()
+    if isinstance(target, ToolContract):
+        return target
+    if isinstance(target, dict):
+        return parse_contract(origin, target)
+    raise ManifestError(origin, f"entry point '{entry_point.name}' is not a contract")
@@ -0,0 +1,313 @@
+"""SchemaCompiler: Code-generating backend for hot tool schemas.
+
+Part of P1-TASK-06: Tool Registry + Schema Validation
+Requirements: INV-01, P1-R01, P1-R18
+Oracle: Schema (deterministic validation)
+
+Turns a Draft 7 JSON Schema into a specialized Python predicate that answers
+"is this instance valid?" without interpreting the schema keyword by keyword.
+The predicate only decides validity; error reporting (message, path,
+schema_path) is always delegated to jsonschema so SchemaValidationError
+contents are identical across backends.
+
+Supported subset: type, required, properties, additionalProperties, enum,
+pattern, minimum, maximum, exclusiveMinimum, exclusiveMaximum, minLength,
+maxLength, items (single schema form), minItems, maxItems, plus boolean
+schemas and annotation-only keywords. Any other keyword makes the whole
+schema uncompilable and compile_schema() returns None.
+"""
+
+import re
+from collections.abc import Callable, Mapping, Sequence
+from numbers import Number
+from typing import Any
+
+# Keywords that carry no assertion under Draft7Validator's defaults
+# ("format" is annotation-only unless a format_checker is configured)
+_ANNOTATION_KEYWORDS = frozenset(
+    {
+        "$schema",
+        "$id",
+        "$comment",
+        "title",
+        "description",
+        "default",
+        "examples",
+        "format",
+        "readOnly",
+        "writeOnly",
+    }
+)
+
+_ASSERTION_KEYWORDS = frozenset(
+    {
+        "type",
+        "required",
+        "properties",
+        "additionalProperties",
+        "enum",
+        "pattern",
+        "minimum",
+        "maximum",
+        "exclusiveMinimum",
+        "exclusiveMaximum",
+        "minLength",
+        "maxLength",
+        "items",
+        "minItems",
+        "maxItems",
+    }
+)
+
+# Draft 7 type checks, expressed as source over the instance name `x`
+_TYPE_CHECKS = {
+    "string": "isinstance(x, str)",
+    "object": "isinstance(x, dict)",
+    "array": "isinstance(x, list)",
+    "boolean": "isinstance(x, bool)",
+    "null": "x is None",
+    "number": "_is_number(x)",
+    "integer": "_is_integer(x)",
+}
+
+CompiledCheck = Callable[[Any], bool]
+
+
+class UnsupportedSchemaError(Exception):
+    """Raised internally when a schema uses keywords outside the compiled subset."""
+
+
+def _is_number(x: Any) -> bool:
+    """Draft 7 "number": any numbers.Number except bool."""
+    return not isinstance(x, bool) and isinstance(x, Number)
+
+
+def _is_integer(x: Any) -> bool:
+    """Draft 7 "integer": int (not bool) or an integral float."""
+    if isinstance(x, bool):
+        return False
+    return isinstance(x, int) or (isinstance(x, float) and x.is_integer())
+
+
+def _unbool(x: Any) -> Any:
+    """Make True/False distinct from 1/0 for equality checks."""
+    if x is True:
+        return _TRUE
+    if x is False:
+        return _FALSE
+    return x
+
+
+_TRUE = object()
+_FALSE = object()
+
+
+def _json_equal(one: Any, two: Any) -> bool:
+    """JSON Schema equality (bool is not an int; recurse into containers)."""
+    if one is two:
+        return True
+    if isinstance(one, str) or isinstance(two, str):
+        return bool(one == two)
+    if isinstance(one, Sequence) and isinstance(two, Sequence):
+        return len(one) == len(two) and all(_json_equal(i, j) for i, j in zip(one, two))
+    if isinstance(one, Mapping) and isinstance(two, Mapping):
+        return len(one) == len(two) and all(
+            key in two and _json_equal(value, two[key]) for key, value in one.items()
+        )
+    return bool(_unbool(one) == _unbool(two))
+
+
+def _in_enum(x: Any, values: Sequence[Any]) -> bool:
+    """Enum membership with JSON Schema equality semantics."""
+    return any(_json_equal(value, x) for value in values)
+
+
+class _CodeGen:
+    """Emits one Python function per (sub)schema node."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.constants: dict[str, Any] = {}
+        self._counter = 0
+
+    def const(self, value: Any) -> str:
+        """Bind a value into the generated module namespace."""
+        name = f"_c{len(self.constants)}"
+        self.constants[name] = value
+        return name
+
+    def node(self, schema: Any) -> str:
+        """Compile a schema node and return the generated function name."""
+        name = f"_v{self._counter}"
+        self._counter += 1
+
+        if schema is True:
+            self.lines += [f"def {name}(x):", "    return True", ""]
+            return name
+        if schema is False:
+            self.lines += [f"def {name}(x):", "    return False", ""]
+            return name
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"Unsupported schema node: {schema!r}")
+
+        unknown = set(schema) - _ASSERTION_KEYWORDS - _ANNOTATION_KEYWORDS
+        if unknown:
+            raise UnsupportedSchemaError(f"Unsupported keywords: {sorted(unknown)}")
+
+        body: list[str] = []
+
+        if "type" in schema:
+            types = schema["type"]
+            if isinstance(types, str):
+                types = [types]
+            checks = [_TYPE_CHECKS[t] for t in types]
+            body.append(f"if not ({' or '.join(checks)}):")
+            body.append("    return False")
+
+        if "enum" in schema:
+            values = list(schema["enum"])
+            if values and all(isinstance(v, str) for v in values):
+                members = self.const(frozenset(values))
+                body.append(f"if not (isinstance(x, str) and x in {members}):")
+            else:
+                members = self.const(values)
+                body.append(f"if not _in_enum(x, {members}):")
+            body.append("    return False")
+
+        body += self._object_checks(schema)
+        body += self._string_checks(schema)
+        body += self._number_checks(schema)
+        body += self._array_checks(schema)
+
+        self.lines.append(f"def {name}(x):")
+        self.lines += ["    " + line for line in body]
+        self.lines += ["    return True", ""]
+        return name
+
+    def _object_checks(self, schema: dict[str, Any]) -> list[str]:
+        keys = ("required", "properties", "additionalProperties")
+        if not any(k in schema for k in keys):
+            return []
+
+        inner: list[str] = []
+        for prop in schema.get("required", []):
+            inner += [f"if {self.const(prop)} not in x:", "    return False"]
+
+        properties = schema.get("properties", {})
+        for prop, subschema in properties.items():
+            if subschema is True:
+                continue
+            fn = self.node(subschema)
+            key = self.const(prop)
+            inner += [f"if {key} in x and not {fn}(x[{key}]):", "    return False"]
+
+        additional = schema.get("additionalProperties", True)
+        if additional is not True:
+            known = self.const(frozenset(properties))
+            if additional is False:
+                inner += ["for k in x:", f"    if k not in {known}:", "        return False"]
+            else:
+                fn = self.node(additional)
+                inner += [
+                    "for k, v in x.items():",
+                    f"    if k not in {known} and not {fn}(v):",
+                    "        return False",
+                ]
+
+        if not inner:
+            return []
+        return ["if isinstance(x, dict):"] + ["    " + line for line in inner]
+
+    def _string_checks(self, schema: dict[str, Any]) -> list[str]:
+        inner: list[str] = []
+        if "minLength" in schema:
+            inner += [f"if len(x) < {int(schema['minLength'])}:", "    return False"]
+        if "maxLength" in schema:
+            inner += [f"if len(x) > {int(schema['maxLength'])}:", "    return False"]
+        if "pattern" in schema:
+            search = self.const(re.compile(schema["pattern"]).search)
+            inner += [f"if not {search}(x):", "    return False"]
+
+        if not inner:
+            return []
+        return ["if isinstance(x, str):"] + ["    " + line for line in inner]
+
+    def _number_checks(self, schema: dict[str, Any]) -> list[str]:
+        bounds = (
+            ("minimum", "<"),
+            ("maximum", ">"),
+            ("exclusiveMinimum", "<="),
+            ("exclusiveMaximum", ">="),
+        )
+        inner: list[str] = []
+        for keyword, failing_op in bounds:
+            if keyword in schema:
+                bound = self.const(schema[keyword])
+                inner += [f"if x {failing_op} {bound}:", "    return False"]
+
+        if not inner:
+            return []
+        return ["if _is_number(x):"] + ["    " + line for line in inner]
+
+    def _array_checks(self, schema: dict[str, Any]) -> list[str]:
+        inner: list[str] = []
+        if "minItems" in schema:
+            inner += [f"if len(x) < {int(schema['minItems'])}:", "    return False"]
+        if "maxItems" in schema:
+            inner += [f"if len(x) > {int(schema['maxItems'])}:", "    return False"]
+        if "items" in schema:
+            items = schema["items"]
+            if isinstance(items, list):
+                raise UnsupportedSchemaError("Tuple-form items is not compiled")
+            if items is False:
+                inner += ["if x:", "    return False"]
+            elif items is not True:
+                fn = self.node(items)
+                inner += ["for item in x:", f"    if not {fn}(item):", "        return False"]
+
+        if not inner:
+            return []
+        return ["if isinstance(x, list):"] + ["    " + line for line in inner]
+
+
+def generate_source(schema: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Generate predicate source for a schema.
+
+    Args:
+        schema: Draft 7 JSON Schema (assumed already checked against the metaschema)
+
+    Returns:
+        Tuple of (python source, namespace constants); the entry point is `_v0`
+
+    Raises:
+        UnsupportedSchemaError: If the schema uses keywords outside the compiled subset
+    """
+    gen = _CodeGen()
+    gen.node(schema)
+    return "\n".join(gen.lines), gen.constants
+
+
+def compile_schema(schema: dict[str, Any]) -> CompiledCheck | None:
+    """Compile a schema into a validity predicate.
+
+    Args:
+        schema: Draft 7 JSON Schema (assumed already checked against the metaschema)
+
+    Returns:
+        Function returning True iff the instance is valid, or None if the schema
+        uses constructs the compiler does not support (caller uses jsonschema)
+    """
+    try:
+        source, constants = generate_source(schema)
+    except (UnsupportedSchemaError, KeyError, TypeError, ValueError, re.error):
+        return None
+
+    namespace: dict[str, Any] = {
+        "_is_number": _is_number,
+        "_is_integer": _is_integer,
+        "_in_enum": _in_enum,
+        **constants,
+    }
+    exec(compile(source, "<schema_compiler>", "exec"), namespace)
+    check: CompiledCheck = namespace["_v0"]
+    return check
@@ -3,13 +3,23 @@
 Part of P1-TASK-06: Tool Registry + Schema Validation
 Requirements: INV-01, P1-R01, P1-R18
 Oracle: Schema (deterministic validation)
+
+jsonschema is imported on first compile/validate rather than at module
+import, so processes that never validate do not pay for it.
 """
 
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Literal, cast
+
+from autobiz.kernel.executor.schema_compiler import CompiledCheck, compile_schema
 
-import jsonschema
-from jsonschema import Draft7Validator
+if TYPE_CHECKING:
+    from jsonschema import Draft7Validator
+    from jsonschema.exceptions import ValidationError
+
+SchemaBackend = Literal["jsonschema", "compiled"]
 
 
 class ValidationErrorCode(str, Enum):
@@ -20,6 +30,39 @@ class ValidationErrorCode(str, Enum):
     SCHEMA_MALFORMED = "SCHEMA_MALFORMED"  # Schema itself is invalid
 
 
+class ValidationMode(str, Enum):
+    """How much work validation does once data is known to be invalid."""
+
+    FAIL_FAST = "FAIL_FAST"  # Stop at the first violation
+    FULL_REPORT = "FULL_REPORT"  # Collect every violation (INV-01 rejection trace)
+
+
+@dataclass(frozen=True)
+class SchemaViolation:
+    """A single JSON Schema violation.
+
+    Attributes:
+        message: Human-readable error description
+        path: Dotted path to the invalid field ("" for the root)
+        schema_path: Dotted path within the schema that was violated
+        keyword: JSON Schema keyword that failed (e.g. "required")
+    """
+
+    message: str
+    path: str
+    schema_path: str
+    keyword: str
+
+    def to_dict(self) -> dict[str, str]:
+        """Serialize for trace persistence."""
+        return {
+            "message": self.message,
+            "path": self.path,
+            "schema_path": self.schema_path,
+            "keyword": self.keyword,
+        }
+
+
 class SchemaValidationError(Exception):
     """Raised when schema validation fails.
 
@@ -28,6 +71,8 @@ class SchemaValidationError(Exception):
         message: Human-readable error description
         path: JSONPath to the invalid field (if applicable)
         schema_path: Path within the schema that was violated
+        violations: Violations found - all of them in FULL_REPORT mode, only the
+            first in FAIL_FAST mode; empty for non-data errors
     """
 
     def __init__(
@@ -36,6 +81,7 @@ class SchemaValidationError(Exception):
         message: str,
         path: str = "",
         schema_path: str = "",
+        violations: list[SchemaViolation] | None = None,
     ) -> None:
         """Initialize validation error.
 
@@ -44,12 +90,58 @@ class SchemaValidationError(Exception):
             message: Human-readable error description
             path: JSONPath to the invalid field
             schema_path: Path within the schema that was violated
+            violations: Full list of violations, when collected
         """
         super().__init__(message)
         self.code = code
         self.message = message
         self.path = path
         self.schema_path = schema_path
+        self.violations = violations or []
+
+
+class CompiledSchema:
+    """JSON Schema compiled once and reused across validate calls.
+
+    Building a Draft7Validator walks the schema and sets up ref resolution;
+    holding on to the instance lets hot paths (tool input/output checks)
+    skip that work on every call.
+
+    Attributes:
+        schema: The JSON Schema this validator was compiled from
+        validator: Draft7Validator used for validation and error reporting
+        fast_check: Generated validity predicate (compiled backend only), or None
+            when the schema is outside the compiler's supported subset
+        backend: Backend the schema was compiled with
+    """
+
+    __slots__ = ("schema", "validator", "fast_check", "backend")
+
+    def __init__(self, schema: dict[str, Any], backend: SchemaBackend = "jsonschema") -> None:
+        """Compile schema into a reusable validator.
+
+        Args:
+            schema: JSON Schema to compile
+            backend: "compiled" additionally generates a specialized predicate
+
+        Raises:
+            SchemaValidationError: If the schema itself is malformed (SCHEMA_MALFORMED)
+        """
+        jsonschema = _jsonschema()
+        try:
+            jsonschema.Draft7Validator.check_schema(schema)
+        except jsonschema.exceptions.SchemaError as e:
+            raise SchemaValidationError(
+                code=ValidationErrorCode.SCHEMA_MALFORMED,
+                message=f"Schema is malformed: {str(e)}",
+            )
+
+        self.schema = schema
+        self.backend = backend
+        self.validator = jsonschema.Draft7Validator(schema)
+        self.fast_check: CompiledCheck | None = (
+            compile_schema(schema) if backend == "compiled" else None
+        )
 
 
 class SchemaValidator:
@@ -57,18 +149,51 @@ class SchemaValidator:
 
     Enforces INV-01: All tool calls must be schema-valid before execution.
     Uses Draft 7 JSON Schema specification.
+
+    Backends (affect compiled schemas only):
+    - "jsonschema": Draft7Validator interprets the schema on every call
+    - "compiled": schemas are code-generated into Python predicates; invalid
+      data and unsupported schemas fall back to jsonschema, so error codes,
+      messages, paths and schema paths are identical to the default backend
     """
 
-    def __init__(self) -> None:
-        """Initialize schema validator."""
-        pass
+    def __init__(self, backend: SchemaBackend = "jsonschema") -> None:
+        """Initialize schema validator.
+
+        Args:
+            backend: Validation backend for compile()
+        """
+        if backend not in ("jsonschema", "compiled"):
+            raise ValueError(f"Unknown schema backend '{backend}'")
+        self.backend: SchemaBackend = backend
+
+    def compile(self, schema: dict[str, Any]) -> CompiledSchema:
+        """Check and compile a schema for repeated validation.
+
+        Args:
+            schema: JSON Schema to compile
 
-    def validate(self, data: Any, schema: dict[str, Any]) -> None:
+        Returns:
+            CompiledSchema to pass to validate_compiled()
+
+        Raises:
+            SchemaValidationError: If the schema is malformed (SCHEMA_MALFORMED)
+        """
+        return CompiledSchema(schema, self.backend)
+
+    def validate(
+        self,
+        data: Any,
+        schema: dict[str, Any],
+        mode: ValidationMode = ValidationMode.FAIL_FAST,
+    ) -> None:
         """Validate data against JSON Schema.
 
         Args:
             data: Data to validate (typically dict)
             schema: JSON Schema to validate against
+            mode: FAIL_FAST stops at the first violation; FULL_REPORT attaches
+                every violation to the raised error
 
         Raises:
             SchemaValidationError: If validation fails with code SCHEMA_INVALID
@@ -76,33 +201,141 @@ class SchemaValidator:
         Returns:
             None if validation succeeds
         """
+        # Create validator instance (one-off; use compile() for hot paths)
+        self._validate_with(_jsonschema().Draft7Validator(schema), data, mode)
+
+    def validate_compiled(
+        self,
+        data: Any,
+        compiled: CompiledSchema,
+        mode: ValidationMode = ValidationMode.FAIL_FAST,
+    ) -> None:
+        """Validate data against a precompiled schema.
+
+        Args:
+            data: Data to validate (typically dict)
+            compiled: Schema compiled via compile()
+            mode: FAIL_FAST stops at the first violation; FULL_REPORT attaches
+                every violation to the raised error
+
+        Raises:
+            SchemaValidationError: If validation fails with code SCHEMA_INVALID
+        """
+        if self._fast_valid(compiled, data):
+            return
+
+        self._validate_with(compiled.validator, data, mode)
+
+    def is_valid(self, data: Any, schema: dict[str, Any] | CompiledSchema) -> bool:
+        """Return whether data is valid, without building any error objects.
+
+        Args:
+            data: Data to validate (typically dict)
+            schema: JSON Schema or precompiled schema
+
+        Returns:
+            True if data satisfies the schema
+
+        Raises:
+            SchemaValidationError: SCHEMA_MALFORMED if the schema is malformed,
+                SCHEMA_INVALID if validation crashes on this instance
+        """
+        if isinstance(schema, CompiledSchema):
+            if self._fast_valid(schema, data):
+                return True
+            validator = schema.validator
+        else:
+            validator = _jsonschema().Draft7Validator(schema)
+
         try:
-            # Create validator instance
-            validator = Draft7Validator(schema)
+            return bool(validator.is_valid(data))
+        except Exception as e:
+            raise _crash_error(validator, e) from e
 
-            # Validate and collect errors
-            errors = list(validator.iter_errors(data))
+    def first_violation(self, data: Any, compiled: CompiledSchema) -> SchemaViolation | None:
+        """Return the first violation (None if valid) without raising.
 
-            if errors:
-                # Take the first error for reporting
-                first_error = errors[0]
+        Args:
+            data: Data to validate (typically dict)
+            compiled: Schema compiled via compile()
+
+        Returns:
+            First violation in jsonschema iteration order, or None if valid
+        """
+        try:
+            self.validate_compiled(data, compiled)
+        except SchemaValidationError as e:
+            if e.violations:
+                return e.violations[0]
+            # Validation crashed on this instance; report it as a root violation
+            return SchemaViolation(message=e.message, path="", schema_path="", keyword="")
+        return None
+
+    def collect_violations(
+        self, data: Any, schema: dict[str, Any] | CompiledSchema
+    ) -> list[SchemaViolation]:
+        """Return every violation (empty if valid) without raising.
+
+        Args:
+            data: Data to validate (typically dict)
+            schema: JSON Schema or precompiled schema
 
-                # Build path from error
-                path_parts = [str(p) for p in first_error.path]
-                path = ".".join(path_parts) if path_parts else ""
+        Returns:
+            All violations in jsonschema iteration order
+
+        Raises:
+            SchemaValidationError: If the schema is malformed or validation crashes
+        """
+        if isinstance(schema, CompiledSchema):
+            if self._fast_valid(schema, data):
+                return []
+            validator = schema.validator
+        else:
+            validator = _jsonschema().Draft7Validator(schema)
+
+        try:
+            self._validate_with(validator, data, ValidationMode.FULL_REPORT)
+        except SchemaValidationError as e:
+            if e.violations:
+                return e.violations
+            raise
+        return []
 
-                # Build schema path from error
-                schema_path_parts = [str(p) for p in first_error.schema_path]
-                schema_path = ".".join(schema_path_parts) if schema_path_parts else ""
+    @staticmethod
+    def _fast_valid(compiled: CompiledSchema, data: Any) -> bool:
+        """Run the generated predicate, if any; False means "ask jsonschema"."""
+        if compiled.fast_check is None:
+            return False
+        try:
+            return compiled.fast_check(data)
+        except Exception:
+            return False  # Let jsonschema decide and report
 
-                # Create human-readable message
-                message = first_error.message
+    def _validate_with(
+        self,
+        validator: "Draft7Validator",
+        data: Any,
+        mode: ValidationMode = ValidationMode.FAIL_FAST,
+    ) -> None:
+        """Run a Draft7Validator and translate its errors per mode."""
+        jsonschema = _jsonschema()
+        try:
+            if mode == ValidationMode.FULL_REPORT:
+                violations = [_to_violation(error) for error in validator.iter_errors(data)]
+            else:
+                # Stop at the first error instead of materializing all of them
+                first_error = next(iter(validator.iter_errors(data)), None)
+                violations = [] if first_error is None else [_to_violation(first_error)]
 
+            if violations:
+                # Take the first error for reporting
+                first = violations[0]
                 raise SchemaValidationError(
                     code=ValidationErrorCode.SCHEMA_INVALID,
-                    message=message,
-                    path=path,
-                    schema_path=schema_path,
+                    message=first.message,
+                    path=first.path,
+                    schema_path=first.schema_path,
+                    violations=violations,
                 )
 
         except jsonschema.exceptions.SchemaError as e:
@@ -116,7 +349,64 @@ class SchemaValidator:
             raise
         except Exception as e:
             # Catch-all for unexpected errors
-            raise SchemaValidationError(
-                code=ValidationErrorCode.SCHEMA_INVALID,
-                message=f"Validation failed: {str(e)}",
-            )
+            raise _crash_error(validator, e)
+
+
+def _jsonschema() -> ModuleType:
+    """Import jsonschema on first use (a no-op dict lookup afterwards)."""
+    import jsonschema
+
+    return cast(ModuleType, jsonschema)
+
+
+def _crash_error(validator: "Draft7Validator", error: Exception) -> SchemaValidationError:
+    """Classify an exception raised mid-validation.
+
+    A schema that only fails once data reaches it (an unknown type name, a
+    dangling $ref) is reported as SCHEMA_MALFORMED; anything else crashed on
+    this particular instance and is SCHEMA_INVALID.
+    """
+    jsonschema = _jsonschema()
+    try:
+        jsonschema.Draft7Validator.check_schema(validator.schema)
+    except jsonschema.exceptions.SchemaError as e:
+        return SchemaValidationError(
+            code=ValidationErrorCode.SCHEMA_MALFORMED,
+            message=f"Schema is malformed: {str(e)}",
+        )
+    if isinstance(error, (jsonschema.exceptions.UnknownType, *_unresolvable())):
+        return SchemaValidationError(
+            code=ValidationErrorCode.SCHEMA_MALFORMED,
+            message=f"Schema is malformed: {str(error)}",
+        )
+    return SchemaValidationError(
+        code=ValidationErrorCode.SCHEMA_INVALID,
+        message=f"Validation failed: {str(error)}",
+    )
+
+
+def _unresolvable() -> tuple[type[Exception], ...]:
+    """Exception types jsonschema raises for a $ref that does not resolve."""
+    try:
+        from referencing.exceptions import Unresolvable
+    except ImportError:  # jsonschema < 4.18 resolves refs itself
+        return (_jsonschema().exceptions.RefResolutionError,)
+    return (Unresolvable,)
+
+
+def _to_violation(error: "ValidationError") -> SchemaViolation:
+    """Translate a jsonschema error into a SchemaViolation."""
+    # Build path from error
+    path_parts = [str(p) for p in error.path]
+    path = ".".join(path_parts) if path_parts else ""
+
+    # Build schema path from error
+    schema_path_parts = [str(p) for p in error.schema_path]
+    schema_path = ".".join(schema_path_parts) if schema_path_parts else ""
+
+    return SchemaViolation(
+        message=error.message,
+        path=path,
+        schema_path=schema_path,
+        keyword=str(error.validator),
+    )
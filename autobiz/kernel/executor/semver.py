@@ -0,0 +1,304 @@
+"""SemVer parsing, precedence and range specs for tool versions.
+
+Part of P1-TASK-06: Tool Registry + Schema Validation
+Requirements: INV-01, P1-R01, P1-R18
+
+Implements Semantic Versioning 2.0.0 precedence and the range forms
+workflows use to pick a tool version:
+- "latest" / "*": highest stable version
+- "1.4.2" / "=1.4.2": exact version
+- "^1.4.2": compatible with 1.4.2 (same major; same minor below 1.0.0)
+- "~1.4.2": same major.minor, at or above 1.4.2
+- "1", "1.4", "1.x", "1.4.x": partial versions (equivalent to ~)
+
+Pre-release versions only satisfy a range whose lower bound is itself a
+pre-release of the same major.minor.patch, as in npm.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+
+_SEMVER_RE = re.compile(
+    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
+    r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+)
+
+_PARTIAL_RE = re.compile(r"^(0|[1-9]\d*)(?:\.(0|[1-9]\d*|[xX*]))?(?:\.(0|[1-9]\d*|[xX*]))?$")
+
+# Sort key: (major, minor, patch, is_release, prerelease identifiers)
+SortKey = tuple[int, int, int, int, tuple[tuple[int, int | str], ...]]
+
+
+class SemVerError(ValueError):
+    """Raised when a version or range string is not valid SemVer."""
+
+
+@dataclass(frozen=True)
+class Version:
+    """A parsed SemVer 2.0.0 version.
+
+    Attributes:
+        major: Major version
+        minor: Minor version
+        patch: Patch version
+        prerelease: Dot-separated pre-release identifiers ("" if none)
+        build: Build metadata ("" if none); ignored for precedence
+    """
+
+    major: int
+    minor: int
+    patch: int
+    prerelease: str = ""
+    build: str = ""
+    sort_key: SortKey = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Precompute the precedence key used for ordering and bisection."""
+        identifiers = tuple(
+            (0, int(part)) if part.isdigit() else (1, part)
+            for part in (self.prerelease.split(".") if self.prerelease else ())
+        )
+        key = (self.major, self.minor, self.patch, 0 if self.prerelease else 1, identifiers)
+        object.__setattr__(self, "sort_key", key)
+
+    @property
+    def is_prerelease(self) -> bool:
+        """True if this is a pre-release version."""
+        return bool(self.prerelease)
+
+    def __lt__(self, other: "Version") -> bool:
+        return self.sort_key < other.sort_key
+
+    def __le__(self, other: "Version") -> bool:
+        return self.sort_key <= other.sort_key
+
+    def __gt__(self, other: "Version") -> bool:
+        return self.sort_key > other.sort_key
+
+    def __ge__(self, other: "Version") -> bool:
+        return self.sort_key >= other.sort_key
+
+    def __str__(self) -> str:
+        text = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease:
+            text += f"-{self.prerelease}"
+        if self.build:
+            text += f"+{self.build}"
+        return text
+
+
+def parse_version(text: str) -> Version:
+    """Parse a SemVer 2.0.0 version string.
+
+    Args:
+        text: Version string, e.g. "1.4.2" or "2.0.0-rc.1+build.5"
+
+    Returns:
+        Parsed Version
+
+    Raises:
+        SemVerError: If text is not a valid SemVer version
+    """
+    match = _SEMVER_RE.match(text)
+    if match is None:
+        raise SemVerError(f"Invalid SemVer version '{text}'")
+    major, minor, patch, prerelease, build = match.groups()
+    return Version(int(major), int(minor), int(patch), prerelease or "", build or "")
+
+
+@dataclass(frozen=True)
+class VersionRange:
+    """A contiguous range of versions: lower <= v < upper.
+
+    Attributes:
+        spec: The range string this was parsed from
+        lower: Inclusive lower bound (None = unbounded)
+        upper: Exclusive upper bound (None = unbounded)
+        exact: Exact version, for "1.2.3"-style specs (bounds unused)
+    """
+
+    spec: str
+    lower: Version | None = None
+    upper: Version | None = None
+    exact: Version | None = None
+
+    def allows_prerelease_of(self, version: Version) -> bool:
+        """Whether a pre-release version may satisfy this range."""
+        lower = self.lower
+        return (
+            lower is not None
+            and lower.is_prerelease
+            and (lower.major, lower.minor, lower.patch)
+            == (version.major, version.minor, version.patch)
+        )
+
+    def contains(self, version: Version) -> bool:
+        """Check whether version satisfies the range."""
+        if self.exact is not None:
+            return version.sort_key == self.exact.sort_key
+        if version.is_prerelease and not self.allows_prerelease_of(version):
+            return False
+        if self.lower is not None and version < self.lower:
+            return False
+        return self.upper is None or version < self.upper
+
+
+def _upper_for_caret(v: Version) -> Version:
+    if v.major > 0:
+        return Version(v.major + 1, 0, 0)
+    if v.minor > 0:
+        return Version(0, v.minor + 1, 0)
+    return Version(0, 0, v.patch + 1)
+
+
+def parse_range(spec: str) -> VersionRange:
+    """Parse a version range spec (see module docstring for forms).
+
+    Args:
+        spec: Range string
+
+    Returns:
+        Parsed VersionRange
+
+    Raises:
+        SemVerError: If spec is not a supported range
+    """
+    text = spec.strip()
+
+    if text in ("", "*", "latest", "x", "X"):
+        return VersionRange(spec)
+
+    operator = ""
+    if text[0] in "^~=":
+        operator, text = text[0], text[1:].strip()
+
+    if _SEMVER_RE.match(text):
+        version = parse_version(text)
+        if operator in ("", "="):
+            return VersionRange(spec, exact=version)
+        if operator == "^":
+            return VersionRange(spec, lower=version, upper=_upper_for_caret(version))
+        return VersionRange(spec, lower=version, upper=Version(version.major, version.minor + 1, 0))
+
+    partial = _PARTIAL_RE.match(text)
+    if partial is None or operator == "=":
+        raise SemVerError(f"Invalid version range '{spec}'")
+
+    major_text, minor_text, patch_text = partial.groups()
+    major = int(major_text)
+    minor = int(minor_text) if minor_text and minor_text.isdigit() else None
+    patch = int(patch_text) if patch_text and patch_text.isdigit() else None
+    if minor is None and patch is not None:
+        raise SemVerError(f"Invalid version range '{spec}'")
+
+    lower = Version(major, minor or 0, patch or 0)
+    if operator == "^":
+        if minor is None:
+            upper = Version(major + 1, 0, 0)
+        elif major == 0 and patch is None:
+            upper = Version(0, minor + 1, 0)
+        else:
+            upper = _upper_for_caret(lower)
+    elif minor is None:
+        upper = Version(major + 1, 0, 0)
+    else:
+        upper = Version(major, minor + 1, 0)
+    return VersionRange(spec, lower=lower, upper=upper)
+
+
+class VersionIndex:
+    """Sorted versions of one tool, with O(log n) range resolution.
+
+    Stable releases and pre-releases are kept in separate sorted lists so a
+    range lookup is a bisection on each, never a scan.
+    """
+
+    __slots__ = ("_stable_keys", "_stable", "_pre_keys", "_pre")
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._stable_keys: list[SortKey] = []
+        self._stable: list[Version] = []
+        self._pre_keys: list[SortKey] = []
+        self._pre: list[Version] = []
+
+    def __len__(self) -> int:
+        return len(self._stable) + len(self._pre)
+
+    def add(self, version: Version) -> None:
+        """Insert a version, keeping the index sorted."""
+        keys, versions = (
+            (self._pre_keys, self._pre)
+            if version.is_prerelease
+            else (self._stable_keys, self._stable)
+        )
+        position = bisect_left(keys, version.sort_key)
+        keys.insert(position, version.sort_key)
+        versions.insert(position, version)
+
+    def copy(self) -> "VersionIndex":
+        """Shallow copy (lists copied, Version objects shared)."""
+        clone = VersionIndex()
+        clone._stable_keys = self._stable_keys.copy()
+        clone._stable = self._stable.copy()
+        clone._pre_keys = self._pre_keys.copy()
+        clone._pre = self._pre.copy()
+        return clone
+
+    def versions(self) -> list[Version]:
+        """All versions in ascending precedence order."""
+        merged = self._stable + self._pre
+        merged.sort(key=lambda v: v.sort_key)
+        return merged
+
+    def resolve(self, version_range: VersionRange) -> Version | None:
+        """Highest version satisfying the range, or None.
+
+        Args:
+            version_range: Parsed range
+
+        Returns:
+            Matching Version with the highest precedence, if any
+        """
+        if version_range.exact is not None:
+            exact = version_range.exact
+            keys, versions = (
+                (self._pre_keys, self._pre)
+                if exact.is_prerelease
+                else (self._stable_keys, self._stable)
+            )
+            position = bisect_left(keys, exact.sort_key)
+            if position < len(keys) and keys[position] == exact.sort_key:
+                return versions[position]
+            return None
+
+        best = self._highest_below(self._stable_keys, self._stable, version_range)
+
+        lower = version_range.lower
+        if lower is not None and lower.is_prerelease:
+            # Pre-releases of the lower bound's own major.minor.patch may match
+            release = Version(lower.major, lower.minor, lower.patch)
+            pre_range = VersionRange(version_range.spec, lower=lower, upper=release)
+            candidate = self._highest_below(self._pre_keys, self._pre, pre_range)
+            if candidate is not None and (best is None or candidate > best):
+                best = candidate
+        return best
+
+    @staticmethod
+    def _highest_below(
+        keys: list[SortKey], versions: list[Version], version_range: VersionRange
+    ) -> Version | None:
+        """Bisect for the highest entry in [lower, upper)."""
+        if version_range.upper is None:
+            position = len(keys)
+        else:
+            position = bisect_left(keys, version_range.upper.sort_key)
+        if position == 0:
+            return None
+        candidate = versions[position - 1]
+        if version_range.lower is not None and candidate < version_range.lower:
+            return None
+        return candidate
@@ -16,7 +16,7 @@ class ToolContract(BaseModel):
     Enforces INV-01 (schema validation) before tool execution.
     """
 
-    model_config = ConfigDict(frozen=False)  # Allow modification for registry updates
+    model_config = ConfigDict(frozen=True)  # Shared across registry snapshots; never mutated
 
     name: str
     version: str  # SemVer string
@@ -2,10 +2,47 @@
 
 Part of P1-TASK-06: Tool Registry + Schema Validation
 Requirements: INV-01, P1-R01, P1-R18
+
+Concurrency model: the registry publishes immutable RegistrySnapshot
+objects. Readers take the current snapshot with a single attribute read
+and never lock. Writers (register, reload) serialize on a lock, build a new
+snapshot off to the side - including schema compilation - and swap it in
+atomically, so readers see either the old or the new set, never a mix.
+
+Contracts may also be declared lazily as ContractSource entries (manifest
+files or entry points): only name and version are indexed up front; the
+ToolContract is built and its schemas compiled on first lookup.
 """
 
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Union
+
+from autobiz.kernel.executor.contract_manifest import (
+    ContractSource,
+    load_manifest_dir,
+    scan_manifest_dir,
+)
+from autobiz.kernel.executor.schema_validator import (
+    CompiledSchema,
+    SchemaValidator,
+    ValidationMode,
+)
+from autobiz.kernel.executor.semver import VersionIndex, parse_range, parse_version
+
+if TYPE_CHECKING:
+    from autobiz.kernel.executor.tool_contract import ToolContract
+
+# Default bound on compiled validator pairs kept in memory
+DEFAULT_MAX_COMPILED = 1024
 
-from autobiz.kernel.executor.tool_contract import ToolContract
+ToolKey = tuple[str, str]
+# (contract compiled from, compiled input schema, compiled output schema)
+_CompiledEntry = tuple["ToolContract", CompiledSchema, CompiledSchema]
+# What callers may register: a parsed contract or a lazily loaded declaration
+Declaration = Union["ToolContract", ContractSource]
 
 
 class ToolNotFoundError(Exception):
@@ -28,37 +65,315 @@ class ToolNotFoundError(Exception):
         self.version = version
 
 
+class _LazyContract:
+    """Snapshot slot for a ContractSource, materialized once on first access.
+
+    Shared by every snapshot that carries the declaration, so a contract is
+    parsed and compiled at most once however many swaps happen meanwhile.
+    Failures are not cached; the next access retries.
+    """
+
+    __slots__ = ("source", "_contract", "_lock", "_on_load")
+
+    def __init__(self, source: ContractSource, on_load: Callable[["ToolContract"], None]) -> None:
+        self.source = source
+        self._contract: ToolContract | None = None
+        self._lock = Lock()
+        self._on_load = on_load
+
+    def get(self) -> "ToolContract":
+        """Return the contract, loading and compiling it on first call.
+
+        Raises:
+            ManifestError: If the declaration does not parse into a contract
+            SchemaValidationError: If its schemas are malformed
+        """
+        contract = self._contract
+        if contract is None:
+            with self._lock:
+                contract = self._contract
+                if contract is None:
+                    contract = self.source.load()
+                    self._on_load(contract)
+                    self._contract = contract
+        return contract
+
+
+_Entry = Union["ToolContract", _LazyContract]
+
+
+class _ContractView(Mapping[ToolKey, "ToolContract"]):
+    """Read-only (name, version) -> ToolContract view over snapshot entries.
+
+    Iteration and membership never load lazy contracts; item access does.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, entries: dict[ToolKey, _Entry]) -> None:
+        self._entries = entries
+
+    def __getitem__(self, key: ToolKey) -> "ToolContract":
+        entry = self._entries[key]
+        return entry.get() if entry.__class__ is _LazyContract else entry  # type: ignore[return-value]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[ToolKey]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RegistrySnapshot:
+    """Immutable point-in-time view of registered tools.
+
+    Attributes:
+        generation: Monotonic counter, incremented on every published change
+        tools: Read-only mapping of (name, version) to ToolContract
+    """
+
+    __slots__ = ("generation", "tools", "_entries", "_versions")
+
+    def __init__(
+        self,
+        generation: int,
+        entries: dict[ToolKey, _Entry],
+        versions: dict[str, VersionIndex],
+    ) -> None:
+        """Wrap structures that must not be mutated after this call.
+
+        Args:
+            generation: Snapshot generation number
+            entries: Contracts (or lazy declarations) by (name, version)
+            versions: Sorted version index per tool name
+        """
+        self.generation = generation
+        self.tools: Mapping[ToolKey, ToolContract] = _ContractView(entries)
+        self._entries = entries
+        self._versions = versions
+
+    @classmethod
+    def build(cls, generation: int, entries: Iterable[_Entry]) -> "RegistrySnapshot":
+        """Build a snapshot from scratch.
+
+        Raises:
+            ValueError: If the same name/version appears twice
+            SemVerError: If a version is not valid SemVer
+        """
+        return cls(generation, {}, {}).with_entries(entries, generation)
+
+    def with_entries(
+        self, entries: Iterable[_Entry], generation: int | None = None
+    ) -> "RegistrySnapshot":
+        """Return a new snapshot with entries added (copy-on-write).
+
+        Args:
+            entries: Contracts or lazy declarations to add
+            generation: Generation of the new snapshot (default: ours + 1)
+
+        Raises:
+            ValueError: If a name/version is already present
+            SemVerError: If a version is not valid SemVer
+        """
+        by_key = dict(self._entries)
+        versions = dict(self._versions)
+        copied: set[str] = set()
+        for entry in entries:
+            name, version_text = _key_of(entry)
+            key = (name, version_text)
+            if key in by_key:
+                raise ValueError(f"Tool '{name}' version '{version_text}' already registered")
+            version = parse_version(version_text)
+            by_key[key] = entry
+            if name not in copied:
+                # Copy only the indexes we touch; the rest are shared with self
+                existing = versions.get(name)
+                versions[name] = existing.copy() if existing is not None else VersionIndex()
+                copied.add(name)
+            versions[name].add(version)
+        if generation is None:
+            generation = self.generation + 1
+        return RegistrySnapshot(generation, by_key, versions)
+
+    def lookup(self, name: str, version: str) -> "ToolContract":
+        """Look up a tool by exact name and version.
+
+        Raises:
+            ToolNotFoundError: If tool not found in this snapshot
+            ManifestError, SchemaValidationError: If a lazy contract fails to load
+        """
+        entry = self._entries.get((name, version))
+        if entry is None:
+            raise ToolNotFoundError(name, version)
+        if entry.__class__ is _LazyContract:
+            return entry.get()
+        return entry  # type: ignore[return-value]
+
+    def resolve(self, name: str, spec: str = "latest") -> "ToolContract":
+        """Resolve a SemVer range to the highest matching version.
+
+        Raises:
+            ToolNotFoundError: If no version satisfies spec
+            SemVerError: If spec is not a valid range
+        """
+        version_range = parse_range(spec)
+        index = self._versions.get(name)
+        match = index.resolve(version_range) if index is not None else None
+
+        if match is None:
+            raise ToolNotFoundError(name, spec)
+
+        return self.lookup(name, str(match))
+
+    def list_versions(self, name: str) -> list[str]:
+        """Versions of a tool in ascending SemVer order (empty if unknown)."""
+        index = self._versions.get(name)
+        return [str(v) for v in index.versions()] if index is not None else []
+
+
+def _key_of(entry: _Entry) -> ToolKey:
+    """(name, version) of a contract or lazy declaration, without loading it."""
+    if entry.__class__ is _LazyContract:
+        source = entry.source
+        return (source.name, source.version)
+    return (entry.name, entry.version)  # type: ignore[union-attr]
+
+
 class ToolRegistry:
     """Central registry for tool contracts.
 
     Provides:
     - Registration of tools with name and version
-    - Lookup by name and version
+    - Lookup by name and exact version, or by SemVer range via resolve()
     - Enforces INV-01 by providing schemas for validation
+    - Precompiled input/output validators, cached per (name, version)
+    - Lock-free reads over copy-on-write snapshots; atomic hot reload
+    - Lazy contracts (ContractSource) parsed and compiled on first lookup
     """
 
-    def __init__(self) -> None:
-        """Initialize tool registry."""
-        # Storage: {(name, version): ToolContract}
-        self._tools: dict[tuple[str, str], ToolContract] = {}
+    def __init__(
+        self,
+        validator: SchemaValidator | None = None,
+        max_compiled: int = DEFAULT_MAX_COMPILED,
+    ) -> None:
+        """Initialize tool registry.
 
-    def register(self, tool: ToolContract) -> None:
+        Args:
+            validator: SchemaValidator used to compile and run tool schemas
+            max_compiled: Maximum number of tools whose compiled validators are
+                kept; the oldest compiled entries are evicted and recompiled on demand
+        """
+        if max_compiled < 1:
+            raise ValueError("max_compiled must be at least 1")
+
+        # Current published snapshot; replaced wholesale, never mutated
+        self._snapshot = RegistrySnapshot.build(0, [])
+        # Serializes writers only; readers never take it
+        self._write_lock = Lock()
+
+        self._validator = validator or SchemaValidator()
+        self._max_compiled = max_compiled
+        # Compile order, oldest first (hits never reorder it, so reads stay lock-free):
+        # {(name, version): (contract, compiled input, compiled output)}
+        self._compiled: OrderedDict[ToolKey, _CompiledEntry] = OrderedDict()
+        self._compiled_lock = Lock()
+
+    def snapshot(self) -> RegistrySnapshot:
+        """Return the current immutable snapshot.
+
+        Use one snapshot for a multi-step read (e.g. resolve then validate) to
+        get a consistent view across a concurrent reload.
+        """
+        return self._snapshot
+
+    def register(self, tool: Declaration) -> None:
         """Register a tool in the registry.
 
         Args:
-            tool: ToolContract to register
+            tool: ToolContract to register, or a ContractSource to load on
+                first lookup
 
         Raises:
             ValueError: If tool with same name/version already registered
+            SemVerError: If tool.version is not a valid SemVer string
+            SchemaValidationError: If input_schema or output_schema is malformed
         """
-        key = (tool.name, tool.version)
+        self.register_many([tool])
+
+    def register_many(self, tools: Iterable[Declaration]) -> None:
+        """Register several tools with a single snapshot swap.
 
-        if key in self._tools:
-            raise ValueError(f"Tool '{tool.name}' version '{tool.version}' already registered")
+        Either all tools are registered or none are. ContractSource entries
+        are indexed by name and version only; their schemas are checked on
+        first lookup.
 
-        self._tools[key] = tool
+        Args:
+            tools: ToolContracts and/or ContractSources to register
+
+        Raises:
+            ValueError: If any name/version is already registered or repeated
+            SemVerError: If any version is not a valid SemVer string
+            SchemaValidationError: If any eager contract's schema is malformed
+        """
+        entries, compiled = self._prepare(tools, self._compile)
+
+        with self._write_lock:
+            self._snapshot = self._snapshot.with_entries(entries)
+
+        for entry in compiled:
+            self._store_compiled(entry)
+
+    def reload(self, tools: Iterable[Declaration]) -> RegistrySnapshot:
+        """Atomically replace every registered tool.
+
+        Schema compilation happens before the writer lock is taken and SemVer
+        indexing before the swap; on any error the current snapshot stays in
+        place. Validators of contracts whose schemas did not change are reused.
+
+        Args:
+            tools: Complete new set of contracts and/or ContractSources
+
+        Returns:
+            The newly published snapshot
+
+        Raises:
+            ValueError: If a name/version appears twice
+            SemVerError: If a version is not valid SemVer
+            SchemaValidationError: If an eager contract's schema is malformed
+        """
+        entries, compiled = self._prepare(tools, self._recompile)
+
+        with self._write_lock:
+            snapshot = RegistrySnapshot.build(self._snapshot.generation + 1, entries)
+            self._snapshot = snapshot
+
+        for entry in compiled:
+            self._store_compiled(entry)
+        return snapshot
+
+    def reload_directory(self, directory: Path | str, lazy: bool = False) -> RegistrySnapshot:
+        """Atomically replace every registered tool with a manifest directory.
 
-    def lookup(self, name: str, version: str) -> ToolContract:
+        Args:
+            directory: Directory of `*.json` contract manifests
+            lazy: Index names/versions only and parse each contract on first
+                lookup, instead of validating everything before the swap
+
+        Returns:
+            The newly published snapshot
+
+        Raises:
+            ManifestError: If a manifest is unreadable or invalid
+            ValueError, SemVerError, SchemaValidationError: As for reload()
+        """
+        if lazy:
+            return self.reload(scan_manifest_dir(directory))
+        return self.reload(load_manifest_dir(directory))
+
+    def lookup(self, name: str, version: str) -> "ToolContract":
         """Look up a tool by name and version.
 
         Args:
@@ -71,17 +386,151 @@ class ToolRegistry:
         Raises:
             ToolNotFoundError: If tool not found in registry
         """
-        key = (name, version)
+        return self._snapshot.lookup(name, version)
 
-        if key not in self._tools:
-            raise ToolNotFoundError(name, version)
+    def resolve(self, name: str, spec: str = "latest") -> "ToolContract":
+        """Resolve a SemVer range to the highest matching registered version.
 
-        return self._tools[key]
+        Args:
+            name: Tool name
+            spec: "latest", exact "1.2.3", caret "^1.2", tilde "~1.2.3" or
+                partial "1.x" (see autobiz.kernel.executor.semver)
 
-    def list_tools(self) -> dict[tuple[str, str], ToolContract]:
+        Returns:
+            ToolContract for the highest matching version
+
+        Raises:
+            ToolNotFoundError: If no registered version satisfies spec
+            SemVerError: If spec is not a valid range
+        """
+        return self._snapshot.resolve(name, spec)
+
+    def list_versions(self, name: str) -> list[str]:
+        """List registered versions of a tool in ascending SemVer order.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Version strings (empty if the tool is unknown)
+        """
+        return self._snapshot.list_versions(name)
+
+    def list_tools(self) -> Mapping[tuple[str, str], "ToolContract"]:
         """List all registered tools.
 
         Returns:
-            Dictionary mapping (name, version) to ToolContract
+            Read-only mapping of (name, version) to ToolContract for the
+            current snapshot (no copy; later changes publish a new mapping)
+        """
+        return self._snapshot.tools
+
+    def validate_input(
+        self,
+        name: str,
+        version: str,
+        data: Any,
+        mode: ValidationMode = ValidationMode.FAIL_FAST,
+    ) -> None:
+        """Validate tool input against the tool's precompiled input schema.
+
+        Args:
+            name: Tool name
+            version: Tool version (SemVer string)
+            data: Tool call input
+            mode: FAIL_FAST (default) or FULL_REPORT for the rejection trace
+
+        Raises:
+            ToolNotFoundError: If tool not found in registry
+            SchemaValidationError: If input violates the schema (SCHEMA_INVALID)
         """
-        return self._tools.copy()
+        _, compiled_input, _ = self._get_compiled(name, version)
+        self._validator.validate_compiled(data, compiled_input, mode)
+
+    def validate_output(
+        self,
+        name: str,
+        version: str,
+        data: Any,
+        mode: ValidationMode = ValidationMode.FAIL_FAST,
+    ) -> None:
+        """Validate tool output against the tool's precompiled output schema.
+
+        Args:
+            name: Tool name
+            version: Tool version (SemVer string)
+            data: Tool call output
+            mode: FAIL_FAST (default) or FULL_REPORT for the rejection trace
+
+        Raises:
+            ToolNotFoundError: If tool not found in registry
+            SchemaValidationError: If output violates the schema (SCHEMA_INVALID)
+        """
+        _, _, compiled_output = self._get_compiled(name, version)
+        self._validator.validate_compiled(data, compiled_output, mode)
+
+    def _prepare(
+        self,
+        tools: Iterable[Declaration],
+        compile_one: Callable[["ToolContract"], _CompiledEntry],
+    ) -> tuple[list[_Entry], list[_CompiledEntry]]:
+        """Compile eager contracts and wrap sources, before any lock is taken."""
+        entries: list[_Entry] = []
+        compiled: list[_CompiledEntry] = []
+        for tool in tools:
+            if isinstance(tool, ContractSource):
+                entries.append(_LazyContract(tool, self._on_lazy_load))
+            else:
+                compiled.append(compile_one(tool))
+                entries.append(tool)
+        return entries, compiled
+
+    def _on_lazy_load(self, tool: "ToolContract") -> None:
+        """Compile a lazily loaded contract; raises if its schemas are malformed."""
+        self._store_compiled(self._compile(tool))
+
+    def _compile(self, tool: "ToolContract") -> _CompiledEntry:
+        """Compile a tool's input and output schemas."""
+        return (
+            tool,
+            self._validator.compile(tool.input_schema),
+            self._validator.compile(tool.output_schema),
+        )
+
+    def _recompile(self, tool: "ToolContract") -> _CompiledEntry:
+        """Compile a reloaded tool, reusing validators if its schemas are unchanged."""
+        cached = self._compiled.get((tool.name, tool.version))
+        if (
+            cached is not None
+            and cached[0].input_schema == tool.input_schema
+            and cached[0].output_schema == tool.output_schema
+        ):
+            return (tool, cached[1], cached[2])
+        return self._compile(tool)
+
+    def _get_compiled(self, name: str, version: str) -> _CompiledEntry:
+        """Return cached validators for the current contract, compiling if needed.
+
+        Lock-free on a hit. An entry compiled from a different contract object
+        (the tool was replaced by a reload) is treated as a miss.
+        """
+        tool = self._snapshot.lookup(name, version)
+        key = (name, version)
+
+        entry = self._compiled.get(key)
+        if entry is not None and entry[0] is tool:
+            return entry
+
+        entry = self._compile(tool)
+        self._store_compiled(entry)
+        return entry
+
+    def _store_compiled(self, entry: _CompiledEntry) -> None:
+        """Insert compiled validators, evicting the oldest compiled."""
+        tool = entry[0]
+        key = (tool.name, tool.version)
+        with self._compiled_lock:
+            self._compiled[key] = entry
+            self._compiled.move_to_end(key)
+            while len(self._compiled) > self._max_compiled:
+                self._compiled.popitem(last=False)
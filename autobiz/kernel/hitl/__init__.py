@@ -0,0 +1,32 @@
+"""HITL module: human approval requests and push delivery of decisions.
+
+Part of P1-TASK-16: HITL Approvals
+"""
+
+from autobiz.kernel.hitl.queue import (
+    CHANNEL,
+    QUEUE_NAME,
+    DecisionListener,
+    HitlDecision,
+    HitlQueue,
+    HitlRequest,
+    HitlStatus,
+    HitlStore,
+    InMemoryHitlStore,
+    PostgresHitlStore,
+    Verdict,
+)
+
+__all__ = [
+    "CHANNEL",
+    "QUEUE_NAME",
+    "DecisionListener",
+    "HitlDecision",
+    "HitlQueue",
+    "HitlRequest",
+    "HitlStatus",
+    "HitlStore",
+    "InMemoryHitlStore",
+    "PostgresHitlStore",
+    "Verdict",
+]
@@ -0,0 +1,588 @@
+"""HitlQueue: pending approvals with push delivery of decisions.
+
+Part of P1-TASK-16: HITL Approvals
+Requirements: INV-07, P1-R09
+
+A workflow that hits a HITL rule submits a request (hitl_requests,
+status PENDING) and parks on wait() until a human decides it or it times
+out. Decisions reach the parked workflows without polling:
+
+- One shared subscription per process: the store's decide() and expire()
+  emit a notification per decided request (Postgres: NOTIFY on the
+  hitl_decided channel, delivered at commit), and the queue resolves the
+  futures of every waiter on that request id
+- A sweeper expires requests past timeout_at in batches of sweep_batch
+  (idx_hitl_timeout, the partial index on PENDING rows), sleeping until
+  the earliest timeout rather than scanning on a fixed period
+- decide() settles many requests in one statement, for an approver
+  clearing a backlog
+- At most max_depth (hitl_pending_approvals: 1000) requests are PENDING
+  per tenant; submit() beyond that raises QueueFullError, so the caller
+  escalates instead of growing a queue no human will clear
+
+A notification can be missed (the listening connection dropped), so
+run() also re-reads the decisions of all parked requests every
+resync_interval, one query per batch of ids.
+"""
+
+import asyncio
+import json
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+from autobiz.kernel.config.queues import QUEUE_CONFIGS, QueueConfig, QueueFullError
+from autobiz.kernel.idempotency.receipts import utcnow
+
+if TYPE_CHECKING:
+    import asyncpg
+
+QUEUE_NAME = "hitl_pending_approvals"
+CHANNEL = "hitl_decided"
+SWEEPER = "hitl-sweeper"
+DEFAULT_SWEEP_BATCH = 500
+DEFAULT_RESYNC_INTERVAL = timedelta(seconds=30)
+# decision_reason carried in a notification (NOTIFY payloads are < 8000 bytes)
+NOTIFY_REASON_CHARS = 1000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+HitlStatus = Literal["PENDING", "APPROVED", "DENIED", "TIMED_OUT"]
+Verdict = Literal["APPROVED", "DENIED"]
+
+# hitl_requests.decision by final status
+_DECISION: dict[str, str] = {"APPROVED": "APPROVE", "DENIED": "DENY", "TIMED_OUT": "TIMEOUT"}
+
+
+@dataclass(frozen=True)
+class HitlRequest:
+    """An operation waiting for human approval.
+
+    Attributes:
+        tenant_id: Owning tenant
+        tool_name: Tool whose call is gated
+        tool_input: Tool arguments shown to the approver
+        execution_id: Paused execution
+        correlation_id: Correlation id of the run
+        rule_id: HITL rule that fired
+        rule_reason: Why the rule fired
+        timeout_at: When the request times out (None: never)
+        request_id: Request identifier (generated if not given)
+    """
+
+    tenant_id: str
+    tool_name: str
+    tool_input: Any
+    execution_id: str
+    correlation_id: str
+    rule_id: str
+    rule_reason: str | None = None
+    timeout_at: datetime | None = None
+    request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+
+@dataclass(frozen=True)
+class HitlDecision:
+    """Final outcome of a request.
+
+    Attributes:
+        request_id: Request identifier
+        tenant_id: Owning tenant
+        status: APPROVED, DENIED or TIMED_OUT
+        decided_by: Approver id (SWEEPER for timeouts)
+        decided_at: When it was decided
+        decision_reason: Approver's reason (in notifications, at most
+            NOTIFY_REASON_CHARS characters)
+    """
+
+    request_id: str
+    tenant_id: str
+    status: HitlStatus
+    decided_by: str
+    decided_at: datetime
+    decision_reason: str | None = None
+
+    @property
+    def approved(self) -> bool:
+        """True if the operation may proceed."""
+        return self.status == "APPROVED"
+
+
+# Called with each batch of decisions; its return value is ignored
+DecisionListener = Callable[[list[HitlDecision]], object]
+
+
+class HitlStore(Protocol):
+    """Persistence of HITL requests and decisions."""
+
+    async def create(self, request: HitlRequest, max_pending: int) -> bool:
+        """Insert a PENDING request unless its tenant has max_pending already."""
+        ...
+
+    async def decide(
+        self,
+        request_ids: Sequence[str],
+        status: Verdict,
+        decided_by: str,
+        decided_at: datetime,
+        reason: str | None,
+    ) -> list[HitlDecision]:
+        """Decide the requests still PENDING among request_ids, and notify."""
+        ...
+
+    async def expire(self, now: datetime, limit: int) -> list[HitlDecision]:
+        """Time out up to limit PENDING requests with timeout_at <= now, oldest first."""
+        ...
+
+    async def decisions(self, request_ids: Sequence[str]) -> list[HitlDecision]:
+        """Decisions of the requests among request_ids that are no longer PENDING."""
+        ...
+
+    async def next_timeout(self) -> datetime | None:
+        """Earliest timeout_at of a PENDING request."""
+        ...
+
+    async def listen(self, on_decided: DecisionListener) -> Callable[[], Awaitable[None]]:
+        """Subscribe to decisions; returns a coroutine function that unsubscribes."""
+        ...
+
+
+@dataclass
+class _Row:
+    request: HitlRequest
+    decision: HitlDecision | None = None
+
+
+class InMemoryHitlStore:
+    """In-memory HITL store for tests.
+
+    Listeners are called from the event loop after decide() or expire()
+    returns, as a committed NOTIFY would be delivered.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty store."""
+        self.rows: dict[str, _Row] = {}
+        self.queries = 0
+        self._listeners: list[DecisionListener] = []
+
+    async def create(self, request: HitlRequest, max_pending: int) -> bool:
+        """Insert a PENDING request unless its tenant is at max_pending."""
+        self.queries += 1
+        pending = sum(
+            1
+            for row in self.rows.values()
+            if row.decision is None and row.request.tenant_id == request.tenant_id
+        )
+        if pending >= max_pending:
+            return False
+        self.rows[request.request_id] = _Row(request)
+        return True
+
+    async def decide(
+        self,
+        request_ids: Sequence[str],
+        status: Verdict,
+        decided_by: str,
+        decided_at: datetime,
+        reason: str | None,
+    ) -> list[HitlDecision]:
+        """Decide the PENDING requests among request_ids."""
+        self.queries += 1
+        pending = [
+            row for row in map(self.rows.get, request_ids) if row is not None and not row.decision
+        ]
+        return self._settle(pending, status, decided_by, decided_at, reason)
+
+    async def expire(self, now: datetime, limit: int) -> list[HitlDecision]:
+        """Time out the oldest due PENDING requests."""
+        self.queries += 1
+        due = sorted(
+            (
+                row
+                for row in self.rows.values()
+                if row.decision is None
+                and row.request.timeout_at is not None
+                and row.request.timeout_at <= now
+            ),
+            key=lambda row: row.request.timeout_at or now,
+        )
+        return self._settle(due[:limit], "TIMED_OUT", SWEEPER, now, None)
+
+    async def decisions(self, request_ids: Sequence[str]) -> list[HitlDecision]:
+        """Decisions among request_ids."""
+        self.queries += 1
+        rows = (self.rows.get(request_id) for request_id in request_ids)
+        return [row.decision for row in rows if row is not None and row.decision is not None]
+
+    async def next_timeout(self) -> datetime | None:
+        """Earliest timeout_at of a PENDING request."""
+        self.queries += 1
+        timeouts = [
+            row.request.timeout_at
+            for row in self.rows.values()
+            if row.decision is None and row.request.timeout_at is not None
+        ]
+        return min(timeouts, default=None)
+
+    async def listen(self, on_decided: DecisionListener) -> Callable[[], Awaitable[None]]:
+        """Add a listener."""
+        self._listeners.append(on_decided)
+
+        async def unlisten() -> None:
+            self._listeners.remove(on_decided)
+
+        return unlisten
+
+    def _settle(
+        self,
+        rows: Iterable[_Row],
+        status: HitlStatus,
+        decided_by: str,
+        decided_at: datetime,
+        reason: str | None,
+    ) -> list[HitlDecision]:
+        decided = []
+        for row in rows:
+            row.decision = HitlDecision(
+                row.request.request_id,
+                row.request.tenant_id,
+                status,
+                decided_by,
+                decided_at,
+                reason,
+            )
+            decided.append(row.decision)
+        if decided:
+            loop = asyncio.get_running_loop()
+            for listener in self._listeners:
+                loop.call_soon(listener, decided)
+        return decided
+
+
+_LOCK_TENANT = "SELECT pg_advisory_xact_lock(hashtextextended('hitl_requests:' || $1, 0))"
+
+_CREATE = """
+    INSERT INTO hitl_requests
+        (request_id, tenant_id, tool_name, tool_input, execution_id, correlation_id,
+         rule_id, rule_reason, timeout_at)
+    SELECT $1::uuid, $2, $3, $4::jsonb, $5::uuid, $6, $7, $8, $9
+    WHERE (
+        SELECT COUNT(*) FROM hitl_requests WHERE tenant_id = $2 AND status = 'PENDING'
+    ) < $10
+"""
+
+# Selected from a data-modifying CTE, so pg_notify runs once per decided row.
+# decided_at travels as integer epoch microseconds: json_build_object renders
+# timestamptz as text ("...12:00:00.12+00") that fromisoformat() rejects on 3.10.
+_NOTIFIED = f"""
+    SELECT request_id::text AS request_id, tenant_id, status, decided_by, decided_at,
+           decision_reason,
+           pg_notify('{CHANNEL}', json_build_object(
+               'request_id', request_id, 'tenant_id', tenant_id, 'status', status,
+               'decided_by', decided_by,
+               'decided_at_us', (extract(epoch FROM decided_at) * 1000000)::bigint,
+               'decision_reason', left(decision_reason, {NOTIFY_REASON_CHARS})
+           )::text)
+"""
+
+_DECIDE = f"""
+    WITH decided AS (
+        UPDATE hitl_requests
+        SET status = $2, decision = $3, decided_by = $4, decided_at = $5, decision_reason = $6
+        WHERE request_id = ANY($1::uuid[]) AND status = 'PENDING'
+        RETURNING request_id, tenant_id, status, decided_by, decided_at, decision_reason
+    )
+    {_NOTIFIED}
+    FROM decided
+"""
+
+_EXPIRE = f"""
+    WITH due AS (
+        SELECT request_id FROM hitl_requests
+        WHERE status = 'PENDING' AND timeout_at <= $1
+        ORDER BY timeout_at
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    ), expired AS (
+        UPDATE hitl_requests h
+        SET status = 'TIMED_OUT', decision = '{_DECISION["TIMED_OUT"]}',
+            decided_by = '{SWEEPER}', decided_at = $1
+        FROM due
+        WHERE h.request_id = due.request_id AND h.status = 'PENDING'
+        RETURNING h.request_id, h.tenant_id, h.status, h.decided_by, h.decided_at,
+                  h.decision_reason
+    )
+    {_NOTIFIED}
+    FROM expired
+"""
+
+_DECISIONS = """
+    SELECT request_id::text AS request_id, tenant_id, status, decided_by, decided_at,
+           decision_reason
+    FROM hitl_requests
+    WHERE request_id = ANY($1::uuid[]) AND status <> 'PENDING'
+"""
+
+_NEXT_TIMEOUT = "SELECT MIN(timeout_at) FROM hitl_requests WHERE status = 'PENDING'"
+
+
+class PostgresHitlStore:
+    """hitl_requests with LISTEN/NOTIFY on the hitl_decided channel."""
+
+    def __init__(self, pool: "asyncpg.Pool") -> None:
+        """Initialize store.
+
+        Args:
+            pool: asyncpg connection pool
+        """
+        self._pool = pool
+
+    async def create(self, request: HitlRequest, max_pending: int) -> bool:
+        """Insert under a per-tenant advisory lock, so the bound holds across processes."""
+        async with self._pool.acquire() as conn, conn.transaction():
+            await conn.execute(_LOCK_TENANT, request.tenant_id)
+            status = await conn.execute(
+                _CREATE,
+                request.request_id,
+                request.tenant_id,
+                request.tool_name,
+                json.dumps(request.tool_input),
+                request.execution_id,
+                request.correlation_id,
+                request.rule_id,
+                request.rule_reason,
+                request.timeout_at,
+                max_pending,
+            )
+        # "INSERT 0 <rows>"
+        return bool(status.split()[-1] == "1")
+
+    async def decide(
+        self,
+        request_ids: Sequence[str],
+        status: Verdict,
+        decided_by: str,
+        decided_at: datetime,
+        reason: str | None,
+    ) -> list[HitlDecision]:
+        """One UPDATE for all request_ids (primary key)."""
+        rows = await self._pool.fetch(
+            _DECIDE, list(request_ids), status, _DECISION[status], decided_by, decided_at, reason
+        )
+        return [_decision(row) for row in rows]
+
+    async def expire(self, now: datetime, limit: int) -> list[HitlDecision]:
+        """One UPDATE of the oldest due rows (idx_hitl_timeout).
+
+        Rows locked by a concurrent sweeper are skipped, not waited for.
+        """
+        rows = await self._pool.fetch(_EXPIRE, now, limit)
+        return [_decision(row) for row in rows]
+
+    async def decisions(self, request_ids: Sequence[str]) -> list[HitlDecision]:
+        """Decided rows among request_ids (primary key)."""
+        rows = await self._pool.fetch(_DECISIONS, list(request_ids))
+        return [_decision(row) for row in rows]
+
+    async def next_timeout(self) -> datetime | None:
+        """MIN(timeout_at) over PENDING rows (idx_hitl_timeout)."""
+        value: datetime | None = await self._pool.fetchval(_NEXT_TIMEOUT)
+        return value
+
+    async def listen(self, on_decided: DecisionListener) -> Callable[[], Awaitable[None]]:
+        """LISTEN on a connection held until unsubscribed."""
+        conn = await self._pool.acquire()
+
+        def notified(_conn: Any, _pid: int, _channel: str, payload: str) -> None:
+            data = json.loads(payload)
+            data["decided_at"] = _EPOCH + timedelta(microseconds=data.pop("decided_at_us"))
+            on_decided([_decision(data)])
+
+        await conn.add_listener(CHANNEL, notified)
+
+        async def unlisten() -> None:
+            try:
+                await conn.remove_listener(CHANNEL, notified)
+            finally:
+                await self._pool.release(conn)
+
+        return unlisten
+
+
+def _decision(row: Any) -> HitlDecision:
+    return HitlDecision(
+        request_id=row["request_id"],
+        tenant_id=row["tenant_id"],
+        status=row["status"],
+        decided_by=row["decided_by"],
+        decided_at=row["decided_at"],
+        decision_reason=row["decision_reason"],
+    )
+
+
+class HitlQueue:
+    """Submits HITL requests and resumes their waiters when decided.
+
+    Use from one event loop; call start() before wait().
+    """
+
+    def __init__(
+        self,
+        store: HitlStore,
+        queue: QueueConfig = QUEUE_CONFIGS[QUEUE_NAME],
+        sweep_batch: int = DEFAULT_SWEEP_BATCH,
+        resync_interval: timedelta = DEFAULT_RESYNC_INTERVAL,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        """Initialize queue.
+
+        Args:
+            store: Request persistence and notifications
+            queue: max_depth is the per-tenant bound on PENDING requests
+            sweep_batch: Requests timed out per statement
+            resync_interval: How often run() re-reads parked requests'
+                decisions, in case a notification was missed
+            clock: Aware-UTC clock
+        """
+        if sweep_batch <= 0:
+            raise ValueError("sweep_batch must be positive")
+        self.queue = queue
+        self._store = store
+        self._sweep_batch = sweep_batch
+        self._resync_interval = resync_interval
+        self._clock = clock
+        self._waiters: dict[str, list[asyncio.Future[HitlDecision]]] = {}
+        self._unlisten: Callable[[], Awaitable[None]] | None = None
+        self._next_wake: datetime | None = None
+        self._armed = asyncio.Event()
+
+    @property
+    def parked(self) -> int:
+        """Requests with at least one waiter."""
+        return len(self._waiters)
+
+    async def start(self) -> None:
+        """Subscribe to decisions (once per queue)."""
+        if self._unlisten is None:
+            self._unlisten = await self._store.listen(self._resolve)
+
+    async def close(self) -> None:
+        """Unsubscribe; parked waiters stay parked."""
+        if self._unlisten is not None:
+            unlisten, self._unlisten = self._unlisten, None
+            await unlisten()
+
+    async def submit(self, request: HitlRequest) -> HitlRequest:
+        """Store a PENDING request.
+
+        Raises:
+            QueueFullError: If the tenant already has max_depth PENDING
+                requests (escalate rather than queue)
+        """
+        if not await self._store.create(request, self.queue.max_depth):
+            raise QueueFullError(QUEUE_NAME, self.queue.max_depth, self.queue.max_depth)
+        timeout_at = request.timeout_at
+        if timeout_at is not None and (self._next_wake is None or timeout_at < self._next_wake):
+            self._next_wake = timeout_at
+            self._armed.set()
+        return request
+
+    async def wait(self, request_id: str) -> HitlDecision:
+        """Park until request_id is decided or times out."""
+        future: asyncio.Future[HitlDecision] = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(request_id, []).append(future)
+        try:
+            # Decided before this waiter subscribed: no notification will come
+            self._resolve(await self._store.decisions([request_id]))
+            return await future
+        finally:
+            waiters = self._waiters.get(request_id)
+            if waiters is not None and future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[request_id]
+
+    async def decide(
+        self,
+        request_ids: Sequence[str],
+        status: Verdict,
+        decided_by: str,
+        reason: str | None = None,
+    ) -> list[HitlDecision]:
+        """Approve or deny many requests at once.
+
+        Args:
+            request_ids: Requests to decide
+            status: APPROVED or DENIED
+            decided_by: Approver id
+            reason: Approver's reason
+
+        Returns:
+            Decisions of the requests that were still PENDING (others were
+            decided or timed out already)
+        """
+        if status not in ("APPROVED", "DENIED"):
+            raise ValueError(f"cannot decide a request as {status}")
+        decided = await self._store.decide(
+            list(dict.fromkeys(request_ids)), status, decided_by, self._clock(), reason
+        )
+        self._resolve(decided)
+        return decided
+
+    async def sweep(self, now: datetime | None = None) -> list[HitlDecision]:
+        """Time out every request due by now, sweep_batch per statement."""
+        now = now if now is not None else self._clock()
+        expired: list[HitlDecision] = []
+        while True:
+            batch = await self._store.expire(now, self._sweep_batch)
+            self._resolve(batch)
+            expired.extend(batch)
+            if len(batch) < self._sweep_batch:
+                return expired
+
+    async def resync(self) -> int:
+        """Resolve parked waiters from stored decisions; returns waiters resumed."""
+        resumed = 0
+        request_ids = list(self._waiters)
+        for offset in range(0, len(request_ids), self._sweep_batch):
+            decided = await self._store.decisions(request_ids[offset : offset + self._sweep_batch])
+            resumed += self._resolve(decided)
+        return resumed
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Sweep timeouts as they fall due, and resync, until stop is set."""
+        stopping = asyncio.ensure_future(stop.wait())
+        next_resync = self._clock() + self._resync_interval
+        try:
+            while not stop.is_set():
+                self._armed.clear()
+                await self.sweep()
+                now = self._clock()
+                if now >= next_resync:
+                    await self.resync()
+                    next_resync = now + self._resync_interval
+                self._next_wake = await self._store.next_timeout()
+                wake = next_resync
+                if self._next_wake is not None and self._next_wake < wake:
+                    wake = self._next_wake
+                armed = asyncio.ensure_future(self._armed.wait())
+                await asyncio.wait(
+                    {stopping, armed},
+                    timeout=max(0.0, (wake - self._clock()).total_seconds()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                armed.cancel()
+        finally:
+            stopping.cancel()
+
+    def _resolve(self, decisions: Iterable[HitlDecision]) -> int:
+        resumed = 0
+        for decision in decisions:
+            for future in self._waiters.pop(decision.request_id, ()):
+                if not future.done():
+                    future.set_result(decision)
+                    resumed += 1
+        return resumed
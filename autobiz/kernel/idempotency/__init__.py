@@ -0,0 +1,52 @@
+"""Idempotency module: fingerprints, keys, receipts and deduplication (INV-05).
+
+Part of P1-TASK-13: Idempotency Manager
+"""
+
+from autobiz.kernel.idempotency.hot_tier import HotTier, InMemoryHotTier, RedisHotTier
+from autobiz.kernel.idempotency.jcs import CanonicalizationError, canonicalize, feed_canonical
+from autobiz.kernel.idempotency.keys import (
+    IdempotencyKey,
+    build_key,
+    build_keys,
+    external_key,
+    fingerprint,
+    fingerprint_many,
+    fingerprint_streaming,
+)
+from autobiz.kernel.idempotency.manager import (
+    ExecutionInProgressError,
+    IdempotencyManager,
+    IdempotencyStats,
+    IdempotentResult,
+)
+from autobiz.kernel.idempotency.receipts import (
+    InMemoryReceiptStore,
+    PostgresReceiptStore,
+    Receipt,
+    ReceiptStore,
+)
+
+__all__ = [
+    "CanonicalizationError",
+    "canonicalize",
+    "feed_canonical",
+    "IdempotencyKey",
+    "build_key",
+    "build_keys",
+    "external_key",
+    "fingerprint",
+    "fingerprint_many",
+    "fingerprint_streaming",
+    "ExecutionInProgressError",
+    "IdempotencyManager",
+    "IdempotencyStats",
+    "IdempotentResult",
+    "Receipt",
+    "ReceiptStore",
+    "InMemoryReceiptStore",
+    "PostgresReceiptStore",
+    "HotTier",
+    "InMemoryHotTier",
+    "RedisHotTier",
+]
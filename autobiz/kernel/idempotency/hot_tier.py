@@ -0,0 +1,92 @@
+"""Hot tier: shared, short-lived receipt cache in front of PostgreSQL.
+
+Part of P1-TASK-13: Idempotency Manager
+Requirements: INV-05, P1-R06
+
+Per §2 Idempotency Key Specification: Redis (hot, 25h TTL) + PostgreSQL
+(cold, permanent). The tier only needs GET and SET-with-expiry, so any
+Redis-protocol server works; InMemoryHotTier stands in for tests and
+benchmarks.
+"""
+
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+# 24h lookback + 1h buffer
+HOT_TTL_SECONDS = 25 * 60 * 60
+
+KEY_PREFIX = "autobiz:idem:"
+
+
+class HotTier(Protocol):
+    """Async key/value cache with per-key expiry."""
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the cached value, or None if absent or expired."""
+        ...
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Cache value under key for ttl_seconds."""
+        ...
+
+
+class RedisHotTier:
+    """HotTier backed by a redis.asyncio client."""
+
+    def __init__(self, client: "Redis", prefix: str = KEY_PREFIX) -> None:
+        """Initialize tier.
+
+        Args:
+            client: redis.asyncio.Redis client (decode_responses=False)
+            prefix: Namespace prepended to every key
+        """
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> bytes | None:
+        """GET prefix+key."""
+        value = await self._client.get(self._prefix + key)
+        return value if value is None or isinstance(value, bytes) else value.encode()
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """SET prefix+key value EX ttl_seconds."""
+        await self._client.set(self._prefix + key, value, ex=ttl_seconds)
+
+
+class InMemoryHotTier:
+    """Process-local HotTier with Redis-like expiry semantics.
+
+    Attributes:
+        round_trips: Number of get/set calls served (simulated network round-trips)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an empty tier.
+
+        Args:
+            clock: Seconds clock used for expiry
+        """
+        self._clock = clock
+        self._values: dict[str, tuple[bytes, float]] = {}
+        self.round_trips = 0
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the cached value, or None if absent or expired."""
+        self.round_trips += 1
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if self._clock() >= expires_at:
+            del self._values[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Cache value under key for ttl_seconds."""
+        self.round_trips += 1
+        self._values[key] = (value, self._clock() + ttl_seconds)
@@ -0,0 +1,267 @@
+"""RFC 8785 JSON Canonicalization Scheme (JCS).
+
+Part of P1-TASK-13: Idempotency Manager
+Requirements: INV-05, P1-R06
+
+Canonical form:
+- Object members sorted by key, comparing keys as UTF-16 code units
+- No insignificant whitespace
+- Strings: only '"', '\\' and U+0000..U+001F escaped (short forms where
+  JSON has them, otherwise lowercase \\u00xx); everything else as UTF-8
+- Numbers: IEEE 754 doubles serialized like ECMAScript Number.toString()
+- Output is UTF-8
+
+Input must be I-JSON: NaN/Infinity, lone surrogates, non-string keys and
+integers that a double cannot hold exactly (|n| > 2**53) are rejected
+rather than silently changed - two distinct order amounts must never
+canonicalize to the same bytes.
+
+canonicalize() returns the full bytes. feed_canonical() pushes the same
+bytes to a sink in bounded-size chunks, so hashing never materializes the
+whole document; fingerprinting feeds those chunks straight into SHA-256.
+"""
+
+from collections.abc import Callable
+from json.encoder import encode_basestring
+from typing import Any
+
+# Largest magnitude an integer may have and still be exact as a double
+MAX_EXACT_INTEGER = 2**53
+
+# Text fragments accumulated before a chunk is encoded and handed to the sink
+DEFAULT_CHUNK_PARTS = 8192
+
+
+class CanonicalizationError(ValueError):
+    """Raised when a value cannot be represented in RFC 8785 canonical form."""
+
+
+def canonicalize(value: Any) -> bytes:
+    """Serialize a JSON value to RFC 8785 canonical UTF-8 bytes.
+
+    Args:
+        value: dict/list/tuple/str/int/float/bool/None tree
+
+    Returns:
+        Canonical JSON bytes
+
+    Raises:
+        CanonicalizationError: If value is not representable as I-JSON
+    """
+    parts: list[str] = []
+    _Writer(parts, None).write(value)
+    return _encode("".join(parts))
+
+
+def feed_canonical(
+    value: Any,
+    sink: Callable[[bytes], object],
+    chunk_parts: int = DEFAULT_CHUNK_PARTS,
+) -> None:
+    """Push the canonical form of value into sink in UTF-8 chunks.
+
+    Typical sink: hashlib.sha256().update. The concatenated chunks equal
+    canonicalize(value); at most about chunk_parts fragments are buffered.
+
+    Args:
+        value: JSON value tree
+        sink: Called with each encoded chunk, in order
+        chunk_parts: Fragments (tokens, strings, numbers) per chunk
+
+    Raises:
+        CanonicalizationError: If value is not representable as I-JSON
+    """
+    parts: list[str] = []
+
+    def spill() -> None:
+        sink(_encode("".join(parts)))
+        parts.clear()
+
+    _Writer(parts, spill, chunk_parts).write(value)
+    if parts:
+        spill()
+
+
+def _encode(text: str) -> bytes:
+    try:
+        return text.encode("utf-8")
+    except UnicodeEncodeError as e:
+        raise CanonicalizationError(f"String contains a lone surrogate: {e}") from None
+
+
+class _Writer:
+    """Appends canonical text fragments to a list, spilling when it grows."""
+
+    __slots__ = ("_parts", "_spill", "_limit")
+
+    def __init__(
+        self,
+        parts: list[str],
+        spill: Callable[[], None] | None,
+        limit: int = DEFAULT_CHUNK_PARTS,
+    ) -> None:
+        self._parts = parts
+        self._spill = spill
+        self._limit = limit
+
+    def write(self, value: Any) -> None:
+        """Append the canonical text of any JSON value."""
+        parts = self._parts
+        # Exact type checks first: they cover nearly every value and are cheapest
+        cls = value.__class__
+        if cls is str:
+            parts.append(encode_basestring(value))
+        elif cls is dict:
+            self._write_object(value)
+        elif cls is list or cls is tuple:
+            self._write_array(value)
+        else:
+            parts.append(_scalar(value))
+
+    def _write_array(self, items: list[Any] | tuple[Any, ...]) -> None:
+        parts = self._parts
+        append = parts.append
+        append("[")
+        first = True
+        for item in items:
+            if first:
+                first = False
+            else:
+                append(",")
+            cls = item.__class__
+            if cls is str:
+                append(encode_basestring(item))
+            elif cls is dict or cls is list or cls is tuple:
+                self.write(item)
+            else:
+                append(_scalar(item))
+        append("]")
+        self._maybe_spill()
+
+    def _write_object(self, value: dict[Any, Any]) -> None:
+        keys = list(value)
+        for key in keys:
+            if key.__class__ is not str and not isinstance(key, str):
+                raise CanonicalizationError(f"Object key {key!r} is not a string")
+        if all(key.isascii() for key in keys):
+            # ASCII: code point order is UTF-16 code unit order
+            keys.sort()
+        else:
+            keys.sort(key=_utf16_key)
+
+        parts = self._parts
+        append = parts.append
+        append("{")
+        first = True
+        for key in keys:
+            if first:
+                first = False
+            else:
+                append(",")
+            append(encode_basestring(key))
+            append(":")
+            item = value[key]
+            cls = item.__class__
+            if cls is str:
+                append(encode_basestring(item))
+            elif cls is dict or cls is list or cls is tuple:
+                self.write(item)
+            else:
+                append(_scalar(item))
+        append("}")
+        self._maybe_spill()
+
+    def _maybe_spill(self) -> None:
+        if self._spill is not None and len(self._parts) >= self._limit:
+            self._spill()
+
+
+def _scalar(value: Any) -> str:
+    """Canonical text of a non-container value (or a container subclass)."""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    cls = value.__class__
+    if cls is int:
+        return _format_int(value)
+    if cls is float:
+        return format_number(value)
+    # Subclasses (str/int/float enums, OrderedDict, ...) take the slow path
+    if isinstance(value, str):
+        return encode_basestring(str(value))
+    if isinstance(value, int):
+        return _format_int(int(value))
+    if isinstance(value, float):
+        return format_number(float(value))
+    if isinstance(value, (dict, list, tuple)):
+        parts: list[str] = []
+        writer = _Writer(parts, None)
+        if isinstance(value, dict):
+            writer.write(dict(value))
+        else:
+            writer.write(list(value))
+        return "".join(parts)
+    raise CanonicalizationError(f"Type {cls.__name__} is not JSON-serializable")
+
+
+def _utf16_key(key: str) -> bytes:
+    """Sort key comparing strings by UTF-16 code units (big-endian bytes)."""
+    return key.encode("utf-16-be", "surrogatepass")
+
+
+def _format_int(value: int) -> str:
+    if -MAX_EXACT_INTEGER <= value <= MAX_EXACT_INTEGER:
+        return str(value)
+    raise CanonicalizationError(
+        f"Integer {value} cannot be represented exactly as an IEEE 754 double"
+    )
+
+
+def format_number(value: float) -> str:
+    """Format a double exactly as ECMAScript Number.prototype.toString().
+
+    Args:
+        value: Finite float
+
+    Returns:
+        Shortest round-tripping decimal, in ES layout
+
+    Raises:
+        CanonicalizationError: If value is NaN or infinite
+    """
+    if value != value or value in (float("inf"), float("-inf")):
+        raise CanonicalizationError(f"{value} is not a valid JSON number")
+    if value == 0:
+        return "0"  # Covers -0.0
+    if value.is_integer() and -MAX_EXACT_INTEGER <= value <= MAX_EXACT_INTEGER:
+        return str(int(value))
+
+    # repr() gives the shortest round-tripping digits, same as ES. Without an
+    # exponent (1e-4 <= |value| < 1e16) its layout is already ES layout too.
+    text = repr(value)
+    if "e" not in text:
+        return text
+
+    sign = "-" if value < 0 else ""
+    mantissa, _, exponent_text = text.lstrip("-").partition("e")
+    integer_part, _, fraction_part = mantissa.partition(".")
+    digits = integer_part + fraction_part
+    # n: position of the decimal point relative to the start of digits
+    point = len(integer_part) + (int(exponent_text) if exponent_text else 0)
+    stripped = digits.lstrip("0")
+    point -= len(digits) - len(stripped)
+    digits = stripped.rstrip("0")
+    k = len(digits)
+
+    if k <= point <= 21:
+        return sign + digits + "0" * (point - k)
+    if 0 < point <= 21:
+        return sign + digits[:point] + "." + digits[point:]
+    if -6 < point <= 0:
+        return sign + "0." + "0" * -point + digits
+    exponent = point - 1
+    fraction = "." + digits[1:] if k > 1 else ""
+    return f"{sign}{digits[0]}{fraction}e{'+' if exponent >= 0 else '-'}{abs(exponent)}"
@@ -0,0 +1,195 @@
+"""Idempotency keys and parameter fingerprints (INV-05).
+
+Part of P1-TASK-13: Idempotency Manager
+Requirements: INV-05, P1-R06
+
+Internal key: {tenant_id}:{tool_name}:{tool_version}:{principal_id}:{fingerprint}
+  fingerprint = sha256(JCS(params)).hexdigest()[:32]
+External key: autobiz:{sha256(internal_key).hexdigest()[:32]}
+
+tenant_id, tool_name and tool_version may not contain ':'; principal_id
+may, since the fingerprint has a fixed width and the key still splits
+unambiguously.
+"""
+
+import hashlib
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from autobiz.kernel.idempotency.jcs import canonicalize, feed_canonical
+
+# Hex characters kept from each SHA-256 digest (128 bits)
+FINGERPRINT_HEX_CHARS = 32
+
+EXTERNAL_KEY_PREFIX = "autobiz:"
+
+
+def fingerprint(params: Any) -> str:
+    """Fingerprint tool params: sha256 of their RFC 8785 form, truncated.
+
+    Args:
+        params: JSON-compatible tool parameters
+
+    Returns:
+        32 lowercase hex characters
+
+    Raises:
+        CanonicalizationError: If params are not representable as I-JSON
+    """
+    return hashlib.sha256(canonicalize(params)).hexdigest()[:FINGERPRINT_HEX_CHARS]
+
+
+def fingerprint_streaming(params: Any) -> str:
+    """Same result as fingerprint(), without holding the canonical form in memory.
+
+    Use for very large payloads (bulk imports, catalog syncs); for typical
+    params fingerprint() is faster.
+
+    Raises:
+        CanonicalizationError: If params are not representable as I-JSON
+    """
+    digest = hashlib.sha256()
+    feed_canonical(params, digest.update)
+    return digest.hexdigest()[:FINGERPRINT_HEX_CHARS]
+
+
+def fingerprint_many(params_list: Iterable[Any]) -> list[str]:
+    """Fingerprint many param sets.
+
+    Args:
+        params_list: Param sets, in order
+
+    Returns:
+        One fingerprint per param set, in input order
+
+    Raises:
+        CanonicalizationError: If any param set is not representable as I-JSON
+    """
+    sha256 = hashlib.sha256
+    width = FINGERPRINT_HEX_CHARS
+    return [sha256(canonicalize(params)).hexdigest()[:width] for params in params_list]
+
+
+def external_key(internal_key: str) -> str:
+    """Derive the fixed-length provider key for an internal key.
+
+    Args:
+        internal_key: Internal idempotency key
+
+    Returns:
+        "autobiz:" followed by 32 hex characters (40 characters total)
+    """
+    digest = hashlib.sha256(internal_key.encode("utf-8")).hexdigest()
+    return EXTERNAL_KEY_PREFIX + digest[:FINGERPRINT_HEX_CHARS]
+
+
+@dataclass(frozen=True)
+class IdempotencyKey:
+    """Components of an INV-05 idempotency key.
+
+    Attributes:
+        tenant_id: Tenant the call runs for
+        tool_name: Tool name
+        tool_version: Tool version (SemVer)
+        principal_id: Acting principal (user, agent or workflow)
+        fingerprint: Params fingerprint
+        internal: Full internal key
+    """
+
+    tenant_id: str
+    tool_name: str
+    tool_version: str
+    principal_id: str
+    fingerprint: str
+    internal: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Validate components and assemble the internal key."""
+        for label, value in (
+            ("tenant_id", self.tenant_id),
+            ("tool_name", self.tool_name),
+            ("tool_version", self.tool_version),
+        ):
+            if not value or ":" in value:
+                raise ValueError(f"{label} must be non-empty and must not contain ':'")
+        if not self.principal_id:
+            raise ValueError("principal_id must be non-empty")
+        internal = ":".join(
+            (
+                self.tenant_id,
+                self.tool_name,
+                self.tool_version,
+                self.principal_id,
+                self.fingerprint,
+            )
+        )
+        object.__setattr__(self, "internal", internal)
+
+    @property
+    def external(self) -> str:
+        """Provider-safe external key derived from the internal key."""
+        return external_key(self.internal)
+
+    def template_fields(self) -> dict[str, str]:
+        """Fields available to ToolContract key templates."""
+        internal_sha256 = external_key(self.internal)[len(EXTERNAL_KEY_PREFIX) :]
+        return {
+            "tenant_id": self.tenant_id,
+            "tool_name": self.tool_name,
+            "tool_version": self.tool_version,
+            "principal_id": self.principal_id,
+            "params_fingerprint": self.fingerprint,
+            "internal_key": self.internal,
+            "internal_key_sha256": internal_sha256,
+        }
+
+    def render(self, template: str) -> str:
+        """Render an idempotency_key_template / external_idempotency_template.
+
+        Args:
+            template: str.format template over template_fields(), e.g.
+                "autobiz:{internal_key_sha256}"
+
+        Returns:
+            Rendered key
+
+        Raises:
+            KeyError: If the template references an unknown field
+        """
+        return template.format_map(self.template_fields())
+
+
+def build_key(
+    tenant_id: str,
+    tool_name: str,
+    tool_version: str,
+    principal_id: str,
+    params: Any,
+) -> IdempotencyKey:
+    """Build the idempotency key for one tool call.
+
+    Raises:
+        CanonicalizationError: If params are not representable as I-JSON
+        ValueError: If a key component is empty or contains ':'
+    """
+    return IdempotencyKey(tenant_id, tool_name, tool_version, principal_id, fingerprint(params))
+
+
+def build_keys(
+    tenant_id: str,
+    tool_name: str,
+    tool_version: str,
+    principal_id: str,
+    params_list: Iterable[Mapping[str, Any]],
+) -> list[IdempotencyKey]:
+    """Build keys for many calls of one tool by one principal.
+
+    Raises:
+        CanonicalizationError: If any param set is not representable as I-JSON
+        ValueError: If a key component is empty or contains ':'
+    """
+    return [
+        IdempotencyKey(tenant_id, tool_name, tool_version, principal_id, fp)
+        for fp in fingerprint_many(params_list)
+    ]
@@ -0,0 +1,290 @@
+"""IdempotencyManager: deduplicate side-effecting tool calls (INV-05).
+
+Part of P1-TASK-13: Idempotency Manager
+Requirements: INV-05, P1-R06
+
+Lookup order for a key, cheapest first:
+1. In-process LRU of recently seen receipts
+2. In-flight table: a concurrent call with the same key is already
+   executing; wait for its outcome instead of executing again
+3. Hot tier (Redis protocol, 25h TTL)
+4. ReceiptStore (PostgreSQL receipts table)
+5. Claim the key with a PENDING receipt (insert_receipt() serializes
+   writers per key, so exactly one claim wins across processes), execute,
+   finalize the receipt as COMPLETED and populate both caches
+
+Step 2 (single-flight) means a burst of N identical webhook retries costs
+one store lookup and one claim rather than N of each. A caller that finds
+another process's PENDING claim polls the store until it is finalized;
+a failed or cancelled execution releases its claim, so the key can run
+again. A claim left PENDING by a crashed worker blocks the key until it
+expires (ExecutionInProgressError): whether the side effect happened is
+unknown, and INV-05 must not guess. A manager is bound to one asyncio
+event loop.
+"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any
+
+from autobiz.kernel.idempotency.hot_tier import HOT_TTL_SECONDS, HotTier
+from autobiz.kernel.idempotency.keys import IdempotencyKey
+from autobiz.kernel.idempotency.receipts import LOOKBACK, Receipt, ReceiptStore, utcnow
+
+DEFAULT_LOCAL_CAPACITY = 10_000
+
+# How long to wait for another process's PENDING claim to be finalized
+DEFAULT_PENDING_TIMEOUT = 30.0
+_PENDING_POLL_MIN = 0.05
+_PENDING_POLL_MAX = 1.0
+
+
+class ExecutionInProgressError(RuntimeError):
+    """Raised when another worker's claim on a key stays PENDING too long.
+
+    Attributes:
+        internal_key: Idempotency key that is still claimed
+    """
+
+    def __init__(self, internal_key: str) -> None:
+        """Initialize error.
+
+        Args:
+            internal_key: Idempotency key that is still claimed
+        """
+        super().__init__(f"execution for {internal_key} is still in progress elsewhere")
+        self.internal_key = internal_key
+
+
+@dataclass(frozen=True)
+class IdempotentResult:
+    """Outcome of IdempotencyManager.execute().
+
+    Attributes:
+        receipt: Receipt of the execution whose result is returned
+        duplicate: True if this call did not execute (cached or coalesced)
+        source: Where the receipt came from: "executed", "local", "inflight",
+            "hot" or "store"
+    """
+
+    receipt: Receipt
+    duplicate: bool
+    source: str
+
+    @property
+    def result(self) -> Any:
+        """Tool result (the first execution's, for duplicates)."""
+        return self.receipt.result
+
+
+@dataclass
+class IdempotencyStats:
+    """Counters for idempotency_hit/miss telemetry."""
+
+    local_hits: int = 0
+    coalesced: int = 0
+    hot_hits: int = 0
+    store_hits: int = 0
+    executed: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        """Calls answered without executing."""
+        return self.local_hits + self.coalesced + self.hot_hits + self.store_hits
+
+
+class IdempotencyManager:
+    """Two-tier receipt cache with single-flight execution."""
+
+    def __init__(
+        self,
+        store: ReceiptStore,
+        hot: HotTier | None = None,
+        local_capacity: int = DEFAULT_LOCAL_CAPACITY,
+        lookback: timedelta = LOOKBACK,
+        hot_ttl_seconds: int = HOT_TTL_SECONDS,
+        clock: Callable[[], datetime] = utcnow,
+        pending_timeout: float = DEFAULT_PENDING_TIMEOUT,
+    ) -> None:
+        """Initialize manager.
+
+        Args:
+            store: Durable receipt store
+            hot: Shared hot tier, or None to skip it
+            local_capacity: Receipts kept in the in-process LRU
+            lookback: Window in which a key suppresses re-execution
+            hot_ttl_seconds: Expiry for hot-tier entries
+            clock: Aware-UTC clock
+            pending_timeout: Seconds to wait for another process's claim
+        """
+        if local_capacity < 1:
+            raise ValueError("local_capacity must be at least 1")
+        self._store = store
+        self._hot = hot
+        self._local: OrderedDict[str, Receipt] = OrderedDict()
+        self._local_capacity = local_capacity
+        self._inflight: dict[str, asyncio.Future[Receipt]] = {}
+        self._lookback = lookback
+        self._hot_ttl = hot_ttl_seconds
+        self._clock = clock
+        self._pending_timeout = pending_timeout
+        self.stats = IdempotencyStats()
+
+    async def execute(
+        self,
+        key: IdempotencyKey,
+        run: Callable[[], Awaitable[Any]],
+        *,
+        external_provider: str | None = None,
+    ) -> IdempotentResult:
+        """Run a side effect at most once per key within the lookback window.
+
+        Args:
+            key: Idempotency key for the call
+            run: Coroutine factory performing the side effect; returns the result
+            external_provider: Provider name, to record the external key (FINANCIAL)
+
+        Returns:
+            IdempotentResult with the receipt of the (single) execution
+
+        Raises:
+            ExecutionInProgressError: If another process holds the key's claim
+                for longer than pending_timeout
+            Exception: Whatever run() raises; concurrent duplicates waiting on
+                this execution receive the same exception, and nothing is cached
+        """
+        # The internal key already starts with tenant_id
+        cache_key = key.internal
+        while True:
+            now = self._clock()
+            receipt = self._local.get(cache_key)
+            if receipt is not None:
+                if receipt.is_live(now):
+                    self._local.move_to_end(cache_key)
+                    self.stats.local_hits += 1
+                    return IdempotentResult(receipt, True, "local")
+                del self._local[cache_key]
+
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                break
+            try:
+                receipt = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # This caller was cancelled
+                # The leader was cancelled and released its claim: run again
+                continue
+            self.stats.coalesced += 1
+            return IdempotentResult(receipt, True, "inflight")
+
+        future: asyncio.Future[Receipt] = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            outcome = await self._lookup_or_run(key, cache_key, run, external_provider)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark retrieved so an unwaited future stays quiet
+            future.exception()
+            raise
+        else:
+            future.set_result(outcome.receipt)
+            return outcome
+        finally:
+            del self._inflight[cache_key]
+
+    async def _lookup_or_run(
+        self,
+        key: IdempotencyKey,
+        cache_key: str,
+        run: Callable[[], Awaitable[Any]],
+        external_provider: str | None,
+    ) -> IdempotentResult:
+        if self._hot is not None:
+            cached = await self._hot.get(cache_key)
+            if cached is not None:
+                receipt = Receipt.from_json(cached)
+                if receipt.is_live(self._clock()):
+                    self._remember(cache_key, receipt)
+                    self.stats.hot_hits += 1
+                    return IdempotentResult(receipt, True, "hot")
+
+        stored = await self._store.get(key.tenant_id, key.internal)
+        while True:
+            if stored is not None and stored.is_live(self._clock()):
+                if stored.status == "PENDING":
+                    stored = await self._await_claim(key)
+                    continue
+                await self._publish(cache_key, stored)
+                self.stats.store_hits += 1
+                return IdempotentResult(stored, True, "store")
+
+            first_seen_at = self._clock()
+            claim = Receipt(
+                tenant_id=key.tenant_id,
+                tool_name=key.tool_name,
+                tool_version=key.tool_version,
+                internal_idempotency_key=key.internal,
+                execution_id=str(uuid.uuid4()),
+                status="PENDING",
+                result=None,
+                first_seen_at=first_seen_at,
+                ttl_expires_at=first_seen_at + self._lookback,
+                external_idempotency_key=key.external if external_provider else None,
+                external_provider=external_provider,
+            )
+            stored = await self._store.insert(claim)
+            if stored.execution_id == claim.execution_id:
+                break
+            # Another process claimed the key first; use or wait for its receipt
+
+        try:
+            result = await run()
+        except BaseException:
+            await self._store.release(claim)
+            raise
+        receipt = replace(claim, status="COMPLETED", result=result)
+        await self._store.finalize(receipt)
+        await self._publish(cache_key, receipt)
+        self.stats.executed += 1
+        return IdempotentResult(receipt, False, "executed")
+
+    async def _await_claim(self, key: IdempotencyKey) -> Receipt | None:
+        """Poll another process's PENDING receipt until it is finalized or released.
+
+        Returns:
+            The receipt once it is no longer PENDING, or None if it was released
+
+        Raises:
+            ExecutionInProgressError: If it stays PENDING for pending_timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._pending_timeout
+        delay = _PENDING_POLL_MIN
+        while True:
+            await asyncio.sleep(delay)
+            receipt = await self._store.get(key.tenant_id, key.internal)
+            if receipt is None or receipt.status != "PENDING":
+                return receipt
+            if loop.time() >= deadline:
+                raise ExecutionInProgressError(key.internal)
+            delay = min(delay * 2, _PENDING_POLL_MAX)
+
+    async def _publish(self, cache_key: str, receipt: Receipt) -> None:
+        """Populate the hot tier and the local LRU."""
+        if self._hot is not None:
+            await self._hot.set(cache_key, receipt.to_json().encode(), self._hot_ttl)
+        self._remember(cache_key, receipt)
+
+    def _remember(self, cache_key: str, receipt: Receipt) -> None:
+        self._local[cache_key] = receipt
+        self._local.move_to_end(cache_key)
+        if len(self._local) > self._local_capacity:
+            self._local.popitem(last=False)
@@ -0,0 +1,273 @@
+"""Receipts: durable record of every side-effecting tool call (INV-05).
+
+Part of P1-TASK-14: Receipt Storage
+Requirements: INV-05, P1-R07
+
+A receipt is keyed by (tenant_id, internal_idempotency_key). It
+suppresses re-execution while it is live: from first_seen_at until
+ttl_expires_at (the 24h lookback window). The receipts table is
+partitioned by day on first_seen_at (migration 002), so lookups bound
+first_seen_at to the lookback and expired rows are never deleted in place.
+
+Executions claim their key first: a PENDING receipt is inserted before the
+side effect runs and finalized (COMPLETED) afterwards, or released
+(deleted) if the side effect fails, so a live PENDING receipt means the
+call is running somewhere.
+"""
+
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    import asyncpg
+
+# INV-05 lookback window, measured from first_seen_at
+LOOKBACK = timedelta(hours=24)
+
+
+def utcnow() -> datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class Receipt:
+    """A side-effect receipt (one row of the receipts table).
+
+    Attributes:
+        tenant_id: Tenant the call ran for
+        tool_name: Tool that ran
+        tool_version: Tool version that ran
+        internal_idempotency_key: INV-05 internal key
+        execution_id: Execution that produced the side effect
+        status: PENDING, COMPLETED, FAILED or REFUNDED
+        result: Tool result returned to duplicate callers
+        first_seen_at: When the key was first executed
+        ttl_expires_at: End of the lookback window
+        external_idempotency_key: Provider key (FINANCIAL tools)
+        external_provider: Provider name (FINANCIAL tools)
+        external_transaction_id: Provider transaction ID, once known
+        receipt_id: Receipt primary key
+    """
+
+    tenant_id: str
+    tool_name: str
+    tool_version: str
+    internal_idempotency_key: str
+    execution_id: str
+    status: str
+    result: Any
+    first_seen_at: datetime
+    ttl_expires_at: datetime
+    external_idempotency_key: str | None = None
+    external_provider: str | None = None
+    external_transaction_id: str | None = None
+    receipt_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+    def is_live(self, now: datetime) -> bool:
+        """Whether the receipt still suppresses re-execution at now."""
+        return now < self.ttl_expires_at
+
+    def to_json(self) -> str:
+        """Serialize for the hot cache tier."""
+        data = self.__dict__.copy()
+        data["first_seen_at"] = self.first_seen_at.isoformat()
+        data["ttl_expires_at"] = self.ttl_expires_at.isoformat()
+        return json.dumps(data, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str | bytes) -> "Receipt":
+        """Deserialize a receipt written by to_json()."""
+        data = json.loads(text)
+        data["first_seen_at"] = datetime.fromisoformat(data["first_seen_at"])
+        data["ttl_expires_at"] = datetime.fromisoformat(data["ttl_expires_at"])
+        return cls(**data)
+
+
+class ReceiptStore(Protocol):
+    """Durable (cold) receipt storage."""
+
+    async def get(self, tenant_id: str, internal_key: str) -> Receipt | None:
+        """Return the receipt for a key, or None."""
+        ...
+
+    async def insert(self, receipt: Receipt) -> Receipt:
+        """Insert a receipt; if the key already exists, return the stored one."""
+        ...
+
+    async def finalize(self, receipt: Receipt) -> None:
+        """Overwrite status and result of a stored receipt (same receipt_id)."""
+        ...
+
+    async def release(self, receipt: Receipt) -> None:
+        """Delete a receipt if it is still PENDING (its claim is abandoned)."""
+        ...
+
+
+class InMemoryReceiptStore:
+    """Dict-backed ReceiptStore for tests and benchmarks.
+
+    Attributes:
+        round_trips: Number of get/insert calls served (simulated DB round-trips)
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self._receipts: dict[tuple[str, str], Receipt] = {}
+        self.round_trips = 0
+
+    async def get(self, tenant_id: str, internal_key: str) -> Receipt | None:
+        """Return the receipt for a key, or None."""
+        self.round_trips += 1
+        return self._receipts.get((tenant_id, internal_key))
+
+    async def insert(self, receipt: Receipt) -> Receipt:
+        """Insert a receipt; first writer wins."""
+        self.round_trips += 1
+        key = (receipt.tenant_id, receipt.internal_idempotency_key)
+        existing = self._receipts.get(key)
+        if existing is not None and existing.is_live(receipt.first_seen_at):
+            return existing
+        self._receipts[key] = receipt
+        return receipt
+
+    async def finalize(self, receipt: Receipt) -> None:
+        """Overwrite the stored receipt with the same receipt_id."""
+        self.round_trips += 1
+        key = (receipt.tenant_id, receipt.internal_idempotency_key)
+        existing = self._receipts.get(key)
+        if existing is not None and existing.receipt_id == receipt.receipt_id:
+            self._receipts[key] = receipt
+
+    async def release(self, receipt: Receipt) -> None:
+        """Delete the receipt if it is the stored one and still PENDING."""
+        self.round_trips += 1
+        key = (receipt.tenant_id, receipt.internal_idempotency_key)
+        existing = self._receipts.get(key)
+        if (
+            existing is not None
+            and existing.receipt_id == receipt.receipt_id
+            and existing.status == "PENDING"
+        ):
+            del self._receipts[key]
+
+
+_RECEIPT_COLUMNS = """
+    receipt_id::text, tenant_id, tool_name, tool_version, internal_idempotency_key,
+    execution_id::text, status, result_json, first_seen_at, ttl_expires_at,
+    external_idempotency_key, external_provider, external_transaction_id
+"""
+
+# first_seen_at bound lets the planner prune to the partitions the lookback spans
+_SELECT_LIVE = f"""
+    SELECT {_RECEIPT_COLUMNS}
+    FROM receipts
+    WHERE tenant_id = $1
+      AND internal_idempotency_key = $2
+      AND first_seen_at > NOW() - $3::interval
+      AND ttl_expires_at > NOW()
+    ORDER BY first_seen_at DESC
+    LIMIT 1
+"""
+
+# insert_receipt() (migration 002) serializes writers per key and returns the
+# live receipt instead of inserting when one exists
+_INSERT = f"""
+    SELECT {_RECEIPT_COLUMNS}
+    FROM insert_receipt(
+        $1::uuid, $2, $3, $4, $5, $6::uuid, $7, $8::jsonb, $9, $10, $11, $12, $13,
+        $14::interval
+    )
+"""
+
+# Both bound first_seen_at so only the receipt's own partition is touched
+_FINALIZE = """
+    UPDATE receipts
+    SET status = $3, result_json = $4::jsonb, external_transaction_id = $5
+    WHERE receipt_id = $1::uuid AND first_seen_at = $2
+"""
+_RELEASE = """
+    DELETE FROM receipts
+    WHERE receipt_id = $1::uuid AND first_seen_at = $2 AND status = 'PENDING'
+"""
+
+
+class PostgresReceiptStore:
+    """ReceiptStore over the receipts table (asyncpg pool)."""
+
+    def __init__(self, pool: "asyncpg.Pool", lookback: timedelta = LOOKBACK) -> None:
+        """Initialize store.
+
+        Args:
+            pool: asyncpg connection pool
+            lookback: Window in which an existing receipt wins over a new one
+        """
+        self._pool = pool
+        self._lookback = lookback
+
+    async def get(self, tenant_id: str, internal_key: str) -> Receipt | None:
+        """Return the live receipt for a key, or None (one round-trip)."""
+        row = await self._pool.fetchrow(_SELECT_LIVE, tenant_id, internal_key, self._lookback)
+        return _row_to_receipt(row) if row is not None else None
+
+    async def insert(self, receipt: Receipt) -> Receipt:
+        """Insert a receipt; if the key has a live receipt, return that instead.
+
+        One round-trip either way. Expired receipts are not touched; they
+        leave with their partition.
+        """
+        row = await self._pool.fetchrow(
+            _INSERT,
+            receipt.receipt_id,
+            receipt.tenant_id,
+            receipt.tool_name,
+            receipt.tool_version,
+            receipt.internal_idempotency_key,
+            receipt.execution_id,
+            receipt.status,
+            json.dumps(receipt.result),
+            receipt.first_seen_at,
+            receipt.ttl_expires_at,
+            receipt.external_idempotency_key,
+            receipt.external_provider,
+            receipt.external_transaction_id,
+            self._lookback,
+        )
+        return _row_to_receipt(row)
+
+    async def finalize(self, receipt: Receipt) -> None:
+        """Record the outcome of a claimed receipt (one round-trip)."""
+        await self._pool.execute(
+            _FINALIZE,
+            receipt.receipt_id,
+            receipt.first_seen_at,
+            receipt.status,
+            json.dumps(receipt.result),
+            receipt.external_transaction_id,
+        )
+
+    async def release(self, receipt: Receipt) -> None:
+        """Delete an abandoned PENDING claim (one round-trip)."""
+        await self._pool.execute(_RELEASE, receipt.receipt_id, receipt.first_seen_at)
+
+
+def _row_to_receipt(row: Any) -> Receipt:
+    result_json = row["result_json"]
+    return Receipt(
+        receipt_id=row["receipt_id"],
+        tenant_id=row["tenant_id"],
+        tool_name=row["tool_name"],
+        tool_version=row["tool_version"],
+        internal_idempotency_key=row["internal_idempotency_key"],
+        execution_id=row["execution_id"],
+        status=row["status"],
+        result=json.loads(result_json) if result_json is not None else None,
+        first_seen_at=row["first_seen_at"],
+        ttl_expires_at=row["ttl_expires_at"],
+        external_idempotency_key=row["external_idempotency_key"],
+        external_provider=row["external_provider"],
+        external_transaction_id=row["external_transaction_id"],
+    )
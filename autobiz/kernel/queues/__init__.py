@@ -0,0 +1,12 @@
+"""Queues module: bounded kernel queues with overflow handling.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+"""
+
+from autobiz.kernel.queues.spill import SEGMENT_BYTES, LevelCallback, SpillQueue
+
+__all__ = [
+    "SEGMENT_BYTES",
+    "LevelCallback",
+    "SpillQueue",
+]
@@ -0,0 +1,365 @@
+"""SpillQueue: bounded FIFO queue that spills overflow to disk.
+
+Part of P1-TASK-25: Event Processing + Reconciliation
+Requirements: P1-R29
+
+Implements QueueConfig.overflow_strategy SPILL_TO_DISK (§11.6). Up to
+max_depth items are held in memory. Beyond that, new items are appended
+to segment files under spill_path, and they keep going to disk until the
+disk backlog has drained, so items always come out in FIFO order.
+
+Segments are {number:016d}.seg files of segment_bytes (larger for an item
+that does not fit), preallocated and memory-mapped, so an append or a
+read is a copy into or out of the page cache with no system call.
+Records are
+
+    <u32 payload length> <u32 crc32 of payload> <payload>
+
+with the header written after the payload: a zero length marks the end
+of a segment. The read position lives in a memory-mapped 16-byte
+`cursor` file, updated on every get(). Segments are deleted once read
+past, and spill_max_size_mb bounds their total size: a put() that would
+exceed it raises QueueFullError.
+
+Recovery: opening a queue on an existing spill_path resumes after the
+last item read. Spilled items survive a crash of the process exactly;
+after a power loss, anything since the last flush() may be lost or
+redelivered, and a record failing its CRC ends its segment. Items held in
+memory are not durable. One process owns a spill_path at a time.
+"""
+
+import asyncio
+import json
+import mmap
+import struct
+import zlib
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any, Generic, TypeVar
+
+from autobiz.kernel.config.queues import QueueConfig, QueueFullError, QueueLevel
+
+T = TypeVar("T")
+
+SEGMENT_BYTES = 8 * 1024 * 1024
+
+# payload length, crc32 of payload
+_HEADER = struct.Struct("<II")
+# head segment number, read offset in it
+_CURSOR = struct.Struct("<QQ")
+_CURSOR_FILE = "cursor"
+
+LevelCallback = Callable[[str, QueueLevel, int], None]
+
+
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+_DECODER = json.JSONDecoder()
+
+
+def _encode_json(item: Any) -> bytes:
+    return _ENCODER.encode(item).encode()
+
+
+def _decode_json(data: bytes) -> Any:
+    return _DECODER.raw_decode(data.decode())[0]
+
+
+def _first_depth(config: QueueConfig, levels: tuple[QueueLevel, ...]) -> int:
+    """Smallest depth whose level is one of levels (level is monotonic in depth)."""
+    return bisect_left(range(config.max_depth + 1), True, key=lambda d: config.level(d) in levels)
+
+
+class _Segment:
+    """One memory-mapped segment file."""
+
+    def __init__(self, path: Path, size: int, create: bool) -> None:
+        self.path = path
+        self.file: IO[bytes] = open(path, "w+b" if create else "r+b")  # noqa: SIM115
+        if create:
+            self.file.truncate(size)
+        self.size = size
+        self.map = mmap.mmap(self.file.fileno(), size)
+
+    def close(self) -> None:
+        self.map.close()
+        self.file.close()
+
+
+class SpillQueue(Generic[T]):
+    """FIFO queue with an in-memory head and a memory-mapped disk tail.
+
+    Not thread-safe; use from one event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: QueueConfig,
+        encode: Callable[[T], bytes] = _encode_json,
+        decode: Callable[[bytes], T] = _decode_json,
+        segment_bytes: int = SEGMENT_BYTES,
+        on_level: LevelCallback | None = None,
+    ) -> None:
+        """Open the queue, recovering items spilled by a previous process.
+
+        Args:
+            name: Queue name (QUEUE_CONFIGS key), for errors and signals
+            config: A SPILL_TO_DISK configuration
+            encode: Item to bytes (default: compact JSON)
+            decode: Bytes to item (default: JSON)
+            segment_bytes: Size of each segment file
+            on_level: Called with (name, level, depth) when depth crosses
+                the warning or critical threshold, either way
+
+        Raises:
+            ValueError: If config does not spill to disk
+        """
+        if config.overflow_strategy != "SPILL_TO_DISK" or config.spill_path is None:
+            raise ValueError(f"queue {name} is not configured to SPILL_TO_DISK")
+        if segment_bytes <= _HEADER.size:
+            raise ValueError("segment_bytes is too small")
+        self.name = name
+        self.config = config
+        self._encode = encode
+        self._decode = decode
+        self._on_level = on_level
+        self._max_bytes = (
+            config.spill_max_size_mb * 1024 * 1024 if config.spill_max_size_mb else None
+        )
+        self._segment_bytes = (
+            min(segment_bytes, self._max_bytes) if self._max_bytes else segment_bytes
+        )
+        self._dir = Path(config.spill_path)
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+        self._memory: deque[T] = deque()
+        self._segments: dict[int, _Segment] = {}
+        self._disk_bytes = 0
+        self._spilled = 0
+        self._read_seq = 0
+        self._read_pos = 0
+        self._write_seq = 0
+        self._write_pos = 0
+        self._not_empty = asyncio.Event()
+        self._cursor_file: IO[bytes] | None = None
+        self._cursor: mmap.mmap | None = None
+        self._warning_at = _first_depth(config, ("WARNING", "CRITICAL"))
+        self._critical_at = _first_depth(config, ("CRITICAL",))
+        self._recover()
+        self.recovered = self._spilled
+        self._level: QueueLevel = config.level(len(self))
+
+    def __len__(self) -> int:
+        """Items queued, in memory and on disk."""
+        return len(self._memory) + self._spilled
+
+    @property
+    def spilled(self) -> int:
+        """Items on disk."""
+        return self._spilled
+
+    @property
+    def spill_bytes(self) -> int:
+        """Size of the segment files (counted against spill_max_size_mb)."""
+        return self._disk_bytes
+
+    @property
+    def level(self) -> QueueLevel:
+        """Alert level of the current depth."""
+        return self._level
+
+    def put_nowait(self, item: T) -> None:
+        """Append an item, in memory while there is room and no disk backlog.
+
+        Raises:
+            QueueFullError: If spilling it would exceed spill_max_size_mb
+        """
+        if not self._spilled and len(self._memory) < self.config.max_depth:
+            self._memory.append(item)
+        else:
+            self._spill(self._encode(item))
+        self._not_empty.set()
+        self._signal()
+
+    def get_nowait(self) -> T:
+        """Remove and return the oldest item.
+
+        Raises:
+            asyncio.QueueEmpty: If the queue is empty
+        """
+        if self._memory:
+            item = self._memory.popleft()
+        elif self._spilled:
+            item = self._decode(self._read())
+        else:
+            raise asyncio.QueueEmpty
+        self._signal()
+        return item
+
+    def get_many(self, max_items: int) -> list[T]:
+        """Remove and return up to max_items oldest items (possibly none)."""
+        items: list[T] = []
+        while len(items) < max_items and (self._memory or self._spilled):
+            items.append(self._memory.popleft() if self._memory else self._decode(self._read()))
+        if items:
+            self._signal()
+        return items
+
+    async def get(self) -> T:
+        """Remove and return the oldest item, waiting for one if empty."""
+        while True:
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                self._not_empty.clear()
+                await self._not_empty.wait()
+
+    def flush(self) -> None:
+        """Write the tail segment and read cursor through to disk."""
+        self._segments[self._write_seq].map.flush()
+        if self._cursor is not None:
+            self._cursor.flush()
+
+    def close(self) -> None:
+        """Flush and release the segment files; in-memory items are dropped."""
+        self.flush()
+        for segment in self._segments.values():
+            segment.close()
+        self._segments.clear()
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+        if self._cursor_file is not None:
+            self._cursor_file.close()
+            self._cursor_file = None
+
+    # Disk tail
+
+    def _path(self, number: int) -> Path:
+        return self._dir / f"{number:016d}.seg"
+
+    def _spill(self, data: bytes) -> None:
+        if not data:
+            raise ValueError("items must encode to at least one byte")
+        need = _HEADER.size + len(data)
+        segment = self._segments[self._write_seq]
+        if self._write_pos + need > segment.size:
+            segment = self._roll(need)
+        pos = self._write_pos
+        segment.map[pos + _HEADER.size : pos + need] = data
+        # Header last: a record is visible only once complete
+        _HEADER.pack_into(segment.map, pos, len(data), zlib.crc32(data))
+        self._write_pos = pos + need
+        self._spilled += 1
+
+    def _roll(self, need: int) -> _Segment:
+        size = max(self._segment_bytes, need)
+        # With nothing left to read, every current segment is freed
+        kept = self._disk_bytes if self._spilled else 0
+        if self._max_bytes is not None and kept + size > self._max_bytes:
+            raise QueueFullError(self.name, len(self), self.config.max_depth)
+        number = self._write_seq + 1
+        segment = _Segment(self._path(number), size, create=True)
+        if self._spilled:
+            self._segments[self._write_seq].map.flush()
+        else:
+            self._set_cursor(number, 0)
+            for old in list(self._segments):
+                self._retire(old)
+        self._segments[number] = segment
+        self._disk_bytes += size
+        self._write_seq = number
+        self._write_pos = 0
+        return segment
+
+    def _read(self) -> bytes:
+        while True:
+            segment = self._segments[self._read_seq]
+            pos = self._read_pos
+            if pos + _HEADER.size <= segment.size:
+                length = _HEADER.unpack_from(segment.map, pos)[0]
+                if length:
+                    end = pos + _HEADER.size + length
+                    data = segment.map[pos + _HEADER.size : end]
+                    self._set_cursor(self._read_seq, end)
+                    self._spilled -= 1
+                    return data
+            if self._read_seq == self._write_seq:
+                raise RuntimeError(f"spill queue {self.name} lost track of its tail")
+            # End of this segment: move on and delete it
+            retired = self._read_seq
+            self._set_cursor(min(n for n in self._segments if n > retired), 0)
+            self._retire(retired)
+
+    def _retire(self, number: int) -> None:
+        segment = self._segments.pop(number)
+        segment.close()
+        segment.path.unlink(missing_ok=True)
+        self._disk_bytes -= segment.size
+
+    def _set_cursor(self, number: int, pos: int) -> None:
+        self._read_seq = number
+        self._read_pos = pos
+        if self._cursor is not None:
+            _CURSOR.pack_into(self._cursor, 0, number, pos)
+
+    def _recover(self) -> None:
+        cursor_path = self._dir / _CURSOR_FILE
+        if not cursor_path.exists() or cursor_path.stat().st_size != _CURSOR.size:
+            cursor_path.write_bytes(bytes(_CURSOR.size))
+        self._cursor_file = open(cursor_path, "r+b")  # noqa: SIM115
+        self._cursor = mmap.mmap(self._cursor_file.fileno(), _CURSOR.size)
+        read_seq, read_pos = _CURSOR.unpack_from(self._cursor, 0)
+
+        numbers = sorted(int(path.stem) for path in self._dir.glob("*.seg") if path.stem.isdigit())
+        for number in numbers:
+            if number < read_seq:
+                self._path(number).unlink()
+        numbers = [number for number in numbers if number >= read_seq]
+        if not numbers:
+            segment = _Segment(self._path(read_seq), self._segment_bytes, create=True)
+            self._segments[read_seq] = segment
+            self._disk_bytes = segment.size
+            self._write_seq = read_seq
+            self._set_cursor(read_seq, 0)
+            return
+        if numbers[0] != read_seq:
+            read_seq, read_pos = numbers[0], 0
+        self._set_cursor(read_seq, read_pos)
+
+        for number in numbers:
+            path = self._path(number)
+            segment = _Segment(path, path.stat().st_size, create=False)
+            self._segments[number] = segment
+            self._disk_bytes += segment.size
+            pos = read_pos if number == read_seq else 0
+            while pos + _HEADER.size <= segment.size:
+                length, crc = _HEADER.unpack_from(segment.map, pos)
+                if not length:
+                    break
+                end = pos + _HEADER.size + length
+                if end > segment.size or zlib.crc32(segment.map[pos + _HEADER.size : end]) != crc:
+                    # Torn write: nothing after it in this segment is trusted
+                    segment.map[pos:] = bytes(segment.size - pos)
+                    break
+                self._spilled += 1
+                pos = end
+            self._write_seq = number
+            self._write_pos = pos
+
+    # Signals
+
+    def _signal(self) -> None:
+        # Same result as config.level(), without a model call per item
+        depth = len(self._memory) + self._spilled
+        level: QueueLevel = (
+            "CRITICAL"
+            if depth >= self._critical_at
+            else "WARNING" if depth >= self._warning_at else "OK"
+        )
+        if level != self._level:
+            self._level = level
+            if self._on_level is not None:
+                self._on_level(self.name, level, depth)
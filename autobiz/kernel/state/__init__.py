@@ -0,0 +1,41 @@
+"""State module: versioned entity state, snapshots and replay (INV-06).
+
+Part of P1-TASK-12: State Manager Version + Replay
+"""
+
+from autobiz.kernel.state.manager import EntityState, SnapshotPolicy, StateChange, StateManager
+from autobiz.kernel.state.patch import EMPTY_STATE, merge_patch, replay_patches, state_hash
+from autobiz.kernel.state.retry import ConflictRetry, retry_on_conflict
+from autobiz.kernel.state.store import (
+    CurrentState,
+    EntityKey,
+    InMemoryStateStore,
+    PostgresStateStore,
+    StateBatchConflictError,
+    StateConflictError,
+    StateSnapshot,
+    StateStore,
+    StateWrite,
+)
+
+__all__ = [
+    "EntityState",
+    "SnapshotPolicy",
+    "StateChange",
+    "StateManager",
+    "EMPTY_STATE",
+    "merge_patch",
+    "replay_patches",
+    "state_hash",
+    "ConflictRetry",
+    "retry_on_conflict",
+    "CurrentState",
+    "EntityKey",
+    "InMemoryStateStore",
+    "PostgresStateStore",
+    "StateBatchConflictError",
+    "StateConflictError",
+    "StateSnapshot",
+    "StateStore",
+    "StateWrite",
+]
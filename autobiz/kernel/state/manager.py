@@ -0,0 +1,354 @@
+"""StateManager: versioned entity state with snapshots and a materialized head.
+
+Part of P1-TASK-12: State Manager Version + Replay
+Requirements: INV-06, P1-R08
+
+Reading state by replaying every patch from version 1 gets slower as an
+entity ages. The manager keeps reads bounded:
+- get(): one state_current row, whatever the version count
+- get_at(version): the nearest snapshot at or below version, plus the
+  patches after it (at most SnapshotPolicy.every_versions of them)
+- replay(): the INV-06 reference, every patch from the empty state
+
+apply() merges a patch into the current state, writes the version and
+the new state_current row in one transaction, and adds a full snapshot
+once every_versions versions or every_bytes patch bytes have accumulated
+since the last one. Because snapshots and state_current are derived by
+the same merge_patch() that replay() uses, replaying the history gives a
+state with the same canonical bytes (see verify_replay()).
+
+commit_many() changes several entities in one step (an order, its
+payment and its fulfillment): one read of their current rows, one
+all-or-nothing write, and a StateBatchConflictError naming every stale
+entity. transact() wraps the read-compute-commit cycle in
+retry_on_conflict().
+"""
+
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from autobiz.kernel.idempotency.receipts import utcnow
+from autobiz.kernel.state.patch import (
+    EMPTY_STATE,
+    canonical_state,
+    merge_patch,
+    replay_patches,
+    state_hash,
+)
+from autobiz.kernel.state.retry import ConflictRetry, retry_on_conflict
+from autobiz.kernel.state.store import (
+    CurrentState,
+    EntityKey,
+    StateBatchConflictError,
+    StateConflictError,
+    StateSnapshot,
+    StateStore,
+    StateWrite,
+)
+
+
+@dataclass(frozen=True)
+class SnapshotPolicy:
+    """When apply() writes a full snapshot.
+
+    Attributes:
+        every_versions: Snapshot after this many versions since the last one
+        every_bytes: Or after this many canonical patch bytes since it
+    """
+
+    every_versions: int = 100
+    every_bytes: int = 256 * 1024
+
+    def __post_init__(self) -> None:
+        """Validate thresholds."""
+        if self.every_versions < 1 or self.every_bytes < 1:
+            raise ValueError("every_versions and every_bytes must be at least 1")
+
+    def due(self, versions_since: int, bytes_since: int) -> bool:
+        """True if a snapshot should be written now."""
+        return versions_since >= self.every_versions or bytes_since >= self.every_bytes
+
+
+@dataclass(frozen=True)
+class EntityState:
+    """State of an entity at one version.
+
+    Attributes:
+        key: Entity
+        version: Version (0: before the first patch)
+        state: Full state; treat as read-only
+    """
+
+    key: EntityKey
+    version: int
+    state: Any
+
+    @property
+    def hash(self) -> str:
+        """Hex SHA-256 of the canonical state."""
+        return state_hash(self.state)
+
+
+@dataclass(frozen=True)
+class StateChange:
+    """One entity's part of a multi-entity commit.
+
+    Attributes:
+        key: Entity to change
+        patch: RFC 7396 merge patch
+        expected_version: Version the patch was computed against
+            (None: whatever is current when read)
+        correlation_id: Run making the change
+    """
+
+    key: EntityKey
+    patch: Any
+    expected_version: int | None = None
+    correlation_id: str | None = None
+
+
+class StateManager:
+    """Versioned state reads and writes over a StateStore."""
+
+    def __init__(
+        self,
+        store: StateStore,
+        policy: SnapshotPolicy | None = None,
+        clock: Callable[[], datetime] = utcnow,
+    ) -> None:
+        """Initialize manager.
+
+        Args:
+            store: Durable state store
+            policy: Snapshot cadence (default: every 100 versions or 256 KiB)
+            clock: Aware-UTC clock (replay injects the recorded clock)
+        """
+        self._store = store
+        self.policy = policy if policy is not None else SnapshotPolicy()
+        self._clock = clock
+
+    async def get(self, key: EntityKey) -> EntityState | None:
+        """Latest state from state_current, or None for an unknown entity."""
+        current = await self._store.current(key)
+        if current is None:
+            return None
+        return EntityState(key, current.version, current.state)
+
+    async def get_at(self, key: EntityKey, version: int) -> EntityState:
+        """State as of version: nearest snapshot plus the patches after it.
+
+        Raises:
+            ValueError: If version is negative or beyond the latest version
+        """
+        if version < 0:
+            raise ValueError("version must not be negative")
+        if version == 0:
+            return EntityState(key, 0, EMPTY_STATE)
+        snapshot = await self._store.snapshot_at(key, version)
+        base_version, base = (
+            (snapshot.version, snapshot.state) if snapshot is not None else (0, EMPTY_STATE)
+        )
+        patches = await self._store.patches(key, base_version, version)
+        if base_version + len(patches) != version:
+            raise ValueError(f"{key.entity_type}/{key.entity_id} has no version {version}")
+        return EntityState(key, version, replay_patches(base, patches))
+
+    async def replay(self, key: EntityKey, version: int | None = None) -> EntityState:
+        """Reference replay of every patch from the empty state (INV-06).
+
+        Args:
+            key: Entity
+            version: Last version to apply (default: all)
+        """
+        if version is None:
+            current = await self._store.current(key)
+            version = current.version if current is not None else 0
+        patches = await self._store.patches(key, 0, version)
+        return EntityState(key, len(patches), replay_patches(EMPTY_STATE, patches))
+
+    async def verify_replay(self, key: EntityKey) -> bool:
+        """True if replaying the history reproduces state_current byte for byte."""
+        current = await self.get(key)
+        replayed = await self.replay(key)
+        if current is None:
+            return replayed.version == 0
+        if current.version != replayed.version:
+            return False
+        return canonical_state(current.state) == canonical_state(replayed.state)
+
+    async def apply(
+        self,
+        key: EntityKey,
+        patch: Any,
+        expected_version: int | None = None,
+        correlation_id: str | None = None,
+    ) -> EntityState:
+        """Commit a merge patch as the next version.
+
+        Args:
+            key: Entity to change
+            patch: RFC 7396 merge patch
+            expected_version: Version the patch was computed against
+                (default: whatever is current when read)
+            correlation_id: Run making the change
+
+        Returns:
+            The new version's state
+
+        Raises:
+            StateConflictError: If the entity is not at expected_version
+            CanonicalizationError: If the patch or new state is not I-JSON
+        """
+        current = await self._store.current(key)
+        write = self.prepare(key, current, patch, expected_version, correlation_id)
+        await self._store.commit(write)
+        return EntityState(key, write.current.version, write.current.state)
+
+    async def commit_many(self, changes: Sequence[StateChange]) -> list[EntityState]:
+        """Commit one patch to each of several entities, all or nothing.
+
+        Reads the entities' current rows in one call and writes every new
+        version in one store.commit_many() call: two round trips whatever
+        the batch size.
+
+        Args:
+            changes: At most one change per entity
+
+        Returns:
+            The new states, in the order of changes
+
+        Raises:
+            StateBatchConflictError: If any entity is not at its
+                expected_version; nothing is written
+            ValueError: If an entity appears twice
+            CanonicalizationError: If a patch or new state is not I-JSON
+        """
+        if not changes:
+            return []
+        keys = [change.key for change in changes]
+        if len(set(keys)) != len(keys):
+            raise ValueError("each entity may appear only once in a commit")
+        return await self._commit(changes, await self._store.current_many(keys))
+
+    async def _commit(
+        self, changes: Sequence[StateChange], currents: Mapping[EntityKey, CurrentState]
+    ) -> list[EntityState]:
+        writes = []
+        conflicts = []
+        for change in changes:
+            try:
+                writes.append(
+                    self.prepare(
+                        change.key,
+                        currents.get(change.key),
+                        change.patch,
+                        change.expected_version,
+                        change.correlation_id,
+                    )
+                )
+            except StateConflictError as e:
+                conflicts.append(e)
+        if conflicts:
+            raise StateBatchConflictError(conflicts)
+
+        await self._store.commit_many(writes)
+        return [EntityState(w.current.key, w.current.version, w.current.state) for w in writes]
+
+    async def transact(
+        self,
+        keys: Sequence[EntityKey],
+        build: Callable[[Mapping[EntityKey, EntityState | None]], Mapping[EntityKey, Any]],
+        correlation_id: str | None = None,
+        retry: ConflictRetry | None = None,
+    ) -> list[EntityState]:
+        """Read entities, compute patches from them and commit; retry on conflict.
+
+        Each attempt reads keys afresh, calls build with their states
+        (None for unknown entities) and commits the patches it returns,
+        each expected at the version that was read. Entities that are
+        read but not patched are not checked.
+
+        Args:
+            keys: Entities build needs to see
+            build: Returns {key: patch} for the entities to change; must
+                not have side effects, as it runs once per attempt
+            correlation_id: Run making the change
+            retry: Backoff between attempts (default: ConflictRetry())
+
+        Returns:
+            The new states, in the order build returned them
+
+        Raises:
+            StateConflictError: If the last attempt still conflicted
+            ValueError: If build patches an entity that is not in keys
+        """
+
+        async def attempt() -> list[EntityState]:
+            currents = await self._store.current_many(keys)
+            states = {
+                key: (
+                    EntityState(key, currents[key].version, currents[key].state)
+                    if key in currents
+                    else None
+                )
+                for key in keys
+            }
+            changes = []
+            for key, patch in build(states).items():
+                if key not in states:
+                    raise ValueError(f"{key.entity_type}/{key.entity_id} was not read")
+                changes.append(
+                    StateChange(
+                        key,
+                        patch,
+                        currents[key].version if key in currents else 0,
+                        correlation_id,
+                    )
+                )
+            if not changes:
+                return []
+            return await self._commit(changes, currents)
+
+        return await retry_on_conflict(attempt, retry)
+
+    def prepare(
+        self,
+        key: EntityKey,
+        current: CurrentState | None,
+        patch: Any,
+        expected_version: int | None = None,
+        correlation_id: str | None = None,
+    ) -> StateWrite:
+        """Compute the rows one patch writes on top of current.
+
+        Raises:
+            StateConflictError: If current is not at expected_version
+            CanonicalizationError: If the patch or new state is not I-JSON
+        """
+        version = current.version if current is not None else 0
+        if expected_version is not None and expected_version != version:
+            raise StateConflictError(key, expected_version, version)
+
+        patch_bytes = len(canonical_state(patch))
+        state = merge_patch(current.state if current is not None else EMPTY_STATE, patch)
+        new_version = version + 1
+        now = self._clock()
+        snapshot_version = current.snapshot_version if current is not None else 0
+        bytes_since = patch_bytes
+        if current is not None:
+            bytes_since += current.patch_bytes_since_snapshot
+
+        snapshot = None
+        if self.policy.due(new_version - snapshot_version, bytes_since):
+            snapshot = StateSnapshot(key, new_version, state, now)
+            snapshot_version, bytes_since = new_version, 0
+
+        return StateWrite(
+            expected_version=version,
+            patch=patch,
+            correlation_id=correlation_id,
+            current=CurrentState(key, new_version, state, snapshot_version, bytes_since, now),
+            snapshot=snapshot,
+        )
@@ -0,0 +1,68 @@
+"""State patches: RFC 7396 JSON merge patch and canonical state hashes.
+
+Part of P1-TASK-12: State Manager Version + Replay
+Requirements: INV-06, P1-R08
+
+A state_versions row stores the merge patch that produced its version
+from the previous one (version 0 is the empty object). Merge semantics:
+- An object patch merges into the target member by member
+- A null member deletes that member from the target
+- Any other patch value replaces the target outright
+
+merge_patch() never mutates its inputs; untouched subtrees of the target
+are shared with the result, so states must be treated as read-only.
+
+state_hash() hashes the RFC 8785 canonical bytes of a state, so two
+states are "byte-identical" for INV-06 exactly when their hashes match,
+however they were stored (JSONB reorders keys and reformats numbers).
+"""
+
+import hashlib
+from typing import Any
+
+from autobiz.kernel.idempotency.jcs import canonicalize
+
+EMPTY_STATE: dict[str, Any] = {}
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply an RFC 7396 merge patch.
+
+    Args:
+        target: Current state (any JSON value)
+        patch: Merge patch
+
+    Returns:
+        Patched state (shares unchanged subtrees with target)
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def replay_patches(base: Any, patches: list[Any]) -> Any:
+    """Apply patches in order to base."""
+    state = base
+    for patch in patches:
+        state = merge_patch(state, patch)
+    return state
+
+
+def canonical_state(state: Any) -> bytes:
+    """RFC 8785 canonical bytes of a state.
+
+    Raises:
+        CanonicalizationError: If the state is not representable as I-JSON
+    """
+    return canonicalize(state)
+
+
+def state_hash(state: Any) -> str:
+    """Hex SHA-256 of the canonical state."""
+    return hashlib.sha256(canonicalize(state)).hexdigest()
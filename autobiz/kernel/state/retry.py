@@ -0,0 +1,89 @@
+"""Retrying optimistic state writes after a version conflict.
+
+Part of P1-TASK-12: State Manager Version + Replay
+Requirements: INV-06, P1-R08
+
+A StateConflictError means another writer committed first; nothing was
+written, so the whole read-compute-commit step can simply run again
+against the new versions. retry_on_conflict() does that with exponential
+backoff and jitter (the RETRY strategy of ConflictResolution: 3 retries,
+100 ms base, 5 s cap, x2), so writers colliding on a hot entity spread
+out instead of colliding again in lockstep.
+"""
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from autobiz.kernel.state.store import StateConflictError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ConflictRetry:
+    """Backoff between attempts of a conflicting write.
+
+    Attributes:
+        max_retries: Attempts after the first (0: never retry)
+        base_delay: Seconds before the first retry
+        max_delay: Cap on any single delay
+        multiplier: Growth of the delay per retry
+        jitter: Sleep a uniform random fraction of each delay ("full
+            jitter") instead of the whole delay
+    """
+
+    max_retries: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+    multiplier: float = 2.0
+    jitter: bool = True
+
+    def __post_init__(self) -> None:
+        """Validate settings."""
+        if self.max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        if self.base_delay < 0 or self.max_delay < 0 or self.multiplier < 1:
+            raise ValueError("delays must not be negative and multiplier must be at least 1")
+
+    def delay(self, retry: int, rng: random.Random | None = None) -> float:
+        """Seconds to wait before retry number retry (1-based)."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (retry - 1))
+        if self.jitter:
+            delay *= (rng or random).random()
+        return delay
+
+
+async def retry_on_conflict(
+    operation: Callable[[], Awaitable[T]],
+    policy: ConflictRetry | None = None,
+    rng: random.Random | None = None,
+) -> T:
+    """Run operation, running it again after each StateConflictError.
+
+    operation must redo its reads: retrying a write computed against the
+    old version would only conflict again.
+
+    Args:
+        operation: Read-compute-commit step to run
+        policy: Backoff (default: ConflictRetry())
+        rng: Jitter source (tests inject a seeded one)
+
+    Returns:
+        What the first successful attempt returned
+
+    Raises:
+        StateConflictError: From the last attempt, once retries run out
+    """
+    policy = policy if policy is not None else ConflictRetry()
+    retry = 0
+    while True:
+        try:
+            return await operation()
+        except StateConflictError:
+            if retry >= policy.max_retries:
+                raise
+        retry += 1
+        await asyncio.sleep(policy.delay(retry, rng))
@@ -0,0 +1,636 @@
+"""State storage: version patches, snapshots and materialized current state.
+
+Part of P1-TASK-12: State Manager Version + Replay
+Requirements: INV-06, P1-R08
+
+Three tables per entity (migration 005):
+- state_versions: one merge patch per version (the INV-06 history)
+- state_snapshots: the full state at some versions
+- state_current: the latest version's full state, plus how far it is
+  from the last snapshot
+
+commit() writes a new version, updates state_current and optionally adds
+a snapshot in one transaction. UNIQUE (tenant_id, entity_type, entity_id,
+version) on state_versions is the compare-and-swap: a writer that lost a
+race for a version gets StateConflictError and nothing is written.
+
+commit_many() does the same for several entities at once:
+every write is checked against state_current and, only if none is stale,
+all of them are written, in a single statement. Stale entities are
+reported together in StateBatchConflictError.
+"""
+
+import asyncio
+import json
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Protocol
+
+from autobiz.kernel.state.patch import canonical_state
+
+if TYPE_CHECKING:
+    import asyncpg
+
+
+@dataclass(frozen=True)
+class EntityKey:
+    """Identity of a versioned entity.
+
+    Attributes:
+        tenant_id: Owning tenant
+        entity_type: Entity kind (order, payment, customer, ...)
+        entity_id: Entity identifier within the tenant and type
+    """
+
+    tenant_id: str
+    entity_type: str
+    entity_id: str
+
+
+class StateConflictError(RuntimeError):
+    """Raised when an entity is not at the version a write expected.
+
+    Attributes:
+        key: Entity written
+        expected_version: Version the write was based on
+        actual_version: Version found, if known
+    """
+
+    def __init__(self, key: EntityKey, expected_version: int, actual_version: int | None) -> None:
+        """Initialize error.
+
+        Args:
+            key: Entity written
+            expected_version: Version the write was based on
+            actual_version: Version found, if known
+        """
+        self.key = key
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+        found = f"version {actual_version}" if actual_version is not None else "a newer version"
+        super().__init__(
+            f"{key.entity_type}/{key.entity_id} (tenant {key.tenant_id}) expected version "
+            f"{expected_version}, found {found}"
+        )
+
+
+class StateBatchConflictError(StateConflictError):
+    """Raised when any entity of a multi-entity commit is stale.
+
+    Nothing in the batch is written. key, expected_version and
+    actual_version describe the first conflict.
+
+    Attributes:
+        conflicts: One StateConflictError per stale entity
+    """
+
+    def __init__(self, conflicts: Sequence[StateConflictError]) -> None:
+        """Initialize error.
+
+        Args:
+            conflicts: One StateConflictError per stale entity (not empty)
+        """
+        if not conflicts:
+            raise ValueError("a batch conflict needs at least one conflicting entity")
+        self.conflicts = tuple(conflicts)
+        first = self.conflicts[0]
+        super().__init__(first.key, first.expected_version, first.actual_version)
+        self.args = (
+            f"{len(self.conflicts)} entities conflicted: "
+            + "; ".join(str(conflict) for conflict in self.conflicts),
+        )
+
+    @property
+    def keys(self) -> list[EntityKey]:
+        """Entities that conflicted, in batch order."""
+        return [conflict.key for conflict in self.conflicts]
+
+
+def _distinct_keys(keys: Iterable[EntityKey]) -> None:
+    seen: set[EntityKey] = set()
+    for key in keys:
+        if key in seen:
+            raise ValueError(
+                f"{key.entity_type}/{key.entity_id} appears more than once in the batch"
+            )
+        seen.add(key)
+
+
+@dataclass(frozen=True)
+class CurrentState:
+    """Materialized latest state of an entity (one state_current row).
+
+    Attributes:
+        key: Entity
+        version: Latest version
+        state: Full state at version
+        snapshot_version: Version of the latest snapshot (0: none)
+        patch_bytes_since_snapshot: Canonical patch bytes since that snapshot
+        updated_at: When version was committed
+    """
+
+    key: EntityKey
+    version: int
+    state: Any
+    snapshot_version: int
+    patch_bytes_since_snapshot: int
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """Full state of an entity at one version.
+
+    Attributes:
+        key: Entity
+        version: Version captured
+        state: Full state at version
+        created_at: When the snapshot was written
+    """
+
+    key: EntityKey
+    version: int
+    state: Any
+    created_at: datetime
+
+
+@dataclass(frozen=True)
+class StateWrite:
+    """Everything one commit writes.
+
+    Attributes:
+        expected_version: Version the patch was computed against
+        patch: Merge patch producing current.version
+        correlation_id: Run that made the change
+        current: New state_current row
+        snapshot: Snapshot to add, if due
+    """
+
+    expected_version: int
+    patch: Any
+    correlation_id: str | None
+    current: CurrentState
+    snapshot: StateSnapshot | None = None
+
+
+class StateStore(Protocol):
+    """Durable versioned entity state."""
+
+    async def current(self, key: EntityKey) -> CurrentState | None:
+        """Materialized latest state, or None for an unknown entity."""
+        ...
+
+    async def snapshot_at(self, key: EntityKey, version: int) -> StateSnapshot | None:
+        """Latest snapshot at or below version."""
+        ...
+
+    async def patches(self, key: EntityKey, after: int, upto: int) -> list[Any]:
+        """Patches of versions after+1..upto, in version order."""
+        ...
+
+    async def current_many(self, keys: Sequence[EntityKey]) -> dict[EntityKey, CurrentState]:
+        """Materialized latest states of several entities; unknown ones are absent."""
+        ...
+
+    async def commit(self, write: StateWrite) -> None:
+        """Write a version atomically.
+
+        Raises:
+            StateConflictError: If the entity is no longer at expected_version
+        """
+        ...
+
+    async def commit_many(self, writes: Sequence[StateWrite]) -> None:
+        """Write one version of each of several distinct entities, all or nothing.
+
+        Raises:
+            StateBatchConflictError: If any entity is no longer at its
+                expected_version; lists every such entity that is known
+            ValueError: If an entity appears twice
+        """
+        ...
+
+
+class InMemoryStateStore:
+    """Dict-backed StateStore for tests and benchmarks.
+
+    States and patches are kept as canonical JSON bytes and decoded on
+    read, like JSONB, so callers never share objects with the store.
+
+    Attributes:
+        rows_read: Rows returned by reads (patches, snapshots, current)
+        round_trips: Store calls made
+        latency: Simulated seconds per call; each call yields to the event
+            loop for this long before it runs, like a database round trip
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initialize an empty store.
+
+        Args:
+            latency: Simulated seconds per call (0: calls never yield)
+        """
+        self._patches: dict[EntityKey, list[bytes]] = {}
+        self._snapshots: dict[EntityKey, list[tuple[int, bytes, datetime]]] = {}
+        self._current: dict[EntityKey, tuple[CurrentState, bytes]] = {}
+        self.rows_read = 0
+        self.round_trips = 0
+        self.latency = latency
+
+    async def _round_trip(self) -> None:
+        self.round_trips += 1
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+
+    async def current(self, key: EntityKey) -> CurrentState | None:
+        """Materialized latest state."""
+        await self._round_trip()
+        return self._read_current(key)
+
+    def _read_current(self, key: EntityKey) -> CurrentState | None:
+        found = self._current.get(key)
+        if found is None:
+            return None
+        self.rows_read += 1
+        row, state = found
+        return CurrentState(
+            row.key,
+            row.version,
+            json.loads(state),
+            row.snapshot_version,
+            row.patch_bytes_since_snapshot,
+            row.updated_at,
+        )
+
+    async def snapshot_at(self, key: EntityKey, version: int) -> StateSnapshot | None:
+        """Latest snapshot at or below version."""
+        await self._round_trip()
+        for snapshot_version, state, created_at in reversed(self._snapshots.get(key, [])):
+            if snapshot_version <= version:
+                self.rows_read += 1
+                return StateSnapshot(key, snapshot_version, json.loads(state), created_at)
+        return None
+
+    async def patches(self, key: EntityKey, after: int, upto: int) -> list[Any]:
+        """Patches of versions after+1..upto."""
+        await self._round_trip()
+        rows = self._patches.get(key, [])[after:upto]
+        self.rows_read += len(rows)
+        return [json.loads(row) for row in rows]
+
+    async def current_many(self, keys: Sequence[EntityKey]) -> dict[EntityKey, CurrentState]:
+        """Materialized latest states (one call)."""
+        await self._round_trip()
+        found = {}
+        for key in keys:
+            current = self._read_current(key)
+            if current is not None:
+                found[key] = current
+        return found
+
+    async def commit(self, write: StateWrite) -> None:
+        """Write a version; the version list is the compare-and-swap."""
+        await self._round_trip()
+        key = write.current.key
+        version = len(self._patches.get(key, []))
+        if version != write.expected_version:
+            raise StateConflictError(key, write.expected_version, version)
+        self._write(write)
+
+    async def commit_many(self, writes: Sequence[StateWrite]) -> None:
+        """Check every expected version, then write all of them (one call)."""
+        _distinct_keys(write.current.key for write in writes)
+        await self._round_trip()
+        conflicts = []
+        for write in writes:
+            key = write.current.key
+            version = len(self._patches.get(key, []))
+            if version != write.expected_version:
+                conflicts.append(StateConflictError(key, write.expected_version, version))
+        if conflicts:
+            raise StateBatchConflictError(conflicts)
+        for write in writes:
+            self._write(write)
+
+    def _write(self, write: StateWrite) -> None:
+        key = write.current.key
+        self._patches.setdefault(key, []).append(canonical_state(write.patch))
+        self._current[key] = (write.current, canonical_state(write.current.state))
+        if write.snapshot is not None:
+            self._snapshots.setdefault(key, []).append(
+                (
+                    write.snapshot.version,
+                    canonical_state(write.snapshot.state),
+                    write.snapshot.created_at,
+                )
+            )
+
+    def snapshot_versions(self, key: EntityKey) -> list[int]:
+        """Versions that have a snapshot (test helper)."""
+        return [version for version, _, _ in self._snapshots.get(key, [])]
+
+
+_KEY = "tenant_id = $1 AND entity_type = $2 AND entity_id = $3"
+
+_CURRENT = f"""
+    SELECT version, state, snapshot_version, patch_bytes_since_snapshot, updated_at
+    FROM state_current WHERE {_KEY}
+"""
+
+_SNAPSHOT_AT = f"""
+    SELECT version, state, created_at FROM state_snapshots
+    WHERE {_KEY} AND version <= $4
+    ORDER BY version DESC LIMIT 1
+"""
+
+_PATCHES = f"""
+    SELECT state_patch FROM state_versions
+    WHERE {_KEY} AND version > $4 AND version <= $5
+    ORDER BY version
+"""
+
+_INSERT_VERSION = """
+    INSERT INTO state_versions
+        (tenant_id, entity_type, entity_id, version, state_patch, correlation_id, created_at)
+    VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7)
+"""
+
+# Guarded upsert: a stale state_current row is never overwritten
+_UPSERT_CURRENT = """
+    INSERT INTO state_current AS c
+        (tenant_id, entity_type, entity_id, version, state,
+         snapshot_version, patch_bytes_since_snapshot, updated_at)
+    VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7, $8)
+    ON CONFLICT (tenant_id, entity_type, entity_id) DO UPDATE SET
+        version = EXCLUDED.version,
+        state = EXCLUDED.state,
+        snapshot_version = EXCLUDED.snapshot_version,
+        patch_bytes_since_snapshot = EXCLUDED.patch_bytes_since_snapshot,
+        updated_at = EXCLUDED.updated_at
+    WHERE c.version = $9
+"""
+
+_INSERT_SNAPSHOT = """
+    INSERT INTO state_snapshots (tenant_id, entity_type, entity_id, version, state, created_at)
+    VALUES ($1, $2, $3, $4, $5::jsonb, $6)
+    ON CONFLICT DO NOTHING
+"""
+
+_CURRENT_MANY = """
+    SELECT c.tenant_id, c.entity_type, c.entity_id, c.version, c.state,
+           c.snapshot_version, c.patch_bytes_since_snapshot, c.updated_at
+    FROM state_current c
+    JOIN unnest($1::text[], $2::text[], $3::text[]) AS k(tenant_id, entity_type, entity_id)
+        USING (tenant_id, entity_type, entity_id)
+"""
+
+# One statement for the whole batch. `found` compares each expected
+# version with state_current; the three writes only run if nothing is
+# stale, and the statement returns the stale rows (none on success).
+# A concurrent writer that got past the same check first makes the
+# state_versions insert fail with a unique violation, which aborts the
+# statement as a whole.
+_COMMIT_MANY = """
+    WITH batch AS (
+        SELECT * FROM unnest(
+            $1::text[], $2::text[], $3::text[], $4::int[], $5::text[], $6::text[],
+            $7::text[], $8::int[], $9::bigint[], $10::timestamptz[], $11::bool[]
+        ) AS b(tenant_id, entity_type, entity_id, expected_version, state_patch,
+               correlation_id, state, snapshot_version, patch_bytes_since_snapshot,
+               updated_at, snapshot)
+    ),
+    found AS (
+        SELECT b.tenant_id, b.entity_type, b.entity_id, b.expected_version,
+               COALESCE(c.version, 0) AS actual_version
+        FROM batch b
+        LEFT JOIN state_current c USING (tenant_id, entity_type, entity_id)
+    ),
+    stale AS (
+        SELECT * FROM found WHERE actual_version <> expected_version
+    ),
+    versions AS (
+        INSERT INTO state_versions
+            (tenant_id, entity_type, entity_id, version, state_patch, correlation_id, created_at)
+        SELECT tenant_id, entity_type, entity_id, expected_version + 1, state_patch::jsonb,
+               correlation_id, updated_at
+        FROM batch WHERE NOT EXISTS (SELECT 1 FROM stale)
+    ),
+    snapshots AS (
+        INSERT INTO state_snapshots (tenant_id, entity_type, entity_id, version, state, created_at)
+        SELECT tenant_id, entity_type, entity_id, expected_version + 1, state::jsonb, updated_at
+        FROM batch WHERE snapshot AND NOT EXISTS (SELECT 1 FROM stale)
+        ON CONFLICT DO NOTHING
+    ),
+    upserted AS (
+        INSERT INTO state_current AS c
+            (tenant_id, entity_type, entity_id, version, state,
+             snapshot_version, patch_bytes_since_snapshot, updated_at)
+        SELECT tenant_id, entity_type, entity_id, expected_version + 1, state::jsonb,
+               snapshot_version, patch_bytes_since_snapshot, updated_at
+        FROM batch WHERE NOT EXISTS (SELECT 1 FROM stale)
+        ON CONFLICT (tenant_id, entity_type, entity_id) DO UPDATE SET
+            version = EXCLUDED.version,
+            state = EXCLUDED.state,
+            snapshot_version = EXCLUDED.snapshot_version,
+            patch_bytes_since_snapshot = EXCLUDED.patch_bytes_since_snapshot,
+            updated_at = EXCLUDED.updated_at
+    )
+    SELECT tenant_id, entity_type, entity_id, expected_version, actual_version FROM stale
+"""
+
+_UNIQUE_VIOLATION = "23505"
+# Two batches waiting on each other's version rows; one is aborted
+_DEADLOCK_DETECTED = "40P01"
+
+
+def _json(value: Any) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
+
+class PostgresStateStore:
+    """StateStore over state_versions, state_snapshots and state_current."""
+
+    def __init__(self, pool: "asyncpg.Pool") -> None:
+        """Initialize store.
+
+        Args:
+            pool: asyncpg connection pool
+        """
+        self._pool = pool
+
+    async def current(self, key: EntityKey) -> CurrentState | None:
+        """Materialized latest state (one row)."""
+        row = await self._pool.fetchrow(_CURRENT, key.tenant_id, key.entity_type, key.entity_id)
+        if row is None:
+            return None
+        return CurrentState(
+            key=key,
+            version=row["version"],
+            state=_json(row["state"]),
+            snapshot_version=row["snapshot_version"],
+            patch_bytes_since_snapshot=row["patch_bytes_since_snapshot"],
+            updated_at=row["updated_at"],
+        )
+
+    async def snapshot_at(self, key: EntityKey, version: int) -> StateSnapshot | None:
+        """Latest snapshot at or below version."""
+        row = await self._pool.fetchrow(
+            _SNAPSHOT_AT, key.tenant_id, key.entity_type, key.entity_id, version
+        )
+        if row is None:
+            return None
+        return StateSnapshot(key, row["version"], _json(row["state"]), row["created_at"])
+
+    async def patches(self, key: EntityKey, after: int, upto: int) -> list[Any]:
+        """Patches of versions after+1..upto."""
+        rows = await self._pool.fetch(
+            _PATCHES, key.tenant_id, key.entity_type, key.entity_id, after, upto
+        )
+        return [_json(row["state_patch"]) for row in rows]
+
+    async def current_many(self, keys: Sequence[EntityKey]) -> dict[EntityKey, CurrentState]:
+        """Materialized latest states (one statement)."""
+        if not keys:
+            return {}
+        rows = await self._pool.fetch(
+            _CURRENT_MANY,
+            [key.tenant_id for key in keys],
+            [key.entity_type for key in keys],
+            [key.entity_id for key in keys],
+        )
+        found = {}
+        for row in rows:
+            key = EntityKey(row["tenant_id"], row["entity_type"], row["entity_id"])
+            found[key] = CurrentState(
+                key=key,
+                version=row["version"],
+                state=_json(row["state"]),
+                snapshot_version=row["snapshot_version"],
+                patch_bytes_since_snapshot=row["patch_bytes_since_snapshot"],
+                updated_at=row["updated_at"],
+            )
+        return found
+
+    async def commit(self, write: StateWrite) -> None:
+        """Insert the version, update state_current, add the snapshot; one transaction.
+
+        Raises:
+            StateConflictError: If the version already exists
+        """
+        current = write.current
+        key = current.key
+        ident = (key.tenant_id, key.entity_type, key.entity_id)
+        async with self._pool.acquire() as conn, conn.transaction():
+            try:
+                await conn.execute(
+                    _INSERT_VERSION,
+                    *ident,
+                    current.version,
+                    canonical_state(write.patch).decode(),
+                    write.correlation_id,
+                    current.updated_at,
+                )
+            except Exception as e:
+                if getattr(e, "sqlstate", None) == _UNIQUE_VIOLATION:
+                    raise StateConflictError(key, write.expected_version, None) from e
+                raise
+            status = await conn.execute(
+                _UPSERT_CURRENT,
+                *ident,
+                current.version,
+                canonical_state(current.state).decode(),
+                current.snapshot_version,
+                current.patch_bytes_since_snapshot,
+                current.updated_at,
+                write.expected_version,
+            )
+            if status.endswith(" 0"):
+                raise StateConflictError(key, write.expected_version, None)
+            if write.snapshot is not None:
+                await conn.execute(
+                    _INSERT_SNAPSHOT,
+                    *ident,
+                    write.snapshot.version,
+                    canonical_state(write.snapshot.state).decode(),
+                    write.snapshot.created_at,
+                )
+
+    async def commit_many(self, writes: Sequence[StateWrite]) -> None:
+        """Check and write the whole batch in one statement.
+
+        Writes go in key order so that overlapping batches take row locks
+        in the same order. If the statement loses a race (unique violation
+        or deadlock), the entities' versions are read once more to report
+        which ones moved.
+
+        Raises:
+            StateBatchConflictError: If any entity is stale
+            ValueError: If an entity appears twice
+        """
+        _distinct_keys(write.current.key for write in writes)
+        if not writes:
+            return
+        ordered = sorted(
+            writes,
+            key=lambda w: (
+                w.current.key.tenant_id,
+                w.current.key.entity_type,
+                w.current.key.entity_id,
+            ),
+        )
+        columns: list[list[Any]] = [[] for _ in range(11)]
+        for write in ordered:
+            current = write.current
+            row = (
+                current.key.tenant_id,
+                current.key.entity_type,
+                current.key.entity_id,
+                write.expected_version,
+                canonical_state(write.patch).decode(),
+                write.correlation_id,
+                canonical_state(current.state).decode(),
+                current.snapshot_version,
+                current.patch_bytes_since_snapshot,
+                current.updated_at,
+                write.snapshot is not None,
+            )
+            for column, value in zip(columns, row):
+                column.append(value)
+
+        try:
+            stale = await self._pool.fetch(_COMMIT_MANY, *columns)
+        except Exception as e:
+            if getattr(e, "sqlstate", None) not in (_UNIQUE_VIOLATION, _DEADLOCK_DETECTED):
+                raise
+            raise await self._race_conflicts(writes) from e
+        if stale:
+            actual = {
+                EntityKey(row["tenant_id"], row["entity_type"], row["entity_id"]): row[
+                    "actual_version"
+                ]
+                for row in stale
+            }
+            raise StateBatchConflictError(
+                [
+                    StateConflictError(write.current.key, write.expected_version, actual[key])
+                    for write in writes
+                    if (key := write.current.key) in actual
+                ]
+            )
+
+    async def _race_conflicts(self, writes: Sequence[StateWrite]) -> StateBatchConflictError:
+        found = await self.current_many([write.current.key for write in writes])
+        conflicts = []
+        for write in writes:
+            key = write.current.key
+            version = found[key].version if key in found else 0
+            if version != write.expected_version:
+                conflicts.append(StateConflictError(key, write.expected_version, version))
+        if not conflicts:
+            # The winner's versions are not visible yet; blame the whole batch
+            conflicts = [
+                StateConflictError(write.current.key, write.expected_version, None)
+                for write in writes
+            ]
+        return StateBatchConflictError(conflicts)
@@ -0,0 +1,69 @@
+"""Trace module: INV-04 redaction pipeline and trace persistence.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Part of P1-TASK-11: Trace Redaction
+"""
+
+from autobiz.kernel.trace.archive import (
+    SegmentIndex,
+    TraceArchive,
+    TraceArchiveError,
+    TraceArchiver,
+)
+from autobiz.kernel.trace.redaction import (
+    MASK,
+    ContractRedaction,
+    RedactionPathError,
+    RedactionPlan,
+    compile_plan,
+    plans_for,
+    redact_input,
+    redact_output,
+)
+from autobiz.kernel.trace.scanner import (
+    ACTION_MASK,
+    ACTION_REJECT,
+    Finding,
+    ScanResult,
+    StreamScanner,
+    scan,
+    scan_stream,
+)
+from autobiz.kernel.trace.writer import (
+    InMemoryTraceSink,
+    PostgresTraceSink,
+    TraceRecord,
+    TraceSink,
+    TraceWriteError,
+    TraceWriter,
+    TraceWriterStats,
+)
+
+__all__ = [
+    "MASK",
+    "ContractRedaction",
+    "RedactionPathError",
+    "RedactionPlan",
+    "compile_plan",
+    "plans_for",
+    "redact_input",
+    "redact_output",
+    "ACTION_MASK",
+    "ACTION_REJECT",
+    "Finding",
+    "ScanResult",
+    "StreamScanner",
+    "scan",
+    "scan_stream",
+    "InMemoryTraceSink",
+    "PostgresTraceSink",
+    "TraceRecord",
+    "TraceSink",
+    "TraceWriteError",
+    "TraceWriter",
+    "TraceWriterStats",
+    "SegmentIndex",
+    "TraceArchive",
+    "TraceArchiveError",
+    "TraceArchiver",
+]
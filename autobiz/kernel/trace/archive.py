@@ -0,0 +1,668 @@
+"""Warm-tier trace archive: compressed segment files with a sparse index.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Requirements: INV-04, P1-R05
+
+Retention keeps traces hot in PostgreSQL for 7 days and warm (compressed,
+object storage) for 90. TraceArchiver moves completed traces past the hot
+window out of `traces` (and, by cascade, the trace_* child tables) into
+segment files laid out like object-store keys:
+
+    {root}/{tenant_id}/{YYYY}/{MM}/{DD}/{segment_id}.seg
+    {root}/{tenant_id}/{YYYY}/{MM}/{DD}/{segment_id}.idx.json
+
+A segment holds one tenant-day of traces ordered by started_at, as NDJSON
+cut into frames of about frame_bytes, each compressed on its own (zstd when
+the `zstandard` package is installed, zlib otherwise; the codec is recorded
+per segment). The index is sparse: one entry per frame (byte range, time
+range, trace count and a Bloom filter of the frame's correlation_ids, 10
+bits per run), not one per trace. Fetching one run checks the filters and
+decompresses the frame they point at (about 1% of other frames are read
+on a false positive); time-range queries skip frames outside the range;
+bulk export streams frames without re-encoding.
+
+The local filesystem stands in for the object store: a frame read is a
+ranged GET, and files are written under a temporary name and renamed so
+readers never see a partial segment. The index is written after its
+segment, so a segment without an index is invisible and gets overwritten.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+from uuid import UUID
+
+if TYPE_CHECKING:
+    import asyncpg
+
+try:
+    import zstandard as _zstd
+except ImportError:  # zlib fallback
+    _zstd = None  # type: ignore[assignment]
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+# Uncompressed frame size: one frame is what a single-run fetch decompresses
+FRAME_BYTES = 256 * 1024
+
+HOT_RETENTION = timedelta(days=7)
+
+# How often a fetch miss may rescan a tenant's index files (seconds)
+REFRESH_INTERVAL = 5.0
+
+_INDEX_VERSION = 2
+# Bloom filter per frame: ~1% false positives at 10 bits and 7 probes per key
+_BLOOM_BITS_PER_KEY = 10
+_BLOOM_PROBES = 7
+_TENANT_ID = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+# Columns of the trace_documents view that asyncpg returns as JSON text
+_JSONB_COLUMNS = ("steps", "tool_calls", "state_diffs")
+
+
+class TraceArchiveError(RuntimeError):
+    """Raised when a segment cannot be written or read."""
+
+
+def default_codec() -> str:
+    """Best codec available in this environment."""
+    return CODEC_ZSTD if _zstd is not None else CODEC_ZLIB
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, ZLIB_LEVEL)
+    if _zstd is None:
+        raise TraceArchiveError("zstd segments need the 'zstandard' package")
+    return bytes(_zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data))
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if codec != CODEC_ZSTD:
+        raise TraceArchiveError(f"Unknown segment codec {codec!r}")
+    if _zstd is None:
+        raise TraceArchiveError("zstd segments need the 'zstandard' package")
+    return bytes(_zstd.ZstdDecompressor().decompress(data))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.astimezone(timezone.utc).isoformat()
+    if isinstance(value, (UUID, date)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _bloom_hashes(key: str) -> tuple[int, int]:
+    """Two 64-bit hashes; probe i is h1 + i * h2 (double hashing)."""
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+def _bloom(keys: list[str]) -> bytes:
+    size = max(8, -(-len(keys) * _BLOOM_BITS_PER_KEY // 8))
+    bits = bytearray(size)
+    width = size * 8
+    for key in keys:
+        h1, h2 = _bloom_hashes(key)
+        for i in range(_BLOOM_PROBES):
+            position = (h1 + i * h2) % width
+            bits[position >> 3] |= 1 << (position & 7)
+    return bytes(bits)
+
+
+def _bloom_match(bits: bytes, hashes: tuple[int, int]) -> bool:
+    h1, h2 = hashes
+    width = len(bits) * 8
+    for i in range(_BLOOM_PROBES):
+        position = (h1 + i * h2) % width
+        if not bits[position >> 3] >> (position & 7) & 1:
+            return False
+    return True
+
+
+def _timestamp(value: Any) -> datetime:
+    """Aware UTC datetime from a datetime or ISO-8601 string."""
+    moment = datetime.fromisoformat(value) if isinstance(value, str) else value
+    if not isinstance(moment, datetime) or moment.tzinfo is None:
+        raise ValueError(f"started_at must be an aware timestamp, got {value!r}")
+    return moment.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class FrameEntry:
+    """Sparse index entry for one compressed frame.
+
+    Attributes:
+        offset: Byte offset of the frame in the segment file
+        length: Compressed length in bytes
+        count: Traces in the frame
+        min_started_at: Earliest started_at in the frame
+        max_started_at: Latest started_at in the frame
+        bloom: Bloom filter of the frame's correlation_ids
+    """
+
+    offset: int
+    length: int
+    count: int
+    min_started_at: datetime
+    max_started_at: datetime
+    bloom: bytes
+
+
+@dataclass(frozen=True)
+class SegmentIndex:
+    """Index of one segment file.
+
+    Attributes:
+        path: Segment file path
+        tenant_id: Owning tenant
+        day: UTC day of started_at covered by the segment
+        codec: Frame compression codec
+        frames: Frame entries in file order (ascending started_at)
+        raw_bytes: Uncompressed NDJSON size of the segment
+    """
+
+    path: Path
+    tenant_id: str
+    day: date
+    codec: str
+    frames: tuple[FrameEntry, ...]
+    raw_bytes: int
+
+    @property
+    def stored_bytes(self) -> int:
+        """Compressed size of the segment's frames."""
+        return sum(frame.length for frame in self.frames)
+
+    @property
+    def trace_count(self) -> int:
+        """Traces in the segment."""
+        return sum(frame.count for frame in self.frames)
+
+    def frames_between(self, start: datetime | None, end: datetime | None) -> list[int]:
+        """Frames that may hold traces with start <= started_at < end."""
+        return [
+            n
+            for n, frame in enumerate(self.frames)
+            if (start is None or frame.max_started_at >= start)
+            and (end is None or frame.min_started_at < end)
+        ]
+
+    def frames_for(self, correlation_id: str) -> list[int]:
+        """Frames that may hold the run (every frame that does, plus ~1% others)."""
+        hashes = _bloom_hashes(correlation_id)
+        return [n for n, frame in enumerate(self.frames) if _bloom_match(frame.bloom, hashes)]
+
+    def to_json(self) -> dict[str, Any]:
+        """Serializable form written to {segment_id}.idx.json."""
+        return {
+            "version": _INDEX_VERSION,
+            "tenant_id": self.tenant_id,
+            "day": self.day.isoformat(),
+            "codec": self.codec,
+            "raw_bytes": self.raw_bytes,
+            "frames": [
+                [
+                    f.offset,
+                    f.length,
+                    f.count,
+                    f.min_started_at,
+                    f.max_started_at,
+                    base64.b64encode(f.bloom).decode(),
+                ]
+                for f in self.frames
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, path: Path, data: dict[str, Any]) -> "SegmentIndex":
+        """Rebuild an index read from disk.
+
+        Raises:
+            TraceArchiveError: If the index version is not supported
+        """
+        if data.get("version") != _INDEX_VERSION:
+            raise TraceArchiveError(f"Unsupported index version in {path}")
+        return cls(
+            path=path,
+            tenant_id=data["tenant_id"],
+            day=date.fromisoformat(data["day"]),
+            codec=data["codec"],
+            frames=tuple(
+                FrameEntry(
+                    offset,
+                    length,
+                    count,
+                    _timestamp(low),
+                    _timestamp(high),
+                    base64.b64decode(bloom),
+                )
+                for offset, length, count, low, high, bloom in data["frames"]
+            ),
+            raw_bytes=data["raw_bytes"],
+        )
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_suffix(".idx.json")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class TraceArchive:
+    """Segment store for archived traces under one root directory.
+
+    Indexes are loaded per tenant on first use and cached; segments written
+    by another process are picked up after refresh(), or by a fetch miss at
+    most once per refresh_interval. Keep one long-lived instance per
+    process rather than one per request.
+
+    An instance may be shared between threads (TraceArchiver writes from a
+    worker thread while the event loop fetches): the index cache is
+    guarded by a lock, and write() calls are serialized. Segment files are
+    immutable once indexed, so frames are read without the lock.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        frame_bytes: int = FRAME_BYTES,
+        codec: str | None = None,
+        refresh_interval: float = REFRESH_INTERVAL,
+    ) -> None:
+        """Initialize archive.
+
+        Args:
+            root: Archive root (bucket stand-in)
+            frame_bytes: Target uncompressed size of a frame
+            codec: zstd or zlib (default: zstd when available)
+            refresh_interval: Least time between index rescans caused by
+                fetch misses (seconds)
+
+        Raises:
+            ValueError: If the codec is unknown or frame_bytes is not positive
+            TraceArchiveError: If zstd is requested but not installed
+        """
+        codec = codec if codec is not None else default_codec()
+        if codec not in (CODEC_ZSTD, CODEC_ZLIB):
+            raise ValueError(f"Unknown codec {codec!r}")
+        if codec == CODEC_ZSTD and _zstd is None:
+            raise TraceArchiveError("zstd segments need the 'zstandard' package")
+        if frame_bytes < 1:
+            raise ValueError("frame_bytes must be positive")
+        self.root = Path(root)
+        self.codec = codec
+        self.frame_bytes = frame_bytes
+        self.refresh_interval = refresh_interval
+        self._segments: dict[str, dict[Path, SegmentIndex]] = {}
+        # Monotonic time of each tenant's last directory scan
+        self._scanned: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Frames decompressed so far (telemetry for fetch/export cost)
+        self.frames_read = 0
+
+    def _tenant_dir(self, tenant_id: str) -> Path:
+        if not _TENANT_ID.match(tenant_id):
+            raise ValueError(f"tenant_id {tenant_id!r} is not usable as a path segment")
+        return self.root / tenant_id
+
+    def segments(self, tenant_id: str) -> list[SegmentIndex]:
+        """Indexes of a tenant's segments, oldest day first."""
+        with self._lock:
+            cached = self._segments.get(tenant_id)
+        if cached is None:
+            self.refresh(tenant_id)
+            with self._lock:
+                cached = self._segments[tenant_id]
+        with self._lock:
+            indexes = list(cached.values())
+        return sorted(indexes, key=lambda s: (s.day, s.path.name))
+
+    def tenants(self) -> list[str]:
+        """Tenants with an archive directory."""
+        if not self.root.is_dir():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def refresh(self, tenant_id: str) -> None:
+        """Load index files of a tenant that are not cached yet."""
+        index_paths = sorted(self._tenant_dir(tenant_id).glob("*/*/*/*.idx.json"))
+        with self._lock:
+            known = set(self._segments.get(tenant_id, ()))
+        loaded = []
+        for index_path in index_paths:
+            segment_path = index_path.with_name(index_path.name.removesuffix(".idx.json") + ".seg")
+            if segment_path not in known:
+                data = json.loads(index_path.read_bytes())
+                loaded.append(SegmentIndex.from_json(segment_path, data))
+        with self._lock:
+            cached = self._segments.setdefault(tenant_id, {})
+            for index in loaded:
+                cached.setdefault(index.path, index)
+            self._scanned[tenant_id] = time.monotonic()
+
+    def write(self, documents: Iterable[dict[str, Any]]) -> list[SegmentIndex]:
+        """Archive trace documents, one segment per tenant and UTC day.
+
+        Documents whose (tenant_id, correlation_id) is already archived are
+        skipped, so re-archiving a batch after a crash (segment written, hot
+        rows not yet deleted) does not duplicate traces.
+
+        Args:
+            documents: trace_documents rows (trace_id, tenant_id,
+                correlation_id, started_at, ...) as dicts
+
+        Returns:
+            Indexes of the segments written
+
+        Raises:
+            ValueError: If a document lacks the required fields
+        """
+        groups: dict[tuple[str, date], list[tuple[datetime, dict[str, Any]]]] = {}
+        for document in documents:
+            for required in ("tenant_id", "correlation_id", "started_at"):
+                if required not in document:
+                    raise ValueError(f"Trace document is missing {required!r}")
+            tenant_id = document["tenant_id"]
+            started_at = _timestamp(document["started_at"])
+            self._tenant_dir(tenant_id)
+            groups.setdefault((tenant_id, started_at.date()), []).append((started_at, document))
+
+        written = []
+        with self._write_lock:
+            for (tenant_id, day), entries in sorted(groups.items()):
+                fresh = self._unarchived(tenant_id, day, entries)
+                if fresh:
+                    written.append(self._write_segment(tenant_id, day, fresh))
+        return written
+
+    def _unarchived(
+        self, tenant_id: str, day: date, entries: list[tuple[datetime, dict[str, Any]]]
+    ) -> list[tuple[datetime, dict[str, Any]]]:
+        """Entries whose run is not in one of the tenant's segments for day yet."""
+        indexes = [index for index in self.segments(tenant_id) if index.day == day]
+        if not indexes:
+            return entries
+        # Bloom hits are confirmed against the frame; each frame is parsed once
+        frame_ids: dict[tuple[Path, int], set[str]] = {}
+
+        def archived(correlation_id: str) -> bool:
+            for index in indexes:
+                for frame in index.frames_for(correlation_id):
+                    ids = frame_ids.get((index.path, frame))
+                    if ids is None:
+                        ids = frame_ids[index.path, frame] = {
+                            str(json.loads(line)["correlation_id"])
+                            for line in self._read_frame(index, frame).splitlines()
+                        }
+                    if correlation_id in ids:
+                        return True
+            return False
+
+        return [entry for entry in entries if not archived(str(entry[1]["correlation_id"]))]
+
+    def _write_segment(
+        self, tenant_id: str, day: date, entries: list[tuple[datetime, dict[str, Any]]]
+    ) -> SegmentIndex:
+        entries.sort(key=lambda entry: entry[0])
+        # Deterministic id: re-writing the same batch replaces, never duplicates
+        digest = hashlib.sha256()
+        for _, document in entries:
+            digest.update(str(document["correlation_id"]).encode())
+            digest.update(b"\0")
+        segment_id = f"{entries[0][0]:%H%M%S}-{digest.hexdigest()[:16]}"
+        directory = self._tenant_dir(tenant_id) / f"{day:%Y}" / f"{day:%m}" / f"{day:%d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{segment_id}.seg"
+
+        frames: list[FrameEntry] = []
+        body: list[bytes] = []
+        offset = raw_bytes = 0
+        pending: list[bytes] = []
+        pending_ids: list[str] = []
+        pending_size = 0
+        first = last = entries[0][0]
+
+        def close_frame() -> None:
+            nonlocal offset, pending_size
+            compressed = _compress(self.codec, b"".join(pending))
+            bloom = _bloom(pending_ids)
+            frames.append(FrameEntry(offset, len(compressed), len(pending), first, last, bloom))
+            body.append(compressed)
+            offset += len(compressed)
+            pending.clear()
+            pending_ids.clear()
+            pending_size = 0
+
+        for started_at, document in entries:
+            if not pending:
+                first = started_at
+            line = json.dumps(document, default=_json_default, separators=(",", ":")).encode()
+            pending_ids.append(str(document["correlation_id"]))
+            pending.append(line + b"\n")
+            pending_size += len(line) + 1
+            raw_bytes += len(line) + 1
+            last = started_at
+            if pending_size >= self.frame_bytes:
+                close_frame()
+        if pending:
+            close_frame()
+
+        index = SegmentIndex(
+            path=path,
+            tenant_id=tenant_id,
+            day=day,
+            codec=self.codec,
+            frames=tuple(frames),
+            raw_bytes=raw_bytes,
+        )
+        try:
+            _write_atomic(path, b"".join(body))
+            _write_atomic(
+                _index_path(path),
+                json.dumps(index.to_json(), default=_json_default).encode(),
+            )
+        except OSError as e:
+            raise TraceArchiveError(f"Could not write segment {path}: {e}") from e
+
+        with self._lock:
+            self._segments.setdefault(tenant_id, {})[path] = index
+        return index
+
+    def _read_frame(self, index: SegmentIndex, frame: int) -> bytes:
+        entry = index.frames[frame]
+        try:
+            with open(index.path, "rb") as f:
+                f.seek(entry.offset)
+                compressed = f.read(entry.length)
+        except OSError as e:
+            raise TraceArchiveError(f"Could not read segment {index.path}: {e}") from e
+        if len(compressed) != entry.length:
+            raise TraceArchiveError(f"Segment {index.path} is truncated")
+        with self._lock:
+            self.frames_read += 1
+        return _decompress(index.codec, compressed)
+
+    def fetch(self, tenant_id: str, correlation_id: str) -> dict[str, Any] | None:
+        """Archived trace of one run, decompressing the frame its Bloom filter points at.
+
+        On a miss the tenant's index files are rescanned for segments
+        written by other processes, at most once per refresh_interval.
+
+        Returns:
+            The trace document (timestamps and UUIDs as strings), or None
+            if the run is not archived
+        """
+        indexes = self.segments(tenant_id)
+        document = self._search(indexes, correlation_id)
+        if document is None:
+            with self._lock:
+                due = self._scanned[tenant_id] + self.refresh_interval <= time.monotonic()
+            if due:
+                self.refresh(tenant_id)
+                searched = {index.path for index in indexes}
+                added = [index for index in self.segments(tenant_id) if index.path not in searched]
+                document = self._search(added, correlation_id)
+        return document
+
+    def _search(self, indexes: list[SegmentIndex], correlation_id: str) -> dict[str, Any] | None:
+        # Documents are written compactly, so the member appears verbatim
+        needle = b'"correlation_id":' + json.dumps(correlation_id).encode()
+        for index in reversed(indexes):
+            for frame in index.frames_for(correlation_id):
+                for line in self._read_frame(index, frame).split(b"\n"):
+                    if needle in line:
+                        document: dict[str, Any] = json.loads(line)
+                        if document.get("correlation_id") == correlation_id:
+                            return document
+        return None
+
+    def find(
+        self,
+        tenant_id: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Archived traces of a tenant with start <= started_at < end, in time order."""
+        for index in self.segments(tenant_id):
+            for frame in index.frames_between(start, end):
+                for line in self._read_frame(index, frame).splitlines():
+                    document: dict[str, Any] = json.loads(line)
+                    started_at = _timestamp(document["started_at"])
+                    if (start is None or started_at >= start) and (end is None or started_at < end):
+                        yield document
+
+    def export(
+        self,
+        out: IO[bytes],
+        tenant_id: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> int:
+        """Bulk export as NDJSON (one trace document per line).
+
+        Without a time range whole frames are copied as stored, without
+        parsing; with one, only overlapping frames are read and filtered.
+
+        Args:
+            out: Binary stream to write to
+            tenant_id: Tenant to export (default: every tenant)
+            start: Inclusive lower bound on started_at
+            end: Exclusive upper bound on started_at
+
+        Returns:
+            Number of traces written
+        """
+        tenants = [tenant_id] if tenant_id is not None else self.tenants()
+        exported = 0
+        for tenant in tenants:
+            if start is None and end is None:
+                for index in self.segments(tenant):
+                    for frame in range(len(index.frames)):
+                        out.write(self._read_frame(index, frame))
+                        exported += index.frames[frame].count
+                continue
+            for document in self.find(tenant, start, end):
+                out.write(json.dumps(document, separators=(",", ":")).encode() + b"\n")
+                exported += 1
+        return exported
+
+
+# Completed runs past the hot window, oldest first, in the pre-003 shape
+_SELECT_AGED = """
+    SELECT * FROM trace_documents
+    WHERE started_at < $1 AND completed_at IS NOT NULL
+    ORDER BY tenant_id, started_at
+    LIMIT $2
+"""
+
+# Child rows go with the trace (ON DELETE CASCADE, migration 003)
+_DELETE_ARCHIVED = "DELETE FROM traces WHERE trace_id = ANY($1::uuid[])"
+
+
+def _row_document(row: Any) -> dict[str, Any]:
+    document = dict(row)
+    for column in _JSONB_COLUMNS:
+        if isinstance(document.get(column), str):
+            document[column] = json.loads(document[column])
+    return document
+
+
+class TraceArchiver:
+    """Moves traces past the hot window from PostgreSQL into a TraceArchive.
+
+    Each batch is written to segments (fsynced) before its rows are
+    deleted; a crash in between re-archives the batch on the next pass,
+    which the archive deduplicates by correlation_id.
+    """
+
+    def __init__(
+        self,
+        pool: "asyncpg.Pool",
+        archive: TraceArchive,
+        hot_retention: timedelta = HOT_RETENTION,
+        batch_size: int = 500,
+        clock: Callable[[], datetime] | None = None,
+    ) -> None:
+        """Initialize archiver.
+
+        Args:
+            pool: asyncpg connection pool
+            archive: Destination segment store
+            hot_retention: Age after which a completed trace leaves PostgreSQL
+            batch_size: Traces moved per round-trip pair
+            clock: Aware-UTC clock
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._pool = pool
+        self.archive = archive
+        self.hot_retention = hot_retention
+        self.batch_size = batch_size
+        self._clock = clock if clock is not None else (lambda: datetime.now(timezone.utc))
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """Archive every eligible trace.
+
+        Args:
+            now: Aware current time (default: the clock)
+
+        Returns:
+            Number of traces moved out of PostgreSQL
+        """
+        cutoff = (now if now is not None else self._clock()) - self.hot_retention
+        moved = 0
+        while True:
+            rows = await self._pool.fetch(_SELECT_AGED, cutoff, self.batch_size)
+            if not rows:
+                return moved
+            documents = [_row_document(row) for row in rows]
+            await asyncio.to_thread(self.archive.write, documents)
+            await self._pool.execute(_DELETE_ARCHIVED, [row["trace_id"] for row in rows])
+            moved += len(rows)
+            if len(rows) < self.batch_size:
+                return moved
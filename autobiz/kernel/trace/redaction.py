@@ -0,0 +1,362 @@
+"""Contract-driven trace redaction: allowlist filter + sensitive-field masker.
+
+Part of P1-TASK-11: Trace Redaction
+Requirements: INV-04, P1-R25
+
+Stages 1 and 2 of the INV-04 pipeline. A ToolContract's JSONPath lists
+(trace_allowlist_input/output, sensitive_input/output_fields) are compiled
+once into a RedactionPlan: a trie of path segments driven as a lazily
+built automaton, so each payload is walked once for all paths together.
+
+Walk rules:
+- Subtrees no path can reach are returned as-is (no copy, no descent)
+- A container is copied only if something inside it changed; everything
+  else is shared with the input (structural sharing)
+- With an allowlist, only allowlisted values (whole subtrees) and the
+  containers leading to them survive
+- Sensitive values (whole subtrees) become MASK
+
+The result therefore aliases the input; neither may be mutated afterwards.
+
+Supported JSONPath subset:
+    $                 the whole payload
+    .name  ['name']   object member
+    [0]               array element
+    .*  [*]           any member / element
+    ..name            member at any depth below this point
+"""
+
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from autobiz.kernel.executor.tool_contract import ToolContract
+
+# Replacement for sensitive values
+MASK = "[REDACTED]"
+
+# Transitions cached per automaton state; payloads with unbounded key sets
+# (IDs as keys) fall back to uncached stepping past this
+_MAX_CACHED_TRANSITIONS = 512
+
+_SEGMENT = re.compile(
+    r"""
+      \.\.(?P<deep>[A-Za-z_$][\w$-]*)
+    | \.(?P<field>[A-Za-z_$][\w$-]*)
+    | \.(?P<dot_any>\*)
+    | \[(?P<index>\d+)\]
+    | \[(?P<bracket_any>\*)\]
+    | \['(?P<single>(?:[^'\\]|\\.)*)'\]
+    | \["(?P<double>(?:[^"\\]|\\.)*)"\]
+    """,
+    re.VERBOSE,
+)
+
+
+class RedactionPathError(ValueError):
+    """Raised when a contract's redaction path is not a supported JSONPath."""
+
+    def __init__(self, path: str, message: str) -> None:
+        """Initialize error.
+
+        Args:
+            path: Offending JSONPath expression
+            message: What is wrong with it
+        """
+        self.path = path
+        super().__init__(f"Invalid redaction path {path!r}: {message}")
+
+
+def parse_path(path: str) -> list[tuple[str, str | int | None]]:
+    """Split a JSONPath into (kind, key) segments.
+
+    Kinds: "field" (str key), "index" (int key), "any" (None) and
+    "deep" (str key, matched at any depth).
+
+    Raises:
+        RedactionPathError: If path is outside the supported subset
+    """
+    if not path.startswith("$"):
+        raise RedactionPathError(path, "must start with '$'")
+    segments: list[tuple[str, str | int | None]] = []
+    pos = 1
+    while pos < len(path):
+        match = _SEGMENT.match(path, pos)
+        if match is None:
+            raise RedactionPathError(path, f"unexpected {path[pos:]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)  # type: ignore[arg-type]
+        if kind == "deep":
+            segments.append(("deep", text))
+        elif kind == "field":
+            segments.append(("field", text))
+        elif kind in ("single", "double"):
+            segments.append(("field", re.sub(r"\\(.)", r"\1", text)))
+        elif kind == "index":
+            segments.append(("index", int(text)))
+        else:
+            segments.append(("any", None))
+        pos = match.end()
+    return segments
+
+
+class _Node:
+    """Trie node: one position reached by one or more path prefixes."""
+
+    __slots__ = ("fields", "any", "deep", "terminal", "_carry")
+
+    def __init__(self) -> None:
+        self.fields: dict[str | int, _Node] = {}
+        self.any: _Node | None = None
+        self.deep: dict[str, _Node] = {}
+        self.terminal = False
+        self._carry: _Node | None = None
+
+    def carry(self) -> "_Node":
+        """Node holding only this node's ..name searches, for the levels below.
+
+        The fields and .* children apply one level down only; carrying the
+        whole node would let them match at any depth.
+        """
+        carry = self._carry
+        if carry is None:
+            if self.fields or self.any is not None or self.terminal:
+                carry = _Node()
+                carry.deep = self.deep
+            else:
+                carry = self
+            self._carry = carry
+        return carry
+
+
+def _build_trie(paths: Iterable[str]) -> _Node:
+    root = _Node()
+    for path in paths:
+        node = root
+        for kind, key in parse_path(path):
+            if kind == "any":
+                if node.any is None:
+                    node.any = _Node()
+                node = node.any
+            elif kind == "deep":
+                node = node.deep.setdefault(key, _Node())  # type: ignore[arg-type]
+            else:
+                node = node.fields.setdefault(key, _Node())  # type: ignore[arg-type]
+        node.terminal = True
+    return root
+
+
+# Transition cache key shared by all array elements of a state without [n]
+_ELEMENT: Any = object()
+
+
+class _State:
+    """Set of trie nodes active at one payload position (automaton state).
+
+    Terminal states are absorbing: every step from one returns itself, so
+    "this whole subtree matched" costs nothing further down.
+    """
+
+    __slots__ = ("nodes", "terminal", "dead", "_indexed", "_next", "_interned")
+
+    def __init__(self, nodes: tuple[_Node, ...], interned: dict[Any, "_State"]) -> None:
+        self.nodes = nodes
+        self.terminal = any(node.terminal for node in nodes)
+        self.dead = not nodes
+        # Without [n] segments every array element steps the same way
+        self._indexed = any(key.__class__ is int for node in nodes for key in node.fields)
+        self._next: dict[Any, _State] = {}
+        self._interned = interned
+
+    def step(self, key: str | int) -> "_State":
+        """State for the child at key (object member name or array index)."""
+        if self.terminal or self.dead:
+            return self
+        cache_key = key if key.__class__ is str or self._indexed else _ELEMENT
+        cached = self._next.get(cache_key)
+        if cached is not None:
+            return cached
+        reached: list[_Node] = []
+        for node in self.nodes:
+            child = node.fields.get(key)
+            if child is not None:
+                reached.append(child)
+            if node.any is not None:
+                reached.append(node.any)
+            if node.deep:
+                if key.__class__ is str:
+                    child = node.deep.get(key)
+                    if child is not None:
+                        reached.append(child)
+                # A descendant search stays active all the way down
+                reached.append(node.carry())
+        state = _intern(tuple(dict.fromkeys(reached)), self._interned)
+        if len(self._next) < _MAX_CACHED_TRANSITIONS:
+            self._next[cache_key] = state
+        return state
+
+
+def _intern(nodes: tuple[_Node, ...], interned: dict[Any, _State]) -> _State:
+    ident = frozenset(map(id, nodes))
+    state = interned.get(ident)
+    if state is None:
+        state = interned[ident] = _State(nodes, interned)
+    return state
+
+
+# Returned by the walk for values the allowlist removes
+_DROP: Any = object()
+
+
+class RedactionPlan:
+    """Compiled allowlist + mask for one payload direction of one contract.
+
+    Attributes:
+        sensitive_fields: Paths masked with MASK
+        allowlist: Paths kept, or None to keep everything
+    """
+
+    def __init__(self, sensitive_fields: Iterable[str], allowlist: Iterable[str] | None) -> None:
+        """Compile the paths.
+
+        Args:
+            sensitive_fields: JSONPaths whose values are masked
+            allowlist: JSONPaths that are kept (everything else is dropped),
+                or None to keep everything
+
+        Raises:
+            RedactionPathError: If any path is unsupported
+        """
+        self.sensitive_fields = tuple(sensitive_fields)
+        self.allowlist = tuple(allowlist) if allowlist is not None else None
+        interned: dict[Any, _State] = {}
+        self._mask_root = _intern(
+            (_build_trie(self.sensitive_fields),) if self.sensitive_fields else (),
+            interned,
+        )
+        if self.allowlist is None:
+            keep_all = _Node()
+            keep_all.terminal = True
+            self._allow_root = _intern((keep_all,), interned)
+        else:
+            self._allow_root = _intern((_build_trie(self.allowlist),), interned)
+
+    @property
+    def is_noop(self) -> bool:
+        """True if apply() always returns its input unchanged."""
+        return self._allow_root.terminal and self._mask_root.dead
+
+    def apply(self, payload: Any) -> Any:
+        """Redact one payload.
+
+        Args:
+            payload: JSON value (typically a dict of tool input or output)
+
+        Returns:
+            Redacted value sharing unchanged subtrees with payload; None if
+            the allowlist removes the whole payload
+        """
+        result = _walk(payload, self._allow_root, self._mask_root)
+        return None if result is _DROP else result
+
+
+def _walk(value: Any, allow: _State, mask: _State) -> Any:
+    if mask.terminal:
+        return MASK
+    if allow.terminal and mask.dead:
+        return value
+
+    cls = value.__class__
+    if cls is str or cls is int or cls is float or cls is bool or value is None:
+        # Scalar where the allowlist only names deeper paths
+        return value if allow.terminal else _DROP
+    if cls is dict or isinstance(value, Mapping):
+        out: dict[Any, Any] | None = None
+        for position, (key, item) in enumerate(value.items()):
+            allow_child = allow.step(key)
+            new = _DROP if allow_child.dead else _walk(item, allow_child, mask.step(key))
+            if new is item:
+                if out is not None:
+                    out[key] = item
+                continue
+            if out is None:
+                out = dict(islice(value.items(), position))
+            if new is not _DROP:
+                out[key] = new
+        return value if out is None else out
+
+    if cls is list or cls is tuple:
+        items: list[Any] | None = None
+        for position, item in enumerate(value):
+            allow_child = allow.step(position)
+            new = _DROP if allow_child.dead else _walk(item, allow_child, mask.step(position))
+            if new is item:
+                if items is not None:
+                    items.append(item)
+                continue
+            if items is None:
+                items = list(value[:position])
+            if new is not _DROP:
+                items.append(new)
+        return value if items is None else items
+
+    return value if allow.terminal else _DROP
+
+
+@lru_cache(maxsize=1024)
+def compile_plan(
+    sensitive_fields: tuple[str, ...], allowlist: tuple[str, ...] | None
+) -> RedactionPlan:
+    """Compiled, shared RedactionPlan for a set of paths.
+
+    Contracts are frozen, so plans are cached by their paths: contracts
+    (and contract versions) with the same annotations share one plan.
+
+    Raises:
+        RedactionPathError: If any path is unsupported
+    """
+    return RedactionPlan(sensitive_fields, allowlist)
+
+
+@dataclass(frozen=True)
+class ContractRedaction:
+    """Input and output plans for one contract."""
+
+    input: RedactionPlan
+    output: RedactionPlan
+
+
+def plans_for(contract: "ToolContract") -> ContractRedaction:
+    """Compiled redaction plans for a contract (cached).
+
+    Raises:
+        RedactionPathError: If any annotation is unsupported
+    """
+    return ContractRedaction(
+        input=compile_plan(
+            tuple(contract.sensitive_input_fields),
+            _optional_tuple(contract.trace_allowlist_input),
+        ),
+        output=compile_plan(
+            tuple(contract.sensitive_output_fields),
+            _optional_tuple(contract.trace_allowlist_output),
+        ),
+    )
+
+
+def _optional_tuple(paths: list[str] | None) -> tuple[str, ...] | None:
+    return tuple(paths) if paths is not None else None
+
+
+def redact_input(contract: "ToolContract", payload: Any) -> Any:
+    """Apply a contract's input allowlist and masks to a tool input."""
+    return plans_for(contract).input.apply(payload)
+
+
+def redact_output(contract: "ToolContract", payload: Any) -> Any:
+    """Apply a contract's output allowlist and masks to a tool output."""
+    return plans_for(contract).output.apply(payload)
@@ -0,0 +1,346 @@
+"""Defense-in-depth scanners for serialized trace payloads.
+
+Part of P1-TASK-11: Trace Redaction
+Requirements: INV-04, P1-R25
+
+Stages 3-5 of the INV-04 pipeline, run over the serialized (UTF-8 JSON)
+trace after the allowlist filter and masker:
+
+| Category | Detection                                     | Action |
+|----------|-----------------------------------------------|--------|
+| secret   | sk_/rk_, ghp_/gho_/ghs_, xox*, api_/secret_   | REJECT |
+|          | prefix plus a Shannon entropy floor on the    |        |
+|          | token                                         |        |
+| card     | 13-19 digit run (spaces/dashes allowed),      | REJECT |
+|          | known IIN prefix and length, Luhn-valid       |        |
+| ssn      | ddd-dd-dddd                                   | REJECT |
+| email    | local@domain.tld                              | MASK   |
+| phone    | '+' and 10-15 digits                          | MASK   |
+
+All categories are one alternation compiled into a single bytes regex, so
+the payload is traversed once. The alternation starts with one character
+class covering every possible first byte (digits, '+', '@' and the secret
+prefix letters), which lets the regex engine skip all other bytes in C;
+each branch then re-checks its first byte and the byte before it by
+lookbehind. Emails are anchored at '@' and their local part is recovered
+afterwards, rather than attempting a match at every word. Candidate cards
+are confirmed by issuer prefix and a table-driven Luhn check, accumulated
+for every prefix length while the run's digits are extracted; secrets by
+the entropy test.
+
+StreamScanner accepts the payload in chunks. Every match is at most
+MAX_MATCH bytes, so only that much is carried between chunks.
+
+A detection means an allowlist is misconfigured: alert and review the
+ToolContract annotations.
+"""
+
+import math
+import re
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+ACTION_REJECT = "REJECT"
+ACTION_MASK = "MASK"
+
+CATEGORY_ACTIONS = {
+    "secret": ACTION_REJECT,
+    "card": ACTION_REJECT,
+    "ssn": ACTION_REJECT,
+    "email": ACTION_MASK,
+    "phone": ACTION_MASK,
+}
+
+# Upper bound on the length of any match (every quantifier below is bounded)
+MAX_MATCH = 400
+
+# Minimum bits per character for a token to count as a secret
+KNOWN_PREFIX_MIN_ENTROPY = 3.0
+GENERIC_PREFIX_MIN_ENTROPY = 3.5
+
+# Every alternative's first byte is consumed by one leading character class
+# (so the engine skips everything else in C) and re-checked by lookbehind.
+# Emails are anchored at '@'; the local part is recovered afterwards.
+_PATTERN = re.compile(
+    rb"""
+    [0-9+@srgxa]
+    (?:
+      (?P<ssn>(?<=[0-9])(?<![0-9-].)[0-9]{2}-[0-9]{2}-[0-9]{4}(?![0-9-]))
+    | (?P<card>(?<=[0-9])(?<![0-9.].)(?:[\ -]?[0-9]){12,18}(?![0-9]))
+    | (?P<phone>(?<=\+)(?<![A-Za-z0-9+].)[1-9](?:[\ .()-]{0,2}[0-9]){9,14}(?![0-9]))
+    | (?P<email>(?<=@)(?:[A-Za-z0-9-]{1,63}\.){1,4}[A-Za-z]{2,24}(?![A-Za-z0-9-]))
+    | (?P<secret>(?<![A-Za-z0-9_].)
+          (?: (?P<known>(?<=[sr])k_(?:live|test)_|(?<=g)h[pos]_|(?<=x)ox[abposr]-)
+              (?P<known_token>[A-Za-z0-9-]{16,200})
+            | (?P<generic>(?<=a)pi_(?:key_)?|(?<=s)ecret_(?:key_)?)
+              (?P<generic_token>[A-Za-z0-9]{16,200})
+          )(?![A-Za-z0-9])
+      )
+    )
+    """,
+    re.VERBOSE,
+)
+
+_EMAIL_LOCAL_MAX = 64
+_EMAIL_LOCAL = re.compile(rb"[A-Za-z0-9._%+-]{1,64}\Z")
+
+_DIGIT = re.compile(rb"[0-9]")
+
+# Luhn: value of a digit at an even position from the right (doubled)
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+# Issuer prefixes and lengths: Visa (16/19; legacy 13-digit numbers collide
+# with common IDs), Mastercard, Amex, Discover, JCB, Diners, UnionPay
+_CARD_BRANDS = re.compile(
+    rb"""
+      4[0-9]{15}(?:[0-9]{3})?
+    | (?:5[1-5][0-9]{2}|222[1-9]|22[3-9][0-9]|2[3-6][0-9]{2}|27[01][0-9]|2720)[0-9]{12}
+    | 3[47][0-9]{13}
+    | (?:6011|65[0-9]{2}|64[4-9][0-9])[0-9]{12,15}
+    | 35(?:2[89]|[3-8][0-9])[0-9]{12,15}
+    | 3(?:0[0-5]|[68][0-9])[0-9]{11,16}
+    | 62[0-9]{14,17}
+    """,
+    re.VERBOSE,
+)
+
+
+@dataclass(frozen=True)
+class Finding:
+    """One detection.
+
+    Attributes:
+        category: secret, card, ssn, email or phone
+        action: REJECT or MASK
+        start: Byte offset of the match in the scanned payload
+        end: Byte offset just past the match
+        replacement: Masked form (MASK findings only)
+    """
+
+    category: str
+    action: str
+    start: int
+    end: int
+    replacement: bytes | None = None
+
+
+@dataclass
+class ScanResult:
+    """Findings for one payload, in payload order."""
+
+    findings: list[Finding] = field(default_factory=list)
+
+    @property
+    def rejected(self) -> bool:
+        """True if the trace write must be rejected."""
+        return any(finding.action == ACTION_REJECT for finding in self.findings)
+
+    def counts(self) -> dict[str, int]:
+        """Findings per category (scanner_detection_total by type)."""
+        return dict(Counter(finding.category for finding in self.findings))
+
+    def apply_masks(self, data: bytes) -> bytes:
+        """Replace MASK findings in the scanned payload.
+
+        Args:
+            data: The exact bytes that were scanned
+
+        Returns:
+            data with every MASK finding replaced by its masked form
+        """
+        out: list[bytes] = []
+        pos = 0
+        for finding in self.findings:
+            if finding.replacement is None:
+                continue
+            out.append(data[pos : finding.start])
+            out.append(finding.replacement)
+            pos = finding.end
+        if not out:
+            return data
+        out.append(data[pos:])
+        return b"".join(out)
+
+
+def luhn_valid(digits: bytes) -> bool:
+    """Luhn checksum over ASCII digits."""
+    total = 0
+    doubled = _LUHN_DOUBLED
+    for position, byte in enumerate(reversed(digits)):
+        digit = byte - 48
+        total += doubled[digit] if position & 1 else digit
+    return total % 10 == 0
+
+
+def shannon_entropy(token: bytes) -> float:
+    """Bits per byte of token."""
+    length = len(token)
+    return -sum(n / length * math.log2(n / length) for n in Counter(token).values())
+
+
+def mask_email(email: bytes) -> bytes:
+    """jane@example.com -> j***@***.com"""
+    local, _, domain = email.partition(b"@")
+    return local[:1] + b"***@***." + domain.rsplit(b".", 1)[-1]
+
+
+def mask_phone(phone: bytes) -> bytes:
+    """+1 555 123 4567 -> ***-***-4567"""
+    return b"***-***-" + b"".join(_DIGIT.findall(phone))[-4:]
+
+
+def _card_end(run: bytes) -> int | None:
+    """Byte length of the card number at the start of a digit run, if any.
+
+    The pattern is greedy, so a card followed by more digit groups matches
+    as one long run. Tried in order: the whole run, then shorter numbers
+    (19 down to 13 digits) ending at a separator, then the rest.
+
+    The Luhn checksum of every prefix is accumulated in the one walk that
+    extracts the digits: the rightmost digit of a prefix is never doubled,
+    so a prefix ending at an even index uses the running sum that doubles
+    odd indexes, and vice versa.
+    """
+    ends: list[int] = []
+    luhn: list[bool] = []  # luhn[n - 1]: the first n digits pass
+    digits = bytearray()
+    totals = [0, 0]  # Running sums doubling odd / even indexes
+    doubled = _LUHN_DOUBLED
+    for i, byte in enumerate(run):
+        if 48 <= byte <= 57:
+            digit = byte - 48
+            parity = len(ends) & 1
+            totals[0] += doubled[digit] if parity else digit
+            totals[1] += digit if parity else doubled[digit]
+            luhn.append(totals[parity] % 10 == 0)
+            ends.append(i + 1)
+            digits.append(byte)
+    lengths = range(len(ends), 12, -1)
+    grouped = [n for n in lengths if n == len(ends) or run[ends[n - 1]] in b" -"]
+    for n in grouped + [n for n in lengths if n not in grouped]:
+        if luhn[n - 1] and _CARD_BRANDS.fullmatch(digits, 0, n):
+            return ends[n - 1]
+    return None
+
+
+def _classify(match: re.Match[bytes], data: bytes, base: int, floor: int) -> Finding | None:
+    """Confirm a regex candidate; None if it fails the secondary check.
+
+    floor is the end of the previous candidate: an email's local part may
+    not reach back past it.
+    """
+    category = match.lastgroup
+    start, end = match.span()
+    if category == "card":
+        length = _card_end(match.group())
+        if length is None:
+            return None
+        return Finding("card", ACTION_REJECT, base + start, base + start + length)
+    if category == "email":
+        local = _EMAIL_LOCAL.search(data, max(floor, start - _EMAIL_LOCAL_MAX), start)
+        if local is None:
+            return None
+        start = local.start()
+        replacement = mask_email(data[start:end])
+        return Finding("email", ACTION_MASK, base + start, base + end, replacement)
+    if category == "phone":
+        return Finding("phone", ACTION_MASK, base + start, base + end, mask_phone(match.group()))
+    if category == "secret":
+        if match.group("known") is not None:
+            if shannon_entropy(match.group("known_token")) < KNOWN_PREFIX_MIN_ENTROPY:
+                return None
+        else:
+            token = match.group("generic_token")
+            if token.isalpha() or token.isdigit():
+                return None
+            if shannon_entropy(token) < GENERIC_PREFIX_MIN_ENTROPY:
+                return None
+        return Finding("secret", ACTION_REJECT, base + start, base + end)
+    return Finding("ssn", ACTION_REJECT, base + start, base + end)
+
+
+def scan(data: bytes) -> ScanResult:
+    """Scan a complete serialized payload in one pass.
+
+    Args:
+        data: UTF-8 payload (typically the trace JSON)
+
+    Returns:
+        ScanResult with every confirmed finding
+    """
+    result = ScanResult()
+    append = result.findings.append
+    floor = 0
+    for match in _PATTERN.finditer(data):
+        finding = _classify(match, data, 0, floor)
+        if finding is not None:
+            append(finding)
+        floor = match.end()
+    return result
+
+
+def scan_stream(chunks: Iterable[bytes]) -> ScanResult:
+    """Scan a payload delivered in chunks (same findings as scan(b"".join(chunks)))."""
+    scanner = StreamScanner()
+    for chunk in chunks:
+        scanner.feed(chunk)
+    return scanner.close()
+
+
+class StreamScanner:
+    """Incremental scanner: feed() chunks, then close() for the result.
+
+    Holds at most one chunk plus MAX_MATCH bytes. Offsets in findings are
+    relative to the start of the whole stream.
+    """
+
+    # Bytes kept before the resume point: lookbehinds and email local parts
+    _CONTEXT = _EMAIL_LOCAL_MAX + 8
+
+    def __init__(self) -> None:
+        """Initialize an empty stream."""
+        self._buf = b""
+        self._base = 0  # stream offset of self._buf[0]
+        self._pos = 0  # resume offset within self._buf
+        self._floor = 0  # stream offset of the end of the last candidate
+        self._result = ScanResult()
+        self._closed = False
+
+    def feed(self, chunk: bytes) -> None:
+        """Scan as much of the stream as can no longer change."""
+        if self._closed:
+            raise ValueError("StreamScanner is closed")
+        self._buf += chunk
+        self._scan(len(self._buf) - MAX_MATCH)
+
+    def close(self) -> ScanResult:
+        """Scan the remainder and return every finding."""
+        if not self._closed:
+            self._scan(len(self._buf))
+            self._closed = True
+            self._buf = b""
+        return self._result
+
+    def _scan(self, limit: int) -> None:
+        # A match starting before limit fits in the buffer entirely, so it
+        # is final; anything later waits for more data
+        buf, pos = self._buf, self._pos
+        if limit <= pos:
+            return
+        append = self._result.findings.append
+        base = self._base
+        for match in _PATTERN.finditer(buf, pos):
+            if match.start() >= limit:
+                break
+            finding = _classify(match, buf, base, max(0, self._floor - base))
+            if finding is not None:
+                append(finding)
+            pos = match.end()
+            self._floor = base + pos
+        pos = max(pos, limit)
+
+        keep_from = max(0, pos - self._CONTEXT)
+        self._buf = buf[keep_from:]
+        self._base += keep_from
+        self._pos = pos - keep_from
@@ -0,0 +1,364 @@
+"""TraceWriter: micro-batched, bounded, append-only trace persistence.
+
+Part of P1-TASK-10: Tracing + Correlation + Cost
+Requirements: INV-04, P1-R05
+
+Agent runs append steps, tool calls and state diffs as they happen. The
+writer queues them and a single background task drains the queue into
+batches, so many concurrent runs share each database round-trip:
+
+- A batch is everything queued when the drain starts (up to max_batch),
+  plus whatever arrives during an optional linger of max_delay seconds.
+  While a write is in flight, new records pile up for the next batch, so
+  batches grow by themselves under load.
+- The queue holds at most max_pending records; append() waits when it is
+  full (backpressure on the agent loops instead of unbounded memory).
+- A failed batch is retried up to max_attempts times. Inserts are
+  idempotent per (trace_id, seq), so a retry after an ambiguous failure
+  cannot duplicate rows. A batch that still fails is reported by the next
+  flush() / close().
+
+Records must already be redacted (autobiz.kernel.trace.redaction/scanner).
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+if TYPE_CHECKING:
+    import asyncpg
+
+TraceKind = Literal["step", "tool_call", "state_diff"]
+
+TRACE_TABLES: dict[str, str] = {
+    "step": "trace_steps",
+    "tool_call": "trace_tool_calls",
+    "state_diff": "trace_state_diffs",
+}
+
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_MAX_PENDING = 20_000
+DEFAULT_MAX_DELAY = 0.002
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    """One appended trace element (one row of a trace_* child table).
+
+    Attributes:
+        kind: step, tool_call or state_diff
+        trace_id: Trace the element belongs to
+        tenant_id: Owning tenant
+        seq: Position within the trace for this kind (from 0)
+        payload: Redacted JSON element
+        tool_name: Tool invoked (tool_call records)
+        recorded_at: When the element was produced
+    """
+
+    kind: TraceKind
+    trace_id: str
+    tenant_id: str
+    seq: int
+    payload: Any
+    tool_name: str | None = None
+    recorded_at: datetime = field(default_factory=_utcnow)
+
+
+class TraceWriteError(RuntimeError):
+    """Raised by flush()/close() when batches were dropped after retries.
+
+    Attributes:
+        dropped: Number of records that were not persisted
+    """
+
+    def __init__(self, dropped: int, cause: BaseException) -> None:
+        """Initialize error.
+
+        Args:
+            dropped: Records lost since the last report
+            cause: Last write error
+        """
+        self.dropped = dropped
+        super().__init__(f"{dropped} trace records were not persisted: {cause!r}")
+
+
+class TraceSink(Protocol):
+    """Persists one batch of trace records atomically."""
+
+    async def write(self, records: Sequence[TraceRecord]) -> None:
+        """Write every record, or raise without writing any."""
+        ...
+
+
+class InMemoryTraceSink:
+    """List-backed TraceSink for tests and benchmarks.
+
+    Attributes:
+        records: Everything written, in write order
+        batch_sizes: Size of each write() call
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        """Initialize sink.
+
+        Args:
+            latency: Simulated round-trip time per write() in seconds
+        """
+        self.records: list[TraceRecord] = []
+        self.batch_sizes: list[int] = []
+        self._keys: set[tuple[str, str, int]] = set()
+        self._latency = latency
+
+    async def write(self, records: Sequence[TraceRecord]) -> None:
+        """Store a batch; records already present are skipped (idempotent)."""
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        self.batch_sizes.append(len(records))
+        for record in records:
+            key = (record.kind, record.trace_id, record.seq)
+            if key not in self._keys:
+                self._keys.add(key)
+                self.records.append(record)
+
+
+# One multi-row INSERT per kind; unnest keeps it a single fixed statement
+_INSERT = """
+    INSERT INTO {table} (trace_id, seq, tenant_id, payload, recorded_at)
+    SELECT * FROM unnest($1::uuid[], $2::int[], $3::text[], $4::jsonb[], $5::timestamptz[])
+    ON CONFLICT (trace_id, seq) DO NOTHING
+"""
+
+_INSERT_TOOL_CALLS = """
+    INSERT INTO trace_tool_calls (trace_id, seq, tenant_id, payload, recorded_at, tool_name)
+    SELECT * FROM unnest(
+        $1::uuid[], $2::int[], $3::text[], $4::jsonb[], $5::timestamptz[], $6::text[]
+    )
+    ON CONFLICT (trace_id, seq) DO NOTHING
+"""
+
+
+class PostgresTraceSink:
+    """TraceSink over the trace_* child tables (migration 003).
+
+    One transaction and one INSERT per record kind present in the batch.
+    """
+
+    def __init__(self, pool: "asyncpg.Pool") -> None:
+        """Initialize sink.
+
+        Args:
+            pool: asyncpg connection pool
+        """
+        self._pool = pool
+
+    async def write(self, records: Sequence[TraceRecord]) -> None:
+        """Insert a batch atomically."""
+        by_kind: dict[str, list[TraceRecord]] = {}
+        for record in records:
+            by_kind.setdefault(record.kind, []).append(record)
+
+        async with self._pool.acquire() as conn, conn.transaction():
+            for kind, rows in by_kind.items():
+                columns = [
+                    [r.trace_id for r in rows],
+                    [r.seq for r in rows],
+                    [r.tenant_id for r in rows],
+                    [json.dumps(r.payload, separators=(",", ":")) for r in rows],
+                    [r.recorded_at for r in rows],
+                ]
+                if kind == "tool_call":
+                    await conn.execute(_INSERT_TOOL_CALLS, *columns, [r.tool_name for r in rows])
+                else:
+                    await conn.execute(_INSERT.format(table=TRACE_TABLES[kind]), *columns)
+
+
+@dataclass
+class TraceWriterStats:
+    """Counters for trace-write telemetry."""
+
+    appended: int = 0
+    written: int = 0
+    batches: int = 0
+    retries: int = 0
+    dropped: int = 0
+    # Times append() had to wait for queue space
+    backpressure_waits: int = 0
+
+
+# Queue sentinel telling the drain task to exit
+_STOP: Any = object()
+
+
+class TraceWriter:
+    """Bounded queue + background batch writer for trace records.
+
+    Usage:
+        writer = TraceWriter(PostgresTraceSink(pool))
+        writer.start()
+        await writer.append(TraceRecord("step", trace_id, tenant_id, 0, {...}))
+        ...
+        await writer.close()
+
+    A writer is bound to one asyncio event loop.
+    """
+
+    def __init__(
+        self,
+        sink: TraceSink,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        """Initialize writer.
+
+        Args:
+            sink: Where batches are written
+            max_batch: Most records per sink write
+            max_pending: Queue bound; append() waits beyond it
+            max_delay: Linger before a non-full batch is written (seconds)
+            max_attempts: Write attempts per batch before it is dropped
+        """
+        if max_batch < 1 or max_pending < 1 or max_attempts < 1:
+            raise ValueError("max_batch, max_pending and max_attempts must be at least 1")
+        self._sink = sink
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._max_attempts = max_attempts
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_pending)
+        self._task: asyncio.Task[None] | None = None
+        self._dropped_unreported = 0
+        self._last_error: BaseException | None = None
+        self.stats = TraceWriterStats()
+
+    def start(self) -> None:
+        """Start the background drain task (requires a running loop)."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def append(self, record: TraceRecord) -> None:
+        """Queue a record; waits while the queue is full.
+
+        Raises:
+            RuntimeError: If the writer is not running
+        """
+        if self._task is None or self._task.done():
+            raise RuntimeError("TraceWriter is not running")
+        if self._queue.full():
+            self.stats.backpressure_waits += 1
+        await self._queue.put(record)
+        self.stats.appended += 1
+
+    async def flush(self) -> None:
+        """Wait until every queued record has been written or dropped.
+
+        Raises:
+            TraceWriteError: If records were dropped since the last report
+            RuntimeError: If the drain task stopped with records still queued
+                (chained to the error that stopped it)
+        """
+        if not await self._unless_stopped(self._queue.join()):
+            self._raise_stopped()
+        self._raise_dropped()
+
+    async def close(self) -> None:
+        """Flush, then stop the drain task.
+
+        Raises:
+            TraceWriteError: If records were dropped since the last report
+            RuntimeError: If the drain task had stopped on an error
+        """
+        task = self._task
+        if task is not None:
+            if not task.done() and await self._unless_stopped(self._queue.put(_STOP)):
+                await asyncio.wait({task})
+            if task.cancelled() or task.exception() is not None:
+                self._raise_stopped()
+            self._task = None
+        self._raise_dropped()
+
+    async def _unless_stopped(self, awaitable: Awaitable[None]) -> bool:
+        """Await awaitable, giving up if the drain task stops first; True if it completed.
+
+        A dead drain task never empties the queue, so join() or a put()
+        into a full queue would otherwise wait forever.
+        """
+        future = asyncio.ensure_future(awaitable)
+        waits: set[asyncio.Future[Any]] = {future}
+        if self._task is not None:
+            waits.add(self._task)
+        try:
+            done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            future.cancel()
+        return future in done
+
+    def _raise_stopped(self) -> None:
+        task, self._task = self._task, None
+        error = None if task is None or task.cancelled() else task.exception()
+        raise RuntimeError("TraceWriter drain task stopped") from error
+
+    def _raise_dropped(self) -> None:
+        if self._dropped_unreported:
+            dropped, self._dropped_unreported = self._dropped_unreported, 0
+            raise TraceWriteError(dropped, self._last_error)  # type: ignore[arg-type]
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        stopping = False
+        while not stopping:
+            batch = [await queue.get()]
+            if batch[0] is _STOP:
+                queue.task_done()
+                return
+            stopping = self._take(batch)
+            if not stopping and len(batch) < self._max_batch and self._max_delay > 0:
+                await asyncio.sleep(self._max_delay)
+                stopping = self._take(batch)
+
+            records = batch[:-1] if stopping else batch
+            try:
+                await self._write(records)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _take(self, batch: list[Any]) -> bool:
+        """Move queued items into batch up to max_batch; True if _STOP was taken."""
+        queue = self._queue
+        while len(batch) < self._max_batch:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return False
+            batch.append(item)
+            if item is _STOP:
+                return True
+        return False
+
+    async def _write(self, records: list[TraceRecord]) -> None:
+        if not records:
+            return
+        for attempt in range(1, self._max_attempts + 1):
+            try:
+                await self._sink.write(records)
+            except Exception as e:
+                self._last_error = e
+                if attempt == self._max_attempts:
+                    self.stats.dropped += len(records)
+                    self._dropped_unreported += len(records)
+                    return
+                self.stats.retries += 1
+                await asyncio.sleep(0.01 * 2 ** (attempt - 1))
+            else:
+                self.stats.batches += 1
+                self.stats.written += len(records)
+                return
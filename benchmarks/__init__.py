@@ -0,0 +1,5 @@
+"""Micro-benchmarks for kernel hot paths.
+
+Run a single benchmark with ``python -m benchmarks.<name>`` or all of them
+with ``make bench``. Benchmarks are not part of the pytest suite.
+"""
@@ -0,0 +1,21 @@
+"""Shared timing helpers for benchmarks."""
+
+import time
+from collections.abc import Callable
+
+
+def per_call_us(fn: Callable[[], object], iterations: int, repeat: int = 5) -> float:
+    """Best-of-`repeat` mean time per call in microseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+    return best / iterations * 1e6
+
+
+def report(label: str, value: float, unit: str = "us/call") -> None:
+    """Print one aligned benchmark result line."""
+    print(f"  {label:<48} {value:>12.2f} {unit}")
@@ -0,0 +1,153 @@
+"""Benchmark: audit log append throughput, nightly verification, proofs.
+
+Appends: W concurrent writers against a store whose every write is a
+round-trip of ROUND_TRIP_S. The naive chain serializes writers on the
+tail (lock, read tail, hash, insert one row); AuditSequencer chains and
+writes batches from a single task.
+
+Verification: DAYS days of ENTRIES_PER_DAY entries. Re-verifying the full
+chain every night grows with history; AuditVerifier.checkpoint() only
+verifies the day since the last checkpoint, optionally on a process pool.
+
+Proofs: verify_inclusion() of one entry against a day's root, against
+re-verifying that day's entries.
+
+Usage: python -m benchmarks.bench_audit_log
+"""
+
+import asyncio
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from autobiz.kernel.audit import (
+    GENESIS_HASH,
+    AuditEntry,
+    AuditSequencer,
+    AuditVerifier,
+    InMemoryAuditStore,
+    verify_chain,
+    verify_inclusion,
+)
+from benchmarks._timing import per_call_us, report
+
+WRITERS = 200
+APPENDS_PER_WRITER = 25
+ROUND_TRIP_S = 0.0005
+DAYS = 20
+ENTRIES_PER_DAY = 5000
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class SlowStore(InMemoryAuditStore):
+    """In-memory store with a fixed round-trip per write."""
+
+    async def append(self, entries: Sequence[AuditEntry]) -> None:
+        await asyncio.sleep(ROUND_TRIP_S)
+        await super().append(entries)
+
+
+def _payload(n: int) -> dict[str, object]:
+    return {"tool": "stripe_refund", "amount_cents": n % 9000, "actor": f"agent-{n % 17}"}
+
+
+async def _naive(store: SlowStore) -> None:
+    lock = asyncio.Lock()
+
+    async def writer(w: int) -> None:
+        for n in range(APPENDS_PER_WRITER):
+            async with lock:
+                tail = await store.tail()
+                entry = AuditEntry.chain(
+                    tail, f"t_{w % 8}", "TOOL_CALL", _payload(n), datetime.now(timezone.utc)
+                )
+                await store.append([entry])
+
+    await asyncio.gather(*(writer(w) for w in range(WRITERS)))
+
+
+async def _sequenced(store: SlowStore) -> None:
+    sequencer = AuditSequencer(store)
+    sequencer.start()
+
+    async def writer(w: int) -> None:
+        for n in range(APPENDS_PER_WRITER):
+            await sequencer.append(f"t_{w % 8}", "TOOL_CALL", _payload(n))
+
+    await asyncio.gather(*(writer(w) for w in range(WRITERS)))
+    await sequencer.close()
+
+
+def _appends() -> None:
+    total = WRITERS * APPENDS_PER_WRITER
+    print(f"Audit appends, {WRITERS} writers x {APPENDS_PER_WRITER}, {ROUND_TRIP_S * 1e3} ms/write")
+    for label, run in (("serialized tail", _naive), ("AuditSequencer", _sequenced)):
+        store = SlowStore()
+        start = time.perf_counter()
+        asyncio.run(run(store))
+        elapsed = time.perf_counter() - start
+        verify_chain(store.entries, GENESIS_HASH, 0)
+        report(f"{label} throughput", total / elapsed, "entries/s")
+        report(f"{label} store writes", store.append_calls, "writes")
+
+
+def _history() -> InMemoryAuditStore:
+    store = InMemoryAuditStore()
+    prev = None
+    for n in range(DAYS * ENTRIES_PER_DAY):
+        recorded_at = T0 + timedelta(seconds=n * 86400 // ENTRIES_PER_DAY)
+        prev = AuditEntry.chain(prev, f"t_{n % 8}", "TOOL_CALL", _payload(n), recorded_at)
+        store.entries.append(prev)
+    return store
+
+
+async def _verification(store: InMemoryAuditStore, workers: int) -> None:
+    total = len(store.entries)
+    full_store = InMemoryAuditStore()
+    full_store.entries = store.entries
+    start = time.perf_counter()
+    await AuditVerifier(full_store).verify_all()
+    report(f"full chain re-verification ({total} entries)", time.perf_counter() - start, "s")
+
+    # Checkpoints for every day but the last, then the nightly run
+    nightly = InMemoryAuditStore()
+    nightly.entries = store.entries[: total - ENTRIES_PER_DAY]
+    await AuditVerifier(nightly, chunk_size=ENTRIES_PER_DAY).checkpoint()
+    nightly.entries = store.entries
+    start = time.perf_counter()
+    checkpoint = await AuditVerifier(nightly).checkpoint()
+    report(f"incremental checkpoint ({ENTRIES_PER_DAY} entries)", time.perf_counter() - start, "s")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parallel = InMemoryAuditStore()
+        parallel.entries = store.entries
+        verifier = AuditVerifier(parallel, chunk_size=total // (workers * 4), executor=pool)
+        start = time.perf_counter()
+        await verifier.verify_all()
+        report(f"full re-verification, {workers} processes", time.perf_counter() - start, "s")
+
+    assert checkpoint is not None
+    verifier = AuditVerifier(nightly)
+    proof = await verifier.prove(total - 1234)
+    day = nightly.entries[checkpoint.first_seq :]
+    report(
+        "verify one entry by inclusion proof",
+        per_call_us(lambda: verify_inclusion(proof.entry, proof.inclusion, checkpoint.root), 2000),
+    )
+    report(
+        "verify one entry by re-verifying its day",
+        per_call_us(lambda: verify_chain(day, day[0].prev_hash, day[0].seq), 3),
+    )
+
+
+def main() -> None:
+    _appends()
+    print(f"Audit verification, {DAYS} days x {ENTRIES_PER_DAY} entries")
+    store = _history()
+    asyncio.run(_verification(store, min(4, os.cpu_count() or 1)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: validate_many throughput on a 100k-item batch, serial vs process pool.
+
+Usage: python -m benchmarks.bench_batch_validation [items]
+"""
+
+import os
+import sys
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from autobiz.kernel.executor import SchemaValidator, validate_many
+from benchmarks._timing import report
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "source_event_id": {"type": "string", "pattern": "^evt_"},
+        "event_type": {"enum": ["charge.succeeded", "charge.refunded", "order.updated"]},
+        "amount_cents": {"type": "integer", "minimum": 0},
+        "metadata": {"type": "object", "additionalProperties": {"type": "string"}},
+    },
+    "required": ["source_event_id", "event_type", "amount_cents"],
+}
+
+EVENT_TYPES = ["charge.succeeded", "charge.refunded", "order.updated"]
+
+
+def _events(count: int) -> Iterator[dict[str, Any]]:
+    for i in range(count):
+        amount = -1 if i % 50 == 0 else i % 10_000
+        yield {
+            "source_event_id": f"evt_{i:08d}",
+            "event_type": EVENT_TYPES[i % 3],
+            "amount_cents": amount,
+            "metadata": {"shop": "test_shop", "attempt": str(i % 3)},
+        }
+
+
+def _throughput(count: int, **kwargs: Any) -> float:
+    start = time.perf_counter()
+    result = validate_many(_events(count), SCHEMA, **kwargs)
+    elapsed = time.perf_counter() - start
+    assert len(result) == count
+    return count / elapsed
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cores = os.cpu_count() or 1
+
+    print(f"validate_many, {count} items, {cores} CPU(s)")
+    report(
+        "serial, jsonschema backend",
+        _throughput(count, validator=SchemaValidator(backend="jsonschema")),
+        "items/s",
+    )
+    report("serial, compiled backend", _throughput(count), "items/s")
+    for workers in sorted({2, max(cores, 2)}):
+        report(
+            f"process pool, {workers} workers, compiled backend",
+            _throughput(count, workers=workers, chunk_size=5000),
+            "items/s",
+        )
+
+
+if __name__ == "__main__":
+    main()
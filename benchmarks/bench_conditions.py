@@ -0,0 +1,113 @@
+"""Benchmark: condition-expression throughput for branch steps and HITL rules.
+
+RULES (the plan's examples plus typical refund/cancel gates) are evaluated
+against order states, all rules per state:
+
+- parse + interpret: parse the string and walk the AST on every call
+- interpret: walk a pre-parsed AST (the plan's jsonlogic_evaluate)
+- compiled: compile_condition(raw).evaluate(), one rule at a time
+- ConditionSet: all rules compiled together; shared paths read once
+
+Usage: python -m benchmarks.bench_conditions
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from autobiz.kernel.compile import compile_condition, compile_conditions, interpret, parse_condition
+from benchmarks._timing import per_call_us, report
+
+RULES = (
+    "$.order.amount <= 500",
+    "$.order.refund_eligible AND $.order.amount <= 500 AND NOT $.order.disputed",
+    "duration_seconds($.order.created_at, now()) < 86400",
+    "$.order.financial_status == 'paid' AND $.order.fulfillment_status != 'fulfilled'",
+    "contains($.order.tags, 'wholesale') OR $.customer.orders_count >= 10",
+    "len($.order.line_items) > 3 AND $.order.amount > 250",
+    "$.order.line_items[0].sku == 'TS-BLK-M' AND $.order.line_items[0].quantity >= 2",
+    "startswith($.order.shipping_address.country_code, 'US')",
+    "$.customer.tier == 'gold' OR ($.order.amount < 50 AND NOT $.order.disputed)",
+    "duration_seconds($.order.updated_at, now()) > 3600 AND $.order.status == 'ON_HOLD'",
+    "$.order.discount_total > 25 OR $.order.currency != 'USD'",
+    "NOT ($.order.test OR $.order.disputed) AND $.order.amount >= 1",
+)
+STATES = 1000
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _state(rng: random.Random) -> dict[str, Any]:
+    created = NOW - timedelta(seconds=rng.randint(0, 3 * 86400))
+    return {
+        "order": {
+            "amount": round(rng.uniform(5, 2000), 2),
+            "refund_eligible": rng.random() < 0.7,
+            "disputed": rng.random() < 0.05,
+            "test": False,
+            "created_at": created.isoformat().replace("+00:00", "Z"),
+            "updated_at": (created + timedelta(minutes=rng.randint(0, 600))).isoformat(),
+            "financial_status": rng.choice(["paid", "pending", "refunded"]),
+            "fulfillment_status": rng.choice(["fulfilled", "partial", None]),
+            "status": rng.choice(["OPEN", "ON_HOLD", "CLOSED"]),
+            "tags": rng.sample(["vip", "wholesale", "gift", "rush"], rng.randint(0, 3)),
+            "line_items": [
+                {"sku": rng.choice(["TS-BLK-M", "TS-WHT-L"]), "quantity": rng.randint(1, 4)}
+                for _ in range(rng.randint(1, 6))
+            ],
+            "shipping_address": {"country_code": rng.choice(["US", "CA", "GB"])},
+            "discount_total": rng.choice([0, 10, 40]),
+            "currency": rng.choice(["USD", "EUR"]),
+        },
+        "customer": {
+            "tier": rng.choice(["gold", "silver", None]),
+            "orders_count": rng.randint(0, 20),
+        },
+    }
+
+
+def main() -> None:
+    rng = random.Random(25)
+    states = [_state(rng) for _ in range(STATES)]
+    asts = [parse_condition(rule) for rule in RULES]
+    ruleset = compile_conditions(RULES)
+    cycle = iter(range(1 << 62))
+
+    def next_state() -> dict[str, Any]:
+        return states[next(cycle) % STATES]
+
+    def parse_and_interpret() -> None:
+        state = next_state()
+        for rule in RULES:
+            interpret(parse_condition(rule), state, NOW)
+
+    def interpret_ast() -> None:
+        state = next_state()
+        for ast in asts:
+            interpret(ast, state, NOW)
+
+    def compiled() -> None:
+        state = next_state()
+        for rule in RULES:
+            compile_condition(rule).evaluate(state, NOW)
+
+    def condition_set() -> None:
+        ruleset.evaluate(next_state(), NOW)
+
+    expected = [[interpret(ast, s, NOW) for ast in asts] for s in states]
+    assert [ruleset.evaluate(s, NOW) for s in states] == expected
+
+    print(f"Condition evaluation, {len(RULES)} rules per state, {STATES} order states")
+    for label, fn, iterations in (
+        ("parse + interpret per call", parse_and_interpret, 500),
+        ("interpret pre-parsed AST", interpret_ast, 5000),
+        ("compiled, one rule at a time", compiled, 5000),
+        ("ConditionSet, all rules in one pass", condition_set, 5000),
+    ):
+        us = per_call_us(fn, iterations)
+        report(f"{label} (per state)", us)
+        report(f"{label} throughput", len(RULES) / us, "M rules/s")
+    print(f"  ConditionSet reads {len(ruleset.referenced_paths)} distinct paths per state")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark: webhook ingest throughput and ack latency.
+
+C concurrent senders post signed Stripe webhooks back to back (10% are
+redeliveries). Both paths verify the signature and hash the body for
+real; the database is simulated as a pool of 10 connections, each
+statement holding one for a 1 ms round trip plus 10 us per row.
+
+- per event: dedup SELECT, then INSERT, per webhook (2 statements)
+- ingestor: EventIngestor micro-batches into one INSERT ... ON CONFLICT
+  DO NOTHING RETURNING per batch (up to 4 batches in flight)
+
+Reported: sustained events/s, p50/p99 ack latency, statements per 1000
+events.
+
+Usage: python -m benchmarks.bench_event_ingest
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import time
+from collections.abc import Sequence
+
+from autobiz.kernel.events import (
+    EventIngestor,
+    InboundEvent,
+    InMemoryEventStore,
+    StoredEvent,
+    Webhook,
+)
+from benchmarks._timing import report
+
+EVENTS = 4000
+SENDERS = (16, 256)
+POOL_SIZE = 10
+RTT = 0.001
+PER_ROW = 0.00001
+SECRET = b"whsec_bench"
+
+
+class _Database:
+    """A connection pool where each statement takes RTT plus per-row time."""
+
+    def __init__(self) -> None:
+        self._pool = asyncio.Semaphore(POOL_SIZE)
+        self.statements = 0
+
+    async def execute(self, rows: int) -> None:
+        async with self._pool:
+            self.statements += 1
+            await asyncio.sleep(RTT + PER_ROW * rows)
+
+
+class _SimulatedStore(InMemoryEventStore):
+    def __init__(self, db: _Database) -> None:
+        super().__init__()
+        self._db = db
+
+    async def insert_many(self, events: Sequence[InboundEvent]) -> list[StoredEvent]:
+        await self._db.execute(len(events))
+        return await super().insert_many(events)
+
+
+def _webhooks(rng: random.Random) -> list[Webhook]:
+    now = str(int(time.time()))
+    webhooks = []
+    for n in range(EVENTS):
+        event_id = f"evt_{rng.randrange(n)}" if n and rng.random() < 0.1 else f"evt_{n}"
+        body = json.dumps(
+            {
+                "id": event_id,
+                "type": "charge.succeeded",
+                "created": 1772452800 + n,
+                "data": {"object": {"id": f"ch_{n}", "amount": rng.randrange(100, 90000)}},
+            }
+        ).encode()
+        mac = hmac.new(SECRET, now.encode() + b"." + body, hashlib.sha256).hexdigest()
+        webhooks.append(
+            Webhook("t_bench", "STRIPE", {"Stripe-Signature": f"t={now},v1={mac}"}, body)
+        )
+    return webhooks
+
+
+async def _run(senders: int, batched: bool) -> tuple[float, float, float, float]:
+    db = _Database()
+    store = _SimulatedStore(db)
+    ingestor = EventIngestor(store, lambda tenant, source: [SECRET])
+    ingestor.start()
+    seen: set[tuple[str, str, str]] = set()
+
+    async def per_event(webhook: Webhook) -> None:
+        event = await ingestor.verify(webhook)
+        await db.execute(1)  # dedup check
+        if event.dedup_key not in seen:
+            seen.add(event.dedup_key)
+            await db.execute(1)  # insert
+
+    ingest = ingestor.ingest if batched else per_event
+    webhooks = _webhooks(random.Random(senders))
+    latencies: list[float] = []
+
+    async def sender(offset: int) -> None:
+        for n in range(offset, EVENTS, senders):
+            started = time.perf_counter()
+            await ingest(webhooks[n])
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(sender(s) for s in range(senders)))
+    elapsed = time.perf_counter() - started
+    await ingestor.close()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    return EVENTS / elapsed, p50, p99, db.statements * 1000 / EVENTS
+
+
+def main() -> None:
+    print(f"Webhook ingest, {EVENTS} events, pool of {POOL_SIZE}, {RTT * 1000:.0f} ms round trips")
+    for senders in SENDERS:
+        print(f" {senders} concurrent senders:")
+        for label, batched in (("per event", False), ("ingestor", True)):
+            throughput, p50, p99, statements = asyncio.run(_run(senders, batched))
+            report(f"{label} throughput", throughput, "events/s")
+            report(f"{label} ack p50", p50, "ms")
+            report(f"{label} ack p99", p99, "ms")
+            report(f"{label} statements", statements, "per 1000 events")
+
+
+if __name__ == "__main__":
+    main()
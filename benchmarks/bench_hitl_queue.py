@@ -0,0 +1,129 @@
+"""Benchmark: HITL decision-to-resume latency with thousands of parked workflows.
+
+PARKED workflows (TENANTS tenants, under the 1000-per-tenant bound) each
+submit a request and wait for its decision. Compared:
+
+- polling: every workflow re-reads its request every POLL_INTERVAL
+- HitlQueue: one shared subscription resolves the waiters of decided
+  requests
+
+Reported: latency from decide() to the workflow resuming (single
+decisions, p50/p99), the time to resume all waiters of one batch
+decide(), and store reads per second while nothing is decided.
+
+InMemoryHitlStore stands in for Postgres, so the push figures are the
+in-process fan-out only; with PostgresHitlStore, add the delivery of one
+NOTIFY to the listening connection (not measured here).
+
+Usage: python -m benchmarks.bench_hitl_queue
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+
+from autobiz.kernel.hitl import HitlQueue, HitlRequest, InMemoryHitlStore
+from benchmarks._timing import report
+
+PARKED = 5000
+TENANTS = 10
+DECISIONS = 200
+BATCH = 500
+POLL_INTERVAL = 0.5
+IDLE = 1.0
+
+
+def _request(n: int) -> HitlRequest:
+    return HitlRequest(
+        tenant_id=f"t_{n % TENANTS}",
+        tool_name="stripe.refund",
+        tool_input={"charge_id": f"ch_{n}", "amount": 1200},
+        execution_id=f"00000000-0000-0000-0000-{n:012d}",
+        correlation_id=f"corr_{n}",
+        rule_id="refund_over_limit",
+        request_id=f"10000000-0000-0000-0000-{n:012d}",
+    )
+
+
+def _pct(values: list[float], q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _measure(
+    store: InMemoryHitlStore, waiters: dict[str, asyncio.Future[float]]
+) -> tuple[list[float], float, float]:
+    """Single-decision latencies (ms), batch resume time (ms), idle reads per second."""
+    rng = random.Random(23)
+    ids = list(waiters)
+    rng.shuffle(ids)
+    now = datetime.now(timezone.utc)
+
+    queries = store.queries
+    await asyncio.sleep(IDLE)
+    idle_reads = (store.queries - queries) / IDLE
+
+    latencies = []
+    for request_id in ids[:DECISIONS]:
+        started = time.perf_counter()
+        await store.decide([request_id], "APPROVED", "u_bench", now, None)
+        resumed = await waiters[request_id]
+        latencies.append((resumed - started) * 1e3)
+        await asyncio.sleep(rng.uniform(0, POLL_INTERVAL / 10))
+
+    batch = ids[DECISIONS : DECISIONS + BATCH]
+    started = time.perf_counter()
+    await store.decide(batch, "APPROVED", "u_bench", now, None)
+    batch_ms = (max(await asyncio.gather(*(waiters[i] for i in batch))) - started) * 1e3
+    return latencies, batch_ms, idle_reads
+
+
+async def _parked(
+    queue: HitlQueue | None, store: InMemoryHitlStore
+) -> dict[str, asyncio.Future[float]]:
+    async def workflow(request_id: str) -> float:
+        if queue is not None:
+            await queue.wait(request_id)
+        else:
+            while not await store.decisions([request_id]):
+                await asyncio.sleep(POLL_INTERVAL)
+        return time.perf_counter()
+
+    waiters = {}
+    for n in range(PARKED):
+        request = _request(n)
+        await store.create(request, 1000)
+        waiters[request.request_id] = asyncio.ensure_future(workflow(request.request_id))
+        if n % 100 == 0:
+            # Spread the pollers' phases over the interval
+            await asyncio.sleep(POLL_INTERVAL / (PARKED / 100))
+    await asyncio.sleep(POLL_INTERVAL)
+    return waiters
+
+
+async def _run() -> None:
+    print(f"HITL queue, {PARKED} parked workflows over {TENANTS} tenants")
+    for label in ("polling", "HitlQueue"):
+        store = InMemoryHitlStore()
+        queue = None
+        if label == "HitlQueue":
+            queue = HitlQueue(store)
+            await queue.start()
+        waiters = await _parked(queue, store)
+        latencies, batch_ms, idle_reads = await _measure(store, waiters)
+        report(f"{label} decide-to-resume p50", statistics.median(latencies), "ms")
+        report(f"{label} decide-to-resume p99", _pct(latencies, 0.99), "ms")
+        report(f"{label} resume all of a {BATCH}-request decide", batch_ms, "ms")
+        report(f"{label} store reads while idle", idle_reads, "reads/s")
+        for waiter in waiters.values():
+            waiter.cancel()
+        await asyncio.gather(*waiters.values(), return_exceptions=True)
+
+
+def main() -> None:
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: RFC 8785 fingerprints of large nested order payloads.
+
+Compares fingerprint(), fingerprint_streaming() and fingerprint_many()
+with hashing compact sorted json.dumps() output - which is faster but not
+RFC 8785 (wrong number formatting and key order for non-ASCII keys), and
+is shown only as a floor.
+
+Usage: python -m benchmarks.bench_idempotency_fingerprint
+"""
+
+import hashlib
+import json
+import random
+import tracemalloc
+from typing import Any
+
+from autobiz.kernel.idempotency import fingerprint, fingerprint_many, fingerprint_streaming
+from benchmarks._timing import per_call_us, report
+
+
+def _order(rng: random.Random, lines: int) -> dict[str, Any]:
+    return {
+        "order_id": f"ord_{rng.randrange(10**9)}",
+        "customer": {"id": "cus_9", "email": "a@example.com", "name": "Zoë Ørsted"},
+        "shipping": {"country": "DE", "lines": ["Hauptstraße 1", "10115 Berlin"]},
+        "line_items": [
+            {
+                "sku": f"SKU-{i}",
+                "quantity": rng.randint(1, 5),
+                "unit_price": round(rng.uniform(1, 200), 2),
+                "discounts": [{"code": "SPRING", "amount": 1.5}] if i % 4 == 0 else [],
+                "meta": {"warehouse": "eu-1", "fragile": i % 2 == 0, "note": None},
+            }
+            for i in range(lines)
+        ],
+    }
+
+
+def _json_dumps_hash(value: Any) -> str:
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def _peak_kib(fn: Any, value: Any) -> float:
+    tracemalloc.start()
+    fn(value)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    rng = random.Random(8785)
+    for lines in (10, 1000, 20_000):
+        payload = _order(rng, lines)
+        iterations = max(1, 2000 // lines)
+        print(f"Order payload, {lines} line items")
+        report("fingerprint()", per_call_us(lambda: fingerprint(payload), iterations))
+        report(
+            "fingerprint_streaming()",
+            per_call_us(lambda: fingerprint_streaming(payload), iterations),
+        )
+        report(
+            "json.dumps + sha256 (not RFC 8785)",
+            per_call_us(lambda: _json_dumps_hash(payload), iterations),
+        )
+        report("fingerprint() peak memory", _peak_kib(fingerprint, payload), "KiB")
+        report(
+            "fingerprint_streaming() peak memory",
+            _peak_kib(fingerprint_streaming, payload),
+            "KiB",
+        )
+
+    batch = [_order(rng, 5) for _ in range(2000)]
+    print(f"Batch of {len(batch)} small orders")
+    report(
+        "fingerprint_many() per item",
+        per_call_us(lambda: fingerprint_many(batch), 1) / len(batch),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark: DB round-trips per deduplicated call under webhook retry bursts.
+
+Simulates provider retry storms: each of K distinct calls arrives as a
+burst of D concurrent duplicates, then trickles in again later. The
+receipt store adds a fixed per-round-trip latency. Compares the manager
+(local LRU + hot tier + single-flight) with checking the receipts table
+directly on every call.
+
+Usage: python -m benchmarks.bench_idempotency_manager
+"""
+
+import asyncio
+import time
+from typing import Any
+
+from autobiz.kernel.idempotency import (
+    IdempotencyManager,
+    InMemoryHotTier,
+    InMemoryReceiptStore,
+    Receipt,
+    build_key,
+)
+from autobiz.kernel.idempotency.receipts import LOOKBACK, utcnow
+from benchmarks._timing import report
+
+K = 200  # distinct calls
+BURST = 20
+LATE_RETRIES = 5
+DB_LATENCY_S = 0.0005
+
+
+class SlowReceiptStore(InMemoryReceiptStore):
+    """In-memory store with a simulated network/DB round-trip."""
+
+    async def get(self, tenant_id: str, internal_key: str) -> Receipt | None:
+        await asyncio.sleep(DB_LATENCY_S)
+        return await super().get(tenant_id, internal_key)
+
+    async def insert(self, receipt: Receipt) -> Receipt:
+        await asyncio.sleep(DB_LATENCY_S)
+        return await super().insert(receipt)
+
+    async def finalize(self, receipt: Receipt) -> None:
+        await asyncio.sleep(DB_LATENCY_S)
+        await super().finalize(receipt)
+
+
+async def _side_effect() -> dict[str, Any]:
+    await asyncio.sleep(0.002)
+    return {"ok": True}
+
+
+async def _naive(store: SlowReceiptStore, key: Any, executions: list[int]) -> None:
+    """Check-then-insert against the table on every call (no coalescing)."""
+    if await store.get(key.tenant_id, key.internal) is not None:
+        return
+    result = await _side_effect()
+    executions[0] += 1
+    now = utcnow()
+    await store.insert(
+        Receipt(
+            tenant_id=key.tenant_id,
+            tool_name=key.tool_name,
+            tool_version=key.tool_version,
+            internal_idempotency_key=key.internal,
+            execution_id="x",
+            status="COMPLETED",
+            result=result,
+            first_seen_at=now,
+            ttl_expires_at=now + LOOKBACK,
+        )
+    )
+
+
+async def _run(mode: str) -> None:
+    keys = [build_key("t_1", "create_charge", "1.0.0", "stripe", {"n": n}) for n in range(K)]
+    store = SlowReceiptStore()
+    manager = IdempotencyManager(store, InMemoryHotTier())
+    executions = [0]
+
+    async def call(key: Any) -> None:
+        if mode == "manager":
+            await manager.execute(key, _side_effect)
+        else:
+            await _naive(store, key, executions)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(key) for key in keys for _ in range(BURST)))
+    for _ in range(LATE_RETRIES):
+        await asyncio.gather(*(call(key) for key in keys))
+    elapsed = time.perf_counter() - start
+
+    total = K * (BURST + LATE_RETRIES)
+    executed = manager.stats.executed if mode == "manager" else executions[0]
+    duplicates = total - executed
+    print(f" {mode}: {total} calls, {executed} executions")
+    report("DB round-trips per deduplicated call", store.round_trips / duplicates, "trips")
+    report("DB round-trips total", store.round_trips, "trips")
+    report("duplicate side effects", executed - K, "calls")
+    report("wall time", elapsed * 1e3, "ms")
+
+
+def main() -> None:
+    print(f"Idempotency, {K} distinct calls x {BURST}-way bursts + {LATE_RETRIES} late retries")
+    for mode in ("check receipts table", "manager"):
+        asyncio.run(_run(mode))
+
+
+if __name__ == "__main__":
+    main()
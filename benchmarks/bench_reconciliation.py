@@ -0,0 +1,145 @@
+"""Benchmark: comparisons and remote calls per reconciliation sync.
+
+ENTITIES orders exist locally and at a fake provider
+(InMemoryReconciliationSource, page size 100 like the Stripe and Shopify
+list APIs). Between syncs, CHANGED orders (0.1%) are updated on both
+sides and DRIFTED orders are changed at the provider only. Compared per
+sync:
+
+- full compare: list every order on both sides and compare them all
+  (what the order and payment sync jobs do today)
+- ReconciliationDetector: incremental pulls, hash-range diff of 65,536
+  buckets, fetch of the differing orders
+
+Reported: remote calls, comparisons and wall time per sync, plus the
+cost of the detector's first (full) sync.
+
+Usage: python -m benchmarks.bench_reconciliation
+    (BENCH_ENTITIES=100000 for a quicker run)
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import time
+from typing import Any
+
+from autobiz.kernel.events import (
+    InMemoryDriftStore,
+    InMemoryReconciliationSource,
+    ReconciliationDetector,
+    entity_digest,
+)
+from benchmarks._timing import report
+
+ENTITIES = int(os.getenv("BENCH_ENTITIES", "1000000"))
+CHANGED = ENTITIES // 1000
+DRIFTED = 20
+SYNCS = 5
+PAGE_SIZE = 100
+TENANT = "t_bench"
+
+
+def _order(n: int, rng: random.Random) -> dict[str, Any]:
+    return {
+        "id": f"ord_{n:08d}",
+        "total": rng.randrange(100, 90000),
+        "currency": "usd",
+        "status": rng.choice(("paid", "refunded", "fulfilled")),
+    }
+
+
+async def _full_compare(
+    local: InMemoryReconciliationSource, remote: InMemoryReconciliationSource
+) -> tuple[int, int, int]:
+    """List both sides completely and compare every order; returns (calls, comparisons, drift)."""
+    digests: list[dict[str, int]] = []
+    calls = 0
+    for source in (local, remote):
+        side: dict[str, int] = {}
+        cursor = None
+        while True:
+            page = await source.changed_since(TENANT, "order", cursor, PAGE_SIZE)
+            if source is remote:
+                calls += 1
+            for record in page.records:
+                if record.state is not None:
+                    side[record.entity_id] = entity_digest(record.entity_id, record.state)
+            cursor = page.cursor
+            if not page.has_more:
+                break
+        digests.append(side)
+    mine, theirs = digests
+    comparisons = len(mine.keys() | theirs.keys())
+    drift = sum(1 for e in mine.keys() | theirs.keys() if mine.get(e) != theirs.get(e))
+    return calls, comparisons, drift
+
+
+async def _run() -> None:
+    rng = random.Random(22)
+    local, remote = InMemoryReconciliationSource(), InMemoryReconciliationSource()
+    for n in range(ENTITIES):
+        order = _order(n, rng)
+        local.put(TENANT, "order", order["id"], order)
+        remote.put(TENANT, "order", order["id"], order)
+    drift_store = InMemoryDriftStore()
+    detector = ReconciliationDetector(
+        "ORDER_SYNC",
+        "order",
+        local,
+        remote,
+        drift_store,
+        buckets=65536,
+        fanout=16,
+        page_size=PAGE_SIZE,
+    )
+    print(
+        f"Reconciliation, {ENTITIES} orders, {CHANGED} updated on both sides "
+        f"and {DRIFTED} drifted per sync"
+    )
+
+    started = time.perf_counter()
+    first = await detector.sync(TENANT)
+    print(" detector first sync (full pull):")
+    report("remote calls", first.remote_calls, "calls")
+    report("wall time", time.perf_counter() - started, "s")
+
+    remote_calls: list[int] = []
+    comparisons: list[int] = []
+    elapsed: list[float] = []
+    for _ in range(SYNCS):
+        for n in rng.sample(range(ENTITIES), CHANGED):
+            order = _order(n, rng)
+            local.put(TENANT, "order", order["id"], order)
+            remote.put(TENANT, "order", order["id"], order)
+        for n in rng.sample(range(ENTITIES), DRIFTED):
+            order = dict(local.get(TENANT, "order", f"ord_{n:08d}"), status="disputed")
+            remote.put(TENANT, "order", order["id"], order)
+        started = time.perf_counter()
+        stats = await detector.sync(TENANT)
+        elapsed.append(time.perf_counter() - started)
+        remote_calls.append(stats.remote_calls)
+        comparisons.append(stats.node_comparisons + stats.entity_comparisons)
+
+    started = time.perf_counter()
+    full_calls, full_comparisons, full_drift = await _full_compare(local, remote)
+    full_elapsed = time.perf_counter() - started
+
+    print(" per sync:")
+    report("full compare remote calls", full_calls, "calls")
+    report("detector remote calls", statistics.mean(remote_calls), "calls")
+    report("full compare comparisons", full_comparisons, "comparisons")
+    report("detector comparisons (nodes + entities)", statistics.mean(comparisons), "comparisons")
+    report("full compare wall time", full_elapsed * 1e3, "ms")
+    report("detector wall time", statistics.mean(elapsed) * 1e3, "ms")
+    report("detector drift rows, all syncs", len(drift_store.jobs), "rows")
+    report("full compare drift at the end", full_drift, "entities")
+
+
+def main() -> None:
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark: ToolRegistry lookup latency under a register/reload storm.
+
+Reader threads call resolve() + validate_input() in a loop while a writer
+thread alternates register_many() and reload() of the full contract set.
+Reports reader latency percentiles with and without the writer running.
+
+Usage: python -m benchmarks.bench_registry_concurrency
+"""
+
+import threading
+import time
+
+from autobiz.kernel.executor import ToolContract, ToolRegistry
+from benchmarks._timing import report
+
+TOOLS = 200
+VERSIONS_PER_TOOL = 5
+READERS = 4
+DURATION_S = 1.5
+SCHEMA = {
+    "type": "object",
+    "properties": {"id": {"type": "string"}},
+    "required": ["id"],
+}
+
+
+def _contracts(extra_patch: int = 0) -> list[ToolContract]:
+    return [
+        ToolContract(
+            name=f"tool_{t:03d}",
+            version=f"1.{v}.{extra_patch}",
+            input_schema=SCHEMA,
+            output_schema=SCHEMA,
+            side_effect_level="READ",
+            timeout_seconds=30,
+        )
+        for t in range(TOOLS)
+        for v in range(VERSIONS_PER_TOOL)
+    ]
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def _run(registry: ToolRegistry, storm: bool) -> tuple[list[float], int]:
+    stop = threading.Event()
+    samples: list[list[float]] = [[] for _ in range(READERS)]
+    swaps = 0
+    payload = {"id": "x"}
+
+    def reader(out: list[float]) -> None:
+        n = 0
+        while not stop.is_set():
+            name = f"tool_{n % TOOLS:03d}"
+            start = time.perf_counter()
+            contract = registry.resolve(name, "^1")
+            registry.validate_input(name, contract.version, payload)
+            out.append((time.perf_counter() - start) * 1e6)
+            n += 1
+
+    def writer() -> None:
+        nonlocal swaps
+        base = _contracts()
+        patch = 1
+        while not stop.is_set():
+            registry.register_many(_contracts(patch)[:VERSIONS_PER_TOOL])
+            registry.reload(base)
+            patch += 1
+            swaps += 2
+
+    threads = [threading.Thread(target=reader, args=(out,)) for out in samples]
+    if storm:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION_S)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return [s for out in samples for s in out], swaps
+
+
+def main() -> None:
+    registry = ToolRegistry()
+    registry.reload(_contracts())
+    print(f"ToolRegistry, {TOOLS * VERSIONS_PER_TOOL} tool versions, {READERS} reader threads")
+
+    for label, storm in (("idle", False), ("register/reload storm", True)):
+        samples, swaps = _run(registry, storm)
+        suffix = f" ({swaps} snapshot swaps)" if storm else ""
+        print(f" {label}{suffix}")
+        report("resolve + validate_input p50", _percentile(samples, 0.50))
+        report("resolve + validate_input p99", _percentile(samples, 0.99))
+
+
+if __name__ == "__main__":
+    main()
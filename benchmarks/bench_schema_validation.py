@@ -0,0 +1,87 @@
+"""Benchmark: per-call schema validation cost across validation strategies.
+
+Usage: python -m benchmarks.bench_schema_validation
+"""
+
+from autobiz.kernel.executor import SchemaValidator, ToolContract, ToolRegistry
+from benchmarks._timing import per_call_us, report
+
+ORDER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "order_id": {"type": "string", "pattern": "^ord_[a-z0-9]+$"},
+        "customer": {
+            "type": "object",
+            "properties": {
+                "email": {"type": "string"},
+                "name": {"type": "string", "minLength": 1},
+            },
+            "required": ["email"],
+        },
+        "line_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "sku": {"type": "string"},
+                    "quantity": {"type": "integer", "minimum": 1},
+                    "price_cents": {"type": "integer", "minimum": 0},
+                },
+                "required": ["sku", "quantity", "price_cents"],
+                "additionalProperties": False,
+            },
+        },
+        "currency": {"enum": ["USD", "EUR", "GBP"]},
+    },
+    "required": ["order_id", "customer", "line_items", "currency"],
+}
+
+ORDER = {
+    "order_id": "ord_abc123",
+    "customer": {"email": "jane@test.example.com", "name": "Jane"},
+    "line_items": [
+        {"sku": f"TSHIRT-{i}", "quantity": 1 + i % 3, "price_cents": 2500} for i in range(5)
+    ],
+    "currency": "USD",
+}
+
+
+def _registry(validator: SchemaValidator) -> ToolRegistry:
+    registry = ToolRegistry(validator=validator)
+    registry.register(
+        ToolContract(
+            name="createFulfillment",
+            version="1.0.0",
+            input_schema=ORDER_SCHEMA,
+            output_schema={"type": "object"},
+            side_effect_level="HARD_WRITE",
+            timeout_seconds=60,
+        )
+    )
+    return registry
+
+
+def main() -> None:
+    validator = SchemaValidator()
+    registry = _registry(validator)
+    codegen_registry = _registry(SchemaValidator(backend="compiled"))
+
+    iterations = 2000
+    uncompiled = per_call_us(lambda: validator.validate(ORDER, ORDER_SCHEMA), iterations)
+    compiled = per_call_us(
+        lambda: registry.validate_input("createFulfillment", "1.0.0", ORDER), iterations
+    )
+    codegen = per_call_us(
+        lambda: codegen_registry.validate_input("createFulfillment", "1.0.0", ORDER), iterations
+    )
+
+    print("Schema validation (valid order payload)")
+    report("SchemaValidator.validate (new Draft7Validator)", uncompiled)
+    report("ToolRegistry.validate_input (precompiled)", compiled)
+    report("ToolRegistry.validate_input (compiled backend)", codegen)
+    report("speedup, precompiled vs uncompiled", uncompiled / compiled, "x")
+    report("speedup, compiled backend vs uncompiled", uncompiled / codegen, "x")
+
+
+if __name__ == "__main__":
+    main()
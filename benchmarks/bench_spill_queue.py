@@ -0,0 +1,117 @@
+"""Benchmark: spill queue enqueue/dequeue throughput at 10x overflow.
+
+The reconciliation_queue configuration (max_depth 5000, SPILL_TO_DISK)
+receives 50,000 reconciliation jobs (10x max_depth) in one burst, then
+drains them. Compared:
+
+- deque: unbounded in-memory queue (no bound, no durability; the ceiling)
+- line file: overflow appended as JSON lines to a file, flushed per item
+  and read back with readline(), with the read offset written to a
+  cursor file per get (the same crash recovery, without mmap)
+- SpillQueue: memory head plus memory-mapped segment files
+
+Reported: puts/s and gets/s over the whole burst and drain.
+
+Usage: python -m benchmarks.bench_spill_queue
+"""
+
+import json
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from autobiz.kernel.config import QueueConfig
+from autobiz.kernel.queues import SpillQueue
+from benchmarks._timing import report
+
+MAX_DEPTH = 5000
+ITEMS = 10 * MAX_DEPTH
+
+
+def _job(n: int) -> dict[str, Any]:
+    return {
+        "job_id": f"rj_{n:08d}",
+        "tenant_id": "t_bench",
+        "provider": "STRIPE",
+        "entity_type": "charge",
+        "bucket": n % 4096,
+        "since": "2026-03-02T12:00:00+00:00",
+    }
+
+
+class _LineFileQueue:
+    """Bounded deque spilling overflow to a JSON-lines file."""
+
+    def __init__(self, path: Path) -> None:
+        self._memory: deque[Any] = deque()
+        self._writer = open(path, "w")  # noqa: SIM115
+        self._reader = open(path, "rb")  # noqa: SIM115
+        self._cursor = open(path.with_suffix(".cursor"), "wb")  # noqa: SIM115
+        self._spilled = 0
+
+    def put_nowait(self, item: Any) -> None:
+        if not self._spilled and len(self._memory) < MAX_DEPTH:
+            self._memory.append(item)
+            return
+        self._writer.write(json.dumps(item, separators=(",", ":")) + "\n")
+        self._writer.flush()
+        self._spilled += 1
+
+    def get_nowait(self) -> Any:
+        if self._memory:
+            return self._memory.popleft()
+        self._spilled -= 1
+        item = json.loads(self._reader.readline())
+        self._cursor.seek(0)
+        self._cursor.write(self._reader.tell().to_bytes(8, "little"))
+        self._cursor.flush()
+        return item
+
+    def close(self) -> None:
+        self._writer.close()
+        self._reader.close()
+        self._cursor.close()
+
+
+def _run(queue: Any, jobs: list[dict[str, Any]]) -> tuple[float, float]:
+    put = queue.put_nowait if hasattr(queue, "put_nowait") else queue.append
+    get = queue.get_nowait if hasattr(queue, "get_nowait") else queue.popleft
+    started = time.perf_counter()
+    for job in jobs:
+        put(job)
+    put_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in jobs:
+        get()
+    get_elapsed = time.perf_counter() - started
+    return len(jobs) / put_elapsed, len(jobs) / get_elapsed
+
+
+def main() -> None:
+    jobs = [_job(n) for n in range(ITEMS)]
+    print(f"Spill queue, max_depth {MAX_DEPTH}, burst of {ITEMS} jobs then drain")
+    with tempfile.TemporaryDirectory() as tmp:
+        config = QueueConfig(
+            max_depth=MAX_DEPTH,
+            overflow_strategy="SPILL_TO_DISK",
+            spill_path=str(Path(tmp) / "spill"),
+            spill_max_size_mb=1000,
+        )
+        line_file = _LineFileQueue(Path(tmp) / "spill.jsonl")
+        spill_queue: SpillQueue[dict[str, Any]] = SpillQueue("reconciliation_queue", config)
+        for label, queue in (
+            ("deque", deque()),
+            ("line file", line_file),
+            ("SpillQueue", spill_queue),
+        ):
+            puts, gets = _run(queue, jobs)
+            report(f"{label} put", puts, "items/s")
+            report(f"{label} get", gets, "items/s")
+        line_file.close()
+        spill_queue.close()
+
+
+if __name__ == "__main__":
+    main()
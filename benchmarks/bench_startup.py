@@ -0,0 +1,91 @@
+"""Benchmark: executor import time and time-to-first-validation.
+
+Each measurement runs in a fresh interpreter so module caches do not leak
+between runs. A manifest directory with a full-catalog-sized set of
+contracts is loaded eagerly (parse + compile everything) and lazily
+(index names/versions, load on first lookup).
+
+Usage: python -m benchmarks.bench_startup [contracts]
+"""
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks._timing import report
+
+DEFAULT_CONTRACTS = 500
+RUNS = 5
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "order_id": {"type": "string", "pattern": "^ord_"},
+        "quantity": {"type": "integer", "minimum": 1},
+    },
+    "required": ["order_id", "quantity"],
+}
+
+IMPORT_ONLY = """
+import time
+start = time.perf_counter()
+import autobiz.kernel.executor
+print((time.perf_counter() - start) * 1e3)
+"""
+
+FIRST_VALIDATION = """
+import sys, time
+start = time.perf_counter()
+from autobiz.kernel.executor import ToolRegistry
+registry = ToolRegistry()
+registry.reload_directory(sys.argv[1], lazy=sys.argv[2] == "lazy")
+registry.validate_input("tool_0000", "1.0.0", {"order_id": "ord_1", "quantity": 2})
+print((time.perf_counter() - start) * 1e3)
+"""
+
+
+def _write_manifests(directory: Path, count: int) -> None:
+    contracts = [
+        {
+            "name": f"tool_{i:04d}",
+            "version": "1.0.0",
+            "input_schema": SCHEMA,
+            "output_schema": {"type": "object"},
+            "side_effect_level": "READ",
+            "timeout_seconds": 30,
+        }
+        for i in range(count)
+    ]
+    for start in range(0, count, 50):
+        path = directory / f"tools_{start:05d}.json"
+        path.write_text(json.dumps(contracts[start : start + 50]))
+
+
+def _best_ms(code: str, *args: str) -> float:
+    samples = []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-c", code, *args], capture_output=True, text=True, check=True
+        )
+        samples.append(float(result.stdout.strip()))
+    return min(samples)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CONTRACTS
+    print(f"Executor startup, {count} manifest contracts (best of {RUNS} fresh processes)")
+
+    report("import autobiz.kernel.executor", _best_ms(IMPORT_ONLY), "ms")
+    with tempfile.TemporaryDirectory() as directory:
+        _write_manifests(Path(directory), count)
+        eager = _best_ms(FIRST_VALIDATION, directory, "eager")
+        lazy = _best_ms(FIRST_VALIDATION, directory, "lazy")
+    report("first validation, eager reload_directory()", eager, "ms")
+    report("first validation, lazy reload_directory()", lazy, "ms")
+    report("speedup", eager / lazy, "x")
+
+
+if __name__ == "__main__":
+    main()
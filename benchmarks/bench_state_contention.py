@@ -0,0 +1,112 @@
+"""Benchmark: multi-entity state commits under contention.
+
+W concurrent writers each run "fulfill" steps that change an order, its
+payment and its fulfillment, with orders drawn from a hot set of H.
+Every store call costs a simulated 1 ms round trip. Compares:
+- per entity: three apply() calls, each read + commit (6 round trips,
+  not atomic; each apply retried on its own conflict)
+- commit_many: transact() over the three entities (2 round trips,
+  all or nothing, the whole step retried on conflict)
+
+Reported: committed steps per second, conflicts per step, and the
+round trips spent per committed step.
+
+Usage: python -m benchmarks.bench_state_contention
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from autobiz.kernel.state import (
+    ConflictRetry,
+    EntityKey,
+    InMemoryStateStore,
+    StateConflictError,
+    StateManager,
+    retry_on_conflict,
+)
+from benchmarks._timing import report
+
+RTT = 0.001
+WRITERS = 32
+STEPS = 640
+HOT_SET_SIZES = (1, 4, 16, 256)
+RETRY = ConflictRetry(max_retries=1000, base_delay=0.001, max_delay=0.05)
+
+
+def _entities(order: int) -> list[EntityKey]:
+    return [
+        EntityKey("t_bench", "order", f"ord_{order}"),
+        EntityKey("t_bench", "payment", f"pay_{order}"),
+        EntityKey("t_bench", "fulfillment", f"ful_{order}"),
+    ]
+
+
+def _patches(n: int) -> list[dict[str, Any]]:
+    return [
+        {"status": "fulfilling", "step": n},
+        {"captured": True, "step": n},
+        {"status": "queued", "step": n},
+    ]
+
+
+class _Counted:
+    """Counts conflicts seen by a step (retries included)."""
+
+    def __init__(self) -> None:
+        self.conflicts = 0
+
+    async def __call__(self, operation: Callable[[], Awaitable[Any]]) -> Any:
+        async def counted() -> Any:
+            try:
+                return await operation()
+            except StateConflictError:
+                self.conflicts += 1
+                raise
+
+        return await retry_on_conflict(counted, RETRY)
+
+
+async def _per_entity(manager: StateManager, keys: list[EntityKey], n: int, run: _Counted) -> None:
+    for key, patch in zip(keys, _patches(n)):
+        await run(lambda key=key, patch=patch: manager.apply(key, patch))
+
+
+async def _batched(manager: StateManager, keys: list[EntityKey], n: int, run: _Counted) -> None:
+    patches = dict(zip(keys, _patches(n)))
+    await run(lambda: manager.transact(keys, lambda _: patches, retry=ConflictRetry(0)))
+
+
+async def _measure(step: Any, hot: int) -> tuple[float, float, float]:
+    store = InMemoryStateStore(latency=RTT)
+    manager = StateManager(store)
+    run = _Counted()
+    rng = random.Random(hot)
+    queue = [_entities(rng.randrange(hot)) for _ in range(STEPS)]
+
+    async def writer(offset: int) -> None:
+        for n in range(offset, STEPS, WRITERS):
+            await step(manager, queue[n], n, run)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(w) for w in range(WRITERS)))
+    elapsed = time.perf_counter() - started
+    return STEPS / elapsed, run.conflicts / STEPS, store.round_trips / STEPS
+
+
+def main() -> None:
+    print(f"Fulfill steps (3 entities), {WRITERS} writers, {RTT * 1000:.0f} ms round trips")
+    for hot in HOT_SET_SIZES:
+        print(f" {hot} hot orders:")
+        for label, step in (("per entity", _per_entity), ("commit_many", _batched)):
+            throughput, conflicts, trips = asyncio.run(_measure(step, hot))
+            report(f"{label} throughput", throughput, "steps/s")
+            report(f"{label} conflicts", conflicts, "per step")
+            report(f"{label} round trips", trips, "per step")
+
+
+if __name__ == "__main__":
+    main()
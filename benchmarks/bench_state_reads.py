@@ -0,0 +1,66 @@
+"""Benchmark: entity read latency against version count.
+
+For an order with V versions (realistic small merge patches), compares:
+- full replay of every patch (reading state before snapshots existed)
+- get(): the materialized state_current row
+- get_at(): point-in-time read of a random version (nearest snapshot +
+  tail replay, snapshots every 100 versions)
+
+The in-memory store decodes JSON per row like a JSONB fetch; rows read
+per call stand in for the database work.
+
+Usage: python -m benchmarks.bench_state_reads
+"""
+
+import asyncio
+import random
+from typing import Any
+
+from autobiz.kernel.state import EntityKey, InMemoryStateStore, SnapshotPolicy, StateManager
+from benchmarks._timing import per_call_us, report
+
+VERSION_COUNTS = (10, 100, 1000, 5000)
+ORDER = EntityKey("t_bench", "order", "ord_1")
+
+
+def _patch(rng: random.Random, n: int) -> dict[str, Any]:
+    if n % 3 == 0:
+        return {"status": rng.choice(["paid", "fulfilled", "partially_refunded"]), "seq": n}
+    if n % 3 == 1:
+        sku = f"SKU-{rng.randrange(40)}"
+        return {"lines": {sku: {"qty": rng.randrange(1, 5), "price": rng.randrange(500, 9000)}}}
+    return {"events": {f"e{n}": {"type": "note", "by": f"agent-{n % 7}"}}}
+
+
+async def _build(versions: int) -> tuple[StateManager, InMemoryStateStore]:
+    rng = random.Random(versions)
+    store = InMemoryStateStore()
+    manager = StateManager(store, SnapshotPolicy(every_versions=100))
+    for n in range(versions):
+        await manager.apply(ORDER, _patch(rng, n))
+    return manager, store
+
+
+def main() -> None:
+    print("Entity reads by version count (snapshots every 100 versions)")
+    loop = asyncio.new_event_loop()
+    for versions in VERSION_COUNTS:
+        manager, store = loop.run_until_complete(_build(versions))
+        rng = random.Random(1)
+        iterations = max(5, 20_000 // versions)
+
+        print(f" {versions} versions:")
+        for label, read in (
+            ("full replay", lambda: manager.replay(ORDER)),
+            ("get() current", lambda: manager.get(ORDER)),
+            ("get_at() random version", lambda: manager.get_at(ORDER, rng.randint(1, versions))),
+        ):
+            store.rows_read = 0
+            elapsed = per_call_us(lambda: loop.run_until_complete(read()), iterations, repeat=3)
+            report(label, elapsed)
+            report(f"{label} rows read", store.rows_read / (iterations * 3), "rows/call")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: SemVer range resolution vs scanning a copied tool dict.
+
+Registers thousands of tool versions across tenant-scoped tool names and
+compares ToolRegistry.resolve() with the pre-index approach of copying
+list_tools() and filtering every (name, version) key.
+
+Usage: python -m benchmarks.bench_tool_registry
+"""
+
+import random
+import time
+
+from autobiz.kernel.executor import ToolContract, ToolRegistry
+from autobiz.kernel.executor.semver import parse_range, parse_version
+from benchmarks._timing import per_call_us, report
+
+TENANTS = 40
+TOOLS_PER_TENANT = 5
+VERSIONS_PER_TOOL = 25
+SCHEMA = {"type": "object"}
+
+
+def _scan_resolve(registry: ToolRegistry, name: str, spec: str) -> ToolContract:
+    """Pre-index approach: copy everything, filter, take the max."""
+    version_range = parse_range(spec)
+    tools = dict(registry.list_tools())
+    candidates = [
+        (parse_version(version), contract)
+        for (tool_name, version), contract in tools.items()
+        if tool_name == name and version_range.contains(parse_version(version))
+    ]
+    return max(candidates, key=lambda c: c[0].sort_key)[1]
+
+
+def main() -> None:
+    rng = random.Random(1)
+    registry = ToolRegistry()
+    names = []
+
+    start = time.perf_counter()
+    for tenant in range(TENANTS):
+        for tool in range(TOOLS_PER_TENANT):
+            name = f"tenant_{tenant:03d}.createFulfillment_{tool}"
+            names.append(name)
+            registry.register_many(
+                ToolContract(
+                    name=name,
+                    version=f"{i // 10}.{i % 10}.{rng.randint(0, 3)}",
+                    input_schema=SCHEMA,
+                    output_schema=SCHEMA,
+                    side_effect_level="HARD_WRITE",
+                    timeout_seconds=30,
+                )
+                for i in range(VERSIONS_PER_TOOL)
+            )
+    total = len(registry.list_tools())
+    print(f"ToolRegistry, {total} tool versions ({time.perf_counter() - start:.2f}s to register)")
+
+    specs = ["latest", "^1", "~1.4", "2.x"]
+    lookups = [(rng.choice(names), rng.choice(specs)) for _ in range(200)]
+    for name, spec in lookups:
+        assert registry.resolve(name, spec) is _scan_resolve(registry, name, spec)
+
+    def indexed() -> None:
+        for name, spec in lookups:
+            registry.resolve(name, spec)
+
+    def scanned() -> None:
+        for name, spec in lookups:
+            _scan_resolve(registry, name, spec)
+
+    per_indexed = per_call_us(indexed, 5) / len(lookups)
+    per_scanned = per_call_us(scanned, 1, repeat=2) / len(lookups)
+    report("resolve() via sorted version index", per_indexed)
+    report("copy list_tools() + scan", per_scanned)
+    report("speedup", per_scanned / per_indexed, "x")
+    report("list_tools() (read-only view)", per_call_us(registry.list_tools, 10_000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark: warm-tier trace archive size and archived-run fetch latency.
+
+Archives D days of traces (R runs a day, 40 steps each with a tool call
+and a state diff) into segments, then reports:
+
+- bytes leaving PostgreSQL: the runs' JSON as stored in the hot tables
+  (lower bound: JSONB, tuple headers and indexes add to it)
+- bytes stored in segments, and the ratio
+- fetch latency of one run by correlation_id, cold (fresh archive, index
+  files read) and warm (indexes cached), against decompressing and
+  scanning its whole segment
+- bulk export throughput
+
+Usage: python -m benchmarks.bench_trace_archive
+"""
+
+import io
+import json
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from autobiz.kernel.trace import TraceArchive
+from autobiz.kernel.trace.archive import _decompress
+from benchmarks._timing import per_call_us, report
+
+DAYS = 3
+RUNS_PER_DAY = 2000
+STEPS = 40
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _run(rng: random.Random, day: int, n: int) -> dict[str, Any]:
+    started_at = T0 + timedelta(days=day, seconds=n * 86400 // RUNS_PER_DAY)
+    order = rng.randrange(10**9)
+    return {
+        "trace_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "tenant_id": "t_bench",
+        "correlation_id": f"corr-{day}-{n}",
+        "execution_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "status": "COMPLETED",
+        "cost_cents": rng.randrange(50),
+        "started_at": started_at,
+        "completed_at": started_at + timedelta(seconds=rng.randrange(5, 90)),
+        "steps": [
+            {"seq": s, "thought": "Check inventory before fulfilling", "tokens": rng.randrange(900)}
+            for s in range(STEPS)
+        ],
+        "tool_calls": [
+            {
+                "tool": "printful_get_order",
+                "input": {"order_id": f"po_{order}_{s}"},
+                "output": {"status": rng.choice(["fulfilled", "pending"]), "items": s % 5},
+                "latency_ms": rng.randrange(50, 400),
+            }
+            for s in range(STEPS)
+        ],
+        "state_diffs": [
+            {"op": "replace", "path": f"/orders/{order}/status", "value": "fulfilled"}
+            for _ in range(STEPS)
+        ],
+    }
+
+
+def _json_size(document: dict[str, Any]) -> int:
+    return len(json.dumps(document, default=str, separators=(",", ":")))
+
+
+def main() -> None:
+    rng = random.Random(14)
+    documents = [_run(rng, day, n) for day in range(DAYS) for n in range(RUNS_PER_DAY)]
+    hot_bytes = sum(_json_size(d) for d in documents)
+
+    with tempfile.TemporaryDirectory() as root:
+        archive = TraceArchive(root)
+        start = time.perf_counter()
+        indexes = archive.write(documents)
+        elapsed = time.perf_counter() - start
+        stored = sum(i.stored_bytes for i in indexes)
+        index_bytes = sum(i.path.with_suffix(".idx.json").stat().st_size for i in indexes)
+
+        print(f"Trace archive ({archive.codec}), {len(documents)} runs, {len(indexes)} segments")
+        report("bytes leaving PostgreSQL (JSON)", hot_bytes / 2**20, "MiB")
+        report("segment bytes", stored / 2**20, "MiB")
+        report("index bytes", index_bytes / 2**20, "MiB")
+        report("size reduction", hot_bytes / (stored + index_bytes), "x")
+        report("archive write", len(documents) / elapsed, "runs/s")
+
+        keys = [f"corr-{rng.randrange(DAYS)}-{rng.randrange(RUNS_PER_DAY)}" for _ in range(200)]
+        keys_iter = iter(keys * 1000)
+
+        def cold() -> None:
+            TraceArchive(root).fetch("t_bench", next(keys_iter))
+
+        def warm() -> None:
+            archive.fetch("t_bench", next(keys_iter))
+
+        def whole_segment() -> None:
+            key = next(keys_iter)
+            index = next(i for i in indexes if i.frames_for(key))
+            data = _decompress(index.codec, index.path.read_bytes())
+            for line in data.splitlines():
+                if json.loads(line)["correlation_id"] == key:
+                    return
+
+        report("fetch one run, cold (index read + 1 frame)", per_call_us(cold, 20) / 1e3, "ms")
+        report("fetch one run, warm (1 frame)", per_call_us(warm, 200) / 1e3, "ms")
+        report("fetch by scanning whole segment", per_call_us(whole_segment, 5) / 1e3, "ms")
+
+        out = io.BytesIO()
+        start = time.perf_counter()
+        archive.export(out)
+        elapsed = time.perf_counter() - start
+        report("bulk export", out.tell() / elapsed / 1e6, "MB/s")
+
+
+if __name__ == "__main__":
+    main()
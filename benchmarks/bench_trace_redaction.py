@@ -0,0 +1,205 @@
+"""Benchmark: trace redaction of large Shopify/Printful payloads.
+
+Compares RedactionPlan.apply() (compiled once, single pass, structural
+sharing) with the straightforward approach: deep-copy the payload, then
+evaluate each JSONPath separately - once per allowlist path to assemble
+the kept document and once per sensitive path to mask it.
+
+Usage: python -m benchmarks.bench_trace_redaction
+"""
+
+import copy
+import random
+from typing import Any
+
+from autobiz.kernel.trace import MASK, RedactionPlan
+from autobiz.kernel.trace.redaction import parse_path
+from benchmarks._timing import per_call_us, report
+
+SHOPIFY_SENSITIVE = [
+    "$.email",
+    "$.phone",
+    "$.customer.email",
+    "$.customer.phone",
+    "$..address1",
+    "$..address2",
+    "$..phone",
+    "$.line_items[*].properties[*].value",
+    "$.client_details.browser_ip",
+]
+SHOPIFY_ALLOWLIST = [
+    "$.id",
+    "$.name",
+    "$.email",
+    "$.financial_status",
+    "$.total_price",
+    "$.currency",
+    "$.customer.id",
+    "$.customer.email",
+    "$.line_items[*].sku",
+    "$.line_items[*].quantity",
+    "$.line_items[*].price",
+    "$.line_items[*].properties",
+    "$.shipping_address",
+    "$.shipping_lines",
+]
+PRINTFUL_SENSITIVE = ["$.result.recipient", "$..email", "$.result.costs.vat"]
+
+
+def _address(rng: random.Random) -> dict[str, Any]:
+    return {
+        "first_name": "Jane",
+        "last_name": "Doe",
+        "address1": f"{rng.randint(1, 999)} Market St",
+        "address2": "Apt 5",
+        "city": "San Francisco",
+        "zip": "94107",
+        "country_code": "US",
+        "phone": "+15551234567",
+    }
+
+
+def _shopify_order(rng: random.Random, lines: int) -> dict[str, Any]:
+    return {
+        "id": rng.randrange(10**12),
+        "name": "#1001",
+        "email": "jane@example.com",
+        "phone": "+15551234567",
+        "financial_status": "paid",
+        "total_price": "199.00",
+        "currency": "USD",
+        "client_details": {"browser_ip": "203.0.113.9", "user_agent": "Mozilla/5.0"},
+        "customer": {
+            "id": 77,
+            "email": "jane@example.com",
+            "phone": "+15551234567",
+            "default_address": _address(rng),
+            "tags": "vip,wholesale",
+        },
+        "billing_address": _address(rng),
+        "shipping_address": _address(rng),
+        "shipping_lines": [{"code": "STANDARD", "price": "5.00"}],
+        "line_items": [
+            {
+                "id": rng.randrange(10**12),
+                "sku": f"SKU-{i}",
+                "title": "Heavyweight Tee",
+                "quantity": rng.randint(1, 4),
+                "price": "20.00",
+                "vendor": "Acme",
+                "properties": [{"name": "gift_note", "value": "Happy birthday"}],
+                "tax_lines": [{"title": "CA State Tax", "rate": 0.0725, "price": "1.45"}],
+                "discount_allocations": [],
+            }
+            for i in range(lines)
+        ],
+        "fulfillments": [
+            {"id": rng.randrange(10**12), "tracking_numbers": ["1Z999"], "status": "success"}
+            for _ in range(lines // 10)
+        ],
+    }
+
+
+def _printful_order(rng: random.Random, lines: int) -> dict[str, Any]:
+    return {
+        "code": 200,
+        "result": {
+            "id": rng.randrange(10**9),
+            "status": "fulfilled",
+            "recipient": {**_address(rng), "email": "jane@example.com"},
+            "items": [
+                {
+                    "id": i,
+                    "variant_id": 4011,
+                    "quantity": 1,
+                    "files": [{"type": "default", "url": "https://example.com/a.png"}],
+                    "product": {"name": "Unisex Tee", "image": "https://example.com/p.png"},
+                }
+                for i in range(lines)
+            ],
+            "costs": {"subtotal": "9.95", "shipping": "4.00", "vat": "1.20", "total": "15.15"},
+            "shipments": [{"carrier": "USPS", "tracking_number": "9400", "email": "x@y.z"}],
+        },
+    }
+
+
+def _matches(value: Any, segments: list[tuple[str, Any]]) -> list[list[Any]]:
+    """Concrete paths (key lists) matched by one parsed JSONPath."""
+    found: list[list[Any]] = []
+
+    def visit(node: Any, depth: int, path: list[Any]) -> None:
+        if depth == len(segments):
+            found.append(path)
+            return
+        kind, key = segments[depth]
+        if isinstance(node, dict):
+            children = list(node.items())
+        elif isinstance(node, list):
+            children = list(enumerate(node))
+        else:
+            return
+        for child_key, child in children:
+            if kind == "any" or (kind in ("field", "index", "deep") and child_key == key):
+                visit(child, depth + 1, [*path, child_key])
+            if kind == "deep":
+                visit(child, depth, [*path, child_key])
+
+    visit(value, 0, [])
+    return found
+
+
+def _naive_redact(payload: Any, sensitive: list[str], allowlist: list[str] | None) -> Any:
+    """Per-path evaluation on a deep copy."""
+    source = copy.deepcopy(payload)
+    if allowlist is None:
+        result = source
+    else:
+        result = {}
+        for path in allowlist:
+            for keys in _matches(source, parse_path(path)):
+                src, dst = source, result
+                for key in keys[:-1]:
+                    src = src[key]
+                    if isinstance(dst, list):
+                        while len(dst) <= key:
+                            dst.append({})
+                        dst = dst[key]
+                    else:
+                        dst = dst.setdefault(key, [] if isinstance(src, list) else {})
+                value = src[keys[-1]]
+                if isinstance(dst, list):
+                    while len(dst) <= keys[-1]:
+                        dst.append({})
+                dst[keys[-1]] = copy.deepcopy(value)
+    for path in sensitive:
+        for keys in _matches(result, parse_path(path)):
+            target = result
+            for key in keys[:-1]:
+                target = target[key]
+            target[keys[-1]] = MASK
+    return result
+
+
+def main() -> None:
+    rng = random.Random(25)
+    cases = [
+        ("Shopify order", _shopify_order, SHOPIFY_SENSITIVE, SHOPIFY_ALLOWLIST),
+        ("Shopify order, masks only", _shopify_order, SHOPIFY_SENSITIVE, None),
+        ("Printful order, masks only", _printful_order, PRINTFUL_SENSITIVE, None),
+    ]
+    for label, make, sensitive, allowlist in cases:
+        plan = RedactionPlan(sensitive, allowlist)
+        for lines in (10, 250, 2500):
+            payload = make(rng, lines)
+            assert plan.apply(payload) == _naive_redact(payload, sensitive, allowlist)
+            iterations = max(3, 3000 // lines)
+            print(f"{label}, {lines} line items, {len(sensitive) + len(allowlist or [])} paths")
+            report("RedactionPlan.apply()", per_call_us(lambda: plan.apply(payload), iterations))
+            report(
+                "deepcopy + per-path evaluation",
+                per_call_us(lambda: _naive_redact(payload, sensitive, allowlist), iterations),
+            )
+
+
+if __name__ == "__main__":
+    main()
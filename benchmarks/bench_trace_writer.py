@@ -0,0 +1,133 @@
+"""Benchmark: persisting 200-step agent runs.
+
+Simulates R concurrent runs, each appending 200 steps, each with a tool
+call and a state diff. Every database round-trip holds one of POOL_SIZE
+connections for a fixed latency; bytes written are what the database
+would have to write for each approach:
+
+- JSONB arrays: each append rewrites the trace row's whole growing
+  steps/tool_calls/state_diffs document (pre-003 schema)
+- row per append: one INSERT round-trip per element
+- TraceWriter: micro-batched multi-row INSERTs shared across runs
+
+Usage: python -m benchmarks.bench_trace_writer
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Sequence
+from typing import Any
+
+from autobiz.kernel.trace import TraceRecord, TraceWriter
+from benchmarks._timing import report
+
+RUNS = 50
+STEPS = 200
+ROUND_TRIP_S = 0.0005
+POOL_SIZE = 10
+
+
+def _step(seq: int) -> dict[str, Any]:
+    return {"seq": seq, "thought": "Check inventory before fulfilling " * 4, "tokens": 812}
+
+
+def _tool_call(seq: int) -> dict[str, Any]:
+    return {
+        "tool": "printful_get_order",
+        "input": {"order_id": f"po_{seq}"},
+        "output": {
+            "status": "fulfilled",
+            "items": [{"sku": f"SKU-{i}", "qty": 1} for i in range(6)],
+        },
+        "latency_ms": 184,
+    }
+
+
+def _state_diff(seq: int) -> dict[str, Any]:
+    return {"op": "replace", "path": f"/orders/{seq}/status", "value": "fulfilled"}
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+class Db:
+    """Counts round-trips and bytes written; each round-trip holds a pooled connection."""
+
+    def __init__(self) -> None:
+        self.round_trips = 0
+        self.bytes_written = 0
+        self._pool = asyncio.Semaphore(POOL_SIZE)
+
+    async def round_trip(self, nbytes: int) -> None:
+        self.round_trips += 1
+        self.bytes_written += nbytes
+        async with self._pool:
+            await asyncio.sleep(ROUND_TRIP_S)
+
+
+class DbSink:
+    """TraceSink writing each batch as one round-trip."""
+
+    def __init__(self, db: Db) -> None:
+        self.db = db
+
+    async def write(self, records: Sequence[TraceRecord]) -> None:
+        await self.db.round_trip(sum(_size(r.payload) for r in records))
+
+
+async def _jsonb_arrays(db: Db, run: int) -> None:
+    document_size = 0
+    for seq in range(STEPS):
+        for element in (_step(seq), _tool_call(seq), _state_diff(seq)):
+            document_size += _size(element)
+            # UPDATE traces SET col = col || $1: the new row version holds it all
+            await db.round_trip(document_size)
+
+
+async def _row_per_append(db: Db, run: int) -> None:
+    for seq in range(STEPS):
+        for element in (_step(seq), _tool_call(seq), _state_diff(seq)):
+            await db.round_trip(_size(element))
+
+
+async def _batched(writer: TraceWriter, run: int) -> None:
+    trace_id = f"00000000-0000-0000-0000-{run:012d}"
+    for seq in range(STEPS):
+        await writer.append(TraceRecord("step", trace_id, "t_1", seq, _step(seq)))
+        await writer.append(
+            TraceRecord("tool_call", trace_id, "t_1", seq, _tool_call(seq), "printful_get_order")
+        )
+        await writer.append(TraceRecord("state_diff", trace_id, "t_1", seq, _state_diff(seq)))
+        # Agent work between steps
+        await asyncio.sleep(0)
+
+
+async def _run(mode: str) -> None:
+    db = Db()
+    start = time.perf_counter()
+    if mode == "TraceWriter":
+        writer = TraceWriter(DbSink(db))
+        writer.start()
+        await asyncio.gather(*(_batched(writer, run) for run in range(RUNS)))
+        await writer.close()
+    else:
+        runner = _jsonb_arrays if mode == "JSONB arrays" else _row_per_append
+        await asyncio.gather(*(runner(db, run) for run in range(RUNS)))
+    elapsed = time.perf_counter() - start
+
+    print(f" {mode}:")
+    report("wall time", elapsed * 1e3, "ms")
+    report("round-trips", db.round_trips, "trips")
+    report("bytes written", db.bytes_written / 2**20, "MiB")
+
+
+def main() -> None:
+    print(f"Trace persistence, {RUNS} concurrent runs x {STEPS} steps (+ tool call + diff)")
+    for mode in ("JSONB arrays", "row per append", "TraceWriter"):
+        asyncio.run(_run(mode))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: fail-fast, full-report and is_valid on valid vs heavily invalid payloads.
+
+Usage: python -m benchmarks.bench_validation_modes
+"""
+
+from typing import Any
+
+from autobiz.kernel.executor import (
+    SchemaValidationError,
+    SchemaValidator,
+    ValidationMode,
+)
+from benchmarks._timing import per_call_us, report
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "line_items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "sku": {"type": "string"},
+                    "quantity": {"type": "integer", "minimum": 1},
+                },
+                "required": ["sku", "quantity"],
+                "additionalProperties": False,
+            },
+        }
+    },
+    "required": ["line_items"],
+}
+
+VALID = {"line_items": [{"sku": f"SKU-{i}", "quantity": 1} for i in range(500)]}
+# Every item violates three keywords
+INVALID = {"line_items": [{"sku": i, "quantity": 0, "x": True} for i in range(500)]}
+
+
+def _raising(fn: Any) -> Any:
+    def call() -> None:
+        try:
+            fn()
+        except SchemaValidationError:
+            pass
+
+    return call
+
+
+def main() -> None:
+    for backend in ("jsonschema", "compiled"):
+        validator = SchemaValidator(backend=backend)  # type: ignore[arg-type]
+        compiled = validator.compile(SCHEMA)
+        legacy = compiled.validator
+
+        print(f"Validation modes, backend={backend}, 500 line items")
+        for label, data in (("valid", VALID), ("invalid", INVALID)):
+            iterations = 50
+            report(
+                f"{label}: materialize all errors (legacy)",
+                per_call_us(lambda: list(legacy.iter_errors(data)), iterations),
+            )
+            report(
+                f"{label}: FAIL_FAST",
+                per_call_us(
+                    _raising(lambda: validator.validate_compiled(data, compiled)), iterations
+                ),
+            )
+            report(
+                f"{label}: is_valid",
+                per_call_us(lambda: validator.is_valid(data, compiled), iterations),
+            )
+            report(
+                f"{label}: FULL_REPORT",
+                per_call_us(
+                    _raising(
+                        lambda: validator.validate_compiled(
+                            data, compiled, ValidationMode.FULL_REPORT
+                        )
+                    ),
+                    iterations,
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
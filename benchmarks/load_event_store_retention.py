@@ -0,0 +1,172 @@
+"""Load test: event_store storage and dedup/provenance lookups across tiers.
+
+Writes DAYS simulated days of webhook events through PostgresEventStore,
+running EventStoreCompactor before each day as the periodic job would,
+with a payload retention of RETENTION_DAYS (shortened from 90 so the run
+reaches steady state). Reported:
+- bytes per event in the hot tier (event_store partitions, payload kept)
+  and in the ledger (hash and metadata, kept for good)
+- insert_many latency for batches of redeliveries whose first delivery is
+  still hot, and whose first delivery was compacted
+- get() latency for hot and compacted events
+
+Needs a migrated test database (alembic upgrade head):
+    DATABASE_URL=postgresql://.../autobiz_test python -m benchmarks.load_event_store_retention
+
+Rows are written under a throwaway tenant, which is deleted afterwards.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Awaitable
+from datetime import datetime, timedelta, timezone
+from datetime import time as dtime
+
+from autobiz.kernel.db import PartitionSpec
+from autobiz.kernel.events import EventStoreCompactor, InboundEvent, PostgresEventStore
+from benchmarks._timing import report
+
+DAYS = int(os.getenv("LOAD_DAYS", "14"))
+RETENTION_DAYS = int(os.getenv("LOAD_RETENTION_DAYS", "7"))
+EVENTS_PER_DAY = int(os.getenv("LOAD_EVENTS_PER_DAY", "20000"))
+BATCH = 500
+SAMPLES = 200
+
+_HOT_SIZE = """
+    SELECT COALESCE(SUM(pg_total_relation_size(inhrelid)), 0)::bigint
+    FROM pg_inherits WHERE inhparent = 'event_store'::regclass
+"""
+_LEDGER_SIZE = "SELECT pg_total_relation_size('event_ledger')::bigint"
+_COUNTS = """
+    SELECT COUNT(*) FILTER (WHERE compacted_at IS NULL) AS hot,
+           COUNT(*) FILTER (WHERE compacted_at IS NOT NULL) AS compacted
+    FROM event_ledger
+"""
+
+
+def _event(
+    tenant_id: str, event_id: str, received_at: datetime, rng: random.Random
+) -> InboundEvent:
+    payload = {
+        "id": event_id,
+        "type": "charge.succeeded",
+        "created": int(received_at.timestamp()),
+        "data": {
+            "object": {
+                "id": f"ch_{event_id}",
+                "amount": rng.randrange(100, 90000),
+                "currency": "usd",
+                "customer": f"cus_{rng.randrange(10**6):06d}",
+                "metadata": {"order_id": f"ord_{rng.randrange(10**8):08d}"},
+            }
+        },
+    }
+    body = json.dumps(payload).encode()
+    return InboundEvent(
+        tenant_id=tenant_id,
+        source="STRIPE",
+        source_event_id=event_id,
+        event_type="charge.succeeded",
+        received_at=received_at,
+        body=body,
+        payload=payload,
+        payload_sha256=hashlib.sha256(body).hexdigest(),
+    )
+
+
+async def _timed(call: Awaitable[object]) -> float:
+    started = time.perf_counter()
+    await call
+    return (time.perf_counter() - started) * 1e3
+
+
+async def _run(database_url: str) -> None:
+    import asyncpg
+
+    pool = await asyncpg.create_pool(database_url, min_size=2, max_size=4)
+    tenant_id = f"t_load_{uuid.uuid4().hex[:8]}"
+    await pool.execute(
+        "INSERT INTO tenants (tenant_id, name) VALUES ($1, 'event retention load test')", tenant_id
+    )
+    spec = PartitionSpec(
+        table="event_store",
+        column="received_at",
+        archive_schema=None,
+        retention=timedelta(days=RETENTION_DAYS),
+    )
+    compactor = EventStoreCompactor(pool, spec)
+    store = PostgresEventStore(pool)
+    rng = random.Random(20)
+    sent: list[InboundEvent] = []
+
+    first_day = datetime.combine(datetime.now(timezone.utc).date(), dtime(), tzinfo=timezone.utc)
+    step = timedelta(days=1) / EVENTS_PER_DAY
+    print(
+        f"event_store load test: {DAYS} days x {EVENTS_PER_DAY} events/day, "
+        f"payloads kept {RETENTION_DAYS} days"
+    )
+    try:
+        insert_ms: list[float] = []
+        for day in range(DAYS):
+            day_start = first_day + timedelta(days=day)
+            await compactor.run_once(day_start)
+            events = [
+                _event(tenant_id, f"evt_{day}_{n}", day_start + step * n, rng)
+                for n in range(EVENTS_PER_DAY)
+            ]
+            for offset in range(0, len(events), BATCH):
+                insert_ms.append(await _timed(store.insert_many(events[offset : offset + BATCH])))
+            sent.extend(events)
+        await compactor.run_once(first_day + timedelta(days=DAYS))
+
+        counts = await pool.fetchrow(_COUNTS)
+        hot_bytes = await pool.fetchval(_HOT_SIZE)
+        ledger_bytes = await pool.fetchval(_LEDGER_SIZE)
+        print(" storage:")
+        report("hot events (payload kept)", counts["hot"], "events")
+        report("compacted events (hash and metadata)", counts["compacted"], "events")
+        report("event_store partitions per hot event", hot_bytes / max(counts["hot"], 1), "bytes")
+        report("event_ledger per event (both tiers)", ledger_bytes / len(sent), "bytes")
+
+        cutoff = first_day + timedelta(days=DAYS - RETENTION_DAYS + 1)
+        hot = [e for e in sent if e.received_at >= cutoff]
+        cold = [
+            e for e in sent if e.received_at < first_day + timedelta(days=DAYS - RETENTION_DAYS)
+        ]
+        print(" lookups:")
+        insert_ms.sort()
+        report("insert_many (500 new events) p50", statistics.median(insert_ms), "ms")
+        for label, tier in (("hot", hot), ("compacted", cold)):
+            if not tier:
+                continue
+            redeliveries = rng.sample(tier, min(BATCH, len(tier)))
+            results = await store.insert_many(redeliveries)
+            assert all(result.duplicate for result in results)
+            dedup = [await _timed(store.insert_many(redeliveries)) for _ in range(10)]
+            gets = [
+                await _timed(store.get(e.tenant_id, e.source, e.source_event_id))
+                for e in rng.sample(tier, min(SAMPLES, len(tier)))
+            ]
+            report(f"insert_many (500 {label} redeliveries) p50", statistics.median(dedup), "ms")
+            report(f"get() {label} p50", statistics.median(gets), "ms")
+    finally:
+        await pool.execute("DELETE FROM tenants WHERE tenant_id = $1", tenant_id)
+        await pool.close()
+
+
+def main() -> None:
+    database_url = os.getenv("DATABASE_URL", "")
+    if "_test" not in database_url:
+        sys.exit("DATABASE_URL must point at a migrated *_test database")
+    asyncio.run(_run(database_url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Load test: receipts insert latency and attached table size over simulated weeks.
+
+Drives PostgresReceiptStore.insert() with a simulated clock, one day at a
+time, running PartitionMaintainer before each day as the hourly job would.
+With partitioning, attached size should plateau after the retention window
+(about three daily partitions of data) and insert latency should stay flat
+week over week, instead of growing with the heap and its indexes.
+
+Needs a migrated test database (alembic upgrade head):
+    DATABASE_URL=postgresql://.../autobiz_test python -m benchmarks.load_receipts_partitioning
+
+Rows are written under a throwaway tenant, which is deleted afterwards
+together with the partitions this run archived.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from datetime import time as dtime
+
+from autobiz.kernel.db import PartitionMaintainer, PartitionSpec
+from autobiz.kernel.idempotency import PostgresReceiptStore, Receipt
+from autobiz.kernel.idempotency.receipts import LOOKBACK
+from benchmarks._timing import report
+
+WEEKS = int(os.getenv("LOAD_WEEKS", "4"))
+RECEIPTS_PER_DAY = int(os.getenv("LOAD_RECEIPTS_PER_DAY", "20000"))
+CONCURRENCY = 16
+# Share of inserts that repeat a key from the last hour (provider retries)
+RETRY_EVERY = 10
+
+_ATTACHED_SIZE = """
+    SELECT COALESCE(SUM(pg_total_relation_size(inhrelid)), 0)::bigint
+    FROM pg_inherits WHERE inhparent = 'receipts'::regclass
+"""
+
+
+def _receipt(tenant_id: str, key: str, first_seen_at: datetime) -> Receipt:
+    return Receipt(
+        tenant_id=tenant_id,
+        tool_name="create_charge",
+        tool_version="1.0.0",
+        internal_idempotency_key=key,
+        execution_id=str(uuid.uuid4()),
+        status="COMPLETED",
+        result={"charge_id": key[-12:], "amount": 500},
+        first_seen_at=first_seen_at,
+        ttl_expires_at=first_seen_at + LOOKBACK,
+    )
+
+
+async def _day(store: PostgresReceiptStore, tenant_id: str, day_start: datetime) -> list[float]:
+    """Insert one simulated day of receipts; returns per-insert latencies (ms)."""
+    step = timedelta(days=1) / RECEIPTS_PER_DAY
+    latencies: list[float] = []
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for n in range(RECEIPTS_PER_DAY):
+        queue.put_nowait(n)
+
+    async def worker() -> None:
+        while not queue.empty():
+            n = queue.get_nowait()
+            # Every RETRY_EVERY-th call retries a recent key and must dedupe
+            key_n = n - 1 if n % RETRY_EVERY == 0 and n else n
+            key = f"{tenant_id}:create_charge:1.0.0:agent:{day_start:%Y%m%d}{key_n:012d}"
+            start = time.perf_counter()
+            await store.insert(_receipt(tenant_id, key, day_start + step * n))
+            latencies.append((time.perf_counter() - start) * 1e3)
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return latencies
+
+
+async def _run(database_url: str) -> None:
+    import asyncpg
+
+    pool = await asyncpg.create_pool(database_url, min_size=CONCURRENCY, max_size=CONCURRENCY)
+    tenant_id = f"t_load_{uuid.uuid4().hex[:8]}"
+    await pool.execute(
+        "INSERT INTO tenants (tenant_id, name) VALUES ($1, 'receipts load test')", tenant_id
+    )
+    spec = PartitionSpec()
+    maintainer = PartitionMaintainer(pool, spec)
+    store = PostgresReceiptStore(pool)
+    archived: list[str] = []
+
+    first_day = datetime.combine(datetime.now(timezone.utc).date(), dtime(), tzinfo=timezone.utc)
+    print(f"Receipts load test: {WEEKS} weeks x {RECEIPTS_PER_DAY} receipts/day")
+    try:
+        for week in range(WEEKS):
+            latencies: list[float] = []
+            for weekday in range(7):
+                day_start = first_day + timedelta(days=week * 7 + weekday)
+                plan = await maintainer.run_once(day_start)
+                archived.extend(plan.detach)
+                latencies.extend(await _day(store, tenant_id, day_start))
+
+            latencies.sort()
+            size_mb = await pool.fetchval(_ATTACHED_SIZE) / 2**20
+            attached = len(await maintainer.attached_partitions())
+            print(f" week {week + 1}:")
+            report("insert p50", statistics.median(latencies), "ms")
+            report("insert p99", latencies[int(len(latencies) * 0.99)], "ms")
+            report("attached receipts size", size_mb, "MiB")
+            report("attached partitions (incl. premade, default)", attached, "tables")
+            report("partitions archived so far", len(archived), "tables")
+    finally:
+        await pool.execute("DELETE FROM tenants WHERE tenant_id = $1", tenant_id)
+        for name in archived:
+            await pool.execute(f"DROP TABLE IF EXISTS {spec.archive_schema}.{name}")
+        await pool.close()
+
+
+def main() -> None:
+    database_url = os.getenv("DATABASE_URL", "")
+    if "_test" not in database_url:
+        sys.exit("DATABASE_URL must point at a migrated *_test database")
+    asyncio.run(_run(database_url))
+
+
+if __name__ == "__main__":
+    main()
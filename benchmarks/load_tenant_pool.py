@@ -0,0 +1,146 @@
+"""Load test: tenant-scoped transactions/sec, TenantPool vs the plan's wrapper.
+
+WORKERS concurrent workers spread over TENANTS tenants run short
+transactions for SECONDS each:
+- naive: the §12.2 TenantConnection: acquire, BEGIN, SELECT
+  set_tenant_context($1), the statements, COMMIT, RESET
+  app.current_tenant_id, release (asyncpg's reset query)
+- TenantPool: BEGIN and set_tenant_context() in one message, no resets
+
+Workloads: one parameterized read, and three statements. Then one noisy
+tenant (NOISY_WORKERS workers) shares the pool with the quiet tenants;
+reported is the quiet tenants' p99 wait for a connection, without and
+with the per-tenant cap.
+
+Needs a migrated test database (alembic upgrade head):
+    DATABASE_URL=postgresql://.../autobiz_test python -m benchmarks.load_tenant_pool
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from autobiz.kernel.db import TenantPool, TenantPoolConfig
+from benchmarks._timing import report
+
+SECONDS = float(os.getenv("LOAD_SECONDS", "5"))
+WORKERS = int(os.getenv("LOAD_WORKERS", "32"))
+TENANTS = 8
+POOL_SIZE = 16
+NOISY_WORKERS = 64
+
+_READ = "SELECT require_tenant_context() = $1"
+_STATEMENTS = ("SELECT require_tenant_context() = $1", "SELECT $1::text", "SELECT length($1)")
+
+
+async def _naive(pool: Any, tenant_id: str, statements: tuple[str, ...]) -> None:
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("SELECT set_tenant_context($1)", tenant_id)
+            for statement in statements:
+                await conn.fetchval(statement, tenant_id)
+        await conn.execute("RESET app.current_tenant_id")
+
+
+async def _tenant_pool(pool: TenantPool, tenant_id: str, statements: tuple[str, ...]) -> None:
+    async with pool.transaction(tenant_id) as tx:
+        for statement in statements:
+            await tx.fetchval(statement, tenant_id)
+
+
+async def _throughput(run: Callable[[str], Awaitable[None]], workers: int) -> float:
+    deadline = time.perf_counter() + SECONDS
+    done = 0
+
+    async def worker(n: int) -> None:
+        nonlocal done
+        tenant_id = f"t_load_{n % TENANTS}"
+        while time.perf_counter() < deadline:
+            await run(tenant_id)
+            done += 1
+
+    await asyncio.gather(*(worker(n) for n in range(workers)))
+    return done / SECONDS
+
+
+async def _quiet_p99(acquire_wait: Callable[[str], Awaitable[float]]) -> float:
+    deadline = time.perf_counter() + SECONDS
+    waits: list[float] = []
+
+    async def worker(tenant_id: str, record: bool) -> None:
+        while time.perf_counter() < deadline:
+            waited = await acquire_wait(tenant_id)
+            if record:
+                waits.append(waited)
+
+    noisy = [worker("t_load_noisy", False) for _ in range(NOISY_WORKERS)]
+    quiet = [worker(f"t_load_{n % TENANTS}", True) for n in range(TENANTS)]
+    await asyncio.gather(*noisy, *quiet)
+    waits.sort()
+    return waits[int(0.99 * (len(waits) - 1))] * 1e3
+
+
+async def _run(database_url: str) -> None:
+    import asyncpg
+
+    naive = await asyncpg.create_pool(database_url, min_size=POOL_SIZE, max_size=POOL_SIZE)
+    tenant_ids = [f"t_load_{n}" for n in range(TENANTS)] + ["t_load_noisy"]
+    await naive.executemany(
+        "INSERT INTO tenants (tenant_id, name) VALUES ($1, 'pool load test') "
+        "ON CONFLICT DO NOTHING",
+        [(t,) for t in tenant_ids],
+    )
+    config = TenantPoolConfig(
+        shared_min_size=POOL_SIZE, shared_max_size=POOL_SIZE, max_connections_per_tenant=4
+    )
+    tenant_pool = await TenantPool.connect(database_url, config)
+    print(f"Tenant pool load test: {WORKERS} workers, {TENANTS} tenants, pool {POOL_SIZE}")
+    try:
+        for label, statements in (("1 statement", (_READ,)), ("3 statements", _STATEMENTS)):
+            naive_tps = await _throughput(lambda t: _naive(naive, t, statements), WORKERS)
+            pool_tps = await _throughput(
+                lambda t: _tenant_pool(tenant_pool, t, statements), WORKERS
+            )
+            report(f"naive wrapper, {label}", naive_tps, "tx/s")
+            report(f"TenantPool, {label}", pool_tps, "tx/s")
+
+        async def naive_wait(tenant_id: str) -> float:
+            started = time.perf_counter()
+            async with naive.acquire() as conn:
+                waited = time.perf_counter() - started
+                async with conn.transaction():
+                    await conn.execute("SELECT set_tenant_context($1)", tenant_id)
+                    await conn.fetchval(_READ, tenant_id)
+            return waited
+
+        async def capped_wait(tenant_id: str) -> float:
+            started = time.perf_counter()
+            async with tenant_pool.transaction(tenant_id) as tx:
+                waited = time.perf_counter() - started
+                await tx.fetchval(_READ, tenant_id)
+            return waited
+
+        print(f" quiet tenants beside a noisy one ({NOISY_WORKERS} workers):")
+        report("uncapped quiet p99 wait", await _quiet_p99(naive_wait), "ms")
+        report("capped quiet p99 wait", await _quiet_p99(capped_wait), "ms")
+        stats = tenant_pool.stats
+        report("TenantPool mean wait", stats.wait_seconds_total / stats.transactions * 1e3, "ms")
+        report("TenantPool capped acquires", stats.capped, "acquires")
+    finally:
+        await naive.execute("DELETE FROM tenants WHERE tenant_id = ANY($1::text[])", tenant_ids)
+        await naive.close()
+        await tenant_pool.close()
+
+
+def main() -> None:
+    database_url = os.getenv("DATABASE_URL", "")
+    if "_test" not in database_url:
+        sys.exit("DATABASE_URL must point at a migrated *_test database")
+    asyncio.run(_run(database_url))
+
+
+if __name__ == "__main__":
+    main()
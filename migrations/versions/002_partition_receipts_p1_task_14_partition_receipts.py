@@ -0,0 +1,239 @@
+"""P1-TASK-14: Range-partition receipts by first_seen_at
+
+Rebuilds `receipts` as a table range-partitioned by day on first_seen_at,
+so expired receipts leave the hot table by detaching a whole partition
+(O(1), no row deletes, no index bloat) instead of DELETE sweeps.
+
+Partitioned tables cannot carry UNIQUE (tenant_id, internal_idempotency_key)
+without the partition key, so INV-05 deduplication moves into
+insert_receipt(): it takes a transaction-scoped advisory lock on the key,
+returns a live receipt from the lookback window if there is one (pruned
+to the one or two partitions the window spans), and inserts otherwise.
+
+Partitions are created ahead of time and detached/archived by
+autobiz.kernel.db.partitions.PartitionMaintainer. A DEFAULT partition
+catches rows if maintenance falls behind; the maintainer's next pass
+moves them into their daily partitions, since a day cannot be created
+while DEFAULT holds rows for it. The migration itself creates a partition
+for every legacy day, so nothing starts out in DEFAULT.
+
+Revision ID: 002_partition_receipts
+Revises: 001_core_tables
+Create Date: 2026-02-02
+
+Requirements: INV-05, P1-R07
+Test Coverage: P1-T11, P1-T12, P1-T13
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "002_partition_receipts"
+down_revision: Union[str, Sequence[str], None] = "001_core_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Days of partitions created ahead of today at migration time
+PREMAKE_DAYS = 7
+
+
+def upgrade() -> None:
+    """Upgrade schema - move receipts onto daily partitions."""
+
+    # 1. Keep the existing rows aside
+    op.execute("""
+        ALTER TABLE receipts RENAME TO receipts_legacy;
+        ALTER INDEX idx_receipts_internal_key RENAME TO idx_receipts_legacy_internal_key;
+        ALTER INDEX idx_receipts_external_key RENAME TO idx_receipts_legacy_external_key;
+        ALTER INDEX idx_receipts_ttl RENAME TO idx_receipts_legacy_ttl;
+
+        CREATE SCHEMA IF NOT EXISTS receipts_archive;
+        """)
+
+    # 2. Partitioned parent (INV-05 - dual idempotency)
+    op.execute("""
+        CREATE TABLE receipts (
+            receipt_id UUID NOT NULL DEFAULT gen_random_uuid(),
+            tenant_id TEXT NOT NULL,
+            tool_name TEXT NOT NULL,
+            tool_version TEXT NOT NULL,
+
+            -- Internal idempotency
+            internal_idempotency_key TEXT NOT NULL,
+            execution_id UUID NOT NULL,
+
+            -- External idempotency (for FINANCIAL tools)
+            external_idempotency_key TEXT,
+            external_provider TEXT,
+            external_transaction_id TEXT,
+
+            -- Result
+            status TEXT NOT NULL,
+            result_json JSONB,
+
+            -- Timestamps
+            first_seen_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            ttl_expires_at TIMESTAMPTZ NOT NULL,
+
+            CONSTRAINT receipts_tenant_fk FOREIGN KEY (tenant_id)
+                REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            PRIMARY KEY (receipt_id, first_seen_at)
+        ) PARTITION BY RANGE (first_seen_at);
+
+        -- Lookback lookups: equality on the key, newest first
+        CREATE INDEX idx_receipts_internal_key
+            ON receipts(tenant_id, internal_idempotency_key, first_seen_at DESC);
+        CREATE INDEX idx_receipts_external_key
+            ON receipts(external_provider, external_idempotency_key)
+            WHERE external_idempotency_key IS NOT NULL;
+
+        CREATE TABLE receipts_default PARTITION OF receipts DEFAULT;
+        """)
+
+    # 3. Daily partitions covering every legacy row and PREMAKE_DAYS ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            day date;
+            last_day date;
+        BEGIN
+            day := COALESCE(
+                (SELECT MIN(first_seen_at AT TIME ZONE 'UTC')::date FROM receipts_legacy),
+                (NOW() AT TIME ZONE 'UTC')::date
+            );
+            -- Legacy rows stamped past the premake window get partitions too
+            last_day := GREATEST(
+                (NOW() AT TIME ZONE 'UTC')::date + {PREMAKE_DAYS},
+                (SELECT MAX(first_seen_at AT TIME ZONE 'UTC')::date FROM receipts_legacy)
+            );
+            WHILE day <= last_day LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF receipts FOR VALUES FROM (%L) TO (%L)',
+                    'receipts_p' || to_char(day, 'YYYYMMDD'),
+                    (day::timestamp AT TIME ZONE 'UTC'),
+                    ((day + 1)::timestamp AT TIME ZONE 'UTC')
+                );
+                day := day + 1;
+            END LOOP;
+        END
+        $$;
+
+        INSERT INTO receipts SELECT
+            receipt_id, tenant_id, tool_name, tool_version, internal_idempotency_key,
+            execution_id, external_idempotency_key, external_provider,
+            external_transaction_id, status, result_json, first_seen_at, ttl_expires_at
+        FROM receipts_legacy;
+
+        DROP TABLE receipts_legacy;
+        """)
+
+    # 4. Deduplicating insert (replaces the global UNIQUE constraint)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION insert_receipt(
+            p_receipt_id uuid,
+            p_tenant_id text,
+            p_tool_name text,
+            p_tool_version text,
+            p_internal_key text,
+            p_execution_id uuid,
+            p_status text,
+            p_result_json jsonb,
+            p_first_seen_at timestamptz,
+            p_ttl_expires_at timestamptz,
+            p_external_key text DEFAULT NULL,
+            p_external_provider text DEFAULT NULL,
+            p_external_transaction_id text DEFAULT NULL,
+            p_lookback interval DEFAULT interval '24 hours'
+        )
+        RETURNS SETOF receipts AS $$
+        BEGIN
+            -- Serialize writers of one key until the caller's transaction ends
+            PERFORM pg_advisory_xact_lock(
+                hashtextextended(p_tenant_id || ':' || p_internal_key, 0)
+            );
+
+            RETURN QUERY
+                SELECT * FROM receipts
+                WHERE tenant_id = p_tenant_id
+                  AND internal_idempotency_key = p_internal_key
+                  AND first_seen_at > p_first_seen_at - p_lookback
+                  AND ttl_expires_at > p_first_seen_at
+                ORDER BY first_seen_at DESC
+                LIMIT 1;
+            IF FOUND THEN
+                RETURN;
+            END IF;
+
+            RETURN QUERY
+                INSERT INTO receipts (
+                    receipt_id, tenant_id, tool_name, tool_version,
+                    internal_idempotency_key, execution_id,
+                    external_idempotency_key, external_provider, external_transaction_id,
+                    status, result_json, first_seen_at, ttl_expires_at
+                )
+                VALUES (
+                    p_receipt_id, p_tenant_id, p_tool_name, p_tool_version,
+                    p_internal_key, p_execution_id,
+                    p_external_key, p_external_provider, p_external_transaction_id,
+                    p_status, p_result_json, p_first_seen_at, p_ttl_expires_at
+                )
+                RETURNING *;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore receipts as a single heap.
+
+    Rows in archived (detached) partitions are not restored.
+    """
+    op.execute("""
+        DROP FUNCTION IF EXISTS insert_receipt(
+            uuid, text, text, text, text, uuid, text, jsonb, timestamptz, timestamptz,
+            text, text, text, interval
+        );
+
+        ALTER TABLE receipts RENAME TO receipts_partitioned;
+
+        CREATE TABLE receipts (
+            receipt_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            tenant_id TEXT NOT NULL,
+            tool_name TEXT NOT NULL,
+            tool_version TEXT NOT NULL,
+            internal_idempotency_key TEXT NOT NULL,
+            execution_id UUID NOT NULL,
+            external_idempotency_key TEXT,
+            external_provider TEXT,
+            external_transaction_id TEXT,
+            status TEXT NOT NULL,
+            result_json JSONB,
+            first_seen_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            ttl_expires_at TIMESTAMPTZ NOT NULL,
+
+            CONSTRAINT receipts_tenant_fk FOREIGN KEY (tenant_id)
+                REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            UNIQUE (tenant_id, internal_idempotency_key)
+        );
+
+        -- Latest receipt per key wins under the restored UNIQUE constraint
+        INSERT INTO receipts
+        SELECT DISTINCT ON (tenant_id, internal_idempotency_key)
+            receipt_id, tenant_id, tool_name, tool_version, internal_idempotency_key,
+            execution_id, external_idempotency_key, external_provider,
+            external_transaction_id, status, result_json, first_seen_at, ttl_expires_at
+        FROM receipts_partitioned
+        ORDER BY tenant_id, internal_idempotency_key, first_seen_at DESC;
+
+        DROP TABLE receipts_partitioned CASCADE;
+
+        CREATE INDEX idx_receipts_internal_key
+            ON receipts(tenant_id, internal_idempotency_key);
+        CREATE INDEX idx_receipts_external_key
+            ON receipts(external_provider, external_idempotency_key)
+            WHERE external_idempotency_key IS NOT NULL;
+        CREATE INDEX idx_receipts_ttl
+            ON receipts(ttl_expires_at);
+        """)
@@ -0,0 +1,125 @@
+"""P1-TASK-10: Append-only child tables for trace steps, tool calls and state diffs
+
+`traces.steps`, `traces.tool_calls` and `traces.state_diffs` were JSONB
+arrays on the trace row, so every appended step rewrote (and re-TOASTed)
+the whole growing document: O(n^2) bytes written over an n-step run.
+
+Each element now is its own row keyed by (trace_id, seq), written once by
+multi-row INSERTs from autobiz.kernel.trace.writer.TraceWriter. The traces
+row keeps run metadata (status, cost, timestamps). Existing arrays are
+moved into the new tables; the trace_documents view reassembles them for
+readers that want the old shape.
+
+Revision ID: 003_trace_append_tables
+Revises: 002_partition_receipts
+Create Date: 2026-02-09
+
+Requirements: INV-04, P1-R05
+Test Coverage: P1-T09, P1-T10
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "003_trace_append_tables"
+down_revision: Union[str, Sequence[str], None] = "002_partition_receipts"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, legacy traces column) pairs
+_CHILD_TABLES = (
+    ("trace_steps", "steps"),
+    ("trace_tool_calls", "tool_calls"),
+    ("trace_state_diffs", "state_diffs"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema - move trace arrays into append-only tables."""
+
+    # 1. Child tables (INV-04 - one row per appended element)
+    for table, _ in _CHILD_TABLES:
+        tool_name_column = "tool_name TEXT," if table == "trace_tool_calls" else ""
+        op.execute(f"""
+            CREATE TABLE {table} (
+                trace_id UUID NOT NULL,
+                seq INT NOT NULL,
+                tenant_id TEXT NOT NULL,
+                {tool_name_column}
+                payload JSONB NOT NULL,
+                recorded_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+                PRIMARY KEY (trace_id, seq),
+                CONSTRAINT {table}_trace_fk FOREIGN KEY (trace_id)
+                    REFERENCES traces(trace_id) ON DELETE CASCADE
+            );
+
+            CREATE INDEX idx_{table}_tenant_time ON {table}(tenant_id, recorded_at);
+            """)
+
+    op.execute("CREATE INDEX idx_trace_tool_calls_tool ON trace_tool_calls(tenant_id, tool_name);")
+
+    # 2. Move existing arrays (seq = array position, from 0)
+    for table, column in _CHILD_TABLES:
+        tool_name = "element ->> 'tool_name'," if table == "trace_tool_calls" else ""
+        tool_name_column = "tool_name," if table == "trace_tool_calls" else ""
+        op.execute(f"""
+            INSERT INTO {table} (trace_id, seq, tenant_id, {tool_name_column} payload, recorded_at)
+            SELECT t.trace_id, (e.position - 1)::int, t.tenant_id, {tool_name}
+                   e.element, t.started_at
+            FROM traces t,
+                 jsonb_array_elements(t.{column}) WITH ORDINALITY AS e(element, position);
+            """)
+
+    op.execute("""
+        ALTER TABLE traces
+            DROP COLUMN steps,
+            DROP COLUMN tool_calls,
+            DROP COLUMN state_diffs;
+        """)
+
+    # 3. Read-side view in the pre-003 shape
+    op.execute("""
+        CREATE VIEW trace_documents AS
+        SELECT
+            t.*,
+            COALESCE(
+                (SELECT jsonb_agg(s.payload ORDER BY s.seq)
+                 FROM trace_steps s WHERE s.trace_id = t.trace_id),
+                '[]'::jsonb
+            ) AS steps,
+            COALESCE(
+                (SELECT jsonb_agg(c.payload ORDER BY c.seq)
+                 FROM trace_tool_calls c WHERE c.trace_id = t.trace_id),
+                '[]'::jsonb
+            ) AS tool_calls,
+            COALESCE(
+                (SELECT jsonb_agg(d.payload ORDER BY d.seq)
+                 FROM trace_state_diffs d WHERE d.trace_id = t.trace_id),
+                '[]'::jsonb
+            ) AS state_diffs
+        FROM traces t;
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - fold child rows back into trace arrays."""
+    op.execute("DROP VIEW IF EXISTS trace_documents;")
+    op.execute("""
+        ALTER TABLE traces
+            ADD COLUMN steps JSONB NOT NULL DEFAULT '[]'::jsonb,
+            ADD COLUMN tool_calls JSONB NOT NULL DEFAULT '[]'::jsonb,
+            ADD COLUMN state_diffs JSONB NOT NULL DEFAULT '[]'::jsonb;
+        """)
+    for table, column in _CHILD_TABLES:
+        op.execute(f"""
+            UPDATE traces t SET {column} = agg.elements
+            FROM (
+                SELECT trace_id, jsonb_agg(payload ORDER BY seq) AS elements
+                FROM {table} GROUP BY trace_id
+            ) agg
+            WHERE agg.trace_id = t.trace_id;
+            """)
+        op.execute(f"DROP TABLE IF EXISTS {table} CASCADE;")
@@ -0,0 +1,100 @@
+"""P1-TASK-10: Hash-chained audit log and Merkle checkpoints
+
+Creates `audit_log`, one row per chained entry (seq, prev_hash,
+entry_hash; see autobiz.kernel.audit.chain), and `audit_checkpoints`,
+the Merkle roots of verified contiguous seq ranges written by the nightly
+AuditVerifier.
+
+Entries are appended in batches by autobiz.kernel.audit.AuditSequencer;
+the seq primary key rejects a batch that races another writer for the
+tail. A trigger makes both tables append-only: UPDATE, DELETE and
+TRUNCATE raise.
+
+Revision ID: 004_audit_log
+Revises: 003_trace_append_tables
+Create Date: 2026-02-11
+
+Requirements: INV-04, P1-R05
+Test Coverage: P1-T09, P1-T10
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004_audit_log"
+down_revision: Union[str, Sequence[str], None] = "003_trace_append_tables"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - create audit log tables."""
+
+    # 1. Entries (global chain; tenant_id is the tenant the event concerns)
+    op.execute("""
+        CREATE TABLE audit_log (
+            seq BIGINT PRIMARY KEY,
+            tenant_id TEXT NOT NULL,
+            event TEXT NOT NULL,
+            payload JSONB NOT NULL,
+            recorded_at TIMESTAMPTZ NOT NULL,
+            prev_hash BYTEA NOT NULL,
+            entry_hash BYTEA NOT NULL,
+
+            CONSTRAINT audit_log_hash_size
+                CHECK (octet_length(prev_hash) = 32 AND octet_length(entry_hash) = 32),
+            CONSTRAINT audit_log_seq_nonnegative CHECK (seq >= 0)
+        );
+
+        CREATE INDEX idx_audit_log_tenant_time ON audit_log(tenant_id, recorded_at);
+        """)
+
+    # 2. Checkpoints (contiguous ranges, one per verification run)
+    op.execute("""
+        CREATE TABLE audit_checkpoints (
+            first_seq BIGINT NOT NULL,
+            last_seq BIGINT PRIMARY KEY,
+            root BYTEA NOT NULL,
+            head_hash BYTEA NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+            CONSTRAINT audit_checkpoints_range CHECK (first_seq >= 0 AND first_seq <= last_seq),
+            UNIQUE (first_seq)
+        );
+        """)
+
+    # 3. Append-only enforcement
+    op.execute("""
+        CREATE OR REPLACE FUNCTION audit_append_only()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            RAISE EXCEPTION '% is append-only', TG_TABLE_NAME
+                USING ERRCODE = 'insufficient_privilege';
+        END;
+        $$;
+
+        CREATE TRIGGER audit_log_append_only
+            BEFORE UPDATE OR DELETE ON audit_log
+            FOR EACH ROW EXECUTE FUNCTION audit_append_only();
+        CREATE TRIGGER audit_log_no_truncate
+            BEFORE TRUNCATE ON audit_log
+            FOR EACH STATEMENT EXECUTE FUNCTION audit_append_only();
+
+        CREATE TRIGGER audit_checkpoints_append_only
+            BEFORE UPDATE OR DELETE ON audit_checkpoints
+            FOR EACH ROW EXECUTE FUNCTION audit_append_only();
+        CREATE TRIGGER audit_checkpoints_no_truncate
+            BEFORE TRUNCATE ON audit_checkpoints
+            FOR EACH STATEMENT EXECUTE FUNCTION audit_append_only();
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop audit log tables."""
+    op.execute("DROP TABLE IF EXISTS audit_checkpoints CASCADE;")
+    op.execute("DROP TABLE IF EXISTS audit_log CASCADE;")
+    op.execute("DROP FUNCTION IF EXISTS audit_append_only();")
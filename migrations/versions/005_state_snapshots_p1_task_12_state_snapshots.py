@@ -0,0 +1,134 @@
+"""P1-TASK-12: State snapshots and materialized current state
+
+`state_versions` holds one RFC 7396 merge patch per version, so reading
+an entity meant replaying its whole history. This adds:
+- state_current: the latest full state per entity, updated in the same
+  transaction as each new version (one-row reads)
+- state_snapshots: full states every N versions or bytes, so a
+  point-in-time read replays at most N patches
+
+Writers: autobiz.kernel.state.StateManager. state_current is backfilled
+from the existing history with jsonb_merge_patch_agg(), an SQL version of
+the same merge; snapshots start with the next write of each entity.
+
+Revision ID: 005_state_snapshots
+Revises: 004_audit_log
+Create Date: 2026-02-12
+
+Requirements: INV-06, P1-R08
+Test Coverage: P1-T14, P1-T15
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005_state_snapshots"
+down_revision: Union[str, Sequence[str], None] = "004_audit_log"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add snapshot and current-state tables."""
+
+    # 1. Materialized current state (one row per entity)
+    op.execute("""
+        CREATE TABLE state_current (
+            tenant_id TEXT NOT NULL,
+            entity_type TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            version INT NOT NULL,
+            state JSONB NOT NULL,
+            snapshot_version INT NOT NULL DEFAULT 0,
+            patch_bytes_since_snapshot BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+            PRIMARY KEY (tenant_id, entity_type, entity_id),
+            CONSTRAINT state_current_tenant_fk FOREIGN KEY (tenant_id)
+                REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            CONSTRAINT state_current_version_check CHECK (version > 0)
+        );
+        """)
+
+    # 2. Periodic full snapshots
+    op.execute("""
+        CREATE TABLE state_snapshots (
+            tenant_id TEXT NOT NULL,
+            entity_type TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            version INT NOT NULL,
+            state JSONB NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+            PRIMARY KEY (tenant_id, entity_type, entity_id, version),
+            CONSTRAINT state_snapshots_tenant_fk FOREIGN KEY (tenant_id)
+                REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            CONSTRAINT state_snapshots_version_check CHECK (version > 0)
+        );
+        """)
+
+    # 3. RFC 7396 merge patch in SQL (backfill and ad-hoc inspection)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jsonb_merge_patch(target jsonb, patch jsonb)
+        RETURNS jsonb
+        LANGUAGE plpgsql
+        IMMUTABLE
+        AS $$
+        DECLARE
+            result jsonb;
+            member text;
+            value jsonb;
+        BEGIN
+            IF patch IS NULL OR jsonb_typeof(patch) <> 'object' THEN
+                RETURN patch;
+            END IF;
+            IF target IS NULL OR jsonb_typeof(target) <> 'object' THEN
+                result := '{}'::jsonb;
+            ELSE
+                result := target;
+            END IF;
+            FOR member, value IN SELECT * FROM jsonb_each(patch) LOOP
+                IF jsonb_typeof(value) = 'null' THEN
+                    result := result - member;
+                ELSE
+                    result := jsonb_set(
+                        result, ARRAY[member], jsonb_merge_patch(result -> member, value)
+                    );
+                END IF;
+            END LOOP;
+            RETURN result;
+        END;
+        $$;
+
+        CREATE AGGREGATE jsonb_merge_patch_agg(jsonb) (
+            SFUNC = jsonb_merge_patch,
+            STYPE = jsonb,
+            INITCOND = '{}'
+        );
+        """)
+
+    # 4. Backfill current state from the existing history
+    op.execute("""
+        INSERT INTO state_current
+            (tenant_id, entity_type, entity_id, version, state,
+             snapshot_version, patch_bytes_since_snapshot, updated_at)
+        SELECT
+            tenant_id, entity_type, entity_id,
+            MAX(version),
+            jsonb_merge_patch_agg(state_patch ORDER BY version),
+            0,
+            SUM(octet_length(state_patch::text)),
+            MAX(created_at)
+        FROM state_versions
+        GROUP BY tenant_id, entity_type, entity_id;
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop snapshot and current-state tables."""
+    op.execute("DROP TABLE IF EXISTS state_snapshots CASCADE;")
+    op.execute("DROP TABLE IF EXISTS state_current CASCADE;")
+    op.execute("DROP AGGREGATE IF EXISTS jsonb_merge_patch_agg(jsonb);")
+    op.execute("DROP FUNCTION IF EXISTS jsonb_merge_patch(jsonb, jsonb);")
@@ -0,0 +1,248 @@
+"""P1-TASK-24: Partition event_store by received_at; hash-only long-term tier
+
+`event_store` kept every payload_json forever in one heap. The retention
+spec keeps payloads for 90 days, then only payload_sha256 and metadata
+for long-term dedup and provenance. This splits the table in two tiers:
+- event_ledger: one narrow row per event (key, hash, metadata), never
+  partitioned; its primary key on (tenant_id, source, source_event_id) is
+  the dedup authority for both tiers
+- event_store: the full rows, range-partitioned by day on received_at,
+  so an expired day leaves by detaching and dropping its partition
+
+A partitioned table cannot carry UNIQUE (tenant_id, source,
+source_event_id) without the partition key; ingest inserts into
+event_ledger ON CONFLICT DO NOTHING first, and writes the event_store
+row only for keys that were new (autobiz.kernel.events.store).
+
+Before a partition is dropped, its final processing outcome is copied
+onto the ledger rows (autobiz.kernel.events.retention.EventStoreCompactor).
+Rows already past retention are compacted by this migration directly.
+
+Every retained legacy day gets its own partition, including rows stamped
+past the premake window, so nothing starts out in the DEFAULT partition
+(rows caught there later are drained by the compactor's maintenance pass).
+
+Revision ID: 006_partition_event_store
+Revises: 005_state_snapshots
+Create Date: 2026-02-16
+
+Requirements: P1-R26, P1-R27
+Test Coverage: P1-T36
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "006_partition_event_store"
+down_revision: Union[str, Sequence[str], None] = "005_state_snapshots"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Days of partitions created ahead of today at migration time
+PREMAKE_DAYS = 7
+# Payload retention (autobiz.kernel.events.retention.PAYLOAD_RETENTION)
+PAYLOAD_RETENTION_DAYS = 90
+
+
+def upgrade() -> None:
+    """Upgrade schema - split event_store into ledger and daily partitions."""
+
+    # 1. Keep the existing rows aside
+    op.execute("""
+        ALTER TABLE event_store RENAME TO event_store_legacy;
+        ALTER INDEX idx_events_tenant_source RENAME TO idx_events_legacy_tenant_source;
+        ALTER INDEX idx_events_tenant_status RENAME TO idx_events_legacy_tenant_status;
+        ALTER INDEX idx_events_dedup RENAME TO idx_events_legacy_dedup;
+        """)
+
+    # 2. Long-term tier: hash and metadata of every event
+    op.execute("""
+        CREATE TABLE event_ledger (
+            tenant_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            source_event_id TEXT NOT NULL,
+            event_id UUID NOT NULL,
+            event_type TEXT NOT NULL,
+            received_at TIMESTAMPTZ NOT NULL,
+            seq TEXT,
+            predecessor_source_event_id TEXT,
+            signature_valid BOOLEAN NOT NULL,
+            payload_sha256 TEXT NOT NULL,
+
+            -- Final processing outcome, copied when the payload expires
+            processing_status TEXT,
+            run_id UUID,
+            correlation_id TEXT,
+            applied_at TIMESTAMPTZ,
+            compacted_at TIMESTAMPTZ,
+
+            PRIMARY KEY (tenant_id, source, source_event_id),
+            CONSTRAINT event_ledger_tenant_fk FOREIGN KEY (tenant_id)
+                REFERENCES tenants(tenant_id) ON DELETE CASCADE
+        );
+
+        CREATE UNIQUE INDEX idx_event_ledger_event_id ON event_ledger(event_id);
+        CREATE INDEX idx_events_dedup ON event_ledger(tenant_id, payload_sha256);
+        """)
+
+    # 3. Hot tier: full rows, partitioned by day
+    op.execute("""
+        CREATE TABLE event_store (
+            event_id UUID NOT NULL DEFAULT gen_random_uuid(),
+            tenant_id TEXT NOT NULL,
+
+            -- Source
+            source TEXT NOT NULL,
+            source_event_id TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+
+            -- Timing & ordering
+            received_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            seq TEXT,
+            predecessor_source_event_id TEXT,
+
+            -- Security & validation
+            signature_valid BOOLEAN NOT NULL DEFAULT FALSE,
+            payload_json JSONB NOT NULL,
+            payload_sha256 TEXT NOT NULL,
+
+            -- Processing
+            processing_status TEXT NOT NULL DEFAULT 'RECEIVED',
+            run_id UUID,
+            correlation_id TEXT,
+            applied_at TIMESTAMPTZ,
+
+            CONSTRAINT event_store_tenant_fk FOREIGN KEY (tenant_id)
+                REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            PRIMARY KEY (event_id, received_at)
+        ) PARTITION BY RANGE (received_at);
+
+        CREATE INDEX idx_events_tenant_source
+            ON event_store(tenant_id, source, source_event_id);
+        CREATE INDEX idx_events_tenant_status
+            ON event_store(tenant_id, processing_status, received_at);
+
+        CREATE TABLE event_store_default PARTITION OF event_store DEFAULT;
+        """)
+
+    # 4. Ledger rows for everything; expired rows are compacted on the way
+    op.execute(f"""
+        INSERT INTO event_ledger (
+            tenant_id, source, source_event_id, event_id, event_type, received_at, seq,
+            predecessor_source_event_id, signature_valid, payload_sha256,
+            processing_status, run_id, correlation_id, applied_at, compacted_at
+        )
+        SELECT
+            tenant_id, source, source_event_id, event_id, event_type, received_at, seq,
+            predecessor_source_event_id, signature_valid, payload_sha256,
+            processing_status, run_id, correlation_id, applied_at, NOW()
+        FROM event_store_legacy
+        WHERE received_at < (NOW() AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC'
+            - interval '{PAYLOAD_RETENTION_DAYS} days';
+
+        INSERT INTO event_ledger (
+            tenant_id, source, source_event_id, event_id, event_type, received_at, seq,
+            predecessor_source_event_id, signature_valid, payload_sha256
+        )
+        SELECT
+            tenant_id, source, source_event_id, event_id, event_type, received_at, seq,
+            predecessor_source_event_id, signature_valid, payload_sha256
+        FROM event_store_legacy
+        WHERE received_at >= (NOW() AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC'
+            - interval '{PAYLOAD_RETENTION_DAYS} days';
+        """)
+
+    # 5. Daily partitions covering every retained row and PREMAKE_DAYS ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            day date;
+            last_day date;
+        BEGIN
+            day := COALESCE(
+                (SELECT MIN(received_at AT TIME ZONE 'UTC')::date FROM event_ledger
+                 WHERE compacted_at IS NULL),
+                (NOW() AT TIME ZONE 'UTC')::date
+            );
+            -- Legacy rows stamped past the premake window get partitions too
+            last_day := GREATEST(
+                (NOW() AT TIME ZONE 'UTC')::date + {PREMAKE_DAYS},
+                (SELECT MAX(received_at AT TIME ZONE 'UTC')::date FROM event_ledger
+                 WHERE compacted_at IS NULL)
+            );
+            WHILE day <= last_day LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF event_store FOR VALUES FROM (%L) TO (%L)',
+                    'event_store_p' || to_char(day, 'YYYYMMDD'),
+                    (day::timestamp AT TIME ZONE 'UTC'),
+                    ((day + 1)::timestamp AT TIME ZONE 'UTC')
+                );
+                day := day + 1;
+            END LOOP;
+        END
+        $$;
+
+        INSERT INTO event_store SELECT
+            legacy.event_id, legacy.tenant_id, legacy.source, legacy.source_event_id,
+            legacy.event_type, legacy.received_at, legacy.seq,
+            legacy.predecessor_source_event_id, legacy.signature_valid, legacy.payload_json,
+            legacy.payload_sha256, legacy.processing_status, legacy.run_id,
+            legacy.correlation_id, legacy.applied_at
+        FROM event_store_legacy legacy
+        JOIN event_ledger ledger USING (event_id)
+        WHERE ledger.compacted_at IS NULL;
+
+        DROP TABLE event_store_legacy;
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - restore event_store as a single heap.
+
+    Compacted events (payload expired) have no payload to restore and are
+    not brought back.
+    """
+    op.execute("""
+        ALTER TABLE event_store RENAME TO event_store_partitioned;
+
+        CREATE TABLE event_store (
+            event_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            tenant_id TEXT NOT NULL,
+            source TEXT NOT NULL,
+            source_event_id TEXT NOT NULL,
+            event_type TEXT NOT NULL,
+            received_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            seq TEXT,
+            predecessor_source_event_id TEXT,
+            signature_valid BOOLEAN NOT NULL DEFAULT FALSE,
+            payload_json JSONB NOT NULL,
+            payload_sha256 TEXT NOT NULL,
+            processing_status TEXT NOT NULL DEFAULT 'RECEIVED',
+            run_id UUID,
+            correlation_id TEXT,
+            applied_at TIMESTAMPTZ,
+
+            CONSTRAINT event_store_tenant_fk FOREIGN KEY (tenant_id)
+                REFERENCES tenants(tenant_id) ON DELETE CASCADE,
+            UNIQUE (tenant_id, source, source_event_id)
+        );
+
+        INSERT INTO event_store
+        SELECT
+            event_id, tenant_id, source, source_event_id, event_type, received_at, seq,
+            predecessor_source_event_id, signature_valid, payload_json, payload_sha256,
+            processing_status, run_id, correlation_id, applied_at
+        FROM event_store_partitioned;
+
+        DROP TABLE event_store_partitioned CASCADE;
+        DROP TABLE event_ledger CASCADE;
+
+        CREATE INDEX idx_events_tenant_source
+            ON event_store(tenant_id, source, source_event_id);
+        CREATE INDEX idx_events_tenant_status
+            ON event_store(tenant_id, processing_status, received_at);
+        CREATE INDEX idx_events_dedup
+            ON event_store(tenant_id, payload_sha256);
+        """)
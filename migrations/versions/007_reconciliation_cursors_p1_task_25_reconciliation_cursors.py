@@ -0,0 +1,46 @@
+"""P1-TASK-25: Indexes for incremental reconciliation
+
+The reconciliation detector (autobiz.kernel.events.reconciliation) reads
+local state incrementally, paging state_current by (updated_at,
+entity_id) per tenant and entity type, and checks reconciliation_jobs
+for a PENDING job of the same entity and job type before inserting
+drift. This adds:
+- idx_state_current_updated: the keyset order of the incremental reads
+- idx_reconciliation_pending: PENDING jobs per entity and job type
+
+Revision ID: 007_reconciliation_cursors
+Revises: 006_partition_event_store
+Create Date: 2026-02-18
+
+Requirements: P1-R29
+Test Coverage: P1-T39
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007_reconciliation_cursors"
+down_revision: Union[str, Sequence[str], None] = "006_partition_event_store"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add incremental reconciliation indexes."""
+    op.execute("""
+        CREATE INDEX idx_state_current_updated
+            ON state_current(tenant_id, entity_type, updated_at, entity_id);
+        """)
+    op.execute("""
+        CREATE INDEX idx_reconciliation_pending
+            ON reconciliation_jobs(tenant_id, entity_type, entity_id, job_type)
+            WHERE status = 'PENDING';
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema - drop incremental reconciliation indexes."""
+    op.execute("DROP INDEX IF EXISTS idx_reconciliation_pending;")
+    op.execute("DROP INDEX IF EXISTS idx_state_current_updated;")
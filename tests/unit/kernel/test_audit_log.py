@@ -0,0 +1,389 @@
+"""P1-T09, P1-T10: Hash-chained audit log tests.
+
+Test Coverage:
+- Entries chain prev_hash -> entry_hash from the genesis hash
+- Concurrent appends are sequenced in batches without gaps
+- A racing writer is detected and the batch re-chained
+- Tampered, reordered and missing entries are detected
+- Checkpoints verify only entries since the previous checkpoint
+- Merkle roots and inclusion proofs match RFC 6962 tree shape
+- Any entry is proven against its checkpoint root
+
+Requirements: INV-04, P1-R05
+Oracle: Trace (deterministic persistence)
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from autobiz.kernel.audit import (
+    GENESIS_HASH,
+    AuditChainError,
+    AuditConflictError,
+    AuditEntry,
+    AuditSequencer,
+    AuditVerifier,
+    InMemoryAuditStore,
+    MerkleTree,
+    merkle_root,
+    root_from_proof,
+    verify_chain,
+    verify_inclusion,
+)
+from autobiz.kernel.idempotency import CanonicalizationError
+
+T0 = datetime(2026, 2, 11, 3, 0, tzinfo=timezone.utc)
+
+
+def _entries(count: int, start: AuditEntry | None = None) -> list[AuditEntry]:
+    entries: list[AuditEntry] = []
+    prev = start
+    for n in range(count):
+        prev = AuditEntry.chain(
+            prev, f"t_{n % 3}", "TOOL_CALL", {"n": n}, T0 + timedelta(seconds=n)
+        )
+        entries.append(prev)
+    return entries
+
+
+async def _store_with(count: int) -> InMemoryAuditStore:
+    store = InMemoryAuditStore()
+    await store.append(_entries(count))
+    return store
+
+
+def _rfc6962_root(leaves: list[bytes]) -> bytes:
+    """MTH(D[n]) as specified in RFC 6962 section 2.1 (recursive split)."""
+    if len(leaves) == 1:
+        return leaves[0]
+    k = 1
+    while k * 2 < len(leaves):
+        k *= 2
+    left, right = _rfc6962_root(leaves[:k]), _rfc6962_root(leaves[k:])
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+class RacingStore(InMemoryAuditStore):
+    """Another writer appends one entry just before our first append."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.raced = False
+
+    async def append(self, entries: list[AuditEntry]) -> None:  # type: ignore[override]
+        if not self.raced:
+            self.raced = True
+            self.entries.append(AuditEntry.chain(None, "t_x", "OTHER_WRITER", {}, T0))
+        await super().append(entries)
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestAuditChain:
+    """P1-T10: prev_hash = SHA-256(prev_entry) chaining."""
+
+    def test_entries_link_from_genesis(self) -> None:
+        """Each entry's prev_hash is the previous entry_hash."""
+        entries = _entries(5)
+
+        assert entries[0].seq == 0 and entries[0].prev_hash == GENESIS_HASH
+        for prev, entry in zip(entries, entries[1:]):
+            assert entry.seq == prev.seq + 1
+            assert entry.prev_hash == prev.entry_hash
+        verify_chain(entries, GENESIS_HASH, 0)
+
+    def test_hash_is_stable_across_payload_key_order(self) -> None:
+        """Hashes use the canonical payload, so a JSONB round-trip keeps them."""
+        a = AuditEntry.chain(None, "t_1", "E", {"b": 1, "a": [1.0, "x"]}, T0)
+        b = AuditEntry.chain(None, "t_1", "E", {"a": [1, "x"], "b": 1}, T0)
+
+        assert a.entry_hash == b.entry_hash
+
+    def test_tampered_payload_detected(self) -> None:
+        """Changing an entry's content breaks verification at that seq."""
+        entries = _entries(10)
+        entries[4] = dataclasses.replace(entries[4], payload={"n": 999})
+
+        with pytest.raises(AuditChainError) as exc:
+            verify_chain(entries, GENESIS_HASH, 0)
+        assert exc.value.seq == 4
+
+    def test_removed_entry_detected(self) -> None:
+        """A gap in seq is reported at the missing entry."""
+        entries = _entries(10)
+        del entries[6]
+
+        with pytest.raises(AuditChainError) as exc:
+            verify_chain(entries, GENESIS_HASH, 0)
+        assert exc.value.seq == 6
+
+    def test_rehashed_entry_breaks_next_link(self) -> None:
+        """Rewriting an entry and its own hash still breaks the following entry."""
+        entries = _entries(10)
+        forged = AuditEntry.chain(entries[2], "t_1", "TOOL_CALL", {"n": 999}, T0)
+        entries[3] = forged
+
+        with pytest.raises(AuditChainError) as exc:
+            verify_chain(entries, GENESIS_HASH, 0)
+        assert exc.value.seq == 4
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestAuditSequencer:
+    """P1-T10: batched single-writer chaining."""
+
+    def test_concurrent_appends_chain_in_batches(self) -> None:
+        """500 concurrent appends become a gapless chain in few store writes."""
+
+        async def scenario() -> None:
+            store = InMemoryAuditStore()
+            sequencer = AuditSequencer(store, max_batch=100)
+            sequencer.start()
+
+            entries = await asyncio.gather(
+                *(sequencer.append(f"t_{n % 4}", "TOOL_CALL", {"n": n}) for n in range(500))
+            )
+            await sequencer.close()
+
+            assert sorted(e.seq for e in entries) == list(range(500))
+            assert store.entries == sorted(entries, key=lambda e: e.seq)
+            verify_chain(store.entries, GENESIS_HASH, 0)
+            assert store.append_calls <= 10
+
+        asyncio.run(scenario())
+
+    def test_continues_existing_chain(self) -> None:
+        """A new sequencer resumes from the stored tail."""
+
+        async def scenario() -> None:
+            store = await _store_with(7)
+            sequencer = AuditSequencer(store)
+            sequencer.start()
+
+            entry = await sequencer.append("t_1", "HITL_DECISION", {"approved": True})
+            await sequencer.close()
+
+            assert entry.seq == 7
+            assert entry.prev_hash == store.entries[6].entry_hash
+
+        asyncio.run(scenario())
+
+    def test_racing_writer_rechains_batch(self) -> None:
+        """A conflict on the tail reloads it and re-chains the batch."""
+
+        async def scenario() -> None:
+            store = RacingStore()
+            sequencer = AuditSequencer(store)
+            sequencer.start()
+
+            entry = await sequencer.append("t_1", "TOOL_CALL", {})
+            await sequencer.close()
+
+            assert entry.seq == 1
+            assert sequencer.stats.conflicts == 1
+            verify_chain(store.entries, GENESIS_HASH, 0)
+
+        asyncio.run(scenario())
+
+    def test_invalid_payload_rejected_alone(self) -> None:
+        """A non-I-JSON payload fails its caller without consuming a seq."""
+
+        async def scenario() -> None:
+            store = InMemoryAuditStore()
+            sequencer = AuditSequencer(store)
+            sequencer.start()
+
+            results = await asyncio.gather(
+                sequencer.append("t_1", "E", {"n": 1}),
+                sequencer.append("t_1", "E", {"n": float("nan")}),
+                sequencer.append("t_1", "E", {"n": 3}),
+                return_exceptions=True,
+            )
+            await sequencer.close()
+
+            assert isinstance(results[1], CanonicalizationError)
+            assert [e.payload["n"] for e in store.entries] == [1, 3]
+            verify_chain(store.entries, GENESIS_HASH, 0)
+
+        asyncio.run(scenario())
+
+    def test_append_requires_running_sequencer(self) -> None:
+        """Appending before start() fails fast."""
+
+        async def scenario() -> None:
+            sequencer = AuditSequencer(InMemoryAuditStore())
+            with pytest.raises(RuntimeError, match="not running"):
+                await sequencer.append("t_1", "E", {})
+
+        asyncio.run(scenario())
+
+    def test_store_rejects_gap(self) -> None:
+        """The store refuses a batch that does not continue its tail."""
+
+        async def scenario() -> None:
+            store = await _store_with(3)
+            with pytest.raises(AuditConflictError):
+                await store.append(_entries(2))
+
+        asyncio.run(scenario())
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestMerkle:
+    """P1-T10: Merkle roots and inclusion proofs."""
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 5, 8, 13, 100])
+    def test_root_matches_rfc6962(self, count: int) -> None:
+        """Bottom-up promotion gives the RFC 6962 split-tree root."""
+        leaves = [e.entry_hash for e in _entries(count)]
+
+        assert merkle_root(leaves) == _rfc6962_root(leaves)
+
+    @pytest.mark.parametrize("count", [1, 2, 3, 7, 33])
+    def test_every_leaf_proves(self, count: int) -> None:
+        """Each leaf's proof rebuilds the root in at most ceil(log2 n) steps."""
+        leaves = [e.entry_hash for e in _entries(count)]
+        tree = MerkleTree(leaves)
+
+        for index, leaf in enumerate(leaves):
+            proof = tree.proof(index)
+            assert len(proof.path) <= max(count - 1, 0).bit_length()
+            assert root_from_proof(leaf, proof) == tree.root
+
+    def test_wrong_leaf_or_index_fails(self) -> None:
+        """A proof only fits its own leaf and position."""
+        leaves = [e.entry_hash for e in _entries(9)]
+        tree = MerkleTree(leaves)
+        proof = tree.proof(4)
+
+        assert root_from_proof(leaves[5], proof) != tree.root
+        moved = dataclasses.replace(proof, leaf_index=5)
+        assert root_from_proof(leaves[4], moved) != tree.root
+        truncated = dataclasses.replace(proof, path=proof.path[:-1])
+        assert root_from_proof(leaves[4], truncated) is None
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestAuditVerifier:
+    """P1-T10: incremental verification, checkpoints and proofs."""
+
+    def test_checkpoint_covers_only_new_entries(self) -> None:
+        """The second checkpoint starts after the first and reads only new entries."""
+
+        async def scenario() -> None:
+            store = await _store_with(250)
+            verifier = AuditVerifier(store, chunk_size=64)
+
+            first = await verifier.checkpoint()
+            await store.append(_entries(100, store.entries[-1]))
+            read: list[tuple[int, int]] = []
+            original_read = store.read
+
+            async def tracking_read(first_seq: int, last_seq: int) -> list[AuditEntry]:
+                read.append((first_seq, last_seq))
+                return await original_read(first_seq, last_seq)
+
+            store.read = tracking_read  # type: ignore[method-assign]
+            second = await verifier.checkpoint()
+
+            assert first is not None and second is not None
+            assert (first.first_seq, first.last_seq) == (0, 249)
+            assert (second.first_seq, second.last_seq) == (250, 349)
+            assert min(start for start, _ in read) == 250
+            assert second.root == merkle_root([e.entry_hash for e in store.entries[250:]])
+            assert await verifier.checkpoint() is None
+
+        asyncio.run(scenario())
+
+    def test_checkpoint_detects_break_across_chunks(self) -> None:
+        """A broken link at a chunk boundary is caught and no checkpoint is written."""
+
+        async def scenario() -> None:
+            store = await _store_with(200)
+            store.entries[64] = dataclasses.replace(store.entries[64], prev_hash=bytes(32))
+            verifier = AuditVerifier(store, chunk_size=64)
+
+            with pytest.raises(AuditChainError) as exc:
+                await verifier.checkpoint()
+            assert exc.value.seq == 64
+            assert await store.latest_checkpoint() is None
+
+        asyncio.run(scenario())
+
+    def test_checkpoint_detects_tamper_inside_chunk_on_executor(self) -> None:
+        """Chunks verified on an executor report the tampered seq."""
+
+        async def scenario() -> None:
+            store = await _store_with(300)
+            store.entries[170] = dataclasses.replace(store.entries[170], event="EDITED")
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                verifier = AuditVerifier(store, chunk_size=50, executor=pool)
+                with pytest.raises(AuditChainError) as exc:
+                    await verifier.checkpoint()
+            assert exc.value.seq == 170
+
+        asyncio.run(scenario())
+
+    def test_proof_verifies_single_entry(self) -> None:
+        """prove() + verify_inclusion() check one entry against the checkpoint root."""
+
+        async def scenario() -> None:
+            store = await _store_with(1000)
+            verifier = AuditVerifier(store)
+            checkpoint = await verifier.checkpoint()
+            assert checkpoint is not None
+
+            proof = await verifier.prove(613)
+
+            assert proof.entry.seq == 613
+            assert len(proof.inclusion.path) <= 10
+            assert verify_inclusion(proof.entry, proof.inclusion, checkpoint.root)
+            forged = dataclasses.replace(proof.entry, payload={"n": 1})
+            assert not verify_inclusion(forged, proof.inclusion, checkpoint.root)
+
+        asyncio.run(scenario())
+
+    def test_proof_requires_checkpoint(self) -> None:
+        """Entries after the latest checkpoint cannot be proven yet."""
+
+        async def scenario() -> None:
+            store = await _store_with(10)
+            verifier = AuditVerifier(store)
+            await verifier.checkpoint()
+            await store.append(_entries(1, store.entries[-1]))
+
+            with pytest.raises(LookupError):
+                await verifier.prove(10)
+
+        asyncio.run(scenario())
+
+    def test_verify_all_checks_chain_and_roots(self) -> None:
+        """Full verification covers every entry and recomputes checkpoint roots."""
+
+        async def scenario() -> None:
+            store = await _store_with(120)
+            verifier = AuditVerifier(store, chunk_size=32)
+            await verifier.checkpoint()
+            await store.append(_entries(30, store.entries[-1]))
+            await verifier.checkpoint()
+
+            assert await verifier.verify_all() == 150
+
+            store.entries[130] = dataclasses.replace(store.entries[130], tenant_id="t_9")
+            with pytest.raises(AuditChainError) as exc:
+                await verifier.verify_all()
+            assert exc.value.seq == 130
+
+        asyncio.run(scenario())
@@ -0,0 +1,147 @@
+"""Batch validation tests (validate_many).
+
+Test Coverage:
+- Per-item statuses and first errors match single-item validation
+- Streaming input, ToolContract input/output selection
+- Process-pool execution returns identical results in input order
+- Process-pool workers compile a precompiled schema with its own backend
+
+Requirements: INV-01, P1-R01, P1-R18
+Oracle: Schema (deterministic validation)
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.executor import batch_validator
+from autobiz.kernel.executor.batch_validator import (
+    STATUS_INVALID,
+    STATUS_VALID,
+    validate_many,
+)
+from autobiz.kernel.executor.schema_validator import (
+    SchemaValidationError,
+    SchemaValidator,
+    ValidationErrorCode,
+)
+from autobiz.kernel.executor.tool_contract import ToolContract
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"order_id": {"type": "string"}, "amount": {"type": "integer", "minimum": 0}},
+    "required": ["order_id", "amount"],
+}
+
+
+def _items(count: int) -> Iterator[dict[str, Any]]:
+    for i in range(count):
+        if i % 7 == 3:
+            yield {"order_id": f"o{i}"}
+        elif i % 11 == 5:
+            yield {"order_id": f"o{i}", "amount": -i}
+        else:
+            yield {"order_id": f"o{i}", "amount": i}
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.oracle_schema
+class TestValidateMany:
+    """validate_many compiles once and reports per-item results."""
+
+    def test_statuses_and_first_errors_match_single_validation(self) -> None:
+        """Each item's status/first error equals SchemaValidator.validate."""
+        items = list(_items(100))
+        result = validate_many(items, SCHEMA)
+        single = SchemaValidator()
+
+        assert len(result) == 100
+        for index, item in enumerate(items):
+            try:
+                single.validate(item, SCHEMA)
+            except SchemaValidationError as e:
+                assert result.statuses[index] == STATUS_INVALID
+                assert result.errors[index].message == e.message
+                assert result.errors[index].path == e.path
+                assert result.errors[index].schema_path == e.schema_path
+            else:
+                assert result.statuses[index] == STATUS_VALID
+                assert index not in result.errors
+
+        assert result.valid_count + result.invalid_count == 100
+        assert result.invalid_indices() == sorted(result.errors)
+
+    def test_accepts_generator_stream(self) -> None:
+        """Items can be a lazy iterable."""
+        result = validate_many(_items(50), SCHEMA)
+
+        assert len(result) == 50
+        assert not result.is_valid(3)
+        assert result.is_valid(0)
+
+    def test_contract_input_and_output(self) -> None:
+        """ToolContract selects input_schema by default, output_schema on request."""
+        contract = ToolContract(
+            name="create_order",
+            version="1.0.0",
+            input_schema=SCHEMA,
+            output_schema={"type": "object", "required": ["receipt_id"]},
+            side_effect_level="HARD_WRITE",
+            timeout_seconds=60,
+        )
+
+        inputs = validate_many([{"order_id": "o", "amount": 1}], contract)
+        outputs = validate_many([{"order_id": "o", "amount": 1}], contract, which="output")
+
+        assert inputs.invalid_count == 0
+        assert outputs.invalid_count == 1
+        assert "receipt_id" in outputs.errors[0].message
+
+    def test_malformed_schema_rejected_once(self) -> None:
+        """Schema errors surface before any item is processed."""
+        with pytest.raises(SchemaValidationError) as exc_info:
+            validate_many(_items(10), {"type": "nope"})
+
+        assert exc_info.value.code == ValidationErrorCode.SCHEMA_MALFORMED
+
+    def test_invalid_arguments(self) -> None:
+        """workers and chunk_size must be positive."""
+        with pytest.raises(ValueError):
+            validate_many([], SCHEMA, workers=0)
+        with pytest.raises(ValueError):
+            validate_many([], SCHEMA, chunk_size=0)
+
+    def test_process_pool_matches_serial(self) -> None:
+        """Chunked process-pool results are identical and in input order."""
+        serial = validate_many(_items(500), SCHEMA)
+        parallel = validate_many(_items(500), SCHEMA, workers=2, chunk_size=64)
+
+        assert parallel.statuses == serial.statuses
+        assert parallel.errors == serial.errors
+
+    @pytest.mark.parametrize("backend", ["jsonschema", "compiled"])
+    def test_process_pool_uses_precompiled_backend(
+        self, backend: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Workers recompile with the CompiledSchema's backend, not the validator's."""
+        compiled = SchemaValidator(backend=backend).compile(SCHEMA)  # type: ignore[arg-type]
+        backends: list[str] = []
+        run_parallel = batch_validator._validate_parallel
+
+        def spy(worker_backend: Any, *args: Any) -> None:
+            backends.append(worker_backend)
+            run_parallel(worker_backend, *args)
+
+        monkeypatch.setattr(batch_validator, "_validate_parallel", spy)
+        validator = SchemaValidator(backend="compiled" if backend == "jsonschema" else "jsonschema")
+
+        serial = validate_many(_items(300), compiled, validator=validator)
+        parallel = validate_many(
+            _items(300), compiled, validator=validator, workers=2, chunk_size=64
+        )
+
+        assert backends == [backend]
+        assert parallel.statuses == serial.statuses
+        assert parallel.errors == serial.errors
@@ -0,0 +1,302 @@
+"""P1-T16, P1-T40: Condition expression tests.
+
+Test Coverage:
+- The DSL parses to the JSONLogic AST; invalid expressions fail with a
+  position
+- Compiled evaluation equals the reference interpreter (value, type and
+  error) on generated expressions and states
+- Equality, ordering, missing-path and function semantics
+- now() comes only from the injected clock
+- Expressions are parsed once per string; a ConditionSet reads each path
+  once per state
+
+Requirements: INV-07, P1-R09
+Oracle: Permission (deterministic branch and HITL decisions)
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.compile import (
+    CompiledCondition,
+    ConditionEvaluationError,
+    ConditionSyntaxError,
+    compile_condition,
+    compile_conditions,
+    interpret,
+    parse_condition,
+)
+from autobiz.kernel.compile.conditions import _parsed
+
+SEED = 20260302
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+ORDER_STATE = {
+    "order": {
+        "amount": 420,
+        "refund_eligible": True,
+        "disputed": False,
+        "created_at": "2026-03-01T18:00:00Z",
+        "tags": ["vip", "wholesale"],
+        "items": [{"sku": "TS-BLK-M", "qty": 2}],
+    }
+}
+
+PATHS = [
+    "$.a",
+    "$.b",
+    "$.s",
+    "$.flag",
+    "$.items",
+    "$.items[0]",
+    "$.items[5]",
+    "$.nested.x",
+    "$.nested.deep.y",
+    "$.when",
+    "$.missing.path",
+]
+LITERALS = [
+    "0",
+    "1",
+    "-2.5",
+    "500",
+    "'vip'",
+    "''",
+    "'2026-03-01T00:00:00Z'",
+    "true",
+    "false",
+    "null",
+]
+OPERATORS = ["==", "!=", "<", "<=", ">", ">="]
+VALUES: list[Any] = [
+    None,
+    True,
+    False,
+    0,
+    1,
+    1.0,
+    -2.5,
+    500,
+    "",
+    "vip",
+    "b",
+    "2026-03-01T00:00:00Z",
+    "2026-03-02T11:59:00+00:00",
+    [],
+    ["vip", 1],
+    [True],
+    {"x": 1},
+]
+
+
+def _expression(rng: random.Random, depth: int) -> str:
+    if depth <= 0 or rng.random() < 0.25:
+        return rng.choice(PATHS + LITERALS)
+    roll = rng.random()
+    if roll < 0.4:
+        return f"({_expression(rng, depth - 1)}) {rng.choice(OPERATORS)} {_expression(rng, 0)}"
+    if roll < 0.65:
+        joiner = rng.choice([" AND ", " OR "])
+        parts = [_expression(rng, depth - 1) for _ in range(rng.randint(2, 4))]
+        return "(" + joiner.join(parts) + ")"
+    if roll < 0.8:
+        return f"NOT {_expression(rng, depth - 1)}"
+    name = rng.choice(["len", "contains", "startswith", "endswith", "duration_seconds", "now"])
+    if name == "now":
+        return "now()"
+    if name == "len":
+        return f"len({_expression(rng, depth - 1)})"
+    return f"{name}({_expression(rng, depth - 1)}, {_expression(rng, depth - 1)})"
+
+
+def _state(rng: random.Random) -> dict[str, Any]:
+    return {
+        "a": rng.choice(VALUES),
+        "b": rng.choice(VALUES),
+        "s": rng.choice(["", "vip", "wholesale", "2026-03-01T00:00:00Z"]),
+        "flag": rng.choice([True, False, None]),
+        "items": rng.choice([[], ["vip"], [1, "vip", {"x": 1}], "vip", None]),
+        "nested": rng.choice([{"x": rng.choice(VALUES), "deep": {"y": 3}}, [1], 7]),
+        "when": rng.choice(["2026-03-02T11:00:00Z", "2026-03-02T11:00:00", "not a time"]),
+    }
+
+
+def _outcome(evaluate: Any) -> tuple[Any, ...]:
+    try:
+        value = evaluate()
+    except ConditionEvaluationError as exc:
+        return ("error", str(exc))
+    return ("ok", type(value), value)
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestConditionParser:
+    """P1-T16: The DSL of §5.5 and its JSONLogic AST."""
+
+    def test_plan_examples(self) -> None:
+        """The plan's example conditions parse to the expected AST."""
+        assert parse_condition("$.order.amount <= 500") == {"<=": [{"var": "order.amount"}, 500]}
+        assert parse_condition(
+            "$.order.refund_eligible AND $.order.amount <= 500 AND NOT $.order.disputed"
+        ) == {
+            "and": [
+                {"var": "order.refund_eligible"},
+                {"<=": [{"var": "order.amount"}, 500]},
+                {"!": [{"var": "order.disputed"}]},
+            ]
+        }
+        assert parse_condition("duration_seconds($.order.created_at, now()) < 86400") == {
+            "<": [{"duration_seconds": [{"var": "order.created_at"}, {"now": []}]}, 86400]
+        }
+
+    def test_precedence_and_literals(self) -> None:
+        """OR binds loosest, then AND, then NOT; literals are JSON values."""
+        assert parse_condition("$.a OR $.b AND NOT $.c == 'x\\'y'") == {
+            "or": [
+                {"var": "a"},
+                {"and": [{"var": "b"}, {"!": [{"==": [{"var": "c"}, "x'y"]}]}]},
+            ]
+        }
+        assert parse_condition('($.a OR $.b) AND $.items[2].sku != "z"') == {
+            "and": [
+                {"or": [{"var": "a"}, {"var": "b"}]},
+                {"!=": [{"var": "items.2.sku"}, "z"]},
+            ]
+        }
+        assert parse_condition("-1.5e2") == -150.0
+        assert parse_condition("null") is None
+
+    @pytest.mark.parametrize(
+        ("raw", "position", "message"),
+        [
+            ("$.a < ", 6, "unexpected end"),
+            ("$.a < 1 < 2", 8, "do not chain"),
+            ("eval($.a)", 0, "unknown function 'eval'"),
+            ("$.a AND len()", 8, "takes 1 argument"),
+            ("amount > 5", 0, "unexpected 'amount'"),
+            ("$ == 1", 0, "unexpected"),
+            ("$.a == 'unterminated", 7, "unexpected"),
+            ("$.a == '\\q'", 7, "unknown escape"),
+            ("($.a", 4, "expected"),
+        ],
+    )
+    def test_syntax_errors(self, raw: str, position: int, message: str) -> None:
+        """Invalid expressions raise with the offending position."""
+        with pytest.raises(ConditionSyntaxError, match=message) as caught:
+            compile_condition(raw)
+        assert caught.value.position == position
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestConditionEvaluation:
+    """P1-T40: Compiled conditions and the reference interpreter agree."""
+
+    def test_compiled_matches_interpreter(self) -> None:
+        """Value, type and error agree on generated expressions and states."""
+        rng = random.Random(SEED)
+        states = [_state(rng) for _ in range(40)]
+        for _ in range(400):
+            raw = _expression(rng, 3)
+            compiled = compile_condition(raw)
+            ast = parse_condition(raw)
+            for state in states:
+                now = rng.choice([NOW, None])
+                expected = _outcome(lambda: interpret(ast, state, now))
+                assert _outcome(lambda: compiled.evaluate(state, now)) == expected, raw
+            together = compile_conditions((raw, "$.a == $.b", raw))
+            for state in states[:5]:
+                assert _outcome(lambda: together.evaluate(state, NOW)[0]) == _outcome(
+                    lambda: interpret(ast, state, NOW)
+                ), raw
+
+    def test_plan_examples(self) -> None:
+        """The plan's HITL-style rules on an order state."""
+        refundable = compile_condition(
+            "$.order.refund_eligible AND $.order.amount <= 500 AND NOT $.order.disputed"
+        )
+        assert refundable.evaluate(ORDER_STATE) is True
+        recent = compile_condition("duration_seconds($.order.created_at, now()) < 86400")
+        assert recent.clock_dependent and not refundable.clock_dependent
+        assert recent.evaluate(ORDER_STATE, NOW) is True
+        assert recent.evaluate(ORDER_STATE, NOW + timedelta(days=1)) is False
+        assert compile_condition("contains($.order.tags, 'vip')").evaluate(ORDER_STATE) is True
+        assert compile_condition("$.order.items[0].qty >= 2").evaluate(ORDER_STATE) is True
+        assert compile_condition("len($.order.items)").evaluate(ORDER_STATE) == 1
+
+    def test_semantics(self) -> None:
+        """JSON equality, strict ordering, null for missing paths."""
+        state = {"n": 1, "flag": True, "s": "abc", "items": [1, 2]}
+
+        def value(raw: str) -> Any:
+            return compile_condition(raw).evaluate(state, NOW)
+
+        assert value("$.flag == 1") is False
+        assert value("$.n == 1.0") is True
+        assert value("$.missing == null") is True
+        assert value("$.s.deeper == null AND $.items[9] == null") is True
+        assert value("$.s < 'abd' AND $.n < 1.5") is True
+        assert value("$.flag OR $.n < 'x'") is True
+        with pytest.raises(ConditionEvaluationError, match="cannot order int and str"):
+            value("$.n < 'x'")
+        with pytest.raises(ConditionEvaluationError, match="cannot order NoneType and int"):
+            value("$.missing > 5")
+        with pytest.raises(ConditionEvaluationError, match="len"):
+            value("len($.n)")
+        with pytest.raises(ConditionEvaluationError, match="not a timestamp"):
+            value("duration_seconds($.s, now()) > 0")
+
+    def test_now_requires_injected_clock(self) -> None:
+        """now() is the evaluate() clock; without one it raises when reached."""
+        condition = compile_condition(
+            "$.skip OR duration_seconds('2026-03-02T11:00:00Z', now()) == 3600"
+        )
+        assert condition.evaluate({}, NOW) is True
+        assert condition.evaluate({"skip": True}) is True
+        with pytest.raises(ConditionEvaluationError, match="injected clock"):
+            condition.evaluate({})
+
+    def test_parsed_once_and_cached(self) -> None:
+        """The same string returns the same compiled condition and AST."""
+        raw = "$.order.amount <= 501"
+        before = _parsed.cache_info().misses
+        first = compile_condition(raw)
+        assert compile_condition(raw) is first
+        assert compile_conditions((raw, "$.order.amount > 0")).raws[0] == raw
+        assert _parsed.cache_info().misses == before + 2
+        assert isinstance(first, CompiledCondition)
+        assert first.referenced_paths == ("$.order.amount",)
+
+    def test_condition_set_reads_each_path_once(self) -> None:
+        """Paths shared by members of a set are resolved once per state."""
+
+        class CountingState(dict[str, Any]):
+            reads = 0
+
+            def get(self, key: str, default: Any = None) -> Any:
+                CountingState.reads += 1
+                return super().get(key, default)
+
+        conditions = compile_conditions(
+            (
+                "$.order.amount <= 500",
+                "$.order.amount > 100 AND NOT $.order.disputed",
+                "$.customer.tier == 'gold' OR $.order.amount > 1000",
+            )
+        )
+        state = CountingState(ORDER_STATE, customer={"tier": "gold"})
+
+        assert conditions.evaluate(state) == [True, True, True]
+        assert conditions.referenced_paths == (
+            "$.order.amount",
+            "$.order.disputed",
+            "$.customer.tier",
+        )
+        assert CountingState.reads == 3
+        assert len(conditions) == 3
@@ -0,0 +1,97 @@
+"""Contract manifest loading tests.
+
+Test Coverage:
+- Manifest directories scanned for name/version without parsing contracts
+- Entry-point declared contracts (dict, ToolContract or factory targets)
+- Declared vs loaded name/version mismatches rejected
+
+Requirements: INV-01, P1-R01, P1-R18
+Oracle: Schema (deterministic validation)
+"""
+
+import json
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.executor.contract_manifest import (
+    ENTRY_POINT_GROUP,
+    ManifestError,
+    scan_entry_points,
+    scan_manifest_dir,
+)
+from autobiz.kernel.executor.tool_contract import ToolContract
+
+CONTRACT: dict[str, Any] = {
+    "name": "send_invoice",
+    "version": "1.2.0",
+    "input_schema": {"type": "object"},
+    "output_schema": {"type": "object"},
+    "side_effect_level": "FINANCIAL",
+    "timeout_seconds": 30,
+}
+
+
+def send_invoice_contract() -> ToolContract:
+    """Entry-point factory target used by the tests below."""
+    return ToolContract(**CONTRACT)
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestContractManifest:
+    """Lazy manifest and entry-point declarations."""
+
+    def test_scan_manifest_dir_defers_parsing(self, tmp_path: Path) -> None:
+        """Entries with invalid bodies scan fine and fail only on load()."""
+        broken = {"name": "broken", "version": "1.0.0", "timeout_seconds": "soon"}
+        (tmp_path / "tools.json").write_text(json.dumps([CONTRACT, broken]))
+
+        sources = scan_manifest_dir(tmp_path)
+
+        assert [(s.name, s.version) for s in sources] == [
+            ("send_invoice", "1.2.0"),
+            ("broken", "1.0.0"),
+        ]
+        assert sources[0].load() == ToolContract(**CONTRACT)
+        with pytest.raises(ManifestError):
+            sources[1].load()
+
+    def test_scan_manifest_dir_requires_name_and_version(self, tmp_path: Path) -> None:
+        """Name and version are needed up front to index the declaration."""
+        (tmp_path / "tools.json").write_text(json.dumps({"name": "no_version"}))
+
+        with pytest.raises(ManifestError):
+            scan_manifest_dir(tmp_path)
+
+    @pytest.mark.parametrize(
+        "target",
+        [f"{__name__}:send_invoice_contract", f"{__name__}:CONTRACT"],
+    )
+    def test_scan_entry_points(self, monkeypatch: pytest.MonkeyPatch, target: str) -> None:
+        """Entry points named name@version load factories or contract dicts."""
+        entry_point = EntryPoint("send_invoice@1.2.0", target, ENTRY_POINT_GROUP)
+        monkeypatch.setattr(
+            "importlib.metadata.entry_points",
+            lambda group: [entry_point] if group == ENTRY_POINT_GROUP else [],
+        )
+
+        [source] = scan_entry_points()
+
+        assert (source.name, source.version) == ("send_invoice", "1.2.0")
+        assert source.load().side_effect_level == "FINANCIAL"
+
+    def test_entry_point_version_mismatch_rejected(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A contract must match the name@version it was declared under."""
+        entry_point = EntryPoint(
+            "send_invoice@2.0.0", f"{__name__}:send_invoice_contract", ENTRY_POINT_GROUP
+        )
+        monkeypatch.setattr("importlib.metadata.entry_points", lambda group: [entry_point])
+
+        [source] = scan_entry_points()
+
+        with pytest.raises(ManifestError):
+            source.load()
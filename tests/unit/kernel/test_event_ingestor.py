@@ -0,0 +1,478 @@
+"""P1-H10, P1-T36: Webhook verification and batched event ingest tests.
+
+Test Coverage:
+- Stripe, Shopify and internal signatures verified; bad ones rejected pre-store
+- payload_sha256 is the hash of the raw body, streamed or whole
+- Duplicate webhooks are stored once and acked as duplicates
+- Concurrent webhooks share multi-row inserts; acks wait for the commit
+- The event_ordering_gate bound rejects new webhooks (REJECT_NEW)
+- Bodies jsonb would refuse, and non-object internal bodies, are rejected
+  in verification
+- ingest() racing close() fails instead of hanging
+
+Requirements: P1-RH05, P1-R26
+Oracle: Security, Consistency
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from collections.abc import AsyncIterator, Mapping, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.config import QUEUE_CONFIGS, QueueConfig, QueueFullError
+from autobiz.kernel.events import (
+    EventIdentity,
+    EventIngestor,
+    InboundEvent,
+    InMemoryEventStore,
+    StoredEvent,
+    Webhook,
+    WebhookRejectedError,
+    WebhookSignatureError,
+    WebhookSource,
+)
+
+T0 = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+SECRET = b"whsec_test"
+TENANT = "t_1"
+
+
+def _secrets(tenant_id: str, source: str) -> Sequence[bytes]:
+    return [SECRET] if tenant_id == TENANT else []
+
+
+def _stripe(event_id: str, secret: bytes = SECRET, at: datetime = T0, **extra: Any) -> Webhook:
+    body = json.dumps(
+        {"id": event_id, "type": "charge.succeeded", "created": 1772452800, **extra}
+    ).encode()
+    timestamp = str(int(at.timestamp()))
+    mac = hmac.new(secret, timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return Webhook(TENANT, "STRIPE", {"Stripe-Signature": f"t={timestamp},v1={mac}"}, body)
+
+
+def _shopify(webhook_id: str, body: bytes) -> Webhook:
+    mac = base64.b64encode(hmac.new(SECRET, body, hashlib.sha256).digest()).decode()
+    headers = {
+        "X-Shopify-Hmac-Sha256": mac,
+        "X-Shopify-Webhook-Id": webhook_id,
+        "X-Shopify-Topic": "orders/paid",
+    }
+    return Webhook(TENANT, "SHOPIFY", headers, body)
+
+
+def _internal(body: bytes) -> Webhook:
+    mac = hmac.new(SECRET, body, hashlib.sha256).hexdigest()
+    return Webhook(TENANT, "INTERNAL", {"X-Autobiz-Signature": f"sha256={mac}"}, body)
+
+
+def _ingestor(store: Any, **kwargs: Any) -> EventIngestor:
+    return EventIngestor(store, _secrets, clock=lambda: T0, **kwargs)
+
+
+class _GatedStore(InMemoryEventStore):
+    """Holds every insert until the gate opens."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = asyncio.Event()
+        self.batch_sizes: list[int] = []
+
+    async def insert_many(self, events: Sequence[InboundEvent]) -> list[StoredEvent]:
+        self.batch_sizes.append(len(events))
+        await self.gate.wait()
+        return await super().insert_many(events)
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestWebhookVerification:
+    """P1-H10: signatures checked before anything is stored."""
+
+    def test_valid_stripe_webhook_is_stored(self) -> None:
+        """A signed event is stored with its hash, identity and ordering key."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            ingestor = _ingestor(store)
+            ingestor.start()
+            webhook = _stripe("evt_1")
+
+            ack = await ingestor.ingest(webhook)
+            await ingestor.close()
+
+            assert not ack.duplicate and ack.event_id in store.events
+            event = store.events[ack.event_id]
+            assert isinstance(webhook.body, bytes)
+            assert event.payload_sha256 == hashlib.sha256(webhook.body).hexdigest()
+            assert (event.source, event.source_event_id, event.event_type) == (
+                "STRIPE",
+                "evt_1",
+                "charge.succeeded",
+            )
+            assert event.seq == "1772452800" and event.signature_valid
+            assert event.received_at == T0
+
+        asyncio.run(scenario())
+
+    @pytest.mark.parametrize(
+        ("webhook", "reason"),
+        [
+            (_stripe("evt_1", secret=b"wrong"), "signature mismatch"),
+            (_stripe("evt_1", at=T0 - timedelta(minutes=6)), "tolerance"),
+            (Webhook(TENANT, "STRIPE", {}, b"{}"), "missing"),
+            (
+                Webhook(
+                    TENANT, "STRIPE", {"stripe-signature": f"t={T0.timestamp():.0f},v1=zz"}, b""
+                ),
+                "malformed",
+            ),
+            (Webhook("t_other", "STRIPE", {}, b"{}"), "no signing secret"),
+        ],
+    )
+    def test_bad_signatures_rejected_before_store(self, webhook: Webhook, reason: str) -> None:
+        """Wrong, stale, missing and malformed signatures never reach event_store."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            ingestor = _ingestor(store)
+            ingestor.start()
+            with pytest.raises(WebhookSignatureError, match=reason):
+                await ingestor.ingest(webhook)
+            await ingestor.close()
+            assert store.statements == 0
+            assert ingestor.stats.rejected_invalid == 1
+
+        asyncio.run(scenario())
+
+    def test_tampered_body_rejected(self) -> None:
+        """The signature covers the body."""
+
+        async def scenario() -> None:
+            ingestor = _ingestor(InMemoryEventStore())
+            ingestor.start()
+            signed = _stripe("evt_1")
+            assert isinstance(signed.body, bytes)
+            tampered = Webhook(
+                TENANT, "STRIPE", signed.headers, signed.body.replace(b"evt_1", b"evt_2")
+            )
+            with pytest.raises(WebhookSignatureError):
+                await ingestor.ingest(tampered)
+            await ingestor.close()
+
+        asyncio.run(scenario())
+
+    def test_rotated_secret_accepted(self) -> None:
+        """Any currently valid secret verifies."""
+
+        async def scenario() -> None:
+            ingestor = EventIngestor(
+                InMemoryEventStore(), lambda t, s: [b"new", SECRET], clock=lambda: T0
+            )
+            ingestor.start()
+            ack = await ingestor.ingest(_stripe("evt_1"))
+            await ingestor.close()
+            assert not ack.duplicate
+
+        asyncio.run(scenario())
+
+    def test_streamed_shopify_body_hashed_in_one_pass(self) -> None:
+        """Chunked bodies verify and hash exactly like whole ones."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            ingestor = _ingestor(store)
+            ingestor.start()
+            body = json.dumps({"id": 820982911946154500, "note": "x" * 5000}).encode()
+            signed = _shopify("wh_1", body)
+
+            async def stream() -> AsyncIterator[bytes]:
+                for start in range(0, len(body), 1000):
+                    yield body[start : start + 1000]
+
+            ack = await ingestor.ingest(Webhook(TENANT, "SHOPIFY", signed.headers, stream()))
+            await ingestor.close()
+
+            assert ack.event.body == body
+            assert ack.event.payload_sha256 == hashlib.sha256(body).hexdigest()
+            assert (ack.event.source_event_id, ack.event.event_type) == ("wh_1", "orders/paid")
+
+        asyncio.run(scenario())
+
+    def test_internal_event_carries_predecessor(self) -> None:
+        """Internal events name their causal predecessor for the ordering gate."""
+
+        async def scenario() -> None:
+            ingestor = _ingestor(InMemoryEventStore())
+            ingestor.start()
+            body = json.dumps(
+                {"id": "ie_2", "type": "payment.succeeded", "seq": 2, "predecessor_id": "ie_1"}
+            ).encode()
+            mac = hmac.new(SECRET, body, hashlib.sha256).hexdigest()
+            ack = await ingestor.ingest(
+                Webhook(TENANT, "INTERNAL", {"X-Autobiz-Signature": f"sha256={mac}"}, body)
+            )
+            await ingestor.close()
+
+            assert ack.event.seq == "2"
+            assert ack.event.predecessor_source_event_id == "ie_1"
+
+        asyncio.run(scenario())
+
+    def test_oversized_and_malformed_bodies_rejected(self) -> None:
+        """Bodies over the limit, non-JSON bodies and unknown sources are refused."""
+
+        async def scenario() -> None:
+            ingestor = _ingestor(InMemoryEventStore(), max_body_bytes=100)
+            ingestor.start()
+            with pytest.raises(WebhookRejectedError, match="too large"):
+                await ingestor.ingest(_stripe("evt_1", padding="x" * 200))
+            with pytest.raises(WebhookRejectedError, match="not JSON"):
+                await ingestor.ingest(_shopify("wh_1", b"not json"))
+            with pytest.raises(WebhookRejectedError, match="unknown source"):
+                await ingestor.ingest(Webhook(TENANT, "PAYPAL", {}, b"{}"))
+            await ingestor.close()
+
+        asyncio.run(scenario())
+
+    @pytest.mark.parametrize(
+        ("body", "reason"),
+        [
+            ('{"id": "x"}'.encode("utf-16"), "not UTF-8"),
+            ('{"id": "x"}'.encode("utf-32-le"), "not JSON"),
+            (b'{"total": NaN}', "not JSON"),
+            (b'{"total": -Infinity}', "not JSON"),
+            (b'{"note": "a\\u0000b"}', "u0000"),
+            (b'{"a\\u0000": 1}', "u0000"),
+            (b'{"note": ["\\ud800"]}', "surrogate"),
+        ],
+    )
+    def test_bodies_jsonb_refuses_rejected(self, body: bytes, reason: str) -> None:
+        """Signed bodies event_store could not store never reach a batch."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            ingestor = _ingestor(store)
+            ingestor.start()
+            with pytest.raises(WebhookRejectedError, match=reason):
+                await ingestor.ingest(_shopify("wh_1", body))
+            assert not (
+                await ingestor.ingest(_shopify("wh_2", b'{"note": "a\\\\u0000"}'))
+            ).duplicate
+            await ingestor.close()
+            assert len(store.events) == 1
+
+        asyncio.run(scenario())
+
+    @pytest.mark.parametrize("body", [b'[{"id": "ie_1", "type": "x"}]', b'"ie_1"', b"7", b"null"])
+    def test_internal_non_object_body_rejected(self, body: bytes) -> None:
+        """A correctly signed internal event whose body is not an object is refused."""
+
+        async def scenario() -> None:
+            ingestor = _ingestor(InMemoryEventStore())
+            ingestor.start()
+            with pytest.raises(WebhookRejectedError, match="payload has no 'id'"):
+                await ingestor.ingest(_internal(body))
+            await ingestor.close()
+
+        asyncio.run(scenario())
+
+    def test_webhook_source_is_abstract(self) -> None:
+        """A source must implement identify() and _signatures()."""
+
+        class Partial(WebhookSource):
+            name = "PARTIAL"
+
+            def identify(self, headers: Mapping[str, str], payload: Any) -> EventIdentity:
+                return EventIdentity("id", "type")
+
+        with pytest.raises(TypeError, match="_signatures"):
+            Partial()  # type: ignore[abstract]
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestBatchedIngest:
+    """P1-T36: dedup, batching, ack-after-commit and backpressure."""
+
+    def test_duplicate_webhook_stored_once(self) -> None:
+        """A redelivery is acked as a duplicate of the stored row."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            ingestor = _ingestor(store)
+            ingestor.start()
+
+            first = await ingestor.ingest(_stripe("evt_1"))
+            again = await ingestor.ingest(_stripe("evt_1"))
+            await ingestor.close()
+
+            assert not first.duplicate and again.duplicate
+            assert again.event_id == first.event_id
+            assert len(store.events) == 1
+            assert (ingestor.stats.stored, ingestor.stats.duplicates) == (1, 1)
+
+        asyncio.run(scenario())
+
+    def test_concurrent_webhooks_share_inserts(self) -> None:
+        """A burst lands in a few multi-row inserts; duplicates in a batch collapse."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            ingestor = _ingestor(store, max_batch=100, max_in_flight=1)
+            ingestor.start()
+            ids = [f"evt_{n}" for n in range(250)] + ["evt_7", "evt_7"]
+
+            acks = await asyncio.gather(*(ingestor.ingest(_stripe(i)) for i in ids))
+            await ingestor.close()
+
+            assert store.statements <= 4
+            assert len(store.events) == 250
+            assert sum(ack.duplicate for ack in acks) == 2
+            by_id = {ack.event.source_event_id: ack.event_id for ack in acks if not ack.duplicate}
+            assert all(ack.event_id == by_id[ack.event.source_event_id] for ack in acks)
+
+        asyncio.run(scenario())
+
+    def test_ack_waits_for_commit(self) -> None:
+        """ingest() does not return until the batch insert returns."""
+
+        async def scenario() -> None:
+            store = _GatedStore()
+            ingestor = _ingestor(store)
+            ingestor.start()
+
+            task = asyncio.ensure_future(ingestor.ingest(_stripe("evt_1")))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert store.batch_sizes == [1] and not task.done()
+
+            store.gate.set()
+            ack = await task
+            await ingestor.close()
+            assert ack.event_id in store.events
+
+        asyncio.run(scenario())
+
+    def test_reject_new_when_gate_full(self) -> None:
+        """Beyond max_depth unacked webhooks, new ones are refused at once."""
+
+        async def scenario() -> None:
+            store = _GatedStore()
+            queue = QueueConfig(max_depth=5, overflow_strategy="REJECT_NEW")
+            ingestor = _ingestor(store, queue=queue)
+            ingestor.start()
+
+            held = [asyncio.ensure_future(ingestor.ingest(_stripe(f"evt_{n}"))) for n in range(5)]
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert ingestor.depth == 5 and ingestor.level == "CRITICAL"
+            with pytest.raises(QueueFullError) as exc:
+                await ingestor.ingest(_stripe("evt_5"))
+            assert (exc.value.queue, exc.value.depth) == ("event_ordering_gate", 5)
+
+            store.gate.set()
+            await asyncio.gather(*held)
+            assert ingestor.depth == 0 and ingestor.level == "OK"
+            assert not (await ingestor.ingest(_stripe("evt_5"))).duplicate
+            await ingestor.close()
+            assert ingestor.stats.rejected_full == 1
+
+        asyncio.run(scenario())
+
+    def test_failed_batch_fails_every_webhook_in_it(self) -> None:
+        """A store error reaches each caller of the batch; nothing is acked."""
+
+        class BrokenStore(InMemoryEventStore):
+            async def insert_many(self, events: Sequence[InboundEvent]) -> list[StoredEvent]:
+                raise ConnectionError("db down")
+
+        async def scenario() -> None:
+            ingestor = _ingestor(BrokenStore())
+            ingestor.start()
+            results = await asyncio.gather(
+                *(ingestor.ingest(_stripe(f"evt_{n}")) for n in range(3)),
+                return_exceptions=True,
+            )
+            await ingestor.close()
+
+            assert all(isinstance(result, ConnectionError) for result in results)
+            assert ingestor.stats.failed == 3 and ingestor.depth == 0
+
+        asyncio.run(scenario())
+
+    def test_ingest_racing_close_does_not_hang(self) -> None:
+        """A webhook still streaming when close() starts fails instead of waiting forever."""
+
+        async def slow_body() -> AsyncIterator[bytes]:
+            await asyncio.sleep(0.01)
+            yield _stripe("evt_2").body  # type: ignore[misc]
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            ingestor = _ingestor(store)
+            ingestor.start()
+            streaming = _stripe("evt_2")
+            late = asyncio.ensure_future(
+                ingestor.ingest(Webhook(TENANT, "STRIPE", streaming.headers, slow_body()))
+            )
+            queued = asyncio.ensure_future(ingestor.ingest(_stripe("evt_1")))
+            await asyncio.sleep(0)
+
+            await ingestor.close()
+
+            assert not (await queued).duplicate
+            with pytest.raises(RuntimeError, match="not running"):
+                await asyncio.wait_for(late, timeout=1)
+            assert list(store.events) == [(await queued).event_id]
+
+        asyncio.run(scenario())
+
+    def test_ingest_requires_start(self) -> None:
+        """A stopped ingestor refuses webhooks."""
+
+        async def scenario() -> None:
+            with pytest.raises(RuntimeError, match="not running"):
+                await _ingestor(InMemoryEventStore()).ingest(_stripe("evt_1"))
+
+        asyncio.run(scenario())
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestQueueConfig:
+    """§11.6 queue bounds."""
+
+    def test_levels_follow_thresholds(self) -> None:
+        """Depth maps to OK / WARNING / CRITICAL at 70% / 90%."""
+        gate = QUEUE_CONFIGS["event_ordering_gate"]
+        assert (gate.max_depth, gate.overflow_strategy) == (10000, "REJECT_NEW")
+        assert [gate.level(d) for d in (0, 6999, 7000, 8999, 9000)] == [
+            "OK",
+            "OK",
+            "WARNING",
+            "WARNING",
+            "CRITICAL",
+        ]
+        assert QUEUE_CONFIGS["hitl_pending_approvals"].level(500) == "WARNING"
+
+    def test_invalid_configs_rejected(self) -> None:
+        """Inverted thresholds, spilling without a path and zero depth are errors."""
+        with pytest.raises(ValueError):
+            QueueConfig(max_depth=10, overflow_strategy="REJECT_NEW", warning_threshold=0.95)
+        with pytest.raises(ValueError):
+            QueueConfig(max_depth=10, overflow_strategy="SPILL_TO_DISK")
+        with pytest.raises(ValueError):
+            QueueConfig(max_depth=0, overflow_strategy="DROP_OLDEST")
+        with pytest.raises(ValueError, match="REJECT_NEW"):
+            EventIngestor(
+                InMemoryEventStore(), _secrets, queue=QUEUE_CONFIGS["reconciliation_queue"]
+            )
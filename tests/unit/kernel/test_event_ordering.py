@@ -0,0 +1,263 @@
+"""P1-T37, P1-T38: Event ordering gate tests.
+
+Test Coverage:
+- Timer wheel fires each timer at the first tick at or after its deadline
+- Out-of-order events are held until their predecessor is released (RK07a)
+- Releasing an event releases whole chains of dependents, in causal order
+- Held events are released after the 60 s timeout, flagged (RK07b)
+- The gate is rebuilt from stored HELD_ORDERING events on restart
+- 10k held events are each released exactly once, on time
+- run() wakes early for a held event whose deadline precedes the pending one
+
+Requirements: P1-R27, P1-R28
+Oracle: Timing, Consistency
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from autobiz.kernel.events import EventOrderingGate, GatedEvent, Release, TimerWheel
+
+T0 = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+TENANT = "t_1"
+
+
+def _event(event_id: str, predecessor: str | None = None, at: datetime = T0) -> GatedEvent:
+    return GatedEvent(
+        event_id=f"row_{event_id}",
+        tenant_id=TENANT,
+        source="STRIPE",
+        source_event_id=event_id,
+        event_type="charge.updated",
+        received_at=at,
+        predecessor_source_event_id=predecessor,
+    )
+
+
+def _ids(releases: list[Release]) -> list[str]:
+    return [release.event.source_event_id for release in releases]
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestTimerWheel:
+    """Hierarchical timing wheel."""
+
+    @pytest.mark.parametrize(("slots", "levels"), [(4, 2), (8, 3), (64, 4), (3, 1)])
+    def test_fires_exactly_at_deadline(self, slots: int, levels: int) -> None:
+        """Every timer fires at the first tick >= its deadline, across cascades."""
+        rng = random.Random(slots * 10 + levels)
+        wheel: TimerWheel[int] = TimerWheel(start=100, slots=slots, levels=levels)
+        deadlines = {key: 100 + rng.randrange(-5, 6000) for key in range(400)}
+        for key, deadline in deadlines.items():
+            wheel.schedule(key, deadline)
+
+        for tick in range(101, 6200):
+            for key, deadline in wheel.advance(tick):
+                assert deadlines.pop(key) == deadline
+                assert deadline == tick or (deadline <= 100 and tick == 101)
+            next_due = wheel.next_due()
+            if deadlines:
+                assert next_due is not None and next_due <= max(min(deadlines.values()), tick + 1)
+        assert not deadlines and len(wheel) == 0
+
+    def test_cancel_and_reschedule(self) -> None:
+        """Cancelled timers never fire; rescheduling replaces the deadline."""
+        wheel: TimerWheel[str] = TimerWheel()
+        wheel.schedule("a", 10)
+        wheel.schedule("b", 5000)
+        wheel.schedule("c", 20)
+        assert wheel.cancel("c") and not wheel.cancel("c")
+        wheel.schedule("a", 30)
+
+        assert wheel.advance(29) == []
+        assert wheel.advance(30) == [("a", 30)]
+        assert "b" in wheel and wheel.advance(10**6) == [("b", 5000)]
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestEventOrderingGate:
+    """P1-T37/P1-T38: holds, releases and timeouts."""
+
+    def test_event_without_predecessor_passes(self) -> None:
+        """In-order events are released at once."""
+        gate = EventOrderingGate(clock=lambda: T0)
+        releases = gate.offer(_event("evt_a"))
+        assert [(r.event.source_event_id, r.reason) for r in releases] == [("evt_a", "IN_ORDER")]
+        assert gate.depth == 0
+
+    def test_out_of_order_held_until_predecessor(self) -> None:
+        """RK07a: B arrives before A; B is held and released right after A."""
+        gate = EventOrderingGate(clock=lambda: T0 + timedelta(seconds=5))
+
+        assert gate.offer(_event("evt_b", "evt_a")) == []
+        assert gate.is_held((TENANT, "STRIPE", "evt_b"))
+        releases = gate.offer(_event("evt_a", at=T0 + timedelta(seconds=5)))
+
+        assert _ids(releases) == ["evt_a", "evt_b"]
+        assert releases[1].reason == "PREDECESSOR_RELEASED"
+        assert releases[1].held_for == timedelta(seconds=5)
+        assert gate.depth == 0
+
+    def test_chains_release_in_causal_order(self) -> None:
+        """D -> C -> B -> A arriving backwards all release when A arrives."""
+        gate = EventOrderingGate(clock=lambda: T0)
+        gate.offer(_event("d", "c"))
+        gate.offer(_event("c", "b"))
+        gate.offer(_event("x", "b"))
+        gate.offer(_event("b", "a"))
+        assert gate.depth == 4 and gate.waiting_for((TENANT, "STRIPE", "b")) == [
+            (TENANT, "STRIPE", "c"),
+            (TENANT, "STRIPE", "x"),
+        ]
+
+        released = _ids(gate.offer(_event("a")))
+
+        assert released[0] == "a" and sorted(released) == ["a", "b", "c", "d", "x"]
+        for before, after in (("a", "b"), ("b", "c"), ("c", "d"), ("b", "x")):
+            assert released.index(before) < released.index(after)
+
+    def test_successor_of_released_event_passes(self) -> None:
+        """A successor arriving after its predecessor was released is not held."""
+        gate = EventOrderingGate(clock=lambda: T0)
+        gate.offer(_event("evt_a"))
+        assert _ids(gate.offer(_event("evt_b", "evt_a"))) == ["evt_b"]
+        # Predecessors beyond the gate's memory: the caller says so
+        assert _ids(gate.offer(_event("evt_z", "evt_old"), predecessor_released=True)) == ["evt_z"]
+
+    def test_successor_of_held_event_waits(self) -> None:
+        """An event whose predecessor is itself held waits behind it."""
+        gate = EventOrderingGate(clock=lambda: T0)
+        gate.offer(_event("evt_b", "evt_a"))
+        assert gate.offer(_event("evt_c", "evt_b"), predecessor_released=True) == []
+        assert gate.depth == 2
+
+    def test_duplicate_offers_ignored(self) -> None:
+        """Offering an event twice neither holds nor releases it twice."""
+        gate = EventOrderingGate(clock=lambda: T0)
+        gate.offer(_event("evt_b", "evt_a"))
+        assert gate.offer(_event("evt_b", "evt_a")) == []
+        assert _ids(gate.offer(_event("evt_a"))) == ["evt_a", "evt_b"]
+        assert gate.offer(_event("evt_a")) == [] and gate.offer(_event("evt_b", "evt_a")) == []
+
+    def test_timeout_releases_after_60s(self) -> None:
+        """RK07b: A never arrives; B is released at 60 s, flagged, not before."""
+        gate = EventOrderingGate(clock=lambda: T0)
+        gate.offer(_event("evt_b", "evt_a"))
+        gate.offer(_event("evt_c", "evt_b"))
+
+        assert gate.expire(T0 + timedelta(seconds=59, milliseconds=999)) == []
+        releases = gate.expire(T0 + timedelta(seconds=60))
+
+        assert _ids(releases) == ["evt_b", "evt_c"]
+        assert releases[0].timeout_released and releases[0].missing_predecessor == "evt_a"
+        assert releases[1].reason == "PREDECESSOR_RELEASED"
+        assert gate.depth == 0
+        # The late predecessor no longer releases anything
+        assert _ids(gate.offer(_event("evt_a"))) == ["evt_a"]
+
+    def test_rebuild_from_stored_held_events(self) -> None:
+        """Restart: held rows are re-held; overdue ones time out on the next expire()."""
+        now = T0 + timedelta(seconds=90)
+        gate = EventOrderingGate(clock=lambda: now)
+        stored = [
+            _event("old", "missing", at=T0),
+            _event("c", "b", at=T0 + timedelta(seconds=70)),
+            _event("b", "a", at=T0 + timedelta(seconds=80)),
+            _event("stray", None, at=T0 + timedelta(seconds=85)),
+        ]
+
+        assert _ids(gate.rebuild(stored)) == ["stray"]
+        assert gate.depth == 3
+        assert _ids(gate.expire(now)) == ["old"]
+        assert _ids(gate.offer(_event("a", at=now))) == ["a", "b", "c"]
+
+    def test_ten_thousand_held_events(self) -> None:
+        """10k held events: each released exactly once, never early, within a tick."""
+        rng = random.Random(19)
+        tick = timedelta(milliseconds=100)
+        clock_now = [T0]
+        gate = EventOrderingGate(tick=tick, clock=lambda: clock_now[0])
+        for n in range(10_000):
+            at = T0 + timedelta(milliseconds=rng.randrange(30_000))
+            gate.offer(_event(f"e{n}", f"p{n % 4000}", at=at))
+        assert gate.depth == 10_000 and gate.level == "CRITICAL"
+
+        released: dict[str, Release] = {}
+        # Half of the predecessors arrive during the first 50 s
+        for n in range(0, 4000, 2):
+            clock_now[0] = T0 + timedelta(milliseconds=rng.randrange(30_000, 50_000))
+            for release in gate.offer(_event(f"p{n}", at=clock_now[0])):
+                assert release.event.source_event_id not in released
+                released[release.event.source_event_id] = release
+        # The rest time out; the wheel is advanced every 10 ms
+        now = T0
+        while now <= T0 + timedelta(seconds=100):
+            for release in gate.expire(now):
+                name = release.event.source_event_id
+                assert name not in released and release.timeout_released
+                assert timedelta(seconds=60) <= release.held_for < timedelta(seconds=60) + tick
+                released[name] = release
+            now += timedelta(milliseconds=10)
+
+        held = {name: r for name, r in released.items() if name.startswith("e")}
+        assert len(held) == 10_000 and gate.depth == 0
+        assert sum(r.reason == "PREDECESSOR_RELEASED" for r in held.values()) == 5000
+        assert sum(r.reason == "TIMEOUT" for r in held.values()) == 5000
+
+    def test_run_fires_timeouts_without_polling_calls(self) -> None:
+        """run() sleeps until the next timeout and hands releases over."""
+
+        async def scenario() -> None:
+            gate = EventOrderingGate(
+                timeout=timedelta(milliseconds=30), tick=timedelta(milliseconds=5)
+            )
+            released: list[Release] = []
+            stop = asyncio.Event()
+
+            async def on_release(releases: list[Release]) -> None:
+                released.extend(releases)
+                stop.set()
+
+            runner = asyncio.ensure_future(gate.run(on_release, stop))
+            await asyncio.sleep(0)
+            gate.offer(_event("evt_b", "evt_a", at=datetime.now(timezone.utc)))
+            await asyncio.wait_for(runner, timeout=2)
+
+            assert _ids(released) == ["evt_b"] and released[0].timeout_released
+            assert released[0].held_for >= timedelta(milliseconds=30)
+
+        asyncio.run(scenario())
+
+    def test_run_wakes_for_earlier_deadline(self) -> None:
+        """A short deadline held after a long one is not stuck behind it."""
+
+        async def scenario() -> None:
+            # 100 ms ticks: the wheel's next cascade boundary is 6.4 s away
+            gate = EventOrderingGate(
+                timeout=timedelta(seconds=30), tick=timedelta(milliseconds=100)
+            )
+            released: list[Release] = []
+            stop = asyncio.Event()
+
+            async def on_release(releases: list[Release]) -> None:
+                released.extend(releases)
+                stop.set()
+
+            runner = asyncio.ensure_future(gate.run(on_release, stop))
+            now = datetime.now(timezone.utc)
+            gate.offer(_event("evt_b", "evt_a", at=now))
+            await asyncio.sleep(0.01)
+            # Received late: its 30 s deadline is 150 ms away
+            gate.offer(_event("evt_d", "evt_c", at=now - timedelta(seconds=29.85)))
+            await asyncio.wait_for(runner, timeout=2)
+
+            assert _ids(released) == ["evt_d"]
+
+        asyncio.run(scenario())
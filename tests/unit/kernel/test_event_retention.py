@@ -0,0 +1,204 @@
+"""P1-T36: Event payload retention tests.
+
+Test Coverage:
+- event_store partitions expire 90 days after their last row
+- Expired partitions are detached, compacted (outcome copied to the ledger)
+  and dropped
+- Rows caught by event_store_default are drained into daily partitions
+- Redeliveries are deduplicated against both the hot and compacted tiers
+- Provenance lookups return the payload while kept, hash and metadata after
+
+Requirements: P1-R26
+Oracle: Schema (deterministic DDL), Consistency
+"""
+
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.db import PartitionSpec, drain_default_sql, partition_name, plan_partitions
+from autobiz.kernel.events import (
+    EVENT_STORE_PARTITIONS,
+    EventStoreCompactor,
+    InboundEvent,
+    InMemoryEventStore,
+    compact_partition_sql,
+)
+
+NOW = datetime(2026, 6, 1, 9, 30, tzinfo=timezone.utc)
+
+
+def _event(event_id: str, received_at: datetime) -> InboundEvent:
+    body = json.dumps({"id": event_id, "type": "charge.succeeded"}).encode()
+    return InboundEvent(
+        tenant_id="t_1",
+        source="STRIPE",
+        source_event_id=event_id,
+        event_type="charge.succeeded",
+        received_at=received_at,
+        body=body,
+        payload=json.loads(body),
+        payload_sha256=hashlib.sha256(body).hexdigest(),
+    )
+
+
+class FakeConnection:
+    """Records executed statements and transaction boundaries."""
+
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def execute(self, sql: str) -> None:
+        self.log.append(sql)
+
+    @asynccontextmanager
+    async def transaction(self) -> Any:
+        self.log.append("BEGIN")
+        yield
+        self.log.append("COMMIT")
+
+
+class FakePool:
+    """asyncpg.Pool stand-in holding attached partitions and the days stuck in DEFAULT."""
+
+    def __init__(self, attached: list[str], stranded: list[date] | None = None) -> None:
+        self.attached = attached
+        self.stranded = stranded or []
+        self.log: list[str] = []
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict[str, Any]]:
+        if args:
+            return [{"relname": name} for name in self.attached]
+        return [{"day": day} for day in self.stranded]
+
+    @asynccontextmanager
+    async def acquire(self) -> Any:
+        yield FakeConnection(self.log)
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestEventStoreCompaction:
+    """P1-T36: partition expiry and compaction DDL."""
+
+    def test_partitions_expire_after_90_days(self) -> None:
+        """A day is compacted once 90 days have passed since its end."""
+        spec = EVENT_STORE_PARTITIONS
+        first = date(2026, 2, 28)
+        existing = [partition_name(spec, first + timedelta(days=n)) for n in range(95)]
+
+        plan = plan_partitions(spec, existing, NOW)
+
+        # Mar 2 ends Mar 3 00:00; + 90 days = Jun 1 00:00 <= now
+        assert plan.detach == [
+            "event_store_p20260228",
+            "event_store_p20260301",
+            "event_store_p20260302",
+        ]
+
+    def test_compactor_copies_outcome_before_dropping(self) -> None:
+        """Each expired partition: lock timeout, DETACH, ledger UPDATE, DROP in one transaction."""
+
+        async def scenario() -> None:
+            pool = FakePool(
+                ["event_store_default", "event_store_p20260301", "event_store_p20260601"]
+            )
+
+            plan = await EventStoreCompactor(pool).run_once(NOW)  # type: ignore[arg-type]
+
+            assert plan.detach == ["event_store_p20260301"]
+            start = pool.log.index("BEGIN")
+            assert pool.log[start + 1].startswith("SET LOCAL lock_timeout")
+            assert pool.log[start + 2 : start + 6] == [
+                "ALTER TABLE event_store DETACH PARTITION event_store_p20260301",
+                compact_partition_sql("event_store_p20260301"),
+                "DROP TABLE event_store_p20260301",
+                "COMMIT",
+            ]
+
+        asyncio.run(scenario())
+
+    def test_compactor_drains_default(self) -> None:
+        """Events that landed in event_store_default move into their day's partition."""
+
+        async def scenario() -> None:
+            spec = PartitionSpec(table="event_store", column="received_at", archive_schema=None)
+            existing = [partition_name(spec, NOW.date() + timedelta(days=n)) for n in range(8)]
+            late = NOW.date() + timedelta(days=30)
+            pool = FakePool(["event_store_default", *existing], stranded=[late])
+
+            plan = await EventStoreCompactor(pool).run_once(NOW)  # type: ignore[arg-type]
+
+            assert plan.create == plan.drain == [late]
+            assert pool.log[1 : pool.log.index("COMMIT")] == drain_default_sql(spec, [late])
+
+        asyncio.run(scenario())
+
+    def test_compact_sql_joins_ledger_on_event_id(self) -> None:
+        """The outcome is copied from the partition onto matching ledger rows."""
+        sql = compact_partition_sql("event_store_p20260301")
+
+        assert sql.startswith("UPDATE event_ledger l SET processing_status = e.processing_status")
+        assert "compacted_at = NOW()" in sql
+        assert sql.endswith("FROM event_store_p20260301 e WHERE l.event_id = e.event_id")
+
+    def test_compactor_never_archives(self) -> None:
+        """Payloads past retention are dropped, not moved to an archive schema."""
+        with pytest.raises(ValueError, match="compacted"):
+            EventStoreCompactor(FakePool([]), PartitionSpec(table="event_store"))  # type: ignore[arg-type]
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestTieredDedup:
+    """P1-T36: dedup and provenance across hot and compacted tiers."""
+
+    def test_dedup_spans_both_tiers(self) -> None:
+        """A redelivery of a compacted event is still a duplicate of the same event_id."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            old = _event("evt_old", NOW - timedelta(days=120))
+            new = _event("evt_new", NOW - timedelta(days=1))
+            stored_old, stored_new = await store.insert_many([old, new])
+
+            assert store.compact(NOW - timedelta(days=90), NOW) == 1
+            again = await store.insert_many([old, new, _event("evt_3", NOW)])
+
+            assert [s.duplicate for s in again] == [True, True, False]
+            assert again[0].event_id == stored_old.event_id
+            assert again[1].event_id == stored_new.event_id
+            assert len(store.events) == 2 and len(store.compacted) == 1
+
+        asyncio.run(scenario())
+
+    def test_provenance_before_and_after_compaction(self) -> None:
+        """get() keeps hash and metadata for good; the payload only until compaction."""
+
+        async def scenario() -> None:
+            store = InMemoryEventStore()
+            event = _event("evt_1", NOW - timedelta(days=100))
+            (stored,) = await store.insert_many([event])
+
+            hot = await store.get("t_1", "STRIPE", "evt_1")
+            assert hot is not None and not hot.compacted
+            assert hot.payload == {"id": "evt_1", "type": "charge.succeeded"}
+
+            store.compact(NOW - timedelta(days=90), NOW)
+            cold = await store.get("t_1", "STRIPE", "evt_1")
+
+            assert cold is not None and cold.compacted and cold.compacted_at == NOW
+            assert cold.payload is None
+            assert cold.event_id == stored.event_id
+            assert cold.payload_sha256 == event.payload_sha256
+            assert cold.received_at == event.received_at
+            assert await store.get("t_1", "STRIPE", "evt_missing") is None
+
+        asyncio.run(scenario())
@@ -0,0 +1,269 @@
+"""P1-T16, P1-T17: HITL queue tests.
+
+Test Coverage:
+- Parked waiters resume on decision without polling the store
+- A decision made before wait() is returned at once
+- Batch decide settles only PENDING requests, for every waiter
+- The sweeper times out due requests in bounded batches, oldest first
+- run() sweeps at timeout_at and resyncs after a missed notification
+- hitl_pending_approvals max_depth is enforced per tenant
+- PostgresHitlStore decodes notifications with sub-second decided_at
+
+Requirements: INV-07, P1-R09
+Oracle: Permission, Timing
+"""
+
+import asyncio
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from autobiz.kernel.config import QueueConfig, QueueFullError
+from autobiz.kernel.hitl import (
+    CHANNEL,
+    HitlDecision,
+    HitlQueue,
+    HitlRequest,
+    InMemoryHitlStore,
+    PostgresHitlStore,
+)
+
+TENANT = "t_hitl"
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _request(n: int, tenant_id: str = TENANT, timeout_at: datetime | None = None) -> HitlRequest:
+    return HitlRequest(
+        tenant_id=tenant_id,
+        tool_name="stripe.refund",
+        tool_input={"charge_id": f"ch_{n}", "amount": 1200},
+        execution_id=f"00000000-0000-0000-0000-{n:012d}",
+        correlation_id=f"corr_{n}",
+        rule_id="refund_over_limit",
+        timeout_at=timeout_at,
+        request_id=f"10000000-0000-0000-0000-{n:012d}",
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestHitlQueue:
+    """P1-T16, P1-T17: Parking, decisions, timeouts and backpressure."""
+
+    def test_waiters_resume_on_decision(self) -> None:
+        """Parked waiters are resumed by the notification, with no store reads."""
+
+        async def scenario() -> None:
+            store = InMemoryHitlStore()
+            queue = HitlQueue(store, clock=lambda: NOW)
+            await queue.start()
+            requests = [await queue.submit(_request(n)) for n in range(50)]
+            waiters = [asyncio.ensure_future(queue.wait(r.request_id)) for r in requests]
+            await asyncio.sleep(0)
+            assert queue.parked == 50
+            queries = store.queries
+
+            await store.decide([r.request_id for r in requests[:10]], "APPROVED", "u_1", NOW, None)
+            decided = await asyncio.wait_for(asyncio.gather(*waiters[:10]), timeout=1)
+
+            assert store.queries == queries + 1
+            assert not any(w.done() for w in waiters[10:])
+            decision = decided[0]
+            assert decision.approved and decision.decided_by == "u_1"
+            assert queue.parked == 40
+            for waiter in waiters[10:]:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+            assert queue.parked == 0
+            await queue.close()
+
+        asyncio.run(scenario())
+
+    def test_decision_before_wait(self) -> None:
+        """wait() on an already decided request returns its decision."""
+
+        async def scenario() -> None:
+            queue = HitlQueue(InMemoryHitlStore(), clock=lambda: NOW)
+            await queue.start()
+            request = await queue.submit(_request(1))
+            await queue.decide([request.request_id], "DENIED", "u_2", "amount too high")
+
+            decision = await asyncio.wait_for(queue.wait(request.request_id), timeout=1)
+
+            assert decision.status == "DENIED" and not decision.approved
+            assert decision.decision_reason == "amount too high"
+
+        asyncio.run(scenario())
+
+    def test_batch_decide_settles_pending_only(self) -> None:
+        """decide() returns only requests still PENDING; every waiter resumes."""
+
+        async def scenario() -> None:
+            queue = HitlQueue(InMemoryHitlStore(), clock=lambda: NOW)
+            await queue.start()
+            ids = [(await queue.submit(_request(n))).request_id for n in range(5)]
+            first = asyncio.ensure_future(queue.wait(ids[0]))
+            second = asyncio.ensure_future(queue.wait(ids[0]))
+            await asyncio.sleep(0)
+            await queue.decide(ids[:2], "DENIED", "u_1")
+
+            decided = await queue.decide([*ids, ids[3], "unknown"], "APPROVED", "u_2", "bulk")
+
+            assert [d.request_id for d in decided] == ids[2:]
+            assert (await first).status == (await second).status == "DENIED"
+            with pytest.raises(ValueError, match="TIMED_OUT"):
+                await queue.decide(ids, "TIMED_OUT", "u_2")  # type: ignore[arg-type]
+
+        asyncio.run(scenario())
+
+    def test_sweep_expires_in_bounded_batches(self) -> None:
+        """Due requests time out oldest first, sweep_batch per store call."""
+
+        async def scenario() -> None:
+            store = InMemoryHitlStore()
+            queue = HitlQueue(store, sweep_batch=4, clock=lambda: NOW)
+            await queue.start()
+            for n in range(10):
+                await queue.submit(_request(n, timeout_at=NOW - timedelta(seconds=10 - n)))
+            await queue.submit(_request(10, timeout_at=NOW + timedelta(seconds=1)))
+            await queue.submit(_request(11))
+            waiter = asyncio.ensure_future(queue.wait(_request(9).request_id))
+            await asyncio.sleep(0)
+            queries = store.queries
+
+            expired = await queue.sweep()
+
+            assert [d.request_id for d in expired] == [_request(n).request_id for n in range(10)]
+            assert store.queries == queries + 3
+            assert {d.status for d in expired} == {"TIMED_OUT"}
+            assert (await waiter).status == "TIMED_OUT"
+            assert await store.next_timeout() == NOW + timedelta(seconds=1)
+
+        asyncio.run(scenario())
+
+    def test_run_sweeps_at_timeout(self) -> None:
+        """run() sleeps until the earliest timeout, including one submitted later."""
+
+        async def scenario() -> None:
+            queue = HitlQueue(InMemoryHitlStore())
+            await queue.start()
+            stop = asyncio.Event()
+            runner = asyncio.ensure_future(queue.run(stop))
+            await asyncio.sleep(0.01)
+            now = datetime.now(timezone.utc)
+            request = await queue.submit(_request(1, timeout_at=now + timedelta(milliseconds=30)))
+
+            decision = await asyncio.wait_for(queue.wait(request.request_id), timeout=2)
+
+            assert decision.status == "TIMED_OUT"
+            stop.set()
+            await asyncio.wait_for(runner, timeout=1)
+
+        asyncio.run(scenario())
+
+    def test_resync_recovers_missed_notifications(self) -> None:
+        """Waiters are resumed by resync() when no notification arrives."""
+
+        async def scenario() -> None:
+            store = InMemoryHitlStore()
+            queue = HitlQueue(store, sweep_batch=2, clock=lambda: NOW)
+            ids = [(await queue.submit(_request(n))).request_id for n in range(5)]
+            # Not started: notifications are lost
+            waiters = [asyncio.ensure_future(queue.wait(i)) for i in ids]
+            await asyncio.sleep(0)
+            await store.decide(ids[:3], "APPROVED", "u_1", NOW, None)
+            await asyncio.sleep(0)
+            assert not any(w.done() for w in waiters)
+
+            assert await queue.resync() == 3
+            results: list[HitlDecision] = await asyncio.gather(*waiters[:3])
+            assert [d.request_id for d in results] == ids[:3]
+            assert queue.parked == 2
+            for waiter in waiters[3:]:
+                waiter.cancel()
+
+        asyncio.run(scenario())
+
+    def test_max_depth_per_tenant(self) -> None:
+        """Beyond max_depth PENDING requests, submit() raises QueueFullError."""
+
+        async def scenario() -> None:
+            config = QueueConfig(max_depth=3, overflow_strategy="REJECT_NEW")
+            queue = HitlQueue(InMemoryHitlStore(), queue=config, clock=lambda: NOW)
+            for n in range(3):
+                await queue.submit(_request(n))
+            await queue.submit(_request(3, tenant_id="t_other"))
+
+            with pytest.raises(QueueFullError) as caught:
+                await queue.submit(_request(4))
+            assert caught.value.queue == "hitl_pending_approvals"
+            assert caught.value.max_depth == 3
+
+            await queue.decide([_request(0).request_id], "APPROVED", "u_1")
+            await queue.submit(_request(4))
+
+        asyncio.run(scenario())
+
+    def test_default_bound_is_hitl_pending_approvals(self) -> None:
+        """The default bound comes from QUEUE_CONFIGS (max_depth 1000)."""
+        assert HitlQueue(InMemoryHitlStore()).queue.max_depth == 1000
+
+
+class _ListenPool:
+    """Hands out one connection that records its LISTEN callbacks."""
+
+    def __init__(self) -> None:
+        self.listeners: dict[str, Callable[..., None]] = {}
+        self.released = False
+
+    async def acquire(self) -> "_ListenPool":
+        return self
+
+    async def release(self, _conn: object) -> None:
+        self.released = True
+
+    async def add_listener(self, channel: str, callback: Callable[..., None]) -> None:
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel: str, _callback: Callable[..., None]) -> None:
+        del self.listeners[channel]
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestPostgresHitlStoreListen:
+    """Notification payloads decode on every supported Python."""
+
+    def test_sub_second_decided_at(self) -> None:
+        """decided_at 12:00:00.12+00 arrives as epoch microseconds, exactly."""
+
+        async def scenario() -> None:
+            pool = _ListenPool()
+            store = PostgresHitlStore(pool)  # type: ignore[arg-type]
+            received: list[HitlDecision] = []
+            unlisten = await store.listen(received.extend)
+            decided_at = NOW + timedelta(milliseconds=120)
+            micros = (decided_at - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(
+                microseconds=1
+            )
+            payload = {
+                "request_id": _request(0).request_id,
+                "tenant_id": TENANT,
+                "status": "APPROVED",
+                "decided_by": "u_1",
+                "decided_at_us": micros,
+                "decision_reason": None,
+            }
+
+            pool.listeners[CHANNEL](pool, 1, CHANNEL, json.dumps(payload))
+            await unlisten()
+
+            assert [d.decided_at for d in received] == [decided_at]
+            assert received[0].decided_at.tzinfo is not None
+            assert pool.released and not pool.listeners
+
+        asyncio.run(scenario())
@@ -0,0 +1,234 @@
+"""P1-T11, P1-T12: RFC 8785 canonicalization and idempotency key tests.
+
+Test Coverage:
+- RFC 8785 test vectors (sorting, string escaping, ES number formatting)
+- I-JSON rejections (NaN/Infinity, lone surrogates, inexact integers)
+- Streaming and batched fingerprints identical to the one-shot path
+- Internal/external key format (INV-05)
+
+Requirements: INV-05, P1-R06
+Oracle: Idempotency (deterministic key derivation)
+"""
+
+import hashlib
+import json
+import random
+import struct
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.idempotency import (
+    CanonicalizationError,
+    IdempotencyKey,
+    build_key,
+    build_keys,
+    canonicalize,
+    external_key,
+    feed_canonical,
+    fingerprint,
+    fingerprint_many,
+    fingerprint_streaming,
+)
+from autobiz.kernel.idempotency.jcs import format_number
+
+# RFC 8785 Appendix B: IEEE 754 bit patterns and their canonical text
+NUMBER_VECTORS = [
+    ("0000000000000000", "0"),
+    ("8000000000000000", "0"),
+    ("0000000000000001", "5e-324"),
+    ("8000000000000001", "-5e-324"),
+    ("7fefffffffffffff", "1.7976931348623157e+308"),
+    ("ffefffffffffffff", "-1.7976931348623157e+308"),
+    ("4340000000000000", "9007199254740992"),
+    ("c340000000000000", "-9007199254740992"),
+    ("4430000000000000", "295147905179352830000"),
+    ("44b52d02c7e14af5", "9.999999999999997e+22"),
+    ("44b52d02c7e14af6", "1e+23"),
+    ("44b52d02c7e14af7", "1.0000000000000001e+23"),
+    ("444b1ae4d6e2ef4e", "999999999999999700000"),
+    ("444b1ae4d6e2ef4f", "999999999999999900000"),
+    ("444b1ae4d6e2ef50", "1e+21"),
+    ("3eb0c6f7a0b5ed8c", "9.999999999999997e-7"),
+    ("3eb0c6f7a0b5ed8d", "0.000001"),
+    ("41b3de4355555553", "333333333.3333332"),
+    ("41b3de4355555554", "333333333.33333325"),
+    ("41b3de4355555555", "333333333.3333333"),
+    ("41b3de4355555556", "333333333.3333334"),
+    ("41b3de4355555557", "333333333.33333343"),
+    ("becbf647612f3696", "-0.0000033333333333333333"),
+    ("43143ff3c1cb0959", "1424953923781206.2"),
+]
+
+
+def _double(bits: str) -> float:
+    return struct.unpack(">d", bytes.fromhex(bits))[0]
+
+
+def _order_payload(rng: random.Random, lines: int) -> dict[str, Any]:
+    return {
+        "order_id": f"ord_{rng.randrange(10**9)}",
+        "customer": {"id": "cus_9", "email": "a@example.com", "name": "Zoë Ørsted"},
+        "currency": "EUR",
+        "line_items": [
+            {
+                "sku": f"SKU-{i}",
+                "quantity": rng.randint(1, 5),
+                "unit_price": round(rng.uniform(1, 200), 2),
+                "tags": ["gift", "€"] if i % 3 == 0 else [],
+                "meta": {"warehouse": "eu-1", "fragile": i % 2 == 0, "note": None},
+            }
+            for i in range(lines)
+        ],
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestCanonicalization:
+    """RFC 8785 JCS output."""
+
+    @pytest.mark.parametrize(("bits", "expected"), NUMBER_VECTORS)
+    def test_number_vectors(self, bits: str, expected: str) -> None:
+        """Doubles serialize exactly as ECMAScript Number.toString()."""
+        assert format_number(_double(bits)) == expected
+
+    def test_random_doubles_round_trip(self) -> None:
+        """Formatted numbers parse back to the same double (seeded sample)."""
+        rng = random.Random(20260131)
+        for _ in range(5000):
+            value = struct.unpack(">d", rng.getrandbits(64).to_bytes(8, "big"))[0]
+            if value != value or value in (float("inf"), float("-inf")):
+                continue
+            assert float(format_number(value)) == value
+
+    @pytest.mark.parametrize("bits", ["7fffffffffffffff", "7ff0000000000000"])
+    def test_nan_and_infinity_rejected(self, bits: str) -> None:
+        """NaN and Infinity are not valid JSON numbers."""
+        with pytest.raises(CanonicalizationError):
+            canonicalize([_double(bits)])
+
+    def test_rfc_example_document(self) -> None:
+        """RFC 8785 section 3.2.2 example."""
+        source = (
+            '{"numbers": [333333333.33333329, 1E30, 4.50, 2e-3, 0.000000000000000000000000001],'
+            ' "string": "\\u20ac$\\u000F\\u000aA\'\\u0042\\u0022\\u005c\\\\\\"\\/",'
+            ' "literals": [null, true, false]}'
+        )
+        expected = (
+            '{"literals":[null,true,false],"numbers":[333333333.3333333,1e+30,4.5,0.002,1e-27],'
+            '"string":"€$\\u000f\\nA\'B\\"\\\\\\\\\\"/"}'
+        )
+
+        assert canonicalize(json.loads(source)) == expected.encode("utf-8")
+
+    def test_rfc_sorting_example(self) -> None:
+        """RFC 8785 section 3.2.3: keys sorted by UTF-16 code units."""
+        value = {
+            "€": "Euro Sign",
+            "\r": "Carriage Return",
+            "דּ": "Hebrew Letter Dalet With Dagesh",
+            "1": "One",
+            "\U0001f600": "Emoji: Grinning Face",
+            "\u0080": "Control",
+            "ö": "Latin Small Letter O With Diaeresis",
+        }
+
+        keys = list(json.loads(canonicalize(value)))
+
+        assert keys == ["\r", "1", "\u0080", "ö", "€", "\U0001f600", "דּ"]
+
+    def test_matches_compact_sorted_json_for_ascii_int_data(self) -> None:
+        """For ASCII keys and integer/string leaves, JCS is compact sorted JSON."""
+        rng = random.Random(8785)
+        for _ in range(50):
+            value = {
+                f"k{rng.randrange(100)}": [rng.randrange(-(10**6), 10**6), "x\ty", None, True]
+                for _ in range(rng.randint(0, 8))
+            }
+            assert canonicalize(value) == json.dumps(
+                value, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+            ).encode("utf-8")
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            {1: "non-string key"},
+            {"amount": 2**53 + 1},
+            ["\ud800"],
+            {"when": object()},
+        ],
+    )
+    def test_non_ijson_rejected(self, value: Any) -> None:
+        """Values that cannot be canonicalized without loss raise."""
+        with pytest.raises(CanonicalizationError):
+            canonicalize(value)
+
+    def test_streaming_chunks_equal_one_shot(self) -> None:
+        """feed_canonical() chunks concatenate to canonicalize()."""
+        payload = _order_payload(random.Random(1), 500)
+        chunks: list[bytes] = []
+
+        feed_canonical(payload, chunks.append, chunk_parts=64)
+
+        assert len(chunks) > 1
+        assert b"".join(chunks) == canonicalize(payload)
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestIdempotencyKeys:
+    """P1-T11/P1-T12: INV-05 key format."""
+
+    def test_fingerprint_is_truncated_sha256_of_jcs(self) -> None:
+        """Fingerprint is the first 32 hex chars of sha256(JCS(params))."""
+        params = {"b": 1.50, "a": [1, "two"]}
+
+        expected = hashlib.sha256(b'{"a":[1,"two"],"b":1.5}').hexdigest()[:32]
+
+        assert fingerprint(params) == expected
+        assert fingerprint({"a": [1, "two"], "b": 1.5}) == expected
+
+    def test_streaming_and_batched_fingerprints_agree(self) -> None:
+        """All fingerprint paths produce identical results."""
+        rng = random.Random(2)
+        payloads = [_order_payload(rng, n) for n in (0, 1, 10, 300)]
+
+        batched = fingerprint_many(payloads)
+
+        assert batched == [fingerprint(p) for p in payloads]
+        assert batched == [fingerprint_streaming(p) for p in payloads]
+
+    def test_internal_and_external_key_format(self) -> None:
+        """Internal key joins components; external key is autobiz:{sha256[:32]}."""
+        key = build_key("t_1", "create_order", "1.2.0", "user:42", {"qty": 1})
+
+        assert key.internal == f"t_1:create_order:1.2.0:user:42:{fingerprint({'qty': 1})}"
+        expected = hashlib.sha256(key.internal.encode()).hexdigest()[:32]
+        assert key.external == f"autobiz:{expected}"
+        assert key.external == external_key(key.internal)
+        assert len(key.external) == 40
+
+    def test_key_templates(self) -> None:
+        """ToolContract templates render from key fields."""
+        key = build_key("t_1", "charge", "1.0.0", "agent_7", {"amount": 500})
+
+        assert key.render("autobiz:{internal_key_sha256}") == key.external
+        assert key.render("{tenant_id}/{params_fingerprint}") == f"t_1/{key.fingerprint}"
+
+    def test_ambiguous_components_rejected(self) -> None:
+        """Colons in fixed components would make keys ambiguous."""
+        with pytest.raises(ValueError):
+            IdempotencyKey("t:1", "tool", "1.0.0", "p", "0" * 32)
+        with pytest.raises(ValueError):
+            IdempotencyKey("t", "tool", "1.0.0", "", "0" * 32)
+
+    def test_build_keys_batch(self) -> None:
+        """build_keys() matches build_key() per param set."""
+        params_list = [{"qty": i} for i in range(5)]
+
+        keys = build_keys("t_1", "create_order", "1.0.0", "p", params_list)
+
+        assert keys == [build_key("t_1", "create_order", "1.0.0", "p", p) for p in params_list]
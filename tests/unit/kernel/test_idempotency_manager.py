@@ -0,0 +1,271 @@
+"""P1-T11, P1-T12: IdempotencyManager deduplication tests.
+
+Test Coverage:
+- First call executes; duplicates within 24h return the cached receipt
+- Lookups fall through local LRU -> hot tier -> receipt store
+- Concurrent duplicates coalesce onto one execution (single-flight)
+- Failures are shared with waiters and not cached
+- The key is claimed (PENDING receipt) before executing, so managers in
+  different processes sharing a store execute once
+- A cancelled leader's waiters re-run instead of inheriting its cancellation
+- Re-execution after the lookback window
+
+Requirements: INV-05, P1-R06, P1-R07
+Oracle: Idempotency (deterministic dedup)
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.idempotency import (
+    ExecutionInProgressError,
+    IdempotencyManager,
+    InMemoryHotTier,
+    InMemoryReceiptStore,
+    Receipt,
+    build_key,
+)
+
+START = datetime(2026, 1, 31, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """Settable aware-UTC clock."""
+
+    def __init__(self) -> None:
+        self.now = START
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class SideEffect:
+    """Counts executions; optionally yields to the loop first."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self) -> dict[str, Any]:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        return {"charge_id": f"ch_{self.calls}"}
+
+
+def _key(params: dict[str, Any] | None = None) -> Any:
+    return build_key("t_1", "create_charge", "1.0.0", "agent_1", params or {"amount": 500})
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestIdempotencyManager:
+    """P1-T11/P1-T12: execute-once semantics."""
+
+    def test_duplicate_returns_cached_result(self) -> None:
+        """Second call with the same key does not execute."""
+
+        async def scenario() -> None:
+            manager = IdempotencyManager(InMemoryReceiptStore(), InMemoryHotTier())
+            effect = SideEffect()
+
+            first = await manager.execute(_key(), effect)
+            second = await manager.execute(_key(), effect)
+
+            assert effect.calls == 1
+            assert (first.duplicate, first.source) == (False, "executed")
+            assert (second.duplicate, second.source) == (True, "local")
+            assert second.result == first.result == {"charge_id": "ch_1"}
+
+        asyncio.run(scenario())
+
+    def test_tiers_consulted_in_order(self) -> None:
+        """A fresh process finds receipts in the hot tier, then in the store."""
+
+        async def scenario() -> None:
+            store, hot = InMemoryReceiptStore(), InMemoryHotTier()
+            effect = SideEffect()
+            await IdempotencyManager(store, hot).execute(_key(), effect)
+
+            from_hot = await IdempotencyManager(store, hot).execute(_key(), effect)
+            from_store = await IdempotencyManager(store, InMemoryHotTier()).execute(_key(), effect)
+
+            assert effect.calls == 1
+            assert from_hot.source == "hot"
+            assert from_store.source == "store"
+            assert from_hot.receipt == from_store.receipt
+
+        asyncio.run(scenario())
+
+    def test_concurrent_duplicates_single_flight(self) -> None:
+        """A burst of identical calls executes once and hits the store twice."""
+
+        async def scenario() -> None:
+            store = InMemoryReceiptStore()
+            manager = IdempotencyManager(store, InMemoryHotTier())
+            effect = SideEffect(delay=0.01)
+
+            results = await asyncio.gather(*(manager.execute(_key(), effect) for _ in range(50)))
+
+            assert effect.calls == 1
+            assert [r.duplicate for r in results].count(False) == 1
+            assert {r.receipt.execution_id for r in results} == {results[0].receipt.execution_id}
+            assert manager.stats.coalesced == 49
+            assert store.round_trips == 3  # one lookup, one claim, one finalize
+
+        asyncio.run(scenario())
+
+    def test_failure_shared_and_not_cached(self) -> None:
+        """Waiters see the leader's error; a later retry executes again."""
+
+        async def scenario() -> None:
+            manager = IdempotencyManager(InMemoryReceiptStore())
+            failing = SideEffect(delay=0.01, fail=True)
+
+            results = await asyncio.gather(
+                *(manager.execute(_key(), failing) for _ in range(5)), return_exceptions=True
+            )
+            assert all(isinstance(r, RuntimeError) for r in results)
+            assert failing.calls == 1
+
+            retry = await manager.execute(_key(), SideEffect())
+            assert retry.source == "executed"
+
+        asyncio.run(scenario())
+
+    def test_claim_before_execute_across_managers(self) -> None:
+        """Two workers sharing a store: one executes, the other waits for its receipt."""
+
+        async def scenario() -> None:
+            store = InMemoryReceiptStore()
+            effect = SideEffect(delay=0.02)
+            workers = [IdempotencyManager(store), IdempotencyManager(store)]
+
+            results = await asyncio.gather(*(w.execute(_key(), effect) for w in workers))
+
+            assert effect.calls == 1
+            assert sorted(r.source for r in results) == ["executed", "store"]
+            assert {r.receipt.status for r in results} == {"COMPLETED"}
+            assert results[0].result == results[1].result == {"charge_id": "ch_1"}
+
+        asyncio.run(scenario())
+
+    def test_stale_claim_raises_in_progress(self) -> None:
+        """A PENDING claim that is never finalized blocks the key, not re-runs it."""
+
+        async def scenario() -> None:
+            store = InMemoryReceiptStore()
+            await store.insert(
+                Receipt(
+                    tenant_id="t_1",
+                    tool_name="create_charge",
+                    tool_version="1.0.0",
+                    internal_idempotency_key=_key().internal,
+                    execution_id="crashed",
+                    status="PENDING",
+                    result=None,
+                    first_seen_at=START,
+                    ttl_expires_at=START + timedelta(hours=24),
+                )
+            )
+            manager = IdempotencyManager(store, clock=FakeClock(), pending_timeout=0.1)
+            effect = SideEffect()
+
+            with pytest.raises(ExecutionInProgressError):
+                await manager.execute(_key(), effect)
+            assert effect.calls == 0
+
+        asyncio.run(scenario())
+
+    def test_cancelled_leader_waiters_rerun(self) -> None:
+        """Cancelling the executing call releases its claim; waiters execute again."""
+
+        async def scenario() -> None:
+            manager = IdempotencyManager(InMemoryReceiptStore())
+            effect = SideEffect(delay=0.02)
+            leader = asyncio.ensure_future(manager.execute(_key(), effect))
+            await asyncio.sleep(0.005)
+            waiters = [asyncio.ensure_future(manager.execute(_key(), effect)) for _ in range(3)]
+            await asyncio.sleep(0)
+
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+
+            assert leader.cancelled()
+            assert effect.calls == 2
+            assert [r.source for r in results].count("executed") == 1
+            assert {r.result["charge_id"] for r in results} == {"ch_2"}
+
+        asyncio.run(scenario())
+
+    def test_reexecutes_after_lookback_window(self) -> None:
+        """Receipts stop suppressing execution 24h after first_seen_at."""
+
+        async def scenario() -> None:
+            clock = FakeClock()
+            manager = IdempotencyManager(InMemoryReceiptStore(), InMemoryHotTier(), clock=clock)
+            effect = SideEffect()
+
+            await manager.execute(_key(), effect)
+            clock.now = START + timedelta(hours=23, minutes=59)
+            assert (await manager.execute(_key(), effect)).duplicate
+            clock.now = START + timedelta(hours=24)
+            again = await manager.execute(_key(), effect)
+
+            assert effect.calls == 2
+            assert again.source == "executed"
+            assert again.receipt.first_seen_at == clock.now
+
+        asyncio.run(scenario())
+
+    def test_distinct_params_execute_separately(self) -> None:
+        """Different params give different keys."""
+
+        async def scenario() -> None:
+            manager = IdempotencyManager(InMemoryReceiptStore(), local_capacity=1)
+            effect = SideEffect()
+
+            await manager.execute(_key({"amount": 500}), effect)
+            await manager.execute(_key({"amount": 501}), effect)
+            repeat = await manager.execute(_key({"amount": 500}), effect)
+
+            assert effect.calls == 2
+            assert repeat.source == "store"  # evicted from the 1-entry LRU
+
+        asyncio.run(scenario())
+
+    def test_external_key_recorded_for_financial_calls(self) -> None:
+        """Receipts carry the derived external key when a provider is given."""
+
+        async def scenario() -> None:
+            manager = IdempotencyManager(InMemoryReceiptStore())
+
+            outcome = await manager.execute(_key(), SideEffect(), external_provider="STRIPE")
+
+            assert outcome.receipt.external_idempotency_key == _key().external
+            assert outcome.receipt.external_provider == "STRIPE"
+
+        asyncio.run(scenario())
+
+    def test_receipt_json_round_trip(self) -> None:
+        """Hot-tier serialization preserves every field."""
+        receipt = Receipt(
+            tenant_id="t_1",
+            tool_name="create_charge",
+            tool_version="1.0.0",
+            internal_idempotency_key=_key().internal,
+            execution_id="e1",
+            status="COMPLETED",
+            result={"ok": True},
+            first_seen_at=START,
+            ttl_expires_at=START + timedelta(hours=24),
+        )
+
+        assert Receipt.from_json(receipt.to_json()) == receipt
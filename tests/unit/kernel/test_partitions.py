@@ -0,0 +1,250 @@
+"""P1-T13: Receipt partition maintenance tests.
+
+Test Coverage:
+- Partitions are created for today through premake_days ahead
+- Partitions are detached only once every row is past retention
+- Receipts within the 24h lookback always stay attached
+- Plans are idempotent; DEFAULT and foreign partitions are ignored
+- Maintainer applies a plan as DDL (create, detach + archive/drop)
+- Rows left in DEFAULT after maintenance fell behind are moved into new
+  partitions before those days are created
+
+Requirements: INV-05, P1-R07
+Oracle: Schema (deterministic DDL)
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.db import (
+    PartitionMaintainer,
+    PartitionSpec,
+    create_partition_sql,
+    detach_partition_sql,
+    drain_default_sql,
+    partition_name,
+    plan_partitions,
+)
+from autobiz.kernel.idempotency.receipts import LOOKBACK
+
+NOW = datetime(2026, 2, 10, 9, 30, tzinfo=timezone.utc)
+
+
+def _names(spec: PartitionSpec, first: date, days: int) -> list[str]:
+    return [partition_name(spec, first + timedelta(days=n)) for n in range(days)]
+
+
+class FakeConnection:
+    """Records executed statements and transaction boundaries."""
+
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def execute(self, sql: str) -> None:
+        self.log.append(sql)
+
+    @asynccontextmanager
+    async def transaction(self) -> Any:
+        self.log.append("BEGIN")
+        yield
+        self.log.append("COMMIT")
+
+
+class FakePool:
+    """asyncpg.Pool stand-in holding attached partitions and the days stuck in DEFAULT."""
+
+    def __init__(self, attached: list[str], stranded: list[date] | None = None) -> None:
+        self.attached = attached
+        self.stranded = stranded or []
+        self.log: list[str] = []
+
+    async def fetch(self, sql: str, *args: Any) -> list[dict[str, Any]]:
+        if args:
+            return [{"relname": name} for name in self.attached]
+        return [{"day": day} for day in self.stranded]
+
+    @asynccontextmanager
+    async def acquire(self) -> Any:
+        yield FakeConnection(self.log)
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestPlanPartitions:
+    """P1-T13: create-ahead / detach-behind planning."""
+
+    def test_empty_table_gets_today_through_premake(self) -> None:
+        """A table with only DEFAULT gets today plus premake_days partitions."""
+        spec = PartitionSpec(premake_days=3)
+
+        plan = plan_partitions(spec, ["receipts_default"], NOW)
+
+        assert plan.create == [date(2026, 2, 10) + timedelta(days=n) for n in range(4)]
+        assert plan.detach == []
+
+    def test_detaches_only_fully_expired_partitions(self) -> None:
+        """A day is detached once its upper bound plus retention has passed."""
+        spec = PartitionSpec(premake_days=0, retention=timedelta(hours=48))
+        existing = _names(spec, date(2026, 2, 5), 6)  # Feb 5 .. Feb 10
+
+        plan = plan_partitions(spec, existing, NOW)
+
+        # Feb 7 ends Feb 8 00:00; + 48h = Feb 10 00:00 <= now
+        assert plan.detach == ["receipts_p20260205", "receipts_p20260206", "receipts_p20260207"]
+        assert plan.create == []
+
+    def test_lookback_window_stays_attached(self) -> None:
+        """Every partition that can hold a live receipt is kept."""
+        spec = PartitionSpec()
+        existing = _names(spec, date(2026, 1, 1), 48)
+
+        for hour in range(0, 24 * 30, 5):
+            now = datetime(2026, 1, 3, tzinfo=timezone.utc) + timedelta(hours=hour)
+            plan = plan_partitions(spec, existing, now)
+            oldest_live = (now - LOOKBACK).date()
+            assert partition_name(spec, oldest_live) not in plan.detach
+            assert partition_name(spec, now.date()) not in plan.detach
+
+    def test_plan_is_idempotent(self) -> None:
+        """Applying a plan leaves nothing to do at the same instant."""
+        spec = PartitionSpec()
+        existing = _names(spec, date(2026, 2, 1), 5)
+
+        plan = plan_partitions(spec, existing, NOW)
+        applied = set(existing) - set(plan.detach)
+        applied |= {partition_name(spec, day) for day in plan.create}
+
+        assert not plan.empty
+        assert plan_partitions(spec, applied, NOW).empty
+
+    def test_ignores_default_and_unrelated_names(self) -> None:
+        """Only {table}_pYYYYMMDD names are treated as daily partitions."""
+        spec = PartitionSpec(premake_days=0)
+        existing = [
+            "receipts_default",
+            "receipts_p2026",
+            "receipts_p20261399",
+            "other_p20200101",
+            "receipts_p20260210",
+        ]
+
+        plan = plan_partitions(spec, existing, NOW)
+
+        assert plan.empty
+
+    def test_stranded_days_are_created_and_drained(self) -> None:
+        """Days with rows in DEFAULT are created, however old, and marked for draining."""
+        spec = PartitionSpec(premake_days=1)
+        existing = ["receipts_default", *_names(spec, date(2026, 2, 10), 1)]
+        stranded = [date(2026, 2, 11), date(2026, 2, 1), date(2026, 2, 10)]
+
+        plan = plan_partitions(spec, existing, NOW, stranded)
+
+        assert plan.drain == [date(2026, 2, 1), date(2026, 2, 11)]
+        assert plan.create == [date(2026, 2, 1), date(2026, 2, 11)]
+        assert plan_partitions(spec, existing, NOW).drain == []
+
+    def test_non_utc_now_uses_utc_day(self) -> None:
+        """Partition days are UTC days regardless of the caller's offset."""
+        spec = PartitionSpec(premake_days=0)
+        late_evening = datetime(2026, 2, 10, 23, 0, tzinfo=timezone(timedelta(hours=-5)))
+
+        plan = plan_partitions(spec, [], late_evening)
+
+        assert plan.create == [date(2026, 2, 11)]
+
+    def test_rejects_unsafe_identifiers(self) -> None:
+        """Names interpolated into DDL must be plain identifiers."""
+        with pytest.raises(ValueError, match="identifier"):
+            PartitionSpec(table="receipts; DROP TABLE tenants")
+        with pytest.raises(ValueError, match="identifier"):
+            PartitionSpec(archive_schema="Archive")
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestPartitionDDL:
+    """P1-T13: generated DDL and maintainer."""
+
+    def test_create_partition_sql_bounds(self) -> None:
+        """A daily partition covers [00:00 UTC, next 00:00 UTC)."""
+        sql = create_partition_sql(PartitionSpec(), date(2026, 2, 28))
+
+        assert sql == (
+            "CREATE TABLE IF NOT EXISTS receipts_p20260228 PARTITION OF receipts "
+            "FOR VALUES FROM ('2026-02-28T00:00:00+00:00') TO ('2026-03-01T00:00:00+00:00')"
+        )
+
+    def test_detach_archives_or_drops(self) -> None:
+        """Detached partitions move to the archive schema, or are dropped without one."""
+        archived = detach_partition_sql(PartitionSpec(), "receipts_p20260201")
+        dropped = detach_partition_sql(PartitionSpec(archive_schema=None), "receipts_p20260201")
+
+        assert archived[0].startswith("SET LOCAL lock_timeout")
+        assert archived[1:] == [
+            "ALTER TABLE receipts DETACH PARTITION receipts_p20260201",
+            "ALTER TABLE receipts_p20260201 SET SCHEMA receipts_archive",
+        ]
+        assert dropped[-1] == "DROP TABLE receipts_p20260201"
+
+    def test_maintainer_applies_plan(self) -> None:
+        """run_once creates missing days and detaches each expired one in its own transaction."""
+
+        async def scenario() -> None:
+            spec = PartitionSpec(premake_days=1)
+            pool = FakePool(["receipts_default", *_names(spec, date(2026, 2, 6), 5)])
+
+            plan = await PartitionMaintainer(pool, spec).run_once(NOW)  # type: ignore[arg-type]
+
+            assert plan.create == [date(2026, 2, 11)]
+            assert plan.detach == ["receipts_p20260206", "receipts_p20260207"]
+            assert pool.log[0] == create_partition_sql(spec, date(2026, 2, 11))
+            assert pool.log.count("BEGIN") == pool.log.count("COMMIT") == 2
+            assert "ALTER TABLE receipts_p20260207 SET SCHEMA receipts_archive" in pool.log
+
+        asyncio.run(scenario())
+
+    def test_drain_default_sql(self) -> None:
+        """DEFAULT is detached, its rows re-routed into the new days, and re-attached empty."""
+        days = [date(2026, 2, 9), date(2026, 2, 10)]
+
+        statements = drain_default_sql(PartitionSpec(), days)
+
+        assert statements[0].startswith("SET LOCAL lock_timeout")
+        assert statements[1:] == [
+            "ALTER TABLE receipts DETACH PARTITION receipts_default",
+            create_partition_sql(PartitionSpec(), days[0]),
+            create_partition_sql(PartitionSpec(), days[1]),
+            "INSERT INTO receipts SELECT * FROM receipts_default",
+            "TRUNCATE receipts_default",
+            "ALTER TABLE receipts ATTACH PARTITION receipts_default DEFAULT",
+        ]
+
+    def test_maintenance_fell_behind(self) -> None:
+        """After an outage, rows caught by DEFAULT move out before their days are created."""
+
+        async def scenario() -> None:
+            spec = PartitionSpec(premake_days=1)
+            # The job last ran on Feb 6; rows for Feb 8 and 9 went to DEFAULT
+            pool = FakePool(
+                ["receipts_default", *_names(spec, date(2026, 2, 6), 2)],
+                stranded=[date(2026, 2, 9), date(2026, 2, 8)],
+            )
+
+            plan = await PartitionMaintainer(pool, spec).run_once(NOW)  # type: ignore[arg-type]
+
+            assert plan.drain == [date(2026, 2, 8), date(2026, 2, 9)]
+            assert plan.create == [date(2026, 2, n) for n in (8, 9, 10, 11)]
+            assert pool.log[0] == "BEGIN"
+            assert pool.log[1 : pool.log.index("COMMIT")] == drain_default_sql(spec, plan.create)
+            assert not any(
+                sql.startswith("CREATE TABLE") for sql in pool.log[pool.log.index("COMMIT") :]
+            )
+
+        asyncio.run(scenario())
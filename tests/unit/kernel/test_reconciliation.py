@@ -0,0 +1,315 @@
+"""P1-T39: Reconciliation drift detection tests.
+
+Test Coverage:
+- Hash tree diff finds exactly the differing entities, opening only
+  differing buckets
+- Incremental syncs pull only changes since the last cursor
+- Missing and mismatched entities become drift rows, once
+- Transient differences that resolve before the fetch are not reported
+- Projections limit the compared fields
+
+Requirements: P1-R29
+Oracle: Consistency
+"""
+
+import asyncio
+import random
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.events import (
+    BucketHashTree,
+    DriftKind,
+    InMemoryDriftStore,
+    InMemoryReconciliationSource,
+    ReconciliationDetector,
+    entity_digest,
+)
+
+TENANT = "t_recon"
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _order(n: int, status: str = "paid") -> dict[str, Any]:
+    return {"id": f"ord_{n}", "total": n * 100, "status": status}
+
+
+def _detector(
+    local: InMemoryReconciliationSource,
+    remote: InMemoryReconciliationSource,
+    drift: InMemoryDriftStore,
+    **kwargs: Any,
+) -> ReconciliationDetector:
+    return ReconciliationDetector(
+        "ORDER_SYNC",
+        "order",
+        local,
+        remote,
+        drift,
+        buckets=256,
+        fanout=16,
+        page_size=50,
+        clock=lambda: NOW,
+        **kwargs,
+    )
+
+
+def _both(
+    local: InMemoryReconciliationSource, remote: InMemoryReconciliationSource, n: int
+) -> None:
+    local.put(TENANT, "order", f"ord_{n}", _order(n))
+    remote.put(TENANT, "order", f"ord_{n}", _order(n))
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestBucketHashTree:
+    """P1-T39: Incremental bucket sums and range diffing."""
+
+    def test_diff_matches_set_difference(self) -> None:
+        """diff() returns exactly the entities whose digests differ."""
+        rng = random.Random(22)
+        left, right = BucketHashTree(256, 4), BucketHashTree(256, 4)
+        for n in range(2000):
+            digest = rng.getrandbits(64)
+            left.set(f"e{n}", digest)
+            right.set(f"e{n}", digest)
+        changed = {f"e{n}" for n in rng.sample(range(2000), 15)}
+        for entity_id in changed:
+            right.set(entity_id, rng.getrandbits(64))
+        left.discard("e1999")
+        right.set("extra", 7)
+        expected = changed | {"e1999", "extra"}
+
+        diff = left.diff(right)
+
+        assert set(diff.entity_ids) == expected
+        assert len(diff.entity_ids) == len(expected)
+        assert len(diff.buckets) <= len(expected)
+        # Only differing buckets are opened
+        assert diff.entity_comparisons < 2000 // 4
+
+    def test_equal_trees_cost_one_comparison(self) -> None:
+        """Identical contents compare at the root only, in any insertion order."""
+        left, right = BucketHashTree(), BucketHashTree()
+        ids = [f"e{n}" for n in range(500)]
+        for entity_id in ids:
+            left.set(entity_id, entity_digest(entity_id, {"v": 1}))
+        for entity_id in reversed(ids):
+            right.set(entity_id, entity_digest(entity_id, {"v": 0}))
+            right.set(entity_id, entity_digest(entity_id, {"v": 1}))
+
+        diff = left.diff(right)
+
+        assert left.root == right.root and len(left) == len(right) == 500
+        assert diff.node_comparisons == 1 and diff.entity_ids == []
+
+    def test_discard_restores_root(self) -> None:
+        """Adding then removing an entity leaves the tree as before."""
+        tree = BucketHashTree(16, 4)
+        tree.set("a", 5)
+        root = tree.root
+        tree.set("b", (1 << 64) - 1)
+        tree.discard("b")
+        tree.discard("missing")
+
+        assert tree.root == root and len(tree) == 1 and tree.get("b") is None
+
+    def test_rejects_bad_shape(self) -> None:
+        """Bucket counts must be powers of the fanout, and shapes must match."""
+        with pytest.raises(ValueError, match="power of fanout"):
+            BucketHashTree(100, 16)
+        with pytest.raises(ValueError, match="same buckets"):
+            BucketHashTree(256, 16).diff(BucketHashTree(256, 4))
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestReconciliationDetector:
+    """P1-T39: Incremental drift detection against a fake provider."""
+
+    def test_in_sync_entities_produce_no_drift(self) -> None:
+        """A full first pull of equal sides finds nothing."""
+
+        async def scenario() -> None:
+            local, remote, drift = (
+                InMemoryReconciliationSource(),
+                InMemoryReconciliationSource(),
+                InMemoryDriftStore(),
+            )
+            for n in range(300):
+                _both(local, remote, n)
+            stats = await _detector(local, remote, drift).sync(TENANT)
+
+            assert stats.local_changes == stats.remote_changes == 300
+            assert stats.node_comparisons == 1 and stats.entity_comparisons == 0
+            assert stats.drift_found == 0 and drift.jobs == []
+
+        asyncio.run(scenario())
+
+    def test_incremental_sync_pulls_only_changes(self) -> None:
+        """Later syncs list only entities changed since the cursor."""
+
+        async def scenario() -> None:
+            local, remote, drift = (
+                InMemoryReconciliationSource(),
+                InMemoryReconciliationSource(),
+                InMemoryDriftStore(),
+            )
+            for n in range(1000):
+                _both(local, remote, n)
+            detector = _detector(local, remote, drift)
+            await detector.sync(TENANT)
+            remote.calls = 0
+
+            for n in (3, 500, 501):
+                local.put(TENANT, "order", f"ord_{n}", _order(n, "refunded"))
+                remote.put(TENANT, "order", f"ord_{n}", _order(n, "refunded"))
+            # Updated twice: listed once, at its latest state
+            remote.put(TENANT, "order", "ord_3", _order(3, "refunded"))
+            stats = await detector.sync(TENANT)
+
+            assert stats.local_changes == stats.remote_changes == 3
+            assert stats.remote_calls == remote.calls == 1
+            assert stats.drift_found == 0
+            empty = await detector.sync(TENANT)
+            assert empty.remote_changes == 0 and empty.node_comparisons == 1
+
+        asyncio.run(scenario())
+
+    def test_drift_kinds_are_inserted_once(self) -> None:
+        """Missing and mismatched entities become one drift row each."""
+
+        async def scenario() -> None:
+            local, remote, drift = (
+                InMemoryReconciliationSource(),
+                InMemoryReconciliationSource(),
+                InMemoryDriftStore(),
+            )
+            for n in range(200):
+                _both(local, remote, n)
+            detector = _detector(local, remote, drift)
+            await detector.sync(TENANT)
+
+            remote.put(TENANT, "order", "ord_7", _order(7, "refunded"))
+            remote.delete(TENANT, "order", "ord_8")
+            remote.put(TENANT, "order", "ord_900", _order(900))
+            stats = await detector.sync(TENANT)
+
+            assert stats.candidates == stats.drift_found == stats.drift_inserted == 3
+            assert stats.local_calls == 2 and stats.remote_calls == 2
+            by_id = {job.entity_id: job for job in drift.jobs}
+            assert by_id["ord_7"].kind is DriftKind.MISMATCH
+            assert by_id["ord_7"].description == "MISMATCH: fields status"
+            assert by_id["ord_7"].remote_state["status"] == "refunded"
+            assert by_id["ord_8"].kind is DriftKind.MISSING_REMOTE
+            assert by_id["ord_8"].remote_state is None
+            assert by_id["ord_900"].kind is DriftKind.MISSING_LOCAL
+            assert {job.detected_at for job in drift.jobs} == {NOW}
+
+            # Unchanged drift is not fetched or reported again
+            again = await detector.sync(TENANT)
+            assert again.candidates == 0 and again.remote_calls == 1
+            assert len(drift.jobs) == 3
+
+            # Drift that changes is re-reported, unless a job is still PENDING
+            remote.put(TENANT, "order", "ord_7", _order(7, "disputed"))
+            changed = await detector.sync(TENANT)
+            assert changed.drift_found == 1 and changed.drift_inserted == 0
+            drift.resolve(TENANT, "ORDER_SYNC", "order", "ord_7")
+            remote.put(TENANT, "order", "ord_7", _order(7, "lost"))
+            assert (await detector.sync(TENANT)).drift_inserted == 1
+
+            # Repaired entities leave the drift set
+            local.put(TENANT, "order", "ord_7", _order(7, "lost"))
+            repaired = await detector.sync(TENANT)
+            assert repaired.candidates == 0 and repaired.buckets_differing == 2
+
+        asyncio.run(scenario())
+
+    def test_difference_resolved_before_fetch_is_not_drift(self) -> None:
+        """A side that catches up between listing and fetch is re-checked."""
+
+        async def scenario() -> None:
+            local, remote, drift = (
+                InMemoryReconciliationSource(),
+                InMemoryReconciliationSource(),
+                InMemoryDriftStore(),
+            )
+            _both(local, remote, 1)
+            detector = _detector(local, remote, drift)
+            await detector.sync(TENANT)
+            remote.put(TENANT, "order", "ord_1", _order(1, "refunded"))
+
+            original = local.changed_since
+
+            async def lagging(*args: Any) -> Any:
+                page = await original(*args)
+                # The local write lands after its side was listed
+                local.put(TENANT, "order", "ord_1", _order(1, "refunded"))
+                return page
+
+            local.changed_since = lagging  # type: ignore[method-assign]
+            stats = await detector.sync(TENANT)
+            local.changed_since = original  # type: ignore[method-assign]
+
+            assert stats.candidates == 1 and stats.drift_found == 0
+            assert (await detector.sync(TENANT)).buckets_differing == 0
+
+        asyncio.run(scenario())
+
+    def test_projection_limits_compared_fields(self) -> None:
+        """Fields outside the projections do not count as drift."""
+
+        async def scenario() -> None:
+            local, remote, drift = (
+                InMemoryReconciliationSource(),
+                InMemoryReconciliationSource(),
+                InMemoryDriftStore(),
+            )
+            local.put(TENANT, "order", "ord_1", {"total": 100, "status": "paid", "note": "x"})
+            remote.put(
+                TENANT,
+                "order",
+                "ord_1",
+                {"amount": {"value": 100}, "financial_status": "paid", "updated": 9},
+            )
+            detector = _detector(
+                local,
+                remote,
+                drift,
+                project_local=lambda s: {"total": s["total"], "status": s["status"]},
+                project_remote=lambda s: {
+                    "total": s["amount"]["value"],
+                    "status": s["financial_status"],
+                },
+            )
+
+            assert (await detector.sync(TENANT)).drift_found == 0
+
+        asyncio.run(scenario())
+
+    def test_tenants_are_independent(self) -> None:
+        """Each tenant has its own trees and cursors."""
+
+        async def scenario() -> None:
+            local, remote, drift = (
+                InMemoryReconciliationSource(),
+                InMemoryReconciliationSource(),
+                InMemoryDriftStore(),
+            )
+            _both(local, remote, 1)
+            local.put("t_other", "order", "ord_1", _order(1))
+            detector = _detector(local, remote, drift)
+
+            assert (await detector.sync(TENANT)).drift_found == 0
+            other = await detector.sync("t_other")
+            assert other.drift_found == 1
+            assert drift.jobs[0].tenant_id == "t_other"
+            assert drift.jobs[0].kind is DriftKind.MISSING_REMOTE
+
+        asyncio.run(scenario())
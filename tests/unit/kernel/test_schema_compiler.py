@@ -0,0 +1,248 @@
+"""Differential tests: compiled schema backend vs jsonschema Draft 7.
+
+Test Coverage:
+- Compiled predicates agree with Draft7Validator.is_valid on generated
+  schemas and instances
+- SchemaValidationError code/message/path/schema_path identical across backends
+- Unsupported schemas fall back to jsonschema
+
+Requirements: INV-01, P1-R01, P1-R18
+Oracle: Schema (deterministic validation)
+"""
+
+import random
+from typing import Any
+
+import pytest
+from jsonschema import Draft7Validator
+
+from autobiz.kernel.executor.schema_compiler import compile_schema
+from autobiz.kernel.executor.schema_validator import (
+    SchemaValidationError,
+    SchemaValidator,
+)
+from autobiz.kernel.executor.tool_contract import ToolContract
+from autobiz.kernel.executor.tool_registry import ToolRegistry
+
+SEED = 20260131
+
+SCALARS: list[Any] = [
+    None,
+    True,
+    False,
+    0,
+    1,
+    -1,
+    1.0,
+    2.5,
+    -0.0,
+    10**12,
+    "",
+    "a",
+    "ord_abc123",
+    "ORD-1",
+    "USD",
+    "eur",
+    "x" * 40,
+]
+
+TYPES = ["string", "integer", "number", "boolean", "null", "object", "array"]
+PROP_NAMES = ["id", "qty", "sku", "price", "tags", "meta"]
+
+
+def _random_value(rng: random.Random, depth: int = 0) -> Any:
+    roll = rng.random()
+    if depth >= 3 or roll < 0.6:
+        return rng.choice(SCALARS)
+    if roll < 0.8:
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    keys = rng.sample(PROP_NAMES + ["extra"], rng.randint(0, 4))
+    return {k: _random_value(rng, depth + 1) for k in keys}
+
+
+def _random_schema(rng: random.Random, depth: int = 0) -> Any:
+    if depth > 0 and rng.random() < 0.05:
+        return rng.choice([True, False])
+
+    schema: dict[str, Any] = {}
+    if rng.random() < 0.7:
+        if rng.random() < 0.8:
+            schema["type"] = rng.choice(TYPES)
+        else:
+            schema["type"] = rng.sample(TYPES, 2)
+    if rng.random() < 0.15:
+        schema["enum"] = rng.sample(SCALARS, rng.randint(1, 4))
+    if rng.random() < 0.2:
+        schema["pattern"] = rng.choice(["^ord_", "[0-9]+$", "^[A-Z]{3}$", "a"])
+    if rng.random() < 0.2:
+        schema["minLength"] = rng.randint(0, 3)
+    if rng.random() < 0.1:
+        schema["maxLength"] = rng.randint(0, 12)
+    for keyword in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"):
+        if rng.random() < 0.1:
+            schema[keyword] = rng.choice([0, 1, -1, 2.5, 1.0])
+    if depth < 3 and rng.random() < 0.5:
+        props = rng.sample(PROP_NAMES, rng.randint(1, 3))
+        schema["properties"] = {p: _random_schema(rng, depth + 1) for p in props}
+        if rng.random() < 0.5:
+            schema["required"] = rng.sample(props, rng.randint(1, len(props)))
+        if rng.random() < 0.3:
+            schema["additionalProperties"] = rng.choice(
+                [False, True, _random_schema(rng, depth + 1)]
+            )
+    if depth < 3 and rng.random() < 0.3:
+        schema["items"] = _random_schema(rng, depth + 1)
+        if rng.random() < 0.3:
+            schema["minItems"] = rng.randint(0, 2)
+        if rng.random() < 0.3:
+            schema["maxItems"] = rng.randint(1, 3)
+    if rng.random() < 0.1:
+        schema["description"] = "annotation only"
+    return schema
+
+
+def _instances_for(rng: random.Random, schema: Any, count: int) -> list[Any]:
+    values = [_random_value(rng) for _ in range(count)]
+    # Bias towards objects shaped like the schema so nested keywords get exercised
+    if isinstance(schema, dict) and "properties" in schema:
+        for _ in range(count):
+            values.append(
+                {p: _random_value(rng, 1) for p in schema["properties"] if rng.random() < 0.8}
+            )
+    return values
+
+
+def _error_tuple(backend: str, data: Any, schema: dict[str, Any]) -> tuple[str, ...] | None:
+    validator = SchemaValidator(backend=backend)  # type: ignore[arg-type]
+    compiled = validator.compile(schema)
+    try:
+        validator.validate_compiled(data, compiled)
+    except SchemaValidationError as e:
+        return (e.code.value, e.message, e.path, e.schema_path)
+    return None
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.oracle_schema
+@pytest.mark.pseudo_deterministic
+class TestCompiledBackendDifferential:
+    """Compiled predicates must agree with jsonschema on every instance."""
+
+    def test_generated_schemas_agree_with_draft7(self) -> None:
+        """Randomized (seeded) schemas and instances: validity agrees exactly."""
+        rng = random.Random(SEED)
+        compiled_count = 0
+
+        for _ in range(300):
+            schema = _random_schema(rng)
+            Draft7Validator.check_schema(schema)
+            check = compile_schema(schema)
+            assert check is not None, schema
+            compiled_count += 1
+
+            reference = Draft7Validator(schema)
+            for instance in _instances_for(rng, schema, 15):
+                assert check(instance) == reference.is_valid(instance), (schema, instance)
+
+        assert compiled_count == 300
+
+    def test_errors_identical_across_backends(self) -> None:
+        """SchemaValidationError contents do not depend on the backend."""
+        rng = random.Random(SEED + 1)
+
+        for _ in range(100):
+            schema = _random_schema(rng)
+            for instance in _instances_for(rng, schema, 5):
+                assert _error_tuple("compiled", instance, schema) == _error_tuple(
+                    "jsonschema", instance, schema
+                )
+
+    @pytest.mark.parametrize(
+        ("schema", "instance", "valid"),
+        [
+            ({"type": "integer"}, 1.0, True),
+            ({"type": "integer"}, True, False),
+            ({"type": "number"}, False, False),
+            ({"enum": [1]}, True, False),
+            ({"enum": [1]}, 1.0, True),
+            ({"enum": [False]}, 0, False),
+            ({"enum": [[1, 2]]}, [1, 2], True),
+            ({"enum": [{"a": 1}]}, {"a": True}, False),
+            ({"minimum": 1}, "0", True),
+            ({"exclusiveMaximum": 2}, 2, False),
+            ({"items": False}, [], True),
+            ({"items": False}, [1], False),
+            ({"additionalProperties": False}, {"a": 1}, False),
+            ({"properties": {"a": False}}, {"a": 1}, False),
+            ({"pattern": "b"}, "abc", True),
+        ],
+    )
+    def test_draft7_edge_cases(self, schema: dict[str, Any], instance: Any, valid: bool) -> None:
+        """bool/int distinctions, integral floats and search-style patterns."""
+        check = compile_schema(schema)
+
+        assert check is not None
+        assert Draft7Validator(schema).is_valid(instance) is valid
+        assert check(instance) is valid
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.oracle_schema
+class TestCompiledBackendFallback:
+    """Unsupported constructs fall back to jsonschema."""
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            {"$ref": "#/definitions/x", "definitions": {"x": {"type": "string"}}},
+            {"anyOf": [{"type": "string"}, {"type": "integer"}]},
+            {"type": "object", "patternProperties": {"^x_": {"type": "string"}}},
+            {"type": "array", "items": [{"type": "string"}]},
+            {"properties": {"a": {"const": 1}}},
+        ],
+    )
+    def test_unsupported_schema_not_compiled(self, schema: dict[str, Any]) -> None:
+        """compile_schema returns None for keywords outside the subset."""
+        assert compile_schema(schema) is None
+
+    def test_unsupported_schema_still_validates(self) -> None:
+        """Compiled backend validates uncompilable schemas via jsonschema."""
+        schema = {"anyOf": [{"type": "string"}, {"type": "integer"}]}
+        validator = SchemaValidator(backend="compiled")
+        compiled = validator.compile(schema)
+
+        assert compiled.fast_check is None
+        validator.validate_compiled("ok", compiled)
+        assert _error_tuple("compiled", 1.5, schema) == _error_tuple("jsonschema", 1.5, schema)
+
+    def test_unknown_backend_rejected(self) -> None:
+        """Backend name is validated at construction."""
+        with pytest.raises(ValueError):
+            SchemaValidator(backend="fast")  # type: ignore[arg-type]
+
+    def test_registry_uses_compiled_backend(self) -> None:
+        """ToolRegistry compiles contract schemas with the validator's backend."""
+        registry = ToolRegistry(validator=SchemaValidator(backend="compiled"))
+        registry.register(
+            ToolContract(
+                name="create_order",
+                version="1.0.0",
+                input_schema={
+                    "type": "object",
+                    "properties": {"quantity": {"type": "integer", "minimum": 1}},
+                    "required": ["quantity"],
+                },
+                output_schema={"type": "object"},
+                side_effect_level="HARD_WRITE",
+                timeout_seconds=60,
+            )
+        )
+
+        registry.validate_input("create_order", "1.0.0", {"quantity": 3})
+        with pytest.raises(SchemaValidationError) as exc_info:
+            registry.validate_input("create_order", "1.0.0", {"quantity": 0})
+
+        assert exc_info.value.path == "quantity"
+        assert exc_info.value.schema_path == "properties.quantity.minimum"
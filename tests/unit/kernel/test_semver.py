@@ -0,0 +1,152 @@
+"""SemVer parsing, precedence and range resolution tests.
+
+Test Coverage:
+- SemVer 2.0.0 precedence (pre-release ordering, build metadata ignored)
+- Caret, tilde, partial, exact and latest ranges
+- VersionIndex resolution agrees with a linear scan
+
+Requirements: INV-01, P1-R01, P1-R18
+Oracle: Deterministic
+"""
+
+import random
+
+import pytest
+
+from autobiz.kernel.executor.semver import (
+    SemVerError,
+    VersionIndex,
+    parse_range,
+    parse_version,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestVersionParsing:
+    """SemVer 2.0.0 parsing and precedence."""
+
+    def test_precedence_follows_semver_spec(self) -> None:
+        """Example ordering from semver.org section 11."""
+        ordered = [
+            "1.0.0-alpha",
+            "1.0.0-alpha.1",
+            "1.0.0-alpha.beta",
+            "1.0.0-beta",
+            "1.0.0-beta.2",
+            "1.0.0-beta.11",
+            "1.0.0-rc.1",
+            "1.0.0",
+            "1.0.1",
+            "1.10.0",
+            "2.0.0",
+        ]
+        versions = [parse_version(v) for v in ordered]
+
+        assert sorted(reversed(versions)) == versions
+
+    def test_build_metadata_ignored_for_precedence(self) -> None:
+        """1.0.0+a and 1.0.0+b have equal precedence but keep their text."""
+        a, b = parse_version("1.0.0+a"), parse_version("1.0.0+b")
+
+        assert not a < b and not b < a
+        assert str(a) == "1.0.0+a"
+
+    @pytest.mark.parametrize("text", ["1", "1.0", "01.0.0", "1.0.0-", "v1.0.0", "1.0.0-01"])
+    def test_invalid_versions_rejected(self, text: str) -> None:
+        """Non-SemVer strings raise SemVerError (a ValueError)."""
+        with pytest.raises(SemVerError):
+            parse_version(text)
+
+    @pytest.mark.parametrize("spec", ["^", "~x", "=1.2", "1.x.3", ">=1.0.0", "latest-ish"])
+    def test_invalid_ranges_rejected(self, spec: str) -> None:
+        """Unsupported range syntax raises SemVerError."""
+        with pytest.raises(SemVerError):
+            parse_range(spec)
+
+
+AVAILABLE = [
+    "0.0.3",
+    "0.0.4",
+    "0.1.0",
+    "0.1.7",
+    "0.2.0",
+    "1.0.0",
+    "1.2.0",
+    "1.2.9",
+    "1.3.0-beta.1",
+    "1.3.0",
+    "1.9.4",
+    "2.0.0-rc.1",
+    "2.0.0-rc.2",
+]
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestRangeResolution:
+    """VersionIndex.resolve picks the highest satisfying version."""
+
+    @pytest.fixture
+    def index(self) -> VersionIndex:
+        index = VersionIndex()
+        for text in reversed(AVAILABLE):
+            index.add(parse_version(text))
+        return index
+
+    @pytest.mark.parametrize(
+        ("spec", "expected"),
+        [
+            ("latest", "1.9.4"),
+            ("*", "1.9.4"),
+            ("^1.2.0", "1.9.4"),
+            ("^1", "1.9.4"),
+            ("^0.1.0", "0.1.7"),
+            ("^0.0.3", "0.0.3"),
+            ("^0.0", "0.0.4"),
+            ("~1.2.0", "1.2.9"),
+            ("~1.2", "1.2.9"),
+            ("~1", "1.9.4"),
+            ("1.x", "1.9.4"),
+            ("1.2.x", "1.2.9"),
+            ("0", "0.2.0"),
+            ("1.3.0", "1.3.0"),
+            ("=1.3.0-beta.1", "1.3.0-beta.1"),
+            ("^2.0.0-rc.1", "2.0.0-rc.2"),
+            ("~1.3.0-beta.1", "1.3.0"),
+            ("^3", None),
+            ("1.2.1", None),
+        ],
+    )
+    def test_resolution(self, index: VersionIndex, spec: str, expected: str | None) -> None:
+        """Each range resolves to the documented version."""
+        match = index.resolve(parse_range(spec))
+
+        assert (str(match) if match is not None else None) == expected
+
+    def test_bisection_agrees_with_linear_scan(self) -> None:
+        """Randomized check against VersionRange.contains over all versions."""
+        rng = random.Random(7)
+        index = VersionIndex()
+        texts = set()
+        for _ in range(400):
+            text = f"{rng.randint(0, 3)}.{rng.randint(0, 5)}.{rng.randint(0, 5)}"
+            if rng.random() < 0.2:
+                text += f"-rc.{rng.randint(0, 3)}"
+            if text not in texts:
+                texts.add(text)
+                index.add(parse_version(text))
+        versions = [parse_version(t) for t in texts]
+
+        for _ in range(300):
+            base = f"{rng.randint(0, 3)}.{rng.randint(0, 5)}.{rng.randint(0, 5)}"
+            if rng.random() < 0.2:
+                base += "-rc.1"
+            spec = rng.choice(["^", "~", ""]) + base
+            version_range = parse_range(spec)
+            matching = [v for v in versions if version_range.contains(v)]
+            expected = max(matching) if matching else None
+
+            assert index.resolve(version_range) == expected, spec
@@ -0,0 +1,183 @@
+"""P1-T39: Reconciliation queue spill-to-disk tests.
+
+Test Coverage:
+- Items come out in FIFO order across the memory head and disk tail
+- Segments are deleted once read; spill_max_size_mb is enforced
+- Spilled items are recovered after a crash, resuming after the last read
+- A torn record ends its segment on recovery
+- Warning/critical level signals fire on threshold crossings
+
+Requirements: P1-R29
+Oracle: Consistency
+"""
+
+import asyncio
+import random
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+from autobiz.kernel.config import QUEUE_CONFIGS, QueueConfig, QueueFullError
+from autobiz.kernel.queues import SpillQueue
+
+
+def _config(path: Path, max_depth: int = 10, max_mb: int | None = None) -> QueueConfig:
+    return QueueConfig(
+        max_depth=max_depth,
+        overflow_strategy="SPILL_TO_DISK",
+        spill_path=str(path),
+        spill_max_size_mb=max_mb,
+    )
+
+
+def _segments(path: Path) -> list[str]:
+    return sorted(p.name for p in path.glob("*.seg"))
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestSpillQueue:
+    """P1-T39: FIFO, bounds and recovery of the spill queue."""
+
+    def test_fifo_across_memory_and_disk(self, tmp_path: Path) -> None:
+        """Random puts/gets at up to 10x max_depth match a plain deque."""
+        rng = random.Random(21)
+        queue: SpillQueue[dict[str, int]] = SpillQueue(
+            "reconciliation_queue", _config(tmp_path), segment_bytes=256
+        )
+        expected: deque[dict[str, int]] = deque()
+        for n in range(5000):
+            if rng.random() < 0.55 and len(expected) < 100:
+                item = {"n": n, "pad": rng.randrange(10**6)}
+                queue.put_nowait(item)
+                expected.append(item)
+            elif expected:
+                assert queue.get_nowait() == expected.popleft()
+            assert len(queue) == len(expected)
+        assert queue.get_many(1000) == list(expected)
+        with pytest.raises(asyncio.QueueEmpty):
+            queue.get_nowait()
+        queue.close()
+
+    def test_memory_first_then_spill(self, tmp_path: Path) -> None:
+        """Only items beyond max_depth go to disk; read segments are deleted."""
+        queue: SpillQueue[int] = SpillQueue("q", _config(tmp_path), segment_bytes=64)
+
+        for n in range(100):
+            queue.put_nowait(n)
+
+        assert queue.spilled == 90 and len(queue) == 100
+        assert len(_segments(tmp_path)) > 10
+        assert queue.get_many(100) == list(range(100))
+        assert len(_segments(tmp_path)) == 1
+        # Disk drained: new items are held in memory again
+        queue.put_nowait(100)
+        assert queue.spilled == 0
+        queue.close()
+
+    def test_spill_max_size_enforced(self, tmp_path: Path) -> None:
+        """A put that would exceed spill_max_size_mb is refused until disk drains."""
+        queue: SpillQueue[str] = SpillQueue(
+            "q", _config(tmp_path, max_depth=1, max_mb=1), segment_bytes=128 * 1024
+        )
+        item = "x" * 10_000
+        with pytest.raises(QueueFullError) as caught:
+            for _ in range(200):
+                queue.put_nowait(item)
+
+        assert caught.value.queue == "q"
+        assert queue.spill_bytes <= 1024 * 1024
+        held = len(queue)
+        assert 90 <= held < 200
+        assert len(queue.get_many(held)) == held
+        queue.put_nowait(item)
+        queue.put_nowait(item)
+        assert queue.spilled == 1
+        queue.close()
+
+    def test_oversized_item_gets_its_own_segment(self, tmp_path: Path) -> None:
+        """An item larger than segment_bytes is still spilled whole."""
+        queue: SpillQueue[str] = SpillQueue("q", _config(tmp_path, max_depth=1), segment_bytes=64)
+        queue.put_nowait("a")
+        queue.put_nowait("b" * 1000)
+        queue.put_nowait("c")
+
+        assert queue.get_many(3) == ["a", "b" * 1000, "c"]
+        queue.close()
+
+    def test_recovers_after_crash(self, tmp_path: Path) -> None:
+        """Reopening resumes after the last item read; memory items are lost."""
+        queue: SpillQueue[int] = SpillQueue("q", _config(tmp_path, max_depth=5), segment_bytes=96)
+        for n in range(40):
+            queue.put_nowait(n)
+        assert queue.get_many(12) == list(range(12))
+        # Crash: no close(), no flush()
+        del queue
+
+        reopened: SpillQueue[int] = SpillQueue(
+            "q", _config(tmp_path, max_depth=5), segment_bytes=96
+        )
+
+        assert reopened.recovered == 28
+        reopened.put_nowait(40)
+        assert reopened.get_many(100) == [*range(12, 40), 40]
+        reopened.close()
+
+    def test_torn_record_ends_segment(self, tmp_path: Path) -> None:
+        """A record failing its CRC, and everything after it, is dropped."""
+        queue: SpillQueue[str] = SpillQueue("q", _config(tmp_path, max_depth=1), segment_bytes=4096)
+        for item in ("a", "bb", "ccc", "dddd"):
+            queue.put_nowait(item)
+        queue.close()
+        segment = tmp_path / _segments(tmp_path)[0]
+        data = bytearray(segment.read_bytes())
+        # Records: "bb" at 0 (8 + 4 bytes), "ccc" at 12: flip a payload byte
+        data[12 + 8] ^= 0xFF
+        segment.write_bytes(bytes(data))
+
+        reopened: SpillQueue[str] = SpillQueue(
+            "q", _config(tmp_path, max_depth=1), segment_bytes=4096
+        )
+
+        assert reopened.recovered == 1
+        reopened.put_nowait("e")
+        assert reopened.get_many(10) == ["bb", "e"]
+        reopened.close()
+
+    def test_level_signals(self, tmp_path: Path) -> None:
+        """on_level fires once per crossing of 70% and 90% of max_depth, both ways."""
+        signals: list[tuple[str, str, int]] = []
+        queue: SpillQueue[int] = SpillQueue(
+            "q",
+            _config(tmp_path, max_depth=10),
+            on_level=lambda name, level, depth: signals.append((name, level, depth)),
+        )
+        for n in range(30):
+            queue.put_nowait(n)
+        assert signals == [("q", "WARNING", 7), ("q", "CRITICAL", 9)]
+
+        queue.get_many(22)
+        queue.get_many(2)
+        assert signals[2:] == [("q", "WARNING", 8), ("q", "OK", 6)]
+        queue.close()
+
+    def test_requires_spill_config(self, tmp_path: Path) -> None:
+        """Only SPILL_TO_DISK configurations are accepted."""
+        with pytest.raises(ValueError, match="SPILL_TO_DISK"):
+            SpillQueue("event_ordering_gate", QUEUE_CONFIGS["event_ordering_gate"])
+
+    def test_get_waits_for_put(self, tmp_path: Path) -> None:
+        """get() blocks until an item is put."""
+
+        async def scenario() -> None:
+            queue: SpillQueue[int] = SpillQueue("q", _config(tmp_path))
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.sleep(0)
+            assert not getter.done()
+            queue.put_nowait(7)
+            assert await asyncio.wait_for(getter, timeout=1) == 7
+            queue.close()
+
+        asyncio.run(scenario())
@@ -0,0 +1,480 @@
+"""P1-T14, P1-T15: Versioned state manager tests.
+
+Test Coverage:
+- RFC 7396 merge patch semantics (merge, delete, replace)
+- Each patch creates the next version; stale writes conflict
+- Snapshots are written every N versions or B patch bytes
+- Current state is one read; point-in-time reads replay only the tail
+- Replaying the full history reproduces the state byte for byte
+- Multi-entity commits are all or nothing and name every stale entity
+- Conflicting transactions retry with backoff until they commit
+
+Requirements: INV-06, P1-R08
+Oracle: Durability, Consistency
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.idempotency import CanonicalizationError
+from autobiz.kernel.state import (
+    ConflictRetry,
+    EntityKey,
+    EntityState,
+    InMemoryStateStore,
+    SnapshotPolicy,
+    StateBatchConflictError,
+    StateChange,
+    StateConflictError,
+    StateManager,
+    merge_patch,
+    retry_on_conflict,
+    state_hash,
+)
+
+ORDER = EntityKey("t_1", "order", "ord_1")
+PAYMENT = EntityKey("t_1", "payment", "pay_1")
+FULFILLMENT = EntityKey("t_1", "fulfillment", "ful_1")
+NO_WAIT = ConflictRetry(base_delay=0.0)
+T0 = datetime(2026, 2, 12, 9, 0, tzinfo=timezone.utc)
+
+
+def _clock() -> Any:
+    ticks = iter(range(10**6))
+    return lambda: T0 + timedelta(seconds=next(ticks))
+
+
+def _patch(rng: random.Random, n: int) -> dict[str, Any]:
+    choice = rng.randrange(4)
+    if choice == 0:
+        return {"status": rng.choice(["paid", "fulfilled", "refunded"]), "n": n}
+    if choice == 1:
+        return {"lines": {f"sku_{rng.randrange(5)}": {"qty": rng.randrange(1, 4), "price": 9.5}}}
+    if choice == 2:
+        return {"lines": {f"sku_{rng.randrange(5)}": None}}
+    return {"notes": [n, "gift"], "customer": {"email": None, "tier": rng.randrange(3)}}
+
+
+def _manager(store: InMemoryStateStore, **policy: int) -> StateManager:
+    return StateManager(store, SnapshotPolicy(**policy), clock=_clock())
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestMergePatch:
+    """P1-T14: RFC 7396 patch semantics."""
+
+    @pytest.mark.parametrize(
+        ("target", "patch", "expected"),
+        [
+            ({"a": "b"}, {"a": "c"}, {"a": "c"}),
+            ({"a": "b"}, {"b": "c"}, {"a": "b", "b": "c"}),
+            ({"a": "b"}, {"a": None}, {}),
+            ({"a": "b", "b": "c"}, {"a": None}, {"b": "c"}),
+            ({"a": ["b"]}, {"a": "c"}, {"a": "c"}),
+            ({"a": "c"}, {"a": ["b"]}, {"a": ["b"]}),
+            ({"a": {"b": "c"}}, {"a": {"b": "d", "c": None}}, {"a": {"b": "d"}}),
+            ({"a": [{"b": "c"}]}, {"a": [1]}, {"a": [1]}),
+            (["a", "b"], ["c", "d"], ["c", "d"]),
+            ({"a": "b"}, ["c"], ["c"]),
+            ({"a": "foo"}, "bar", "bar"),
+            ({"e": None}, {"a": 1}, {"e": None, "a": 1}),
+            ([1, 2], {"a": "b", "c": None}, {"a": "b"}),
+            ({}, {"a": {"bb": {"ccc": None}}}, {"a": {"bb": {}}}),
+        ],
+    )
+    def test_rfc7396_examples(self, target: Any, patch: Any, expected: Any) -> None:
+        """Appendix A test cases of RFC 7396."""
+        assert merge_patch(target, patch) == expected
+
+    def test_inputs_are_not_mutated(self) -> None:
+        """The target and patch are left untouched."""
+        target = {"a": {"b": 1}, "c": [1]}
+        patch = {"a": {"b": None, "d": 2}}
+
+        merge_patch(target, patch)
+
+        assert target == {"a": {"b": 1}, "c": [1]}
+        assert patch == {"a": {"b": None, "d": 2}}
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestStateManager:
+    """P1-T14/P1-T15: versions, snapshots and replay."""
+
+    def test_patch_creates_next_version(self) -> None:
+        """Each apply() increments the version and merges into current state."""
+
+        async def scenario() -> None:
+            manager = _manager(InMemoryStateStore())
+
+            first = await manager.apply(ORDER, {"status": "pending", "total": 12.5})
+            second = await manager.apply(ORDER, {"status": "paid"}, expected_version=1)
+
+            assert (first.version, second.version) == (1, 2)
+            assert second.state == {"status": "paid", "total": 12.5}
+            current = await manager.get(ORDER)
+            assert current is not None and current.state == second.state
+            assert await manager.get(EntityKey("t_1", "order", "other")) is None
+
+        asyncio.run(scenario())
+
+    def test_stale_expected_version_conflicts(self) -> None:
+        """A write based on an old version is rejected and writes nothing."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore()
+            manager = _manager(store)
+            await manager.apply(ORDER, {"status": "pending"})
+            await manager.apply(ORDER, {"status": "paid"})
+
+            with pytest.raises(StateConflictError) as exc:
+                await manager.apply(ORDER, {"status": "cancelled"}, expected_version=1)
+            assert (exc.value.expected_version, exc.value.actual_version) == (1, 2)
+            current = await manager.get(ORDER)
+            assert current is not None and current.version == 2
+
+        asyncio.run(scenario())
+
+    def test_store_commit_is_compare_and_swap(self) -> None:
+        """Two writes prepared against the same version: only one commits."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore()
+            manager = _manager(store)
+            await manager.apply(ORDER, {"status": "pending"})
+            current = await store.current(ORDER)
+
+            first = manager.prepare(ORDER, current, {"status": "paid"})
+            second = manager.prepare(ORDER, current, {"status": "cancelled"})
+            await store.commit(first)
+            with pytest.raises(StateConflictError):
+                await store.commit(second)
+
+            state = await manager.get(ORDER)
+            assert state is not None and state.state == {"status": "paid"}
+
+        asyncio.run(scenario())
+
+    def test_invalid_patch_rejected_before_write(self) -> None:
+        """Non-I-JSON patches never reach the store."""
+
+        async def scenario() -> None:
+            manager = _manager(InMemoryStateStore())
+            with pytest.raises(CanonicalizationError):
+                await manager.apply(ORDER, {"total": float("inf")})
+            assert await manager.get(ORDER) is None
+
+        asyncio.run(scenario())
+
+    def test_snapshot_every_n_versions(self) -> None:
+        """Snapshots land every every_versions versions."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore()
+            manager = _manager(store, every_versions=10, every_bytes=10**9)
+            for n in range(35):
+                await manager.apply(ORDER, {"n": n})
+
+            assert store.snapshot_versions(ORDER) == [10, 20, 30]
+
+        asyncio.run(scenario())
+
+    def test_snapshot_every_b_bytes(self) -> None:
+        """Large patches trigger snapshots before the version threshold."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore()
+            manager = _manager(store, every_versions=1000, every_bytes=1000)
+            for n in range(10):
+                await manager.apply(ORDER, {"blob": "x" * 400, "n": n})
+
+            # ~410 canonical bytes per patch: every third version crosses 1000
+            assert store.snapshot_versions(ORDER) == [3, 6, 9]
+
+        asyncio.run(scenario())
+
+    def test_current_read_is_one_row(self) -> None:
+        """get() cost does not grow with the version count."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore()
+            manager = _manager(store)
+            for n in range(500):
+                await manager.apply(ORDER, {"n": n})
+
+            store.rows_read = 0
+            state = await manager.get(ORDER)
+
+            assert state is not None and state.version == 500
+            assert store.rows_read == 1
+
+        asyncio.run(scenario())
+
+    def test_point_in_time_replays_only_tail(self) -> None:
+        """get_at() loads the nearest snapshot and at most N patches."""
+
+        async def scenario() -> None:
+            rng = random.Random(12)
+            store = InMemoryStateStore()
+            manager = _manager(store, every_versions=25)
+            for n in range(300):
+                await manager.apply(ORDER, _patch(rng, n))
+
+            for version in (1, 24, 25, 26, 137, 299, 300):
+                store.rows_read = 0
+                at = await manager.get_at(ORDER, version)
+                reference = await manager.replay(ORDER, version)
+
+                assert at.version == version
+                assert at.hash == reference.hash
+                assert store.rows_read - version <= 25  # replay read `version` rows
+
+        asyncio.run(scenario())
+
+    def test_point_in_time_bounds(self) -> None:
+        """Version 0 is the empty state; unknown versions are rejected."""
+
+        async def scenario() -> None:
+            manager = _manager(InMemoryStateStore())
+            await manager.apply(ORDER, {"status": "pending"})
+
+            assert (await manager.get_at(ORDER, 0)).state == {}
+            with pytest.raises(ValueError, match="no version 2"):
+                await manager.get_at(ORDER, 2)
+            with pytest.raises(ValueError):
+                await manager.get_at(ORDER, -1)
+
+        asyncio.run(scenario())
+
+    def test_replay_is_byte_identical(self) -> None:
+        """INV-06: replaying every patch reproduces the materialized state."""
+
+        async def scenario() -> None:
+            rng = random.Random(6)
+            store = InMemoryStateStore()
+            manager = _manager(store, every_versions=7, every_bytes=300)
+            keys = [EntityKey("t_1", "order", f"ord_{n}") for n in range(5)]
+            for n in range(400):
+                await manager.apply(rng.choice(keys), _patch(rng, n))
+
+            for key in keys:
+                assert await manager.verify_replay(key)
+                current = await manager.get(key)
+                replayed = await manager.replay(key)
+                assert current is not None
+                assert state_hash(current.state) == replayed.hash
+
+        asyncio.run(scenario())
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestMultiEntityCommit:
+    """P1-T14: atomic commits across entities and conflict retries."""
+
+    def test_commit_many_writes_every_entity(self) -> None:
+        """One read and one write call commit a version of each entity."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore()
+            manager = _manager(store)
+            await manager.apply(ORDER, {"status": "paid"})
+
+            store.round_trips = 0
+            states = await manager.commit_many(
+                [
+                    StateChange(ORDER, {"status": "fulfilling"}, expected_version=1),
+                    StateChange(PAYMENT, {"captured": True}, expected_version=0),
+                    StateChange(FULFILLMENT, {"status": "queued"}),
+                ]
+            )
+
+            assert [(s.key, s.version) for s in states] == [
+                (ORDER, 2),
+                (PAYMENT, 1),
+                (FULFILLMENT, 1),
+            ]
+            assert store.round_trips == 2
+            order = await manager.get(ORDER)
+            assert order is not None and order.state == {"status": "fulfilling"}
+            for key in (ORDER, PAYMENT, FULFILLMENT):
+                assert await manager.verify_replay(key)
+
+        asyncio.run(scenario())
+
+    def test_conflict_names_every_stale_entity_and_writes_nothing(self) -> None:
+        """A batch with stale entities is rejected whole, listing each of them."""
+
+        async def scenario() -> None:
+            manager = _manager(InMemoryStateStore())
+            for key in (ORDER, PAYMENT, FULFILLMENT):
+                await manager.apply(key, {"v": 1})
+            await manager.apply(ORDER, {"v": 2})
+            await manager.apply(FULFILLMENT, {"v": 2})
+
+            with pytest.raises(StateBatchConflictError) as exc:
+                await manager.commit_many(
+                    [
+                        StateChange(ORDER, {"v": 3}, expected_version=1),
+                        StateChange(PAYMENT, {"v": 2}, expected_version=1),
+                        StateChange(FULFILLMENT, {"v": 3}, expected_version=1),
+                    ]
+                )
+
+            assert exc.value.keys == [ORDER, FULFILLMENT]
+            assert [(c.expected_version, c.actual_version) for c in exc.value.conflicts] == [
+                (1, 2),
+                (1, 2),
+            ]
+            assert isinstance(exc.value, StateConflictError)
+            payment = await manager.get(PAYMENT)
+            assert payment is not None and payment.version == 1
+
+        asyncio.run(scenario())
+
+    def test_store_commit_many_is_compare_and_swap(self) -> None:
+        """Two batches prepared from the same read: the second is stale where they overlap."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore()
+            manager = _manager(store)
+            await manager.apply(ORDER, {"status": "paid"})
+            current = await store.current(ORDER)
+
+            first = [
+                manager.prepare(ORDER, current, {"status": "fulfilling"}),
+                manager.prepare(PAYMENT, None, {"captured": True}),
+            ]
+            second = [
+                manager.prepare(FULFILLMENT, None, {"status": "queued"}),
+                manager.prepare(ORDER, current, {"status": "cancelled"}),
+            ]
+            await store.commit_many(first)
+            with pytest.raises(StateBatchConflictError) as exc:
+                await store.commit_many(second)
+
+            assert exc.value.keys == [ORDER]
+            assert await manager.get(FULFILLMENT) is None
+
+        asyncio.run(scenario())
+
+    def test_duplicate_entities_rejected(self) -> None:
+        """An entity can change at most once per commit."""
+
+        async def scenario() -> None:
+            manager = _manager(InMemoryStateStore())
+            with pytest.raises(ValueError, match="once"):
+                await manager.commit_many(
+                    [StateChange(ORDER, {"a": 1}), StateChange(ORDER, {"b": 2})]
+                )
+            assert await manager.commit_many([]) == []
+
+        asyncio.run(scenario())
+
+    def test_transact_retries_after_conflict(self) -> None:
+        """A transaction that lost a race re-reads and commits on the next attempt."""
+
+        class RacingStore(InMemoryStateStore):
+            """Lets another writer commit right after the first read."""
+
+            raced = False
+
+            async def current_many(self, keys: Any) -> Any:
+                found = await super().current_many(keys)
+                if not self.raced:
+                    self.raced = True
+                    await StateManager(self).apply(ORDER, {"items": 5})
+                return found
+
+        async def scenario() -> None:
+            store = RacingStore()
+            manager = _manager(store)
+            await manager.apply(ORDER, {"items": 1})
+            seen: list[int] = []
+
+            def build(states: Any) -> dict[EntityKey, Any]:
+                order = states[ORDER]
+                seen.append(order.version)
+                assert states[PAYMENT] is None
+                return {
+                    ORDER: {"items": order.state["items"] + 1},
+                    PAYMENT: {"amount": order.state["items"] * 10},
+                }
+
+            states = await manager.transact([ORDER, PAYMENT], build, retry=NO_WAIT)
+
+            assert seen == [1, 2]
+            assert [(s.key, s.version) for s in states] == [(ORDER, 3), (PAYMENT, 1)]
+            assert [s.state for s in states] == [{"items": 6}, {"amount": 50}]
+
+        asyncio.run(scenario())
+
+    def test_retry_gives_up_after_max_retries(self) -> None:
+        """The last conflict propagates once retries are exhausted."""
+
+        async def scenario() -> None:
+            calls = 0
+
+            async def always_conflicts() -> None:
+                nonlocal calls
+                calls += 1
+                raise StateConflictError(ORDER, 1, 2)
+
+            with pytest.raises(StateConflictError):
+                await retry_on_conflict(
+                    always_conflicts, ConflictRetry(max_retries=2, base_delay=0)
+                )
+            assert calls == 3
+
+        asyncio.run(scenario())
+
+    def test_backoff_is_exponential_and_capped(self) -> None:
+        """Delays double from base_delay up to max_delay; jitter only shrinks them."""
+        policy = ConflictRetry(base_delay=0.1, max_delay=0.5, jitter=False)
+        assert [policy.delay(n) for n in range(1, 6)] == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+        jittered = ConflictRetry(base_delay=0.1, max_delay=0.5)
+        rng = random.Random(3)
+        assert all(0 <= jittered.delay(n, rng) <= policy.delay(n) for n in range(1, 6))
+
+    def test_concurrent_transfers_keep_totals(self) -> None:
+        """Concurrent transactions on hot entities lose no update."""
+
+        async def scenario() -> None:
+            store = InMemoryStateStore(latency=0.0001)
+            manager = StateManager(store, SnapshotPolicy(every_versions=10))
+            accounts = [EntityKey("t_1", "account", f"acc_{n}") for n in range(3)]
+            await manager.commit_many([StateChange(key, {"balance": 100}) for key in accounts])
+            rng = random.Random(8)
+
+            async def transfer(source: EntityKey, target: EntityKey) -> list[EntityState]:
+                def build(states: Any) -> dict[EntityKey, Any]:
+                    return {
+                        source: {"balance": states[source].state["balance"] - 1},
+                        target: {"balance": states[target].state["balance"] + 1},
+                    }
+
+                return await manager.transact(
+                    [source, target], build, retry=ConflictRetry(max_retries=100, base_delay=0.0005)
+                )
+
+            pairs = [rng.sample(accounts, 2) for _ in range(60)]
+            await asyncio.gather(*(transfer(a, b) for a, b in pairs))
+
+            balances = {key: (await manager.get(key)).state["balance"] for key in accounts}
+            assert sum(balances.values()) == 300
+            for key in accounts:
+                moved = sum((a == key) * -1 + (b == key) for a, b in pairs)
+                assert balances[key] == 100 + moved
+                assert await manager.verify_replay(key)
+
+        asyncio.run(scenario())
@@ -0,0 +1,253 @@
+"""P1-T33, P1-T34: Tenant-scoped connection pool tests.
+
+Test Coverage:
+- Every transaction sets the tenant context in its BEGIN message
+- A first statement without arguments shares that message
+- Rollback on error; no round trips for an unused transaction
+- Tenant ids are quoted safely into the context call
+- Per-tenant concurrency cap on the shared pool; dedicated pools
+- Wait-time, timeout and utilization metrics
+
+Requirements: INV-02, P1-R21
+Oracle: Permission (tenant context per transaction)
+"""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.db import (
+    SHARED,
+    TenantPool,
+    TenantPoolConfig,
+    begin_sql,
+    quote_literal,
+)
+
+
+class FakeConnection:
+    """Records each message sent (one round trip each)."""
+
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+
+    async def execute(self, query: str, *args: Any, timeout: float | None = None) -> str:
+        self.log.append(query)
+        await asyncio.sleep(0)
+        if "FAIL" in query:
+            raise RuntimeError("statement failed")
+        return "UPDATE 1"
+
+    async def fetch(self, query: str, *args: Any, timeout: float | None = None) -> list[Any]:
+        self.log.append(query)
+        await asyncio.sleep(0)
+        return [{"n": 1}]
+
+    async def fetchval(self, query: str, *args: Any, timeout: float | None = None) -> Any:
+        self.log.append(query)
+        return 1
+
+
+class FakePool:
+    """asyncpg.Pool stand-in with max_size connections."""
+
+    def __init__(self, max_size: int, log: list[str] | None = None) -> None:
+        self.log = log if log is not None else []
+        self.max_size = max_size
+        self.idle = [FakeConnection(self.log) for _ in range(max_size)]
+        self._free = asyncio.Semaphore(max_size)
+        self.closed = False
+
+    async def acquire(self) -> FakeConnection:
+        await self._free.acquire()
+        return self.idle.pop()
+
+    async def release(self, connection: FakeConnection) -> None:
+        self.idle.append(connection)
+        self._free.release()
+
+    def get_size(self) -> int:
+        return self.max_size
+
+    def get_idle_size(self) -> int:
+        return len(self.idle)
+
+    def get_max_size(self) -> int:
+        return self.max_size
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestTenantTransaction:
+    """P1-T33: Tenant context per transaction, in as few round trips as possible."""
+
+    def test_first_execute_shares_begin_message(self) -> None:
+        """BEGIN, the context call and an argument-less statement are one message."""
+
+        async def scenario() -> None:
+            shared = FakePool(2)
+            pool = TenantPool(shared)  # type: ignore[arg-type]
+            async with pool.transaction("t_1") as tx:
+                assert await tx.execute("UPDATE orders SET status = 'paid'") == "UPDATE 1"
+                await tx.execute("UPDATE orders SET total = $1", 5)
+
+            assert shared.log == [
+                "BEGIN; SELECT set_tenant_context(E't_1'); UPDATE orders SET status = 'paid'",
+                "UPDATE orders SET total = $1",
+                "COMMIT",
+            ]
+
+        asyncio.run(scenario())
+
+    def test_statement_with_arguments_follows_begin(self) -> None:
+        """A parameterized first statement costs one extra message, not two."""
+
+        async def scenario() -> None:
+            shared = FakePool(2)
+            pool = TenantPool(shared)  # type: ignore[arg-type]
+            async with pool.transaction("t_1", isolation="repeatable_read", readonly=True) as tx:
+                assert await tx.fetch("SELECT * FROM orders WHERE id = $1", "o1") == [{"n": 1}]
+                assert await tx.fetchval("SELECT 1") == 1
+
+            assert shared.log == [
+                "BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY;"
+                " SELECT set_tenant_context(E't_1')",
+                "SELECT * FROM orders WHERE id = $1",
+                "SELECT 1",
+                "COMMIT",
+            ]
+
+        asyncio.run(scenario())
+
+    def test_rollback_on_error_and_unused_transactions(self) -> None:
+        """Errors roll back; a transaction without statements sends nothing."""
+
+        async def scenario() -> None:
+            shared = FakePool(1)
+            pool = TenantPool(shared)  # type: ignore[arg-type]
+            with pytest.raises(RuntimeError, match="statement failed"):
+                async with pool.transaction("t_1") as tx:
+                    await tx.execute("FAIL")
+            assert shared.log[-1] == "ROLLBACK"
+
+            shared.log.clear()
+            async with pool.transaction("t_1"):
+                pass
+            assert shared.log == []
+            assert shared.get_idle_size() == 1 and pool.in_flight("t_1") == 0
+
+            with pytest.raises(RuntimeError, match="not active"):
+                await tx.fetch("SELECT 1")
+
+        asyncio.run(scenario())
+
+    def test_tenant_ids_are_quoted(self) -> None:
+        """Quotes and backslashes cannot escape the literal; NUL is refused."""
+        assert quote_literal("t_1") == "E't_1'"
+        assert quote_literal("x'); DROP TABLE orders; --") == "E'x''); DROP TABLE orders; --'"
+        assert quote_literal("a\\'b") == "E'a\\\\''b'"
+        assert begin_sql("t", "serializable") == (
+            "BEGIN ISOLATION LEVEL SERIALIZABLE; SELECT set_tenant_context(E't')"
+        )
+        with pytest.raises(ValueError, match="NUL"):
+            TenantPool(FakePool(1)).transaction("t\0")  # type: ignore[arg-type]
+        with pytest.raises(ValueError, match="empty"):
+            TenantPool(FakePool(1)).transaction("")  # type: ignore[arg-type]
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestTenantPool:
+    """P1-T34: Per-tenant limits, dedicated pools and metrics."""
+
+    def test_noisy_tenant_is_capped(self) -> None:
+        """A tenant over its cap queues; other tenants still get connections."""
+
+        async def scenario() -> None:
+            shared = FakePool(4)
+            pool = TenantPool(
+                shared, TenantPoolConfig(max_connections_per_tenant=2)  # type: ignore[arg-type]
+            )
+            release = asyncio.Event()
+
+            async def hold(tenant_id: str) -> None:
+                async with pool.transaction(tenant_id) as tx:
+                    await tx.execute("SELECT 1")
+                    await release.wait()
+
+            noisy = [asyncio.ensure_future(hold("t_noisy")) for _ in range(6)]
+            await asyncio.sleep(0.01)
+            assert pool.in_flight("t_noisy") == 6
+            assert pool.usage()[SHARED].in_use == 2
+            assert pool.stats.capped == 4
+
+            async def quiet() -> None:
+                async with pool.transaction("t_quiet") as tx:
+                    await tx.execute("SELECT 1")
+
+            await asyncio.wait_for(quiet(), timeout=1)
+            release.set()
+            await asyncio.gather(*noisy)
+            assert pool.in_flight("t_noisy") == 0
+            assert pool.stats.transactions == 7
+
+        asyncio.run(scenario())
+
+    def test_dedicated_pools(self) -> None:
+        """Listed tenants use their own pool; usage() reports every pool."""
+
+        async def scenario() -> None:
+            shared, vip = FakePool(4), FakePool(2)
+            pool = TenantPool(
+                shared,  # type: ignore[arg-type]
+                TenantPoolConfig(dedicated_pool_tenants=("t_vip",)),
+                dedicated={"t_vip": vip},  # type: ignore[dict-item]
+            )
+            async with pool.transaction("t_vip") as tx:
+                await tx.execute("SELECT 1")
+                usage = pool.usage()
+                assert usage["t_vip"].in_use == 1 and usage["t_vip"].utilization == 0.5
+                assert usage[SHARED].in_use == 0
+            assert vip.log and not shared.log
+            await pool.close()
+            assert shared.closed and vip.closed
+
+        asyncio.run(scenario())
+
+    def test_wait_metrics_and_timeout(self) -> None:
+        """Waits land in the histogram; a wait past the timeout raises and is counted."""
+
+        async def scenario() -> None:
+            pool = TenantPool(
+                FakePool(1),  # type: ignore[arg-type]
+                TenantPoolConfig(connection_timeout_seconds=0.02),
+            )
+            async with pool.transaction("t_1"):
+                with pytest.raises(asyncio.TimeoutError):
+                    async with pool.transaction("t_2"):
+                        pass
+                assert pool.in_flight("t_2") == 0
+
+            async with pool.transaction("t_2"):
+                pass
+            assert pool.stats.timeouts == 1
+            assert pool.stats.transactions == 2
+            assert sum(pool.stats.wait_histogram) == 2
+            assert pool.stats.wait_seconds_max < 0.02
+
+        asyncio.run(scenario())
+
+    def test_config_validation(self) -> None:
+        """Sizes must be consistent."""
+        with pytest.raises(ValueError):
+            TenantPoolConfig(shared_min_size=5, shared_max_size=2)
+        with pytest.raises(ValueError):
+            TenantPoolConfig(min_connections_per_tenant=3, max_connections_per_tenant=2)
+        with pytest.raises(ValueError):
+            TenantPoolConfig(connection_timeout_seconds=0)
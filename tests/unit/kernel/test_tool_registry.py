@@ -10,14 +10,24 @@ Requirements: INV-01, P1-R01, P1-R18
 Oracle: Schema (deterministic validation)
 """
 
+import json
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Any
 
 import pytest
+from pydantic import ValidationError
 
+from autobiz.kernel.executor.contract_manifest import ContractSource, ManifestError
 from autobiz.kernel.executor.schema_validator import (
     SchemaValidationError,
     SchemaValidator,
     ValidationErrorCode,
+    ValidationMode,
 )
+from autobiz.kernel.executor.semver import SemVerError
 from autobiz.kernel.executor.tool_contract import ToolContract
 from autobiz.kernel.executor.tool_registry import ToolNotFoundError, ToolRegistry
 
@@ -237,3 +247,502 @@ class TestToolRegistryWithValidation:
         invalid_input = {"product_id": "prod_123"}  # Missing quantity
         with pytest.raises(SchemaValidationError):
             validator.validate(invalid_input, retrieved_tool.input_schema)
+
+
+def _make_order_tool(version: str = "1.0.0") -> ToolContract:
+    return ToolContract(
+        name="create_order",
+        version=version,
+        input_schema={
+            "type": "object",
+            "properties": {"product_id": {"type": "string"}, "quantity": {"type": "integer"}},
+            "required": ["product_id", "quantity"],
+        },
+        output_schema={
+            "type": "object",
+            "properties": {"order_id": {"type": "string"}},
+            "required": ["order_id"],
+        },
+        side_effect_level="HARD_WRITE",
+        timeout_seconds=60,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.oracle_schema
+class TestCompiledValidators:
+    """Precompiled validators cached per (name, version)."""
+
+    def test_validate_input_and_output_by_name_version(self) -> None:
+        """Registered tool validates input/output without passing schemas around."""
+        registry = ToolRegistry()
+        registry.register(_make_order_tool())
+
+        registry.validate_input("create_order", "1.0.0", {"product_id": "p1", "quantity": 2})
+        registry.validate_output("create_order", "1.0.0", {"order_id": "o1"})
+
+        with pytest.raises(SchemaValidationError) as exc_info:
+            registry.validate_input("create_order", "1.0.0", {"product_id": "p1"})
+        assert exc_info.value.code == ValidationErrorCode.SCHEMA_INVALID
+        assert "quantity" in exc_info.value.message
+
+        with pytest.raises(SchemaValidationError) as exc_info:
+            registry.validate_output("create_order", "1.0.0", {"order_id": 7})
+        assert exc_info.value.code == ValidationErrorCode.SCHEMA_INVALID
+        assert exc_info.value.path == "order_id"
+
+    def test_compiled_errors_match_uncompiled_validate(self) -> None:
+        """Compiled path reports the same error as SchemaValidator.validate."""
+        registry = ToolRegistry()
+        tool = _make_order_tool()
+        registry.register(tool)
+        data = {"product_id": 5, "quantity": "two"}
+
+        with pytest.raises(SchemaValidationError) as direct:
+            SchemaValidator().validate(data, tool.input_schema)
+        with pytest.raises(SchemaValidationError) as compiled:
+            registry.validate_input("create_order", "1.0.0", data)
+
+        assert compiled.value.code == direct.value.code
+        assert compiled.value.message == direct.value.message
+        assert compiled.value.path == direct.value.path
+        assert compiled.value.schema_path == direct.value.schema_path
+
+    def test_register_rejects_malformed_schema(self) -> None:
+        """Malformed schemas fail at registration with SCHEMA_MALFORMED."""
+        registry = ToolRegistry()
+        tool = ToolContract(
+            name="bad_tool",
+            version="1.0.0",
+            input_schema={"type": "object"},
+            output_schema={"type": "not_a_type"},
+            side_effect_level="READ",
+            timeout_seconds=30,
+        )
+
+        with pytest.raises(SchemaValidationError) as exc_info:
+            registry.register(tool)
+
+        assert exc_info.value.code == ValidationErrorCode.SCHEMA_MALFORMED
+        with pytest.raises(ToolNotFoundError):
+            registry.lookup("bad_tool", "1.0.0")
+
+    def test_validate_unknown_tool_raises_not_found(self) -> None:
+        """Validation against an unregistered tool raises ToolNotFoundError."""
+        registry = ToolRegistry()
+
+        with pytest.raises(ToolNotFoundError):
+            registry.validate_input("missing", "1.0.0", {})
+
+    def test_evicted_validators_are_recompiled(self) -> None:
+        """Cache stays bounded; evicted tools still validate correctly."""
+        registry = ToolRegistry(max_compiled=2)
+        for minor in range(4):
+            registry.register(_make_order_tool(f"1.{minor}.0"))
+
+        assert len(registry._compiled) == 2
+
+        registry.validate_input("create_order", "1.0.0", {"product_id": "p", "quantity": 1})
+        with pytest.raises(SchemaValidationError):
+            registry.validate_input("create_order", "1.0.0", {"product_id": "p"})
+
+        assert len(registry._compiled) == 2
+        assert ("create_order", "1.0.0") in registry._compiled
+
+    def test_cache_hits_do_not_mutate_cache(self) -> None:
+        """Hits only read the cache; eviction follows compile order."""
+        registry = ToolRegistry(max_compiled=2)
+        registry.register(_make_order_tool("1.0.0"))
+        registry.register(_make_order_tool("1.1.0"))
+        before = list(registry._compiled)
+
+        registry.validate_input("create_order", "1.0.0", {"product_id": "p", "quantity": 1})
+        assert list(registry._compiled) == before
+
+        registry.register(_make_order_tool("1.2.0"))
+        assert ("create_order", "1.0.0") not in registry._compiled
+
+    def test_max_compiled_must_be_positive(self) -> None:
+        """A zero-sized cache is a configuration error."""
+        with pytest.raises(ValueError):
+            ToolRegistry(max_compiled=0)
+
+
+LINE_ITEMS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"sku": {"type": "string"}, "quantity": {"type": "integer"}},
+                "required": ["sku", "quantity"],
+            },
+        }
+    },
+    "required": ["items"],
+}
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.oracle_schema
+class TestValidationModes:
+    """FAIL_FAST, FULL_REPORT and the is_valid fast path."""
+
+    def test_fail_fast_reports_first_violation_only(self) -> None:
+        """Default mode raises on the first violation and carries just that one."""
+        validator = SchemaValidator()
+        data = {"items": [{"sku": 1, "quantity": 1}, {"sku": "b"}, {"quantity": "x"}]}
+
+        with pytest.raises(SchemaValidationError) as exc_info:
+            validator.validate(data, LINE_ITEMS_SCHEMA)
+
+        error = exc_info.value
+        assert error.code == ValidationErrorCode.SCHEMA_INVALID
+        assert error.path == "items.0.sku"
+        assert len(error.violations) == 1
+        assert error.violations[0].path == error.path
+
+    def test_full_report_collects_every_violation(self) -> None:
+        """FULL_REPORT keeps the first error as headline and lists all of them."""
+        validator = SchemaValidator()
+        data = {"items": [{"sku": 1, "quantity": 1}, {"sku": "b"}, {"quantity": "x"}]}
+
+        with pytest.raises(SchemaValidationError) as exc_info:
+            validator.validate(data, LINE_ITEMS_SCHEMA, mode=ValidationMode.FULL_REPORT)
+
+        error = exc_info.value
+        paths = sorted(v.path for v in error.violations)
+        assert paths == ["items.0.sku", "items.1", "items.2", "items.2.quantity"]
+        assert error.path == error.violations[0].path
+        assert {v.keyword for v in error.violations} == {"type", "required"}
+        assert error.violations[0].to_dict()["schema_path"] == error.schema_path
+
+    def test_modes_agree_on_headline_error(self) -> None:
+        """Both modes report the same first error fields."""
+        validator = SchemaValidator()
+        compiled = validator.compile(LINE_ITEMS_SCHEMA)
+        data = {"items": [{"sku": "a"}, {"sku": 2, "quantity": 1}]}
+
+        errors = []
+        for mode in ValidationMode:
+            with pytest.raises(SchemaValidationError) as exc_info:
+                validator.validate_compiled(data, compiled, mode=mode)
+            errors.append(exc_info.value)
+
+        fail_fast, full = errors
+        assert (fail_fast.message, fail_fast.path, fail_fast.schema_path) == (
+            full.message,
+            full.path,
+            full.schema_path,
+        )
+
+    @pytest.mark.parametrize("backend", ["jsonschema", "compiled"])
+    def test_is_valid_and_collect_violations(self, backend: str) -> None:
+        """is_valid/collect_violations accept raw or compiled schemas and never raise."""
+        validator = SchemaValidator(backend=backend)  # type: ignore[arg-type]
+        compiled = validator.compile(LINE_ITEMS_SCHEMA)
+        valid = {"items": [{"sku": "a", "quantity": 1}]}
+        invalid = {"items": [{"sku": "a"}, {}]}
+
+        for schema in (LINE_ITEMS_SCHEMA, compiled):
+            assert validator.is_valid(valid, schema)
+            assert not validator.is_valid(invalid, schema)
+            assert validator.collect_violations(valid, schema) == []
+            assert len(validator.collect_violations(invalid, schema)) == 3
+
+    @pytest.mark.parametrize(
+        "schema",
+        [{"type": "nonsense"}, {"properties": 5}, {"$ref": "#/definitions/missing"}],
+    )
+    def test_is_valid_raises_on_malformed_schema(self, schema: dict[str, Any]) -> None:
+        """A malformed schema is SCHEMA_MALFORMED, not a False verdict on the data."""
+        validator = SchemaValidator()
+
+        with pytest.raises(SchemaValidationError) as exc_info:
+            validator.is_valid({"a": 1}, schema)
+
+        assert exc_info.value.code == ValidationErrorCode.SCHEMA_MALFORMED
+
+    def test_registry_full_report(self) -> None:
+        """ToolRegistry passes the mode through to the compiled validator."""
+        registry = ToolRegistry()
+        registry.register(_make_order_tool())
+
+        with pytest.raises(SchemaValidationError) as exc_info:
+            registry.validate_input("create_order", "1.0.0", {}, mode=ValidationMode.FULL_REPORT)
+
+        assert len(exc_info.value.violations) == 2
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestVersionResolution:
+    """SemVer-aware resolve() and zero-copy list_tools()."""
+
+    def _registry(self, *versions: str) -> ToolRegistry:
+        registry = ToolRegistry()
+        for version in versions:
+            registry.register(_make_order_tool(version))
+        return registry
+
+    def test_resolve_latest_caret_and_tilde(self) -> None:
+        """Ranges resolve to the highest matching registered contract."""
+        registry = self._registry("1.0.0", "1.4.2", "1.10.0", "2.0.0", "2.1.0-rc.1")
+
+        assert registry.resolve("create_order").version == "2.0.0"
+        assert registry.resolve("create_order", "^1.0").version == "1.10.0"
+        assert registry.resolve("create_order", "~1.4").version == "1.4.2"
+        assert registry.resolve("create_order", "1.4.2").version == "1.4.2"
+        assert registry.list_versions("create_order") == [
+            "1.0.0",
+            "1.4.2",
+            "1.10.0",
+            "2.0.0",
+            "2.1.0-rc.1",
+        ]
+
+    def test_resolve_unmatched_raises_not_found(self) -> None:
+        """No matching version (or unknown tool) raises ToolNotFoundError."""
+        registry = self._registry("1.0.0")
+
+        with pytest.raises(ToolNotFoundError) as exc_info:
+            registry.resolve("create_order", "^2")
+        assert "^2" in str(exc_info.value)
+
+        with pytest.raises(ToolNotFoundError):
+            registry.resolve("unknown_tool")
+        assert registry.list_versions("unknown_tool") == []
+
+    def test_register_rejects_non_semver_version(self) -> None:
+        """Contract versions must be SemVer so they can be indexed."""
+        registry = ToolRegistry()
+
+        with pytest.raises(SemVerError):
+            registry.register(_make_order_tool("v1"))
+
+    def test_list_tools_is_read_only_snapshot_view(self) -> None:
+        """list_tools() does not copy and cannot be mutated by callers."""
+        registry = self._registry("1.0.0")
+        view = registry.list_tools()
+
+        assert view is registry.list_tools()
+        registry.register(_make_order_tool("1.1.0"))
+
+        assert ("create_order", "1.1.0") not in view
+        assert ("create_order", "1.1.0") in registry.list_tools()
+        with pytest.raises(TypeError):
+            view[("x", "1.0.0")] = _make_order_tool()  # type: ignore[index]
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestSnapshotsAndReload:
+    """Copy-on-write snapshots and atomic hot reload."""
+
+    def test_snapshot_is_immutable_after_register(self) -> None:
+        """A held snapshot keeps resolving to the contracts it was taken with."""
+        registry = ToolRegistry()
+        registry.register(_make_order_tool("1.0.0"))
+        before = registry.snapshot()
+
+        registry.register(_make_order_tool("1.1.0"))
+
+        assert before.resolve("create_order").version == "1.0.0"
+        assert registry.resolve("create_order").version == "1.1.0"
+        assert registry.snapshot().generation == before.generation + 1
+
+    def test_contracts_are_frozen(self) -> None:
+        """Contracts shared between snapshots cannot be mutated in place."""
+        tool = _make_order_tool()
+
+        with pytest.raises(ValidationError):
+            tool.version = "9.9.9"  # type: ignore[misc]
+
+    def test_register_many_is_all_or_nothing(self) -> None:
+        """A bad contract in the batch leaves the registry unchanged."""
+        registry = ToolRegistry()
+        registry.register(_make_order_tool("1.0.0"))
+        bad = _make_order_tool("2.0.0").model_copy(update={"output_schema": {"type": "not-a-type"}})
+
+        with pytest.raises(SchemaValidationError):
+            registry.register_many([_make_order_tool("1.1.0"), bad])
+        with pytest.raises(ValueError):
+            registry.register_many([_make_order_tool("1.2.0"), _make_order_tool("1.0.0")])
+
+        assert registry.list_versions("create_order") == ["1.0.0"]
+
+    def test_reload_replaces_all_tools(self) -> None:
+        """reload() swaps in exactly the new set."""
+        registry = ToolRegistry()
+        registry.register_many([_make_order_tool("1.0.0"), _make_order_tool("1.1.0")])
+
+        registry.reload([_make_order_tool("2.0.0")])
+
+        assert registry.list_versions("create_order") == ["2.0.0"]
+        with pytest.raises(ToolNotFoundError):
+            registry.lookup("create_order", "1.0.0")
+
+    def test_failed_reload_keeps_current_snapshot(self) -> None:
+        """Malformed schemas are caught before the swap."""
+        registry = ToolRegistry()
+        registry.register(_make_order_tool("1.0.0"))
+        current = registry.snapshot()
+        bad = _make_order_tool("2.0.0").model_copy(
+            update={"input_schema": {"type": "object", "required": "id"}}
+        )
+
+        with pytest.raises(SchemaValidationError):
+            registry.reload([bad])
+
+        assert registry.snapshot() is current
+
+    def test_reload_recompiles_replaced_contract(self) -> None:
+        """A cached validator is not reused for a contract replaced by reload."""
+        registry = ToolRegistry()
+        registry.register(_make_order_tool("1.0.0"))
+        registry.validate_input("create_order", "1.0.0", {"product_id": "p1", "quantity": 1})
+        strict = _make_order_tool("1.0.0").model_copy(
+            update={"input_schema": {"type": "object", "required": ["customer_id"]}}
+        )
+
+        registry.reload([strict])
+
+        with pytest.raises(SchemaValidationError):
+            registry.validate_input("create_order", "1.0.0", {"product_id": "p1", "quantity": 1})
+
+    def test_reload_directory(self, tmp_path: Path) -> None:
+        """Manifest directories load in filename order; bad files raise ManifestError."""
+        (tmp_path / "a.json").write_text(
+            json.dumps(
+                [_make_order_tool("1.0.0").model_dump(), _make_order_tool("1.1.0").model_dump()]
+            )
+        )
+        (tmp_path / "b.json").write_text(json.dumps(_make_order_tool("2.0.0").model_dump()))
+        registry = ToolRegistry()
+
+        registry.reload_directory(tmp_path)
+        assert registry.list_versions("create_order") == ["1.0.0", "1.1.0", "2.0.0"]
+
+        (tmp_path / "c.json").write_text(json.dumps({"name": "broken"}))
+        with pytest.raises(ManifestError):
+            registry.reload_directory(tmp_path)
+        assert registry.list_versions("create_order") == ["1.0.0", "1.1.0", "2.0.0"]
+
+    def test_concurrent_readers_see_whole_snapshots(self) -> None:
+        """Readers racing reloads always see one complete generation."""
+        registry = ToolRegistry()
+        generations = [
+            [_make_order_tool(f"{major}.{minor}.0") for minor in range(5)] for major in (1, 2)
+        ]
+        registry.reload(generations[0])
+        stop = threading.Event()
+        failures: list[str] = []
+
+        def reader() -> None:
+            while not stop.is_set():
+                snapshot = registry.snapshot()
+                majors = {key[1].split(".")[0] for key in snapshot.tools}
+                if len(majors) != 1 or len(snapshot.tools) != 5:
+                    failures.append(repr(sorted(snapshot.tools)))
+                snapshot.resolve("create_order", "latest")
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(200):
+            registry.reload(generations[i % 2])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        assert failures == []
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestLazyContracts:
+    """ContractSource declarations parsed and compiled on first lookup."""
+
+    def _counting_source(self, version: str, loads: list[str]) -> ContractSource:
+        def loader() -> ToolContract:
+            loads.append(version)
+            return _make_order_tool(version)
+
+        return ContractSource("create_order", version, "test", loader)
+
+    def test_sources_load_on_first_lookup_only(self) -> None:
+        """Registering and resolving versions does not parse untouched contracts."""
+        loads: list[str] = []
+        registry = ToolRegistry()
+        registry.register_many(self._counting_source(v, loads) for v in ("1.0.0", "1.1.0"))
+
+        assert registry.list_versions("create_order") == ["1.0.0", "1.1.0"]
+        assert loads == []
+
+        assert registry.resolve("create_order").version == "1.1.0"
+        registry.validate_input("create_order", "1.1.0", {"product_id": "p1", "quantity": 1})
+        registry.lookup("create_order", "1.1.0")
+        assert loads == ["1.1.0"]
+
+    def test_lazy_load_survives_snapshot_swaps(self) -> None:
+        """A source loaded through one snapshot is not reloaded by the next."""
+        loads: list[str] = []
+        registry = ToolRegistry()
+        registry.register(self._counting_source("1.0.0", loads))
+        registry.lookup("create_order", "1.0.0")
+
+        registry.register(_make_order_tool("2.0.0"))
+        registry.lookup("create_order", "1.0.0")
+
+        assert loads == ["1.0.0"]
+
+    def test_malformed_lazy_contract_fails_on_lookup(self, tmp_path: Path) -> None:
+        """Bad schemas surface at first lookup, and are not cached as loaded."""
+        bad = _make_order_tool("1.0.0").model_dump()
+        bad["input_schema"] = {"type": "object", "required": "product_id"}
+        (tmp_path / "tools.json").write_text(json.dumps(bad))
+        registry = ToolRegistry()
+
+        registry.reload_directory(tmp_path, lazy=True)
+        assert registry.list_versions("create_order") == ["1.0.0"]
+
+        for _ in range(2):
+            with pytest.raises(SchemaValidationError) as exc_info:
+                registry.lookup("create_order", "1.0.0")
+            assert exc_info.value.code == ValidationErrorCode.SCHEMA_MALFORMED
+
+    def test_import_defers_pydantic_and_jsonschema(self) -> None:
+        """Importing the executor and registering sources loads neither library."""
+        code = (
+            "import sys\n"
+            "from autobiz.kernel.executor import ContractSource, ToolRegistry\n"
+            "registry = ToolRegistry()\n"
+            "registry.register(ContractSource('t', '1.0.0', 'x', lambda: None))\n"
+            "registry.list_versions('t')\n"
+            "print(sorted(m for m in ('pydantic', 'jsonschema') if m in sys.modules))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    def test_batch_validator_import_defers_pydantic(self) -> None:
+        """validate_many on a plain schema never imports pydantic."""
+        code = (
+            "import sys\n"
+            "from autobiz.kernel.executor import validate_many\n"
+            "result = validate_many([1, 'x'], {'type': 'integer'})\n"
+            "print('pydantic' in sys.modules, list(result.statuses))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == "False [0, 1]"
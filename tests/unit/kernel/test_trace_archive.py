@@ -0,0 +1,290 @@
+"""P1-T09, P1-T10: Warm-tier trace archive tests.
+
+Test Coverage:
+- Archived runs are fetched by correlation_id from a single frame
+- Segments follow the {tenant}/{YYYY}/{MM}/{DD} object-store layout
+- Time-range queries skip frames outside the range
+- Bulk export streams every archived trace as NDJSON
+- Re-archiving a batch does not duplicate traces
+- A fresh archive instance reads indexes written by another; fetch misses
+  rescan index files at most once per refresh interval
+- The index holds per-frame Bloom filters, not an entry per trace
+- One instance can be written from a worker thread while it is read
+- The archiver writes segments before deleting hot rows
+
+Requirements: INV-04, P1-R05
+Oracle: Trace (deterministic persistence)
+"""
+
+import asyncio
+import io
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.trace import TraceArchive, TraceArchiveError, TraceArchiver
+from autobiz.kernel.trace import archive as archive_module
+
+T0 = datetime(2026, 2, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def _trace(n: int, tenant_id: str = "t_1", started_at: datetime | None = None) -> dict[str, Any]:
+    started = started_at if started_at is not None else T0 + timedelta(minutes=n)
+    return {
+        "trace_id": str(uuid.UUID(int=n)),
+        "tenant_id": tenant_id,
+        "correlation_id": f"corr-{n}",
+        "execution_id": str(uuid.UUID(int=10_000 + n)),
+        "status": "COMPLETED",
+        "cost_cents": n % 7,
+        "started_at": started,
+        "completed_at": started + timedelta(seconds=30),
+        "steps": [{"seq": s, "thought": f"step {s} of run {n}"} for s in range(20)],
+        "tool_calls": [{"tool": "shopify_get_order", "input": {"order_id": n}}],
+        "state_diffs": [],
+    }
+
+
+class FakePool:
+    """asyncpg.Pool stand-in serving aged traces and recording deletes."""
+
+    def __init__(self, rows: list[dict[str, Any]]) -> None:
+        self.rows = rows
+        self.deleted: list[Any] = []
+
+    async def fetch(self, sql: str, cutoff: datetime, limit: int) -> list[dict[str, Any]]:
+        aged = [
+            r for r in self.rows if r["started_at"] < cutoff and r["trace_id"] not in self.deleted
+        ]
+        return aged[:limit]
+
+    async def execute(self, sql: str, trace_ids: list[Any]) -> None:
+        assert sql.startswith("DELETE FROM traces")
+        self.deleted.extend(trace_ids)
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestTraceArchive:
+    """P1-T09/P1-T10: warm-tier segments with a sparse index."""
+
+    def test_fetch_by_correlation_reads_one_frame(self, tmp_path: Path) -> None:
+        """A single run comes back intact after decompressing only its frame."""
+        archive = TraceArchive(tmp_path, frame_bytes=4096)
+        (index,) = archive.write(_trace(n) for n in range(200))
+        assert len(index.frames) > 10
+
+        document = archive.fetch("t_1", "corr-123")
+
+        assert document is not None
+        assert document["trace_id"] == str(uuid.UUID(int=123))
+        assert document["steps"][19] == {"seq": 19, "thought": "step 19 of run 123"}
+        assert document["started_at"] == (T0 + timedelta(minutes=123)).isoformat()
+        assert archive.frames_read == 1
+
+    def test_unknown_run_is_none(self, tmp_path: Path) -> None:
+        """Fetching a run that was never archived returns None."""
+        archive = TraceArchive(tmp_path)
+        archive.write([_trace(1)])
+
+        assert archive.fetch("t_1", "corr-missing") is None
+        assert archive.fetch("t_2", "corr-1") is None
+
+    def test_segments_use_object_store_layout(self, tmp_path: Path) -> None:
+        """One segment per tenant and UTC day, under tenant/YYYY/MM/DD."""
+        archive = TraceArchive(tmp_path)
+        documents = [_trace(1), _trace(2, started_at=T0 + timedelta(days=1)), _trace(3, "t_2")]
+
+        indexes = archive.write(documents)
+
+        relative = sorted(str(i.path.parent.relative_to(tmp_path)) for i in indexes)
+        assert relative == ["t_1/2026/02/01", "t_1/2026/02/02", "t_2/2026/02/01"]
+        for index in indexes:
+            assert index.path.with_suffix(".idx.json").exists()
+            assert index.stored_bytes == index.path.stat().st_size
+
+    def test_compresses_trace_documents(self, tmp_path: Path) -> None:
+        """Stored frames are much smaller than the raw JSON."""
+        archive = TraceArchive(tmp_path)
+        (index,) = archive.write(_trace(n) for n in range(300))
+
+        assert index.trace_count == 300
+        assert index.stored_bytes * 5 < index.raw_bytes
+
+    def test_time_range_skips_other_frames(self, tmp_path: Path) -> None:
+        """find() only decompresses frames overlapping the range."""
+        archive = TraceArchive(tmp_path, frame_bytes=4096)
+        (index,) = archive.write(_trace(n) for n in range(200))
+
+        start, end = T0 + timedelta(minutes=50), T0 + timedelta(minutes=60)
+        found = list(archive.find("t_1", start, end))
+
+        assert [d["correlation_id"] for d in found] == [f"corr-{n}" for n in range(50, 60)]
+        assert archive.frames_read <= 3 < len(index.frames)
+
+    def test_export_streams_all_traces(self, tmp_path: Path) -> None:
+        """Bulk export writes one JSON document per line, every tenant, in time order."""
+        archive = TraceArchive(tmp_path, frame_bytes=4096)
+        archive.write([_trace(n) for n in range(50)] + [_trace(n, "t_2") for n in range(50, 60)])
+        out = io.BytesIO()
+
+        exported = archive.export(out)
+
+        lines = out.getvalue().splitlines()
+        assert exported == len(lines) == 60
+        assert [json.loads(line)["correlation_id"] for line in lines[:50]] == [
+            f"corr-{n}" for n in range(50)
+        ]
+
+    def test_export_with_tenant_and_range(self, tmp_path: Path) -> None:
+        """Export can be narrowed to a tenant and a time range."""
+        archive = TraceArchive(tmp_path)
+        archive.write([_trace(n) for n in range(30)] + [_trace(n, "t_2") for n in range(30)])
+        out = io.BytesIO()
+
+        exported = archive.export(out, "t_2", start=T0 + timedelta(minutes=10))
+
+        assert exported == 20
+        assert {json.loads(line)["tenant_id"] for line in out.getvalue().splitlines()} == {"t_2"}
+
+    def test_rearchiving_does_not_duplicate(self, tmp_path: Path) -> None:
+        """A batch archived twice (crash before the hot delete) is stored once."""
+        archive = TraceArchive(tmp_path)
+        archive.write(_trace(n) for n in range(10))
+
+        second = archive.write(_trace(n) for n in range(15))
+
+        assert [index.trace_count for index in second] == [5]
+        assert archive.export(io.BytesIO()) == 15
+
+    def test_fresh_instance_reads_existing_indexes(self, tmp_path: Path) -> None:
+        """Indexes on disk are loaded by another process's archive."""
+        TraceArchive(tmp_path, frame_bytes=2048).write(_trace(n) for n in range(40))
+
+        reader = TraceArchive(tmp_path)
+        document = reader.fetch("t_1", "corr-33")
+
+        assert document is not None and document["correlation_id"] == "corr-33"
+        assert reader.frames_read == 1
+
+    def test_fetch_miss_rescans_once_per_interval(self, tmp_path: Path) -> None:
+        """Misses do not glob the tenant's index files on every call."""
+        reader = TraceArchive(tmp_path, refresh_interval=3600)
+        reader.write([_trace(1)])
+        scans = 0
+        refresh = reader.refresh
+
+        def counting_refresh(tenant_id: str) -> None:
+            nonlocal scans
+            scans += 1
+            refresh(tenant_id)
+
+        reader.refresh = counting_refresh  # type: ignore[method-assign]
+        for _ in range(5):
+            assert reader.fetch("t_1", "corr-missing") is None
+        assert scans == 0
+
+        TraceArchive(tmp_path).write([_trace(2)])
+        assert reader.fetch("t_1", "corr-2") is None
+        reader.refresh_interval = 0
+        assert reader.fetch("t_1", "corr-2") is not None
+        assert scans == 1
+
+    def test_index_is_sparse(self, tmp_path: Path) -> None:
+        """The index has one entry per frame and a few bytes per trace."""
+        archive = TraceArchive(tmp_path)
+        (index,) = archive.write(
+            _trace(n, started_at=T0 + timedelta(seconds=n)) for n in range(1000)
+        )
+
+        data = json.loads(index.path.with_suffix(".idx.json").read_bytes())
+
+        assert set(data) == {"version", "tenant_id", "day", "codec", "raw_bytes", "frames"}
+        assert len(data["frames"]) == len(index.frames) < 10
+        assert len(json.dumps(data)) < 3 * 1000
+        misses = sum(len(index.frames_for(f"corr-x{n}")) for n in range(1000))
+        assert misses < 0.03 * 1000 * len(index.frames)
+
+    def test_write_from_thread_while_fetching(self, tmp_path: Path) -> None:
+        """Writes in a worker thread (as TraceArchiver does) race safely with fetches."""
+        archive = TraceArchive(tmp_path, frame_bytes=2048)
+        archive.write(_trace(n) for n in range(5000, 5010))
+        errors: list[BaseException] = []
+
+        def writer() -> None:
+            try:
+                for batch in range(20):
+                    day = T0 + timedelta(days=batch + 1)
+                    archive.write(
+                        _trace(n, started_at=day) for n in range(100 * batch, 100 * batch + 100)
+                    )
+            except BaseException as e:  # surfaced below
+                errors.append(e)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        while thread.is_alive():
+            assert archive.fetch("t_1", "corr-5003") is not None
+        thread.join()
+
+        assert errors == []
+        assert archive.export(io.BytesIO()) == 2010
+        assert archive.fetch("t_1", "corr-1999") is not None
+
+    def test_zlib_fallback(self, tmp_path: Path) -> None:
+        """zlib segments are readable regardless of the default codec."""
+        archive = TraceArchive(tmp_path, codec="zlib")
+        (index,) = archive.write(_trace(n) for n in range(5))
+
+        assert index.codec == "zlib"
+        assert TraceArchive(tmp_path).fetch("t_1", "corr-4") is not None
+
+    def test_zstd_requires_zstandard(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Asking for zstd without the package fails clearly."""
+        monkeypatch.setattr(archive_module, "_zstd", None)
+
+        assert archive_module.default_codec() == "zlib"
+        with pytest.raises(TraceArchiveError, match="zstandard"):
+            TraceArchive(tmp_path, codec="zstd")
+
+    def test_rejects_unsafe_tenant_and_missing_fields(self, tmp_path: Path) -> None:
+        """Tenant ids become path segments; documents need the index fields."""
+        archive = TraceArchive(tmp_path)
+
+        with pytest.raises(ValueError, match="path segment"):
+            archive.write([_trace(1, tenant_id="../etc")])
+        document = _trace(1)
+        del document["correlation_id"]
+        with pytest.raises(ValueError, match="correlation_id"):
+            archive.write([document])
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestTraceArchiver:
+    """P1-T10: hot-to-warm movement."""
+
+    def test_moves_aged_traces_in_batches(self, tmp_path: Path) -> None:
+        """Traces past the hot window are archived, then deleted from PostgreSQL."""
+        rows = [_trace(n, started_at=T0 + timedelta(hours=n)) for n in range(48)]
+        for row in rows:
+            row["steps"] = json.dumps(row["steps"])  # jsonb arrives as text
+        pool = FakePool(rows)
+        archive = TraceArchive(tmp_path)
+        archiver = TraceArchiver(pool, archive, batch_size=10)  # type: ignore[arg-type]
+
+        moved = asyncio.run(archiver.run_once(now=T0 + timedelta(days=8)))
+
+        # started_at < now - 7 days = T0 + 24h
+        assert moved == 24
+        assert pool.deleted == [row["trace_id"] for row in rows[:24]]
+        document = archive.fetch("t_1", "corr-5")
+        assert document is not None and isinstance(document["steps"], list)
+        assert archive.fetch("t_1", "corr-30") is None
@@ -0,0 +1,252 @@
+"""P1-T35: Contract-driven trace redaction tests.
+
+Test Coverage:
+- Sensitive fields are masked (object members, array wildcards, descendants)
+- Allowlists keep only listed fields and the containers leading to them
+- Unchanged subtrees are shared with the input, and the input is never mutated
+- Plans are compiled once per set of contract annotations
+- Unsupported JSONPath expressions are rejected
+
+Requirements: INV-04, P1-R25
+Oracle: Security (deterministic redaction)
+"""
+
+import copy
+from typing import Any
+
+import pytest
+
+from autobiz.kernel.executor.tool_contract import ToolContract
+from autobiz.kernel.trace import (
+    MASK,
+    RedactionPathError,
+    RedactionPlan,
+    compile_plan,
+    plans_for,
+    redact_input,
+    redact_output,
+)
+
+
+def _order() -> dict[str, Any]:
+    return {
+        "id": 4501,
+        "email": "jane@example.com",
+        "customer": {"id": 77, "email": "jane@example.com", "phone": "+15551234567"},
+        "line_items": [
+            {"sku": "TEE-1", "price": "20.00", "properties": {"gift_note": "hi"}},
+            {"sku": "MUG-2", "price": "12.50", "properties": {}},
+        ],
+        "shipping_address": {"name": "Jane", "phone": "+15557654321", "zip": "94107"},
+        "note_attributes": [{"name": "token", "value": "abc"}],
+    }
+
+
+def _contract(**redaction: Any) -> ToolContract:
+    return ToolContract(
+        name="shopify_get_order",
+        version="1.0.0",
+        input_schema={"type": "object"},
+        output_schema={"type": "object"},
+        side_effect_level="READ",
+        timeout_seconds=10,
+        **redaction,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestSensitiveFieldMasking:
+    """P1-T35: sensitive-field masker."""
+
+    def test_masks_member_paths(self) -> None:
+        """Dotted and bracketed member paths mask exactly those values."""
+        plan = RedactionPlan(["$.email", "$['customer']['phone']"], None)
+
+        result = plan.apply(_order())
+
+        assert result["email"] == MASK
+        assert result["customer"] == {"id": 77, "email": "jane@example.com", "phone": MASK}
+
+    def test_masks_array_wildcards_and_indexes(self) -> None:
+        """[*] masks in every element; [n] only in that element."""
+        plan = RedactionPlan(["$.line_items[*].price", "$.note_attributes[0].value"], None)
+
+        result = plan.apply(_order())
+
+        assert [item["price"] for item in result["line_items"]] == [MASK, MASK]
+        assert result["note_attributes"] == [{"name": "token", "value": MASK}]
+
+    def test_masks_descendants_at_any_depth(self) -> None:
+        """..name masks the member wherever it appears."""
+        plan = RedactionPlan(["$..phone", "$..gift_note"], None)
+
+        result = plan.apply(_order())
+
+        assert result["customer"]["phone"] == MASK
+        assert result["shipping_address"]["phone"] == MASK
+        assert result["line_items"][0]["properties"] == {"gift_note": MASK}
+
+    def test_descendant_beside_absolute_paths(self) -> None:
+        """Sibling absolute paths still match only at their own depth."""
+        plan = RedactionPlan(["$.email", "$.line_items[*].sku", "$..phone"], None)
+
+        result = plan.apply({**_order(), "customer": {"email": "j@x.io", "phone": "555"}})
+
+        assert result["email"] == MASK
+        assert result["customer"] == {"email": "j@x.io", "phone": MASK}
+        assert [item["sku"] for item in result["line_items"]] == [MASK, MASK]
+        assert RedactionPlan(["$.a", "$..b"], None).apply({"x": {"a": 1, "b": 2}}) == {
+            "x": {"a": 1, "b": MASK}
+        }
+
+    def test_masks_whole_subtree(self) -> None:
+        """A path ending at a container masks the container."""
+        result = RedactionPlan(["$.shipping_address"], None).apply(_order())
+
+        assert result["shipping_address"] == MASK
+
+    def test_missing_paths_are_ignored(self) -> None:
+        """Paths absent from the payload change nothing."""
+        order = _order()
+
+        assert RedactionPlan(["$.billing.card", "$.line_items[9].sku"], None).apply(order) is order
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestAllowlistFilter:
+    """P1-T35: schema allowlist filter."""
+
+    def test_keeps_only_allowlisted_paths(self) -> None:
+        """Unlisted fields are dropped; listed subtrees are kept whole."""
+        plan = RedactionPlan([], ["$.id", "$.line_items[*].sku", "$.shipping_address"])
+
+        result = plan.apply(_order())
+
+        assert result == {
+            "id": 4501,
+            "line_items": [{"sku": "TEE-1"}, {"sku": "MUG-2"}],
+            "shipping_address": _order()["shipping_address"],
+        }
+
+    def test_allowlist_then_mask(self) -> None:
+        """Masks apply inside allowlisted subtrees."""
+        plan = RedactionPlan(["$..phone"], ["$.id", "$.shipping_address"])
+
+        result = plan.apply(_order())
+
+        assert result == {
+            "id": 4501,
+            "shipping_address": {"name": "Jane", "phone": MASK, "zip": "94107"},
+        }
+
+    def test_descendant_beside_absolute_paths(self) -> None:
+        """A ..name entry does not let sibling paths match deeper down."""
+        plan = RedactionPlan([], ["$.k", "$..z"])
+
+        result = plan.apply({"k": 1, "x": {"k": 2, "z": 3, "y": {"z": 4, "k": 5}}})
+
+        assert result == {"k": 1, "x": {"z": 3, "y": {"z": 4}}}
+        assert RedactionPlan([], ["$.a.*", "$..id"]).apply(
+            {"a": {"b": 1}, "c": {"d": {"b": 2, "id": 7}}}
+        ) == {"a": {"b": 1}, "c": {"d": {"id": 7}}}
+
+    def test_scalar_on_deeper_path_is_dropped(self) -> None:
+        """A scalar where the allowlist expects a container is removed."""
+        result = RedactionPlan([], ["$.email.domain", "$.id"]).apply(_order())
+
+        assert result == {"id": 4501}
+
+    def test_empty_allowlist_drops_everything(self) -> None:
+        """An empty allowlist keeps an empty root container."""
+        assert RedactionPlan([], []).apply(_order()) == {}
+
+    def test_root_allowlist_keeps_everything(self) -> None:
+        """'$' allowlists the whole payload."""
+        order = _order()
+
+        assert RedactionPlan([], ["$"]).apply(order) is order
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestStructuralSharing:
+    """P1-T35: single-pass walk without deep copies."""
+
+    def test_input_is_not_mutated(self) -> None:
+        """Redaction never writes into the input payload."""
+        order = _order()
+        before = copy.deepcopy(order)
+
+        RedactionPlan(["$..phone", "$.email"], ["$.customer", "$.email", "$.id"]).apply(order)
+
+        assert order == before
+
+    def test_unchanged_subtrees_are_shared(self) -> None:
+        """Only containers on a changed path are copied."""
+        order = _order()
+
+        result = RedactionPlan(["$.customer.phone"], None).apply(order)
+
+        assert result is not order
+        assert result["customer"] is not order["customer"]
+        assert result["line_items"] is order["line_items"]
+        assert result["shipping_address"] is order["shipping_address"]
+
+    def test_noop_plan_returns_input(self) -> None:
+        """No masks and no allowlist: the payload itself is returned."""
+        order = _order()
+        plan = RedactionPlan([], None)
+
+        assert plan.is_noop
+        assert plan.apply(order) is order
+
+    def test_key_order_preserved(self) -> None:
+        """Copied objects keep member order."""
+        result = RedactionPlan(["$.customer"], None).apply(_order())
+
+        assert list(result) == list(_order())
+
+
+@pytest.mark.unit
+@pytest.mark.P1
+@pytest.mark.deterministic
+class TestContractPlans:
+    """P1-T35: plans compiled from ToolContract annotations."""
+
+    def test_redacts_input_and_output_separately(self) -> None:
+        """Input and output use their own annotation lists."""
+        contract = _contract(
+            sensitive_input_fields=["$.email"],
+            sensitive_output_fields=["$.customer.email"],
+            trace_allowlist_output=["$.id", "$.customer"],
+        )
+
+        assert redact_input(contract, _order())["email"] == MASK
+        assert redact_input(contract, _order())["customer"]["email"] == "jane@example.com"
+        assert redact_output(contract, _order()) == {
+            "id": 4501,
+            "customer": {"id": 77, "email": MASK, "phone": "+15551234567"},
+        }
+
+    def test_plans_cached_by_annotations(self) -> None:
+        """Contracts with the same annotations share compiled plans."""
+        first = _contract(sensitive_input_fields=["$.email"])
+        second = _contract(sensitive_input_fields=["$.email"])
+
+        assert plans_for(first).input is plans_for(second).input
+        assert plans_for(first).input is compile_plan(("$.email",), None)
+
+    @pytest.mark.parametrize(
+        "path",
+        ["email", "$.", "$[name]", "$.a[-1]", "$..*", "$.a b", "$['unterminated]"],
+    )
+    def test_rejects_unsupported_paths(self, path: str) -> None:
+        """Paths outside the supported subset raise RedactionPathError."""
+        with pytest.raises(RedactionPathError) as exc:
+            RedactionPlan([path], None)
+        assert exc.value.path == path
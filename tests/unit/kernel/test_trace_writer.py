@@ -0,0 +1,197 @@
+"""P1-T09, P1-T10: Batched trace writer tests.
+
+Test Coverage:
+- Appends from concurrent runs are coalesced into few sink writes
+- Every record is persisted once, in per-trace order
+- A full queue makes append() wait (backpressure)
+- Transient sink failures are retried without duplicates
+- Persistent failures are reported by flush()
+- flush() and close() raise instead of hanging if the drain task died
+
+Requirements: INV-04, P1-R05
+Oracle: Trace (deterministic persistence)
+"""
+
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from autobiz.kernel.trace import (
+    InMemoryTraceSink,
+    TraceRecord,
+    TraceWriteError,
+    TraceWriter,
+)
+
+
+def _step(trace: int, seq: int) -> TraceRecord:
+    return TraceRecord("step", f"00000000-0000-0000-0000-{trace:012d}", "t_1", seq, {"n": seq})
+
+
+class FlakySink(InMemoryTraceSink):
+    """Fails the first `failures` writes, after persisting them (ambiguous failure)."""
+
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+        self.attempts = 0
+
+    async def write(self, records: Sequence[TraceRecord]) -> None:
+        self.attempts += 1
+        await super().write(records)
+        if self.attempts <= self.failures:
+            raise ConnectionError("connection reset")
+
+
+@pytest.mark.unit
+@pytest.mark.P0
+@pytest.mark.deterministic
+class TestTraceWriter:
+    """P1-T09/P1-T10: micro-batched append-only persistence."""
+
+    def test_concurrent_runs_share_batches(self) -> None:
+        """50 runs x 40 steps are written in far fewer than 2000 round-trips."""
+
+        async def scenario() -> None:
+            sink = InMemoryTraceSink(latency=0.002)
+            writer = TraceWriter(sink, max_delay=0)
+            writer.start()
+
+            async def run(trace: int) -> None:
+                for seq in range(40):
+                    await writer.append(_step(trace, seq))
+                    await asyncio.sleep(0)
+
+            await asyncio.gather(*(run(trace) for trace in range(50)))
+            await writer.close()
+
+            assert len(sink.records) == 2000
+            assert len(sink.batch_sizes) < 100
+            assert writer.stats.written == writer.stats.appended == 2000
+
+        asyncio.run(scenario())
+
+    def test_per_trace_order_preserved(self) -> None:
+        """Records of one trace reach the sink in append order."""
+
+        async def scenario() -> None:
+            sink = InMemoryTraceSink()
+            writer = TraceWriter(sink, max_batch=7)
+            writer.start()
+            for seq in range(30):
+                for trace in range(3):
+                    await writer.append(_step(trace, seq))
+            await writer.flush()
+
+            for trace in range(3):
+                seqs = [r.seq for r in sink.records if r.trace_id.endswith(f"{trace:012d}")]
+                assert seqs == list(range(30))
+            assert max(sink.batch_sizes) <= 7
+            await writer.close()
+
+        asyncio.run(scenario())
+
+    def test_full_queue_applies_backpressure(self) -> None:
+        """append() waits for space instead of growing the queue."""
+
+        async def scenario() -> None:
+            sink = InMemoryTraceSink(latency=0.005)
+            writer = TraceWriter(sink, max_batch=10, max_pending=20, max_delay=0)
+            writer.start()
+
+            for seq in range(200):
+                await writer.append(_step(1, seq))
+                assert writer._queue.qsize() <= 20
+
+            await writer.close()
+            assert writer.stats.backpressure_waits > 0
+            assert len(sink.records) == 200
+
+        asyncio.run(scenario())
+
+    def test_transient_failure_retried_without_duplicates(self) -> None:
+        """A failed write is retried; rows written before the failure are not duplicated."""
+
+        async def scenario() -> None:
+            sink = FlakySink(failures=2)
+            writer = TraceWriter(sink, max_attempts=3)
+            writer.start()
+            for seq in range(5):
+                await writer.append(_step(1, seq))
+            await writer.close()
+
+            assert [r.seq for r in sink.records] == [0, 1, 2, 3, 4]
+            assert writer.stats.retries == 2
+            assert writer.stats.dropped == 0
+
+        asyncio.run(scenario())
+
+    def test_persistent_failure_reported_by_flush(self) -> None:
+        """Records dropped after max_attempts surface as TraceWriteError once."""
+
+        async def scenario() -> None:
+            sink = FlakySink(failures=100)
+            writer = TraceWriter(sink, max_attempts=2, max_delay=0)
+            writer.start()
+            await writer.append(_step(1, 0))
+
+            with pytest.raises(TraceWriteError) as exc:
+                await writer.flush()
+            assert exc.value.dropped == 1
+            await writer.flush()  # already reported
+            await writer.close()
+
+        asyncio.run(scenario())
+
+    def test_flush_raises_if_drain_task_died(self) -> None:
+        """Records stranded by a dead drain task fail flush() instead of hanging it."""
+
+        class Fatal(BaseException):
+            pass
+
+        class FatalSink(InMemoryTraceSink):
+            async def write(self, records: Sequence[TraceRecord]) -> None:
+                raise Fatal()
+
+        async def scenario() -> None:
+            writer = TraceWriter(FatalSink(), max_batch=1, max_delay=0)
+            writer.start()
+            for seq in range(3):
+                await writer.append(_step(1, seq))
+
+            with pytest.raises(RuntimeError, match="drain task stopped") as exc:
+                await asyncio.wait_for(writer.flush(), timeout=1)
+            assert isinstance(exc.value.__cause__, Fatal)
+            with pytest.raises(RuntimeError, match="not running"):
+                await writer.append(_step(1, 3))
+            await asyncio.wait_for(writer.close(), timeout=1)
+
+        asyncio.run(scenario())
+
+    def test_close_raises_if_drain_task_cancelled(self) -> None:
+        """close() does not block on a full queue nobody drains."""
+
+        async def scenario() -> None:
+            writer = TraceWriter(InMemoryTraceSink(), max_pending=1, max_delay=10)
+            writer.start()
+            await writer.append(_step(1, 0))
+            await writer.append(_step(1, 1))
+            assert writer._task is not None
+            writer._task.cancel()
+            await asyncio.sleep(0)
+
+            with pytest.raises(RuntimeError, match="drain task stopped"):
+                await asyncio.wait_for(writer.close(), timeout=1)
+
+        asyncio.run(scenario())
+
+    def test_append_requires_running_writer(self) -> None:
+        """Appending before start() fails fast."""
+
+        async def scenario() -> None:
+            writer = TraceWriter(InMemoryTraceSink())
+            with pytest.raises(RuntimeError, match="not running"):
+                await writer.append(_step(1, 0))
+
+        asyncio.run(scenario())